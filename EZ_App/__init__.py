@@ -4,6 +4,8 @@ __all__ = [
     "config",
     "crypto",
     "wallet_store",
+    "history_store",
+    "metrics",
     "node_manager",
     "profiles",
     "service",
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import csv
 import json
 from pathlib import Path
 
@@ -22,6 +23,7 @@ def _build_runtime(config_path: str):
         cfg.app.data_dir,
         max_tx_amount=cfg.security.max_tx_amount,
         protocol_version=cfg.app.protocol_version,
+        v2_max_pending_bundles=cfg.app.v2_max_pending_bundles,
     )
     return cfg, wallet_store, node_manager, tx_engine
 
@@ -77,6 +79,8 @@ def _tx_capabilities(cfg) -> dict[str, str]:
             "tx_receipts": "remote_read",
             "tx_history": "remote_read",
             "tx_send": "remote_send",
+            "tx_send_batch": "unsupported",
+            "tx_estimate": "remote_read",
             "tx_faucet": "unsupported",
         }
     if protocol_version == "v2":
@@ -87,6 +91,8 @@ def _tx_capabilities(cfg) -> dict[str, str]:
             "tx_receipts": "local",
             "tx_history": "local",
             "tx_send": "local",
+            "tx_send_batch": "local",
+            "tx_estimate": "local",
             "tx_faucet": "local",
         }
     return {
@@ -96,12 +102,14 @@ def _tx_capabilities(cfg) -> dict[str, str]:
         "tx_receipts": "unsupported",
         "tx_history": "local",
         "tx_send": "local",
+        "tx_send_batch": "unsupported",
+        "tx_estimate": "unsupported",
         "tx_faucet": "local",
     }
 
 
 def _tx_action_key(action: str) -> str:
-    return str(action).replace(" ", "_")
+    return str(action).replace(" ", "_").replace("-", "_")
 
 
 def _tx_action_error_payload(
@@ -304,6 +312,30 @@ def _tx_send_error(exc: ValueError) -> tuple[str, str] | None:
     return None
 
 
+def _load_batch_payments(path: str) -> list[dict[str, object]]:
+    # JSON: a list of {"recipient", "amount"} objects, or {"payments": [...]}.
+    # CSV: recipient,amount rows with an optional header line.
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix.lower() == ".json" or text.lstrip().startswith(("[", "{")):
+        parsed = json.loads(text)
+        if isinstance(parsed, dict):
+            parsed = parsed.get("payments", [])
+        if not isinstance(parsed, list):
+            raise ValueError("invalid_batch_file")
+        return parsed
+    payments: list[dict[str, object]] = []
+    for row in csv.reader(text.splitlines()):
+        if not row or not "".join(row).strip() or row[0].strip().startswith("#"):
+            continue
+        if len(row) < 2:
+            raise ValueError("invalid_batch_file")
+        recipient, amount = row[0].strip(), row[1].strip()
+        if not payments and recipient.lower() == "recipient":
+            continue
+        payments.append({"recipient": recipient, "amount": amount})
+    return payments
+
+
 def main(argv=None) -> int:
     parser = argparse.ArgumentParser(description="EZchain CLI")
     parser.add_argument("--config", default="ezchain.yaml")
@@ -336,11 +368,22 @@ def main(argv=None) -> int:
     tx_send.add_argument("--password", required=True)
     tx_send.add_argument("--client-tx-id", default=None)
     tx_send.add_argument("--recipient-endpoint", default=None)
+    tx_send_batch = tx_sub.add_parser("send-batch")
+    tx_send_batch.add_argument("--file", required=True)
+    tx_send_batch.add_argument("--password", required=True)
+    tx_send_batch.add_argument("--client-batch-id", default=None)
+    tx_estimate = tx_sub.add_parser("estimate")
+    tx_estimate.add_argument("--recipient", required=True)
+    tx_estimate.add_argument("--amount", type=int, required=True)
+    tx_estimate.add_argument("--password", required=True)
+    tx_estimate.add_argument("--max-package-bytes", type=int, default=None)
     tx_pending = tx_sub.add_parser("pending")
     tx_pending.add_argument("--password", required=True)
     tx_receipts = tx_sub.add_parser("receipts")
     tx_receipts.add_argument("--password", required=True)
-    tx_sub.add_parser("history")
+    tx_history = tx_sub.add_parser("history")
+    tx_history.add_argument("--limit", type=int, default=None)
+    tx_history.add_argument("--cursor", default=None)
 
     tx_faucet = tx_sub.add_parser("faucet")
     tx_faucet.add_argument("--amount", type=int, required=True)
@@ -515,6 +558,80 @@ def main(argv=None) -> int:
             wallet_store.append_history(item)
             print(json.dumps(item, indent=2))
             return 0
+        if args.tx_cmd == "send-batch":
+            if not _tx_path_ready(cfg) or _tx_capabilities(cfg).get("tx_send_batch") != "local":
+                return _print_tx_path_not_ready(cfg, action="tx send-batch")
+            try:
+                payments = _load_batch_payments(args.file)
+            except (OSError, ValueError) as exc:
+                return _print_tx_action_error(
+                    cfg,
+                    action="tx send-batch",
+                    error_code="invalid_batch_file",
+                    error_message=str(exc),
+                )
+            result = tx_engine.send_batch(
+                wallet_store=wallet_store,
+                password=args.password,
+                payments=payments,
+                client_batch_id=args.client_batch_id,
+            )
+            sender = wallet_store.summary(protocol_version=cfg.app.protocol_version).address
+            history_items = result.history_items(sender)
+            wallet_store.append_history_many([item for item in history_items if item["status"] == "confirmed"])
+            print(
+                json.dumps(
+                    {
+                        "client_batch_id": result.client_batch_id,
+                        "status": result.status,
+                        "bundle_count": result.bundle_count,
+                        "payment_count": len(payments),
+                        "items": history_items,
+                        "error": result.error,
+                    },
+                    indent=2,
+                )
+            )
+            return 0 if result.error is None else 1
+        if args.tx_cmd == "estimate":
+            capability = _tx_capabilities(cfg).get("tx_estimate")
+            try:
+                if capability == "remote_read":
+                    remote_state = _remote_read_state(cfg, node_manager)
+                    if remote_state is None:
+                        return _print_tx_path_not_ready(cfg, action="tx estimate")
+                    data = tx_engine.remote_estimate(
+                        wallet_store,
+                        password=args.password,
+                        state=remote_state,
+                        recipient=args.recipient,
+                        amount=args.amount,
+                        max_package_bytes=args.max_package_bytes,
+                    )
+                elif capability == "local" and _tx_path_ready(cfg):
+                    data = tx_engine.estimate(
+                        wallet_store,
+                        password=args.password,
+                        recipient=args.recipient,
+                        amount=args.amount,
+                        max_package_bytes=args.max_package_bytes,
+                    )
+                else:
+                    return _print_tx_path_not_ready(cfg, action="tx estimate")
+            except ValueError as exc:
+                mapped_error = _tx_send_error(exc)
+                if mapped_error is None:
+                    raise
+                error_code, error_message = mapped_error
+                return _print_tx_action_error(
+                    cfg,
+                    action="tx estimate",
+                    error_code=error_code,
+                    error_message=error_message,
+                    capability=capability,
+                )
+            print(json.dumps(data, indent=2))
+            return 0
         if args.tx_cmd == "pending":
             if not _tx_path_ready(cfg):
                 remote_state = _remote_read_state(cfg, node_manager)
@@ -538,9 +655,15 @@ def main(argv=None) -> int:
                 remote_state = _remote_read_state(cfg, node_manager)
                 if remote_state is None:
                     return _print_tx_path_not_ready(cfg, action="tx history")
-                print(json.dumps(tx_engine.remote_history(wallet_store, state=remote_state), indent=2))
+                data = tx_engine.remote_history(
+                    wallet_store,
+                    state=remote_state,
+                    cursor=args.cursor,
+                    limit=args.limit,
+                )
+                print(json.dumps(data, indent=2))
                 return 0
-            print(json.dumps(tx_engine.history(wallet_store), indent=2))
+            print(json.dumps(tx_engine.history(wallet_store, cursor=args.cursor, limit=args.limit), indent=2))
             return 0
 
     if args.cmd == "contacts":
@@ -28,6 +28,7 @@ DEFAULT_CONFIG = {
         "api_port": 8787,
         "api_token_file": ".ezchain/api.token",
         "protocol_version": "v1",
+        "v2_max_pending_bundles": 1,
     },
     "security": {
         "max_payload_bytes": 65536,
@@ -54,6 +55,7 @@ class AppConfig:
     api_port: int = 8787
     api_token_file: str = ".ezchain/api.token"
     protocol_version: str = "v1"
+    v2_max_pending_bundles: int = 1
 
 
 @dataclass
@@ -147,6 +149,7 @@ def _to_yaml(cfg: EZAppConfig) -> str:
         f"  api_port: {int(cfg.app.api_port)}",
         f'  api_token_file: "{cfg.app.api_token_file}"',
         f'  protocol_version: "{cfg.app.protocol_version}"',
+        f"  v2_max_pending_bundles: {int(cfg.app.v2_max_pending_bundles)}",
         "",
         "security:",
         f"  max_payload_bytes: {int(cfg.security.max_payload_bytes)}",
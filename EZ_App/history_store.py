@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+HISTORY_SOURCE_APP = "app"
+HISTORY_SOURCE_DERIVED = "derived"
+
+DEFAULT_HISTORY_PAGE_LIMIT = 50
+MAX_HISTORY_PAGE_LIMIT = 500
+
+
+def history_entry_key(item: Dict[str, Any]) -> Optional[str]:
+    transfer_package_hash = str(item.get("transfer_package_hash", "")).strip()
+    if transfer_package_hash:
+        return f"transfer:{transfer_package_hash}"
+    tx_id = str(item.get("tx_id", "")).strip()
+    if not tx_id:
+        return None
+    status = str(item.get("status", "")).strip()
+    if status == "received":
+        begin = item.get("value_begin")
+        end = item.get("value_end")
+        if begin is not None and end is not None:
+            return f"received:{tx_id}:{int(begin)}:{int(end)}"
+    return f"tx:{tx_id}:{status}"
+
+
+def parse_history_cursor(cursor: Any) -> Optional[int]:
+    if cursor is None:
+        return None
+    raw = str(cursor).strip()
+    if not raw:
+        return None
+    if not raw.isdigit():
+        raise ValueError("invalid_history_cursor")
+    return int(raw)
+
+
+def normalize_history_limit(limit: Any) -> int:
+    try:
+        value = int(limit)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("invalid_history_limit") from exc
+    if value <= 0:
+        raise ValueError("invalid_history_limit")
+    return min(value, MAX_HISTORY_PAGE_LIMIT)
+
+
+@dataclass(frozen=True)
+class HistoryPage:
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+
+
+class HistoryStore:
+    """Append-only transaction history log.
+
+    Entries are never rewritten: app-recorded entries (sends, received
+    transfers) and entries derived from wallet records share one table ordered
+    by an autoincrement ``seq``. A derived entry is hidden when an app entry
+    with the same key exists, so the app's richer record wins.
+    """
+
+    def __init__(self, db_path: str, legacy_json_path: str | None = None):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # One connection may be shared by a long-lived owner's threads.
+        self._lock = threading.RLock()
+        self._init_schema()
+        if legacy_json_path:
+            self._import_legacy_json(Path(legacy_json_path))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _init_schema(self) -> None:
+        with self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS history_entries (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT NOT NULL,
+                    entry_key TEXT,
+                    entry_json TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_history_entries_key
+                    ON history_entries (entry_key, source);
+                CREATE INDEX IF NOT EXISTS idx_history_entries_source
+                    ON history_entries (source, seq);
+
+                CREATE TABLE IF NOT EXISTS history_meta (
+                    meta_key TEXT PRIMARY KEY,
+                    meta_value TEXT NOT NULL
+                );
+                """
+            )
+
+    def _import_legacy_json(self, legacy_path: Path) -> None:
+        if self.get_meta("legacy_json_imported") is not None:
+            return
+        items: list[Dict[str, Any]] = []
+        if legacy_path.exists():
+            try:
+                parsed = json.loads(legacy_path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                parsed = []
+            if isinstance(parsed, list):
+                items = [item for item in parsed if isinstance(item, dict)]
+        with self._conn:
+            self._insert_many_locked(items, source=HISTORY_SOURCE_APP)
+            self._set_meta_locked("legacy_json_imported", str(len(items)))
+
+    def _insert_many_locked(self, items: Iterable[Dict[str, Any]], *, source: str) -> int:
+        inserted = 0
+        for item in items:
+            key = history_entry_key(item)
+            if source == HISTORY_SOURCE_DERIVED:
+                if key is None:
+                    continue
+                exists = self._conn.execute(
+                    "SELECT 1 FROM history_entries WHERE entry_key = ? LIMIT 1",
+                    (key,),
+                ).fetchone()
+                if exists is not None:
+                    continue
+            self._conn.execute(
+                "INSERT INTO history_entries (source, entry_key, entry_json) VALUES (?, ?, ?)",
+                (source, key, json.dumps(item, sort_keys=True)),
+            )
+            inserted += 1
+        return inserted
+
+    def append(self, item: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._insert_many_locked((item,), source=HISTORY_SOURCE_APP)
+
+    def append_many(self, items: Iterable[Dict[str, Any]]) -> int:
+        with self._lock, self._conn:
+            return self._insert_many_locked(items, source=HISTORY_SOURCE_APP)
+
+    def append_derived(self, items: Iterable[Dict[str, Any]]) -> int:
+        with self._lock, self._conn:
+            return self._insert_many_locked(items, source=HISTORY_SOURCE_DERIVED)
+
+    def list_items(self, *, source: str | None = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            if source is not None:
+                rows = self._conn.execute(
+                    "SELECT entry_json FROM history_entries WHERE source = ? ORDER BY seq",
+                    (source,),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT h.entry_json FROM history_entries h WHERE {self._visible_clause()} ORDER BY h.seq"
+                ).fetchall()
+        return [json.loads(row["entry_json"]) for row in rows]
+
+    def page(self, *, cursor: Any = None, limit: Any = DEFAULT_HISTORY_PAGE_LIMIT) -> HistoryPage:
+        """One page of visible entries in ``list_items`` order, oldest first.
+
+        ``cursor`` is the ``next_cursor`` of the previous page.
+        """
+        after_seq = parse_history_cursor(cursor)
+        page_limit = normalize_history_limit(limit)
+        params: list[Any] = []
+        where = self._visible_clause()
+        if after_seq is not None:
+            where += " AND h.seq > ?"
+            params.append(after_seq)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT h.seq, h.entry_json
+                FROM history_entries h
+                WHERE {where}
+                ORDER BY h.seq
+                LIMIT ?
+                """,
+                (*params, page_limit + 1),
+            ).fetchall()
+        has_more = len(rows) > page_limit
+        rows = rows[:page_limit]
+        next_cursor = str(int(rows[-1]["seq"])) if has_more and rows else None
+        return HistoryPage(
+            items=[json.loads(row["entry_json"]) for row in rows],
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def _visible_clause() -> str:
+        return (
+            "(h.source = 'app' OR h.entry_key IS NULL OR NOT EXISTS ("
+            "SELECT 1 FROM history_entries a WHERE a.entry_key = h.entry_key AND a.source = 'app'))"
+        )
+
+    def get_meta(self, meta_key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT meta_value FROM history_meta WHERE meta_key = ?",
+                (meta_key,),
+            ).fetchone()
+        return None if row is None else str(row["meta_value"])
+
+    def set_meta(self, meta_key: str, meta_value: str) -> None:
+        with self._lock, self._conn:
+            self._set_meta_locked(meta_key, meta_value)
+
+    def _set_meta_locked(self, meta_key: str, meta_value: str) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO history_meta (meta_key, meta_value)
+            VALUES (?, ?)
+            ON CONFLICT(meta_key) DO UPDATE SET meta_value = excluded.meta_value
+            """,
+            (meta_key, meta_value),
+        )
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS_SECONDS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Mapping[str, Any]]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((str(key), str(value)) for key, value in labels.items()))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    body = ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in pairs)
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram; observing is a bisect plus two additions."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_SECONDS):
+        ordered = tuple(sorted(float(bound) for bound in buckets))
+        if not ordered:
+            raise ValueError("histogram_buckets_required")
+        self.buckets = ordered
+        self.bucket_counts = [0] * (len(ordered) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        value = max(0.0, float(value))
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other.buckets != self.buckets:
+            raise ValueError("histogram_bucket_mismatch")
+        for index, count in enumerate(other.bucket_counts):
+            self.bucket_counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+
+    def cumulative_counts(self) -> list[int]:
+        running = 0
+        cumulative: list[int] = []
+        for count in self.bucket_counts:
+            running += count
+            cumulative.append(running)
+        return cumulative
+
+    def quantile(self, q: float) -> Optional[float]:
+        # Linear interpolation inside the bucket holding the q-th observation,
+        # the same estimate Prometheus' histogram_quantile() produces.
+        if self.count == 0:
+            return None
+        rank = min(max(float(q), 0.0), 1.0) * self.count
+        lower = 0.0
+        running = 0
+        for index, count in enumerate(self.bucket_counts):
+            upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+            if count and running + count >= rank:
+                if index >= len(self.buckets):
+                    return self.buckets[-1]
+                return lower + (upper - lower) * ((rank - running) / count)
+            running += count
+            lower = upper
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        def _ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000.0, 3)
+
+        return {
+            "count": self.count,
+            "avg_ms": _ms(self.sum / self.count) if self.count else None,
+            "p50_ms": _ms(self.quantile(0.50)),
+            "p90_ms": _ms(self.quantile(0.90)),
+            "p99_ms": _ms(self.quantile(0.99)),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and latency histograms keyed by name + labels."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_SECONDS):
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self._descriptions: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, LatencyHistogram]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        if kind not in {"counter", "gauge", "histogram"}:
+            raise ValueError("unsupported_metric_kind")
+        with self.lock:
+            self._descriptions[name] = (kind, help_text)
+
+    def inc(self, name: str, labels: Optional[Mapping[str, Any]] = None, amount: float = 1.0) -> None:
+        key = _label_key(labels)
+        with self.lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + float(amount)
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Mapping[str, Any]] = None) -> None:
+        key = _label_key(labels)
+        with self.lock:
+            self._gauges.setdefault(name, {})[key] = float(value)
+
+    def observe(self, name: str, seconds: float, labels: Optional[Mapping[str, Any]] = None) -> None:
+        key = _label_key(labels)
+        with self.lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = LatencyHistogram(self.buckets)
+                series[key] = histogram
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, name: str, labels: Optional[Mapping[str, Any]] = None) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, labels)
+
+    def histogram_snapshot(self, name: str, *labels: str) -> Dict[str, Dict[str, Any]]:
+        """Summaries of one histogram family keyed by the values of ``labels``, space-joined.
+
+        Series that agree on ``labels`` but differ in other labels are merged, so
+        pass every label that tells series apart (e.g. method and route).
+        """
+        with self.lock:
+            series = dict(self._histograms.get(name, {}))
+            merged: Dict[str, LatencyHistogram] = {}
+            for key, histogram in sorted(series.items()):
+                key_labels = dict(key)
+                label_value = " ".join(str(key_labels.get(label, "")) for label in labels)
+                target = merged.get(label_value)
+                if target is None:
+                    target = LatencyHistogram(self.buckets)
+                    merged[label_value] = target
+                target.merge(histogram)
+            return {label_value: histogram.snapshot() for label_value, histogram in merged.items()}
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        with self.lock:
+            families: list[Tuple[str, str, Any]] = []
+            families.extend((name, "counter", series) for name, series in self._counters.items())
+            families.extend((name, "gauge", series) for name, series in self._gauges.items())
+            families.extend((name, "histogram", series) for name, series in self._histograms.items())
+            for name, kind, series in sorted(families, key=lambda item: item[0]):
+                _, help_text = self._descriptions.get(name, (kind, ""))
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key in sorted(series):
+                    if kind != "histogram":
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(series[key])}")
+                        continue
+                    histogram: LatencyHistogram = series[key]
+                    cumulative = histogram.cumulative_counts()
+                    for bound, count in zip(histogram.buckets, cumulative):
+                        le = (("le", _format_value(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(key, le)} {count}")
+                    lines.append(f'{name}_bucket{_format_labels(key, (("le", "+Inf"),))} {cumulative[-1]}')
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
@@ -284,6 +284,7 @@ class NodeManager:
         mode: str = "local",
         bootstrap_nodes: List[str] | None = None,
         network_name: str = "testnet",
+        v2_full_resync_sec: float | None = None,
     ) -> Dict[str, Any]:
         mode = self._normalize_mode(mode)
         bootstrap_nodes = bootstrap_nodes or []
@@ -474,6 +475,8 @@ class NodeManager:
                 "--wallet-file",
                 str(self.data_dir / "wallet.json"),
             ]
+            if v2_full_resync_sec is not None:
+                cmd.extend(["--full-resync-sec", str(v2_full_resync_sec)])
             proc = subprocess.Popen(
                 cmd,
                 cwd=str(self.project_root),
@@ -7,7 +7,7 @@ import time
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Sequence
 
 from EZ_V2.app_client import V2LocalAppClient, V2LocalAppSession
 from EZ_V2.crypto import keccak256
@@ -15,15 +15,23 @@ from EZ_V2.encoding import canonical_encode
 from EZ_V2.network_host import V2AccountHost
 from EZ_V2.network_transport import TCPNetworkTransport
 from EZ_V2.networking import PeerInfo, with_v2_features
+from EZ_V2.storage import LocalWalletDB
 from EZ_V2.transport_peer import TransportPeerNetwork
-from EZ_V2.values import LocalValueStatus, ValueRange
+from EZ_V2.values import LocalValueRecord, LocalValueStatus, ValueRange
 from EZ_V2.wallet import WalletAccountV2
 
+from EZ_App.history_store import DEFAULT_HISTORY_PAGE_LIMIT, history_entry_key
+from EZ_App.metrics import MetricsRegistry
 from EZ_App.wallet_store import WalletStore
 
 if TYPE_CHECKING:
     from EZ_Account.Account import Account
 
+TX_STAGE_METRIC = "ezchain_tx_stage_seconds"
+WALLET_RECORDS_METRIC = "ezchain_wallet_value_records"
+WALLET_WITNESS_METRIC = "ezchain_wallet_witness_size"
+MAX_BATCH_PAYMENTS = 10_000
+
 
 @dataclass
 class TxResult:
@@ -37,6 +45,65 @@ class TxResult:
     receipt_block_hash: Optional[str] = None
 
 
+@dataclass
+class BatchTxResult:
+    items: list[TxResult]
+    bundle_count: int
+    client_batch_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        return "partial" if self.error else "confirmed"
+
+    def history_items(self, sender: str, timestamp: Optional[str] = None) -> list[Dict[str, Any]]:
+        items: list[Dict[str, Any]] = []
+        for result in self.items:
+            item: Dict[str, Any] = {
+                "tx_id": result.tx_hash,
+                "submit_hash": result.submit_hash,
+                "sender": sender,
+                "recipient": result.recipient,
+                "amount": result.amount,
+                "status": result.status,
+                "client_tx_id": result.client_tx_id,
+            }
+            if self.client_batch_id:
+                item["client_batch_id"] = self.client_batch_id
+            if timestamp is not None:
+                item["timestamp"] = timestamp
+            if result.receipt_height is not None:
+                item["receipt_height"] = result.receipt_height
+            if result.receipt_block_hash is not None:
+                item["receipt_block_hash"] = result.receipt_block_hash
+            items.append(item)
+        return items
+
+
+def normalize_batch_payments(payments: Sequence[Mapping[str, Any]], max_tx_amount: int) -> list[tuple[str, int]]:
+    if not payments:
+        raise ValueError("payments_required")
+    if len(payments) > MAX_BATCH_PAYMENTS:
+        raise ValueError("batch_too_large")
+    normalized: list[tuple[str, int]] = []
+    for item in payments:
+        if not isinstance(item, Mapping):
+            raise ValueError("invalid_payment_entry")
+        recipient = str(item.get("recipient", "") or "").strip()
+        if not recipient:
+            raise ValueError("recipient_required")
+        try:
+            amount = int(item.get("amount", 0))
+        except (TypeError, ValueError) as exc:
+            raise ValueError("invalid_payment_amount") from exc
+        if amount <= 0:
+            raise ValueError("amount_must_be_positive")
+        if amount > max_tx_amount:
+            raise ValueError("amount_exceeds_limit")
+        normalized.append((recipient, amount))
+    return normalized
+
+
 class TxEngine:
     def __init__(
         self,
@@ -47,6 +114,7 @@ class TxEngine:
         v2_expiry_height: int = 1000000,
         v2_backend_dir: str | None = None,
         v2_network_timeout_sec: float = 20.0,
+        v2_max_pending_bundles: int = 1,
     ):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
@@ -63,6 +131,7 @@ class TxEngine:
         self.v2_chain_id = v2_chain_id
         self.v2_expiry_height = v2_expiry_height
         self.v2_network_timeout_sec = max(0.5, float(v2_network_timeout_sec))
+        self.v2_max_pending_bundles = max(1, int(v2_max_pending_bundles))
         self.v2_genesis_block_hash = b"\x00" * 32
         self.v2_backend_dir = Path(v2_backend_dir) if v2_backend_dir else (self.data_dir / "v2_runtime")
         self.v2_backend_dir.mkdir(parents=True, exist_ok=True)
@@ -76,6 +145,26 @@ class TxEngine:
         self.v2_faucet_state_file = self.data_dir / "v2_faucet_state.json"
         self.idempotency_file = self.data_dir / "tx_idempotency.json"
         self.idempotency_lock = threading.Lock()
+        self.metrics = MetricsRegistry()
+        self.metrics.describe(TX_STAGE_METRIC, "histogram", "Latency of TxEngine send stages in seconds.")
+        self.metrics.describe(WALLET_RECORDS_METRIC, "gauge", "Wallet value records by local status.")
+        self.metrics.describe(
+            WALLET_WITNESS_METRIC,
+            "gauge",
+            "Witness units and encoded bytes across live wallet records, plus checkpoint count.",
+        )
+
+    def _stage(self, stage: str):
+        return self.metrics.time(TX_STAGE_METRIC, {"stage": stage})
+
+    def _observe_wallet_records(self, account: WalletAccountV2) -> None:
+        counts = {status.value: 0 for status in LocalValueStatus}
+        for record in account.records:
+            counts[record.local_status.value] += 1
+        for status, count in counts.items():
+            self.metrics.set_gauge(WALLET_RECORDS_METRIC, count, {"status": status})
+        for stat, value in account.witness_size_stats().to_dict().items():
+            self.metrics.set_gauge(WALLET_WITNESS_METRIC, value, {"stat": stat})
 
     def _build_account(self, wallet_store: WalletStore, password: str) -> Account:
         from EZ_Account.Account import Account
@@ -92,7 +181,8 @@ class TxEngine:
         )
 
     def _build_v2_wallet(self, wallet_store: WalletStore, password: str) -> tuple[Dict[str, Any], str]:
-        wallet = wallet_store.load_v2_wallet(password=password)
+        with self._stage("unlock"):
+            wallet = wallet_store.load_v2_wallet(password=password)
         wallet_dir = self.data_dir / "wallet_state_v2" / wallet["address"]
         wallet_dir.mkdir(parents=True, exist_ok=True)
         return wallet, str(wallet_dir / "wallet_v2.db")
@@ -105,11 +195,12 @@ class TxEngine:
         auto_confirm_receipts: bool = True,
     ) -> tuple[Dict[str, Any], V2LocalAppSession]:
         wallet_identity, wallet_db_path = self._build_v2_wallet(wallet_store, password)
-        session = self.v2_client.open_session(
-            wallet_identity=wallet_identity,
-            wallet_db_path=wallet_db_path,
-            auto_confirm_receipts=auto_confirm_receipts,
-        )
+        with self._stage("session_open"):
+            session = self.v2_client.open_session(
+                wallet_identity=wallet_identity,
+                wallet_db_path=wallet_db_path,
+                auto_confirm_receipts=auto_confirm_receipts,
+            )
         return wallet_identity, session
 
     def _open_v2_backend(
@@ -192,6 +283,15 @@ class TxEngine:
     def _local_v2_wallet_db_path(self, wallet_address: str) -> str:
         return str(self.data_dir / "wallet_state_v2" / wallet_address / "wallet_v2.db")
 
+    def storage_paths(self, wallet_store: WalletStore) -> Dict[str, Path]:
+        if self.protocol_version == "v1":
+            return {"app_tx_pool": self.data_dir / "app_tx_pool.db"}
+        paths = {"v2_consensus": self.v2_backend_dir / "consensus.sqlite3"}
+        if wallet_store.exists():
+            address = wallet_store.summary(protocol_version="v2").address
+            paths["wallet_v2"] = Path(self._local_v2_wallet_db_path(address))
+        return paths
+
     @staticmethod
     def _remote_v2_chain_height(state: Dict[str, Any]) -> int:
         cursor = state.get("chain_cursor")
@@ -212,7 +312,8 @@ class TxEngine:
         return f"account-{str(address).lower()[-8:]}"
 
     def _open_remote_v2_wallet(self, wallet_store: WalletStore, password: str, state: Dict[str, Any]) -> WalletAccountV2:
-        wallet = wallet_store.load_v2_wallet(password=password)
+        with self._stage("unlock"):
+            wallet = wallet_store.load_v2_wallet(password=password)
         remote_address = str(state.get("address", "")).strip()
         if remote_address and remote_address != wallet["address"]:
             raise ValueError("wallet_address_mismatch_with_account_node")
@@ -221,6 +322,7 @@ class TxEngine:
             address=wallet["address"],
             genesis_block_hash=self.v2_genesis_block_hash,
             db_path=db_path,
+            max_pending_bundles=self.v2_max_pending_bundles,
         )
 
     @staticmethod
@@ -265,49 +367,11 @@ class TxEngine:
             "items": items,
         }
 
-    def _v2_history_key(self, item: Dict[str, Any]) -> tuple[Any, ...] | None:
-        transfer_package_hash = str(item.get("transfer_package_hash", "")).strip()
-        if transfer_package_hash:
-            return ("transfer", transfer_package_hash)
-        tx_id = str(item.get("tx_id", "")).strip()
-        if not tx_id:
-            return None
-        status = str(item.get("status", "")).strip()
-        if status == "received":
-            begin = item.get("value_begin")
-            end = item.get("value_end")
-            if begin is not None and end is not None:
-                return ("received", tx_id, int(begin), int(end))
-        return ("tx", tx_id, status)
-
-    def _merge_v2_history_items(
-        self,
-        stored_items: list[Dict[str, Any]],
-        derived_items: list[Dict[str, Any]],
-    ) -> list[Dict[str, Any]]:
-        merged = [dict(item) for item in stored_items]
-        seen = {key for item in merged if (key := self._v2_history_key(item)) is not None}
-        for item in derived_items:
-            key = self._v2_history_key(item)
-            if key is not None and key in seen:
-                continue
-            merged.append(dict(item))
-            if key is not None:
-                seen.add(key)
-        return merged
-
-    def _derive_v2_history_items(self, account: WalletAccountV2) -> list[Dict[str, Any]]:
-        items: list[Dict[str, Any]] = []
-        seen: set[tuple[Any, ...]] = set()
-        for record in sorted(
-            account.list_records(),
-            key=lambda item: (
-                item.acquisition_height,
-                item.value.begin,
-                item.value.end,
-                item.record_id,
-            ),
-        ):
+    def _derive_v2_history_items(self, address: str, records: Sequence[LocalValueRecord]) -> list[Dict[str, Any]]:
+        # Records arrive in write order, which is not the order their txs
+        # confirmed in, so items are keyed by (receipt height, tx position).
+        keyed: list[tuple[tuple[int, int, int], Dict[str, Any]]] = []
+        for record in records:
             chain = getattr(record.witness_v2, "confirmed_bundle_chain", ())
             if not chain:
                 continue
@@ -320,7 +384,7 @@ class TxEngine:
                 if matching_value is None:
                     continue
                 tx_id = self._v2_tx_hash(tx)
-                if tx.sender_addr == account.address:
+                if tx.sender_addr == address:
                     item = {
                         "tx_id": tx_id,
                         "sender": tx.sender_addr,
@@ -331,7 +395,7 @@ class TxEngine:
                         "receipt_height": receipt_height,
                         "receipt_block_hash": receipt_block_hash,
                     }
-                elif tx.recipient_addr == account.address:
+                elif tx.recipient_addr == address:
                     item = {
                         "tx_id": tx_id,
                         "sender": tx.sender_addr,
@@ -346,30 +410,67 @@ class TxEngine:
                     }
                 else:
                     continue
-                key = self._v2_history_key(item)
-                if key is not None and key in seen:
-                    continue
-                items.append(item)
-                if key is not None:
-                    seen.add(key)
+                keyed.append(((receipt_height, int(tx.tx_local_index), matching_value.begin), item))
+        keyed.sort(key=lambda entry: entry[0])
+        items: list[Dict[str, Any]] = []
+        seen: set[str] = set()
+        for _, item in keyed:
+            key = history_entry_key(item)
+            if key is not None and key in seen:
+                continue
+            items.append(item)
+            if key is not None:
+                seen.add(key)
         return items
 
+    def _sync_v2_derived_history(self, wallet_store: WalletStore, address: str, db_path: Path) -> None:
+        # Derived items only change when a record's witness is rewritten, so
+        # each sync reads just the records written since the last one applied.
+        if not db_path.exists():
+            return
+        marker_name = f"v2_wallet_records:{db_path}"
+        marker = wallet_store.get_history_marker(marker_name)
+        applied_write_seq = -1 if marker is None else int(marker)
+        db = LocalWalletDB(str(db_path))
+        try:
+            latest_write_seq = db.last_record_write_seq(address)
+            if latest_write_seq <= applied_write_seq:
+                return
+            records = db.list_value_records_written_since(
+                address,
+                applied_write_seq,
+                upto_write_seq=latest_write_seq,
+            )
+            wallet_store.append_derived_history(self._derive_v2_history_items(address, records))
+        finally:
+            db.close()
+        wallet_store.set_history_marker(marker_name, str(latest_write_seq))
+
+    @staticmethod
     def _v2_history_payload(
-        self,
         wallet_store: WalletStore,
-        account: WalletAccountV2 | None,
+        address: str,
         *,
         chain_height: int,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> Dict[str, Any]:
-        stored_items = wallet_store.get_history()
-        derived_items = self._derive_v2_history_items(account) if account is not None else []
-        address = account.address if account is not None else wallet_store.summary(protocol_version="v2").address
-        return {
+        payload: Dict[str, Any] = {
             "address": address,
             "protocol_version": "v2",
             "chain_height": chain_height,
-            "items": self._merge_v2_history_items(stored_items, derived_items),
         }
+        if limit is None and cursor is None:
+            payload["items"] = wallet_store.list_history()
+            payload["next_cursor"] = None
+            return payload
+        page = wallet_store.history_page(
+            cursor=cursor,
+            limit=DEFAULT_HISTORY_PAGE_LIMIT if limit is None else limit,
+        )
+        payload["items"] = page.items
+        payload["next_cursor"] = page.next_cursor
+        return payload
 
     @staticmethod
     def _v2_receipts_payload(account: WalletAccountV2, *, chain_height: int) -> Dict[str, Any]:
@@ -425,6 +526,23 @@ class TxEngine:
             "pending_incoming_transfer_count": pending_incoming_transfer_count,
         }
 
+    @staticmethod
+    def _v2_estimate_payload(
+        account: WalletAccountV2,
+        *,
+        recipient: str,
+        amount: int,
+        chain_height: int,
+        max_package_bytes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        estimate = account.estimate_payment_cost(recipient, amount, max_package_bytes=max_package_bytes)
+        return {
+            "address": account.address,
+            "protocol_version": "v2",
+            "chain_height": chain_height,
+            **estimate.to_dict(),
+        }
+
     def _submit_transaction_v2(
         self,
         wallet_store: WalletStore,
@@ -451,7 +569,9 @@ class TxEngine:
                     fee=0,
                     expiry_height=self.v2_expiry_height,
                     anti_spam_nonce=secrets.randbelow(1 << 63),
+                    stage_timer=self._stage,
                 )
+                self._observe_wallet_records(account)
                 receipt = confirmed.receipt
                 return TxResult(
                     tx_hash=self._v2_tx_hash(confirmed.submitted.target_tx),
@@ -470,6 +590,71 @@ class TxEngine:
             finally:
                 session.close()
 
+    def _submit_batch_v2(
+        self,
+        wallet_store: WalletStore,
+        password: str,
+        payments: list[tuple[str, int]],
+        client_batch_id: Optional[str],
+    ) -> BatchTxResult:
+        total_amount = sum(amount for _, amount in payments)
+        with self.v2_backend_lock:
+            _, session = self._open_v2_session(wallet_store, password)
+            try:
+                self._record_v2_received_events(wallet_store, session)
+                account = session.wallet
+                if account.list_pending_bundles():
+                    raise ValueError("pending_bundle_exists")
+                if account.total_balance() < total_amount:
+                    raise ValueError("insufficient_balance")
+                if account.available_balance() < total_amount:
+                    raise ValueError("insufficient_spendable_values")
+
+                batch = session.submit_confirmed_payment_batch(
+                    payments=payments,
+                    fee=0,
+                    expiry_height=self.v2_expiry_height,
+                    stage_timer=self._stage,
+                )
+                self._observe_wallet_records(account)
+                items: list[TxResult] = []
+                for bundle in batch.bundles:
+                    receipt = bundle.receipt
+                    for tx in bundle.target_txs:
+                        items.append(
+                            TxResult(
+                                tx_hash=self._v2_tx_hash(tx),
+                                submit_hash=self._v2_submit_hash(bundle.submission.envelope),
+                                amount=sum(value.size for value in tx.value_list),
+                                recipient=tx.recipient_addr,
+                                status="confirmed",
+                                receipt_height=receipt.header_lite.height if receipt else None,
+                                receipt_block_hash=receipt.header_lite.block_hash.hex() if receipt else None,
+                            )
+                        )
+                for tx in batch.unsent_txs:
+                    items.append(
+                        TxResult(
+                            tx_hash=self._v2_tx_hash(tx),
+                            submit_hash="",
+                            amount=sum(value.size for value in tx.value_list),
+                            recipient=tx.recipient_addr,
+                            status="failed",
+                        )
+                    )
+                return BatchTxResult(
+                    items=items,
+                    bundle_count=len(batch.bundles),
+                    client_batch_id=client_batch_id,
+                    error=batch.error,
+                )
+            except ValueError as exc:
+                if str(exc) == "wallet already has a pending bundle":
+                    raise ValueError("pending_bundle_exists") from exc
+                raise
+            finally:
+                session.close()
+
     def faucet(self, wallet_store: WalletStore, password: str, amount: int) -> Dict[str, Any]:
         if amount <= 0:
             raise ValueError("amount_must_be_positive")
@@ -624,6 +809,35 @@ class TxEngine:
         account = self._build_account(wallet_store, password)
         return self._submit_transaction(account=account, recipient=recipient, amount=amount, client_tx_id=client_tx_id)
 
+    def send_batch(
+        self,
+        wallet_store: WalletStore,
+        password: str,
+        payments: Sequence[Mapping[str, Any]],
+        client_batch_id: Optional[str] = None,
+    ) -> BatchTxResult:
+        if self.protocol_version != "v2":
+            raise ValueError("batch_send_requires_v2")
+        normalized = normalize_batch_payments(payments, self.max_tx_amount)
+        if not client_batch_id:
+            return self._submit_batch_v2(wallet_store, password, normalized, client_batch_id)
+
+        sender_address = wallet_store.summary(protocol_version=self.protocol_version).address
+        with self.idempotency_lock:
+            idempotency = self._load_idempotency()
+            idem_key = f"{sender_address}:batch:{client_batch_id}"
+            if idem_key in idempotency:
+                raise ValueError("duplicate_transaction")
+            result = self._submit_batch_v2(wallet_store, password, normalized, client_batch_id)
+            idempotency[idem_key] = {
+                "tx_hashes": [item.tx_hash for item in result.items if item.status == "confirmed"],
+                "amount": sum(amount for _, amount in normalized),
+                "payments": len(normalized),
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._save_idempotency(idempotency)
+            return result
+
     def _submit_transaction(self, account: Account, recipient: str, amount: int, client_tx_id: Optional[str]) -> TxResult:
         multi_txn_result = account.create_batch_transactions([
             {
@@ -666,6 +880,7 @@ class TxEngine:
                 _, session = self._open_v2_session(wallet_store, password)
                 try:
                     self._record_v2_received_events(wallet_store, session)
+                    self._observe_wallet_records(session.wallet)
                     return self._v2_balance_payload(
                         session.wallet,
                         chain_height=session.consensus.chain.current_height,
@@ -729,34 +944,61 @@ class TxEngine:
             finally:
                 session.close()
 
-    def history(self, wallet_store: WalletStore) -> Dict[str, Any]:
+    def estimate(
+        self,
+        wallet_store: WalletStore,
+        password: str,
+        recipient: str,
+        amount: int,
+        max_package_bytes: Optional[int] = None,
+    ) -> Dict[str, Any]:
         if self.protocol_version != "v2":
-            return {"items": wallet_store.get_history()}
-        account = None
-        try:
-            address = wallet_store.summary(protocol_version="v2").address
-            db_path = Path(self._local_v2_wallet_db_path(address))
-            if db_path.exists():
-                account = WalletAccountV2(
-                    address=address,
-                    genesis_block_hash=self.v2_genesis_block_hash,
-                    db_path=str(db_path),
+            raise ValueError("cost estimate is only supported in v2")
+        with self.v2_backend_lock:
+            _, session = self._open_v2_session(wallet_store, password)
+            try:
+                self._record_v2_received_events(wallet_store, session)
+                return self._v2_estimate_payload(
+                    session.wallet,
+                    recipient=recipient,
+                    amount=amount,
+                    chain_height=session.consensus.chain.current_height,
+                    max_package_bytes=max_package_bytes,
                 )
-            chain_height = 0
-            metadata = self.v2_client.backend_metadata()
-            if isinstance(metadata, dict):
-                try:
-                    chain_height = int(metadata.get("height", 0))
-                except Exception:
-                    chain_height = 0
-            return self._v2_history_payload(
-                wallet_store,
-                account,
-                chain_height=chain_height,
+            finally:
+                session.close()
+
+    def history(
+        self,
+        wallet_store: WalletStore,
+        *,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        if self.protocol_version != "v2":
+            if limit is None and cursor is None:
+                return {"items": wallet_store.get_history(), "next_cursor": None}
+            page = wallet_store.history_page(
+                cursor=cursor,
+                limit=DEFAULT_HISTORY_PAGE_LIMIT if limit is None else limit,
             )
-        finally:
-            if account is not None:
-                account.close()
+            return {"items": page.items, "next_cursor": page.next_cursor}
+        address = wallet_store.summary(protocol_version="v2").address
+        self._sync_v2_derived_history(wallet_store, address, Path(self._local_v2_wallet_db_path(address)))
+        chain_height = 0
+        metadata = self.v2_client.backend_metadata()
+        if isinstance(metadata, dict):
+            try:
+                chain_height = int(metadata.get("height", 0))
+            except Exception:
+                chain_height = 0
+        return self._v2_history_payload(
+            wallet_store,
+            address,
+            chain_height=chain_height,
+            cursor=cursor,
+            limit=limit,
+        )
 
     def remote_balance(self, wallet_store: WalletStore, password: str, state: Dict[str, Any]) -> Dict[str, Any]:
         account = self._open_remote_v2_wallet(wallet_store, password, state)
@@ -800,28 +1042,47 @@ class TxEngine:
         finally:
             account.close()
 
-    def remote_history(self, wallet_store: WalletStore, state: Dict[str, Any]) -> Dict[str, Any]:
-        address = wallet_store.summary(protocol_version="v2").address
-        remote_address = str(state.get("address", "")).strip()
-        if remote_address and remote_address != address:
-            raise ValueError("wallet_address_mismatch_with_account_node")
-        db_path = Path(self._remote_v2_wallet_db_path(address, state))
-        account = None
+    def remote_estimate(
+        self,
+        wallet_store: WalletStore,
+        password: str,
+        state: Dict[str, Any],
+        recipient: str,
+        amount: int,
+        max_package_bytes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        account = self._open_remote_v2_wallet(wallet_store, password, state)
         try:
-            if db_path.exists():
-                account = WalletAccountV2(
-                    address=address,
-                    genesis_block_hash=self.v2_genesis_block_hash,
-                    db_path=str(db_path),
-                )
-            return self._v2_history_payload(
-                wallet_store,
+            return self._v2_estimate_payload(
                 account,
+                recipient=recipient,
+                amount=amount,
                 chain_height=self._remote_v2_chain_height(state),
+                max_package_bytes=max_package_bytes,
             )
         finally:
-            if account is not None:
-                account.close()
+            account.close()
+
+    def remote_history(
+        self,
+        wallet_store: WalletStore,
+        state: Dict[str, Any],
+        *,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        address = wallet_store.summary(protocol_version="v2").address
+        remote_address = str(state.get("address", "")).strip()
+        if remote_address and remote_address != address:
+            raise ValueError("wallet_address_mismatch_with_account_node")
+        self._sync_v2_derived_history(wallet_store, address, Path(self._remote_v2_wallet_db_path(address, state)))
+        return self._v2_history_payload(
+            wallet_store,
+            address,
+            chain_height=self._remote_v2_chain_height(state),
+            cursor=cursor,
+            limit=limit,
+        )
 
     def remote_send(
         self,
@@ -912,17 +1173,22 @@ class TxEngine:
             address=wallet["address"],
             private_key_pem=wallet["private_key_pem"].encode("utf-8"),
             public_key_pem=wallet["public_key_pem"].encode("utf-8"),
+            max_pending_bundles=self.v2_max_pending_bundles,
         )
         try:
-            network.start()
-            account_host.recover_network_state()
-            payment = account_host.submit_payment(
-                recipient_peer_id,
-                amount=amount,
-                expiry_height=self.v2_expiry_height,
-                fee=0,
-                anti_spam_nonce=secrets.randbelow(1 << 63),
-            )
+            with self._stage("session_open"):
+                network.start()
+                account_host.recover_network_state()
+            # Bundle build and consensus submission happen inside the account
+            # host here, so the remote path reports them as one "submit" stage.
+            with self._stage("submit"):
+                payment = account_host.submit_payment(
+                    recipient_peer_id,
+                    amount=amount,
+                    expiry_height=self.v2_expiry_height,
+                    fee=0,
+                    anti_spam_nonce=secrets.randbelow(1 << 63),
+                )
             return TxResult(
                 tx_hash=payment.tx_hash_hex,
                 submit_hash=payment.submit_hash_hex,
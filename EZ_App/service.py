@@ -10,10 +10,13 @@ from datetime import datetime, timezone
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Any, Dict
+from urllib.parse import parse_qs, urlsplit
 
 from EZ_App.contact_card import build_contact_card, contact_entry_from_card, fetch_contact_card, load_contact_card
+from EZ_App.history_store import normalize_history_limit, parse_history_cursor
+from EZ_App.metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry
 from EZ_App.node_manager import NodeManager
-from EZ_App.runtime import TxEngine
+from EZ_App.runtime import TX_STAGE_METRIC, TxEngine
 from EZ_App.ui_panel import build_local_panel_html
 from EZ_App.wallet_store import WalletStore
 
@@ -85,10 +88,67 @@ class AuditLogger:
                 handle.write(line + "\n")
 
 
+HTTP_REQUEST_METRIC = "ezchain_http_request_seconds"
+HTTP_RESPONSES_METRIC = "ezchain_http_responses_total"
+TX_SEND_METRIC = "ezchain_tx_send_seconds"
+TX_SEND_RESULTS_METRIC = "ezchain_tx_send_total"
+NODE_RUNNING_METRIC = "ezchain_node_running"
+DB_SIZE_METRIC = "ezchain_db_size_bytes"
+UPTIME_METRIC = "ezchain_uptime_seconds"
+
+METRIC_ROUTES = frozenset(
+    {
+        "/health",
+        "/",
+        "/ui",
+        "/wallet/show",
+        "/wallet/balance",
+        "/wallet/checkpoints",
+        "/wallet/create",
+        "/wallet/import",
+        "/tx/pending",
+        "/tx/receipts",
+        "/tx/history",
+        "/tx/faucet",
+        "/tx/send",
+        "/tx/send-batch",
+        "/node/status",
+        "/node/account-status",
+        "/node/contact-card",
+        "/node/start",
+        "/node/stop",
+        "/contacts",
+        "/contacts/import-card",
+        "/contacts/fetch-card",
+        "/metrics",
+        "/metrics/prometheus",
+        "/network/info",
+    }
+)
+
+
+def metrics_route(path: str) -> str:
+    # Collapse per-address and unknown paths so label cardinality stays bounded.
+    route = urlsplit(path).path
+    if route in METRIC_ROUTES:
+        return route
+    if route.startswith("/contacts/"):
+        return "/contacts/:address"
+    return "other"
+
+
 class ServiceMetrics:
-    def __init__(self):
+    def __init__(self, registry: MetricsRegistry | None = None):
         self.started_at = time.time()
         self.lock = threading.Lock()
+        self.registry = registry or MetricsRegistry()
+        self.registry.describe(HTTP_REQUEST_METRIC, "histogram", "Local service request latency in seconds.")
+        self.registry.describe(HTTP_RESPONSES_METRIC, "counter", "Local service responses by route and status.")
+        self.registry.describe(TX_SEND_METRIC, "histogram", "End-to-end /tx/send latency in seconds.")
+        self.registry.describe(TX_SEND_RESULTS_METRIC, "counter", "Transaction send attempts by result.")
+        self.registry.describe(NODE_RUNNING_METRIC, "gauge", "1 when the managed node reported running.")
+        self.registry.describe(DB_SIZE_METRIC, "gauge", "On-disk size of local databases in bytes.")
+        self.registry.describe(UPTIME_METRIC, "gauge", "Seconds since the local service started.")
         self.requests_total = 0
         self.tx_send_success = 0
         self.tx_send_failed = 0
@@ -105,7 +165,16 @@ class ServiceMetrics:
             elif status_code >= 400:
                 self.error_code_distribution["http_error"] += 1
 
+    def record_request(self, method: str, path: str, status_code: int, elapsed_seconds: float | None) -> None:
+        labels = {"method": method, "route": metrics_route(path)}
+        if elapsed_seconds is not None:
+            self.registry.observe(HTTP_REQUEST_METRIC, elapsed_seconds, labels)
+        self.registry.inc(HTTP_RESPONSES_METRIC, {**labels, "status": status_code})
+
     def record_tx_send(self, ok: bool, latency_ms: float | None, error_code: str | None = None) -> None:
+        self.registry.inc(TX_SEND_RESULTS_METRIC, {"result": "success" if ok else "failed"})
+        if ok and latency_ms is not None:
+            self.registry.observe(TX_SEND_METRIC, float(latency_ms) / 1000.0)
         with self.lock:
             if ok:
                 self.tx_send_success += 1
@@ -117,6 +186,7 @@ class ServiceMetrics:
                     self.error_code_distribution[error_code] += 1
 
     def record_node_status(self, status: str) -> None:
+        self.registry.set_gauge(NODE_RUNNING_METRIC, 1 if status == "running" else 0)
         with self.lock:
             self.node_status_checks += 1
             if status == "running":
@@ -147,8 +217,22 @@ class ServiceMetrics:
                 },
                 "node_online_rate": round(node_online_rate, 4),
                 "error_code_distribution": dict(self.error_code_distribution),
+                "latency": {
+                    "endpoints": self.registry.histogram_snapshot(HTTP_REQUEST_METRIC, "method", "route"),
+                    "tx_stages": self.registry.histogram_snapshot(TX_STAGE_METRIC, "stage"),
+                },
             }
 
+    def render_prometheus(self, db_paths: Dict[str, Path] | None = None) -> str:
+        self.registry.set_gauge(UPTIME_METRIC, int(max(0, time.time() - self.started_at)))
+        for name, path in sorted((db_paths or {}).items()):
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            self.registry.set_gauge(DB_SIZE_METRIC, size, {"db": name})
+        return self.registry.render_prometheus()
+
 
 class LocalService:
     NONCE_PATTERN = re.compile(r"^[A-Za-z0-9_-]{8,128}$")
@@ -190,15 +274,31 @@ class LocalService:
         self.nonce_guard = NonceGuard(nonce_file=nonce_file, ttl_seconds=nonce_ttl_seconds)
         effective_log_dir = Path(log_dir) if log_dir else (Path(wallet_store.base_dir) / "logs")
         self.audit_logger = AuditLogger(effective_log_dir / "service_audit.log")
-        self.metrics = ServiceMetrics()
+        self.metrics = ServiceMetrics(registry=tx_engine.metrics)
 
     def _ui_html(self) -> str:
         return build_local_panel_html()
 
+    def _metrics_db_paths(self) -> Dict[str, Path]:
+        paths = {"tx_history": Path(self.wallet_store.history_db_file)}
+        paths.update(self.tx_engine.storage_paths(self.wallet_store))
+        return paths
+
     def _build_handler(self):
         service = self
 
         class Handler(BaseHTTPRequestHandler):
+            request_started_at: float | None = None
+
+            def parse_request(self) -> bool:
+                self.request_started_at = time.perf_counter()
+                return super().parse_request()
+
+            def _record_request(self, code: int) -> None:
+                started = self.request_started_at
+                elapsed = None if started is None else time.perf_counter() - started
+                service.metrics.record_request(self.command, self.path, code, elapsed)
+
             def _write(self, code: int, payload: Dict[str, Any]) -> None:
                 body = json.dumps(payload).encode("utf-8")
                 self.send_response(code)
@@ -219,14 +319,19 @@ class LocalService:
                     }
                 )
                 service.metrics.record_response(status_code=code, error_code=error_code)
+                self._record_request(code)
 
             def _write_html(self, code: int, html: str) -> None:
-                body = html.encode("utf-8")
+                self._write_text(code, html, "text/html; charset=utf-8")
+
+            def _write_text(self, code: int, text: str, content_type: str) -> None:
+                body = text.encode("utf-8")
                 self.send_response(code)
-                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Type", content_type)
                 self.send_header("Content-Length", str(len(body)))
                 self.end_headers()
                 self.wfile.write(body)
+                self._record_request(code)
 
             def _ok(self, payload: Dict[str, Any], code: int = 200) -> None:
                 self._write(code, {"ok": True, "data": payload})
@@ -304,6 +409,7 @@ class LocalService:
                         "tx_receipts": "remote_read",
                         "tx_history": "remote_read",
                         "tx_send": "remote_send",
+                        "tx_send_batch": "unsupported",
                         "tx_faucet": "unsupported",
                     }
                 if service.tx_engine.protocol_version == "v2":
@@ -314,6 +420,7 @@ class LocalService:
                         "tx_receipts": "local",
                         "tx_history": "local",
                         "tx_send": "local",
+                        "tx_send_batch": "local",
                         "tx_faucet": "local",
                     }
                 return {
@@ -323,6 +430,7 @@ class LocalService:
                     "tx_receipts": "unsupported",
                     "tx_history": "local",
                     "tx_send": "local",
+                    "tx_send_batch": "unsupported",
                     "tx_faucet": "local",
                 }
 
@@ -335,7 +443,7 @@ class LocalService:
                 )
 
             def _tx_action_key(self, action: str) -> str:
-                return str(action).replace(" ", "_")
+                return str(action).replace(" ", "_").replace("-", "_")
 
             def _err_tx_path_not_ready(self, action: str) -> None:
                 action_key = self._tx_action_key(action)
@@ -503,6 +611,18 @@ class LocalService:
                     fetched_from=str(body.get("fetched_from", "") or "").strip() or None,
                 )
 
+            def _split_path(self) -> tuple[str, Dict[str, list[str]]]:
+                parts = urlsplit(self.path)
+                return parts.path, parse_qs(parts.query)
+
+            def _history_page_params(self, query: Dict[str, list[str]]) -> tuple[str | None, int | None]:
+                cursor = (query.get("cursor") or [None])[-1]
+                raw_limit = (query.get("limit") or [None])[-1]
+                if cursor is not None:
+                    parse_history_cursor(cursor)
+                limit = None if raw_limit is None else normalize_history_limit(raw_limit)
+                return cursor, limit
+
             def log_message(self, fmt: str, *args):
                 return
 
@@ -575,14 +695,25 @@ class LocalService:
                         return
                     self._ok(data)
                     return
-                if self.path == "/tx/history":
+                route, query = self._split_path()
+                if route == "/tx/history":
+                    try:
+                        cursor, limit = self._history_page_params(query)
+                    except ValueError as exc:
+                        self._err(400, "invalid_request", str(exc))
+                        return
                     if not self._tx_path_ready():
                         remote_state = self._remote_read_state()
                         if remote_state is None:
                             self._err_tx_path_not_ready("tx history")
                             return
                         try:
-                            data = service.tx_engine.remote_history(service.wallet_store, state=remote_state)
+                            data = service.tx_engine.remote_history(
+                                service.wallet_store,
+                                state=remote_state,
+                                cursor=cursor,
+                                limit=limit,
+                            )
                         except ValueError as exc:
                             self._err(400, "invalid_request", str(exc))
                             return
@@ -591,7 +722,12 @@ class LocalService:
                             return
                         self._ok(data)
                         return
-                    self._ok(service.tx_engine.history(service.wallet_store))
+                    try:
+                        data = service.tx_engine.history(service.wallet_store, cursor=cursor, limit=limit)
+                    except ValueError as exc:
+                        self._err(400, "invalid_request", str(exc))
+                        return
+                    self._ok(data)
                     return
                 if self.path == "/tx/pending":
                     if not self._auth_ok():
@@ -693,6 +829,10 @@ class LocalService:
                     node_status = service.node_manager.status().get("status", "stopped")
                     self._ok(service.metrics.snapshot(current_node_status=node_status))
                     return
+                if self.path == "/metrics/prometheus":
+                    text = service.metrics.render_prometheus(db_paths=service._metrics_db_paths())
+                    self._write_text(200, text, PROMETHEUS_CONTENT_TYPE)
+                    return
                 if self.path == "/network/info":
                     bootstrap_nodes = service.network_info.get("bootstrap_nodes", [])
                     probe = service.node_manager.probe_bootstrap(bootstrap_nodes) if bootstrap_nodes else {
@@ -885,6 +1025,69 @@ class LocalService:
                     self._ok(history_item)
                     return
 
+                if self.path == "/tx/send-batch":
+                    if not self._tx_path_ready() or self._tx_capabilities().get("tx_send_batch") != "local":
+                        self._err_tx_path_not_ready("tx send-batch")
+                        return
+                    nonce = self.headers.get("X-EZ-Nonce", "")
+                    if not self._validate_nonce(nonce):
+                        return
+                    if not service.nonce_guard.claim(nonce):
+                        self._err(409, "replay_detected", "Replay nonce detected")
+                        return
+                    password = body.get("password", "")
+                    payments = body.get("payments")
+                    client_batch_id = body.get("client_batch_id") or uuid.uuid4().hex
+                    if not password:
+                        self._err(400, "password_required", "password is required")
+                        return
+                    if not isinstance(payments, list) or not payments:
+                        self._err(400, "payments_required", "payments must be a non-empty list")
+                        return
+                    for item in payments:
+                        recipient = item.get("recipient", "") if isinstance(item, dict) else ""
+                        if not isinstance(recipient, str) or not service.RECIPIENT_PATTERN.fullmatch(recipient):
+                            self._err(400, "invalid_recipient", "recipient must match [A-Za-z0-9_.:-]{4,160}")
+                            return
+                    if not isinstance(client_batch_id, str) or not service.CLIENT_TX_ID_PATTERN.fullmatch(client_batch_id):
+                        self._err(400, "invalid_client_batch_id", "client_batch_id must match [A-Za-z0-9_.:-]{4,128}")
+                        return
+                    try:
+                        result = service.tx_engine.send_batch(
+                            service.wallet_store,
+                            password=password,
+                            payments=payments,
+                            client_batch_id=client_batch_id,
+                        )
+                    except FileNotFoundError:
+                        self._err(404, "wallet_not_found", "Wallet not found")
+                        return
+                    except ValueError as exc:
+                        if str(exc) == "duplicate_transaction":
+                            self._err(409, "duplicate_transaction", "Duplicate client_batch_id")
+                            return
+                        self._err(400, "invalid_request", str(exc))
+                        return
+                    except Exception as exc:
+                        self._err(500, "send_failed", str(exc))
+                        return
+
+                    sender = service.wallet_store.summary(protocol_version=service.tx_engine.protocol_version).address
+                    history_items = result.history_items(sender, timestamp=datetime.now(timezone.utc).isoformat())
+                    confirmed_items = [item for item in history_items if item["status"] == "confirmed"]
+                    service.wallet_store.append_history_many(confirmed_items)
+                    self._ok(
+                        {
+                            "client_batch_id": result.client_batch_id,
+                            "status": result.status,
+                            "bundle_count": result.bundle_count,
+                            "payment_count": len(payments),
+                            "items": history_items,
+                            "error": result.error,
+                        }
+                    )
+                    return
+
                 if self.path == "/node/start":
                     node_mode = "v2-localnet" if service.tx_engine.protocol_version == "v2" else "local"
                     self._ok(
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import json
+import threading
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from EZ_App.crypto import decrypt_text, derive_keypair, encrypt_text, generate_mnemonic
+from EZ_App.history_store import DEFAULT_HISTORY_PAGE_LIMIT, HISTORY_SOURCE_APP, HistoryPage, HistoryStore
 from EZ_V2.crypto import address_from_public_key_pem, derive_secp256k1_keypair_from_mnemonic
 
 
@@ -22,8 +24,11 @@ class WalletStore:
         self.base_dir = Path(data_dir)
         self.wallet_file = self.base_dir / "wallet.json"
         self.history_file = self.base_dir / "tx_history.json"
+        self.history_db_file = self.base_dir / "tx_history.sqlite3"
         self.contacts_file = self.base_dir / "contacts.json"
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._history: HistoryStore | None = None
+        self._history_lock = threading.Lock()
 
     def exists(self) -> bool:
         return self.wallet_file.exists()
@@ -47,10 +52,6 @@ class WalletStore:
             "created_at": datetime.now(timezone.utc).isoformat(),
         }
         self.wallet_file.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-
-        if not self.history_file.exists():
-            self.history_file.write_text("[]", encoding="utf-8")
-
         return payload
 
     def import_wallet(self, mnemonic: str, password: str, name: str = "default") -> Dict[str, Any]:
@@ -103,18 +104,43 @@ class WalletStore:
             created_at=payload.get("created_at", ""),
         )
 
+    def _history_store(self) -> HistoryStore:
+        # Opened once per store, which is also when the legacy JSON array is
+        # checked for and imported into the append-only log.
+        with self._history_lock:
+            if self._history is None:
+                self._history = HistoryStore(str(self.history_db_file), legacy_json_path=str(self.history_file))
+            return self._history
+
+    def close(self) -> None:
+        with self._history_lock:
+            if self._history is not None:
+                self._history.close()
+                self._history = None
+
     def append_history(self, record: Dict[str, Any]) -> None:
-        history = self.get_history()
-        history.append(record)
-        self.history_file.write_text(json.dumps(history, indent=2), encoding="utf-8")
+        self._history_store().append(record)
+
+    def append_history_many(self, records: List[Dict[str, Any]]) -> int:
+        return self._history_store().append_many(records)
 
     def get_history(self) -> List[Dict[str, Any]]:
-        if not self.history_file.exists():
-            return []
-        try:
-            return json.loads(self.history_file.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            return []
+        return self._history_store().list_items(source=HISTORY_SOURCE_APP)
+
+    def append_derived_history(self, records: List[Dict[str, Any]]) -> int:
+        return self._history_store().append_derived(records)
+
+    def list_history(self) -> List[Dict[str, Any]]:
+        return self._history_store().list_items()
+
+    def history_page(self, *, cursor: Any = None, limit: Any = DEFAULT_HISTORY_PAGE_LIMIT) -> HistoryPage:
+        return self._history_store().page(cursor=cursor, limit=limit)
+
+    def get_history_marker(self, name: str) -> Optional[str]:
+        return self._history_store().get_meta(f"marker:{name}")
+
+    def set_history_marker(self, name: str, value: str) -> None:
+        self._history_store().set_meta(f"marker:{name}", value)
 
     def _load_contacts(self) -> Dict[str, Dict[str, Any]]:
         if not self.contacts_file.exists():
@@ -247,21 +247,7 @@ class TransactionInjector:
             else:
                 # For simulation without full validation, just add without strict validation
                 try:
-                    with self.transaction_pool.lock:
-                        self.transaction_pool.pool.append(submit_tx_info)
-                        index = len(self.transaction_pool.pool) - 1
-
-                        # Update indices
-                        if submit_tx_info.submitter_address not in self.transaction_pool.submitter_index:
-                            self.transaction_pool.submitter_index[submit_tx_info.submitter_address] = []
-                        self.transaction_pool.submitter_index[submit_tx_info.submitter_address].append(index)
-
-                        submit_hash = submit_tx_info.get_hash()
-                        self.transaction_pool.hash_index[submit_hash] = index
-                        self.transaction_pool.multi_tx_hash_index[submit_tx_info.multi_transactions_hash] = index
-
-                        self.transaction_pool.stats['total_received'] += 1
-                        self.transaction_pool.stats['valid_received'] += 1
+                    self.transaction_pool.add_unvalidated_submit_tx_info(submit_tx_info)
 
                     validation_type = "full validation" if self.config.validation_enabled else "no validation"
                     success, message = True, f"SubmitTxInfo added successfully ({validation_type})"
@@ -349,21 +335,7 @@ class TransactionInjector:
             else:
                 # For simulation without full validation, just add without strict validation
                 try:
-                    with self.transaction_pool.lock:
-                        self.transaction_pool.pool.append(submit_tx_info)
-                        index = len(self.transaction_pool.pool) - 1
-
-                        # Update indices
-                        if submit_tx_info.submitter_address not in self.transaction_pool.submitter_index:
-                            self.transaction_pool.submitter_index[submit_tx_info.submitter_address] = []
-                        self.transaction_pool.submitter_index[submit_tx_info.submitter_address].append(index)
-
-                        submit_hash = submit_tx_info.get_hash()
-                        self.transaction_pool.hash_index[submit_hash] = index
-                        self.transaction_pool.multi_tx_hash_index[submit_tx_info.multi_transactions_hash] = index
-
-                        self.transaction_pool.stats['total_received'] += 1
-                        self.transaction_pool.stats['valid_received'] += 1
+                    self.transaction_pool.add_unvalidated_submit_tx_info(submit_tx_info)
 
                     validation_type = "full validation" if self.config.validation_enabled else "no validation"
                     success, message = True, f"SubmitTxInfo added successfully ({validation_type})"
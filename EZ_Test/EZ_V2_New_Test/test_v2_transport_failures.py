@@ -14,9 +14,12 @@ from __future__ import annotations
 import asyncio
 import logging
 import socket
+import sqlite3
 import struct
+import tempfile
 import time
 import unittest
+from pathlib import Path
 
 from EZ_V2.network_transport import (
     TCPNetworkTransport,
@@ -24,7 +27,8 @@ from EZ_V2.network_transport import (
     encode_envelope,
 )
 from EZ_V2.networking import NetworkEnvelope
-from EZ_V2.transport import TransferMailboxStore
+from EZ_V2.serde import dumps_json
+from EZ_V2.transport import TransferMailboxStore, pending_package_cursor, transfer_package_hash
 from EZ_V2.types import (
     GenesisAnchor,
     OffChainTx,
@@ -380,3 +384,63 @@ class TestTransferMailboxStore(unittest.TestCase):
 
         self.store.mark_claimed(h2, claimed_at=2001)
         self.assertEqual(self.store.pending_count("bob"), 1)
+
+    def test_pending_packages_page_with_cursor(self) -> None:
+        """list_pending_packages按cursor分页，mark_claimed_many批量认领"""
+        h1 = self.store.enqueue_package(
+            sender_addr="alice", recipient_addr="bob",
+            package=self.package2, created_at=1003,
+        )
+        h2 = self.store.enqueue_package(
+            sender_addr="alice", recipient_addr="bob",
+            package=self.package, created_at=1001,
+        )
+        self.store.enqueue_package(
+            sender_addr="alice", recipient_addr="carol",
+            package=self.package_carol, created_at=1000,
+        )
+
+        first = self.store.list_pending_packages("bob", limit=1)
+        self.assertEqual([item[0] for item in first], [h2])
+        second = self.store.list_pending_packages("bob", limit=1, after=pending_package_cursor(first[-1]))
+        self.assertEqual([item[0] for item in second], [h1])
+        self.assertEqual(
+            self.store.list_pending_packages("bob", limit=1, after=pending_package_cursor(second[-1])),
+            [],
+        )
+
+        self.store.mark_claimed_many([h1, h2], claimed_at=2000)
+        self.assertEqual(self.store.pending_count("bob"), 0)
+        self.assertEqual(self.store.pending_count("carol"), 1)
+
+    def test_existing_mailbox_gains_height_column(self) -> None:
+        """旧版mailbox数据库打开时补齐confirmed_height列"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "mailbox.sqlite3")
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                """
+                CREATE TABLE transfer_mailbox (
+                    package_hash BLOB PRIMARY KEY,
+                    sender_addr TEXT NOT NULL,
+                    recipient_addr TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    claimed_at INTEGER,
+                    package_json TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "INSERT INTO transfer_mailbox VALUES (?, 'alice', 'bob', 1000, NULL, ?)",
+                (sqlite3.Binary(transfer_package_hash(self.package)), dumps_json(self.package)),
+            )
+            conn.commit()
+            conn.close()
+
+            store = TransferMailboxStore(db_path)
+            try:
+                pending = store.list_pending_packages("bob")
+                self.assertEqual(len(pending), 1)
+                self.assertEqual(pending_package_cursor(pending[0]).confirmed_height, -1)
+            finally:
+                store.close()
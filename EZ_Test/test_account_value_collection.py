@@ -482,6 +482,34 @@ class TestAccountValueCollectionSearchAndFiltering:
         result = empty_collection.find_intersecting_values(target)
         assert len(result) == 0
         
+    def test_range_index_tracks_split_merge_and_remove(self, empty_collection):
+        """Range queries stay consistent with a linear scan across structural changes."""
+        node_ids = empty_collection.batch_add_values([
+            Value("0x1000", 400, ValueState.UNSPENT),   # 4096-4495
+            Value("0x1100", 16, ValueState.UNSPENT),    # 4352-4367 (nested in first)
+            Value("0x2000", 100, ValueState.UNSPENT),   # 8192-8291
+            Value("0x3000", 50, ValueState.UNSPENT),    # 12288-12337
+        ])
+        empty_collection.split_value(node_ids[2], 40)
+        empty_collection.remove_value(node_ids[3])
+        v1, _ = empty_collection.split_value(node_ids[0], 100)
+        empty_collection.merge_adjacent_values(node_ids[0], empty_collection._index_map[node_ids[0]].next.node_id)
+
+        def scan(start, end):
+            return sorted(
+                (v.begin_index for v in empty_collection.get_all_values()
+                 if v.get_decimal_begin_index() <= end and v.get_decimal_end_index() >= start),
+                key=lambda h: int(h, 16),
+            )
+
+        for start, end in [(0, 5000), (4360, 4360), (4400, 4500), (8200, 8260), (8252, 8252), (12288, 12400)]:
+            assert [v.begin_index for v in empty_collection.find_by_range(start, end)] == scan(start, end)
+
+        assert [v.get_decimal_begin_index() for v in empty_collection.get_values_sorted_by_begin_index()] == \
+            sorted(v.get_decimal_begin_index() for v in empty_collection.get_all_values())
+        assert Value("0x2000", 60) in empty_collection
+        assert Value("0x3000", 50) not in empty_collection
+
     def test_get_all_values(self, populated_collection, test_values):
         """Test getting all values."""
         all_values = populated_collection.get_all_values()
@@ -5,6 +5,7 @@ Tests focus on fork handling, consensus mechanisms, and blockchain validation.
 """
 
 import unittest
+from unittest.mock import patch
 import sys
 import os
 import hashlib
@@ -483,6 +484,57 @@ class TestBlockchainForkHandling(unittest.TestCase):
         # Check that main chain tip was updated
         self.assertEqual(self.blockchain.main_chain_tip.block.get_miner(), "fork_miner_5")
 
+    def test_reorg_updates_flags_indexes_and_late_fork_status(self):
+        """Test reorg flags, tree index lookups and status of a late fork block."""
+        config = ChainConfig(
+            confirmation_blocks=4,
+            max_fork_height=1,
+            data_directory=self.temp_dir,
+            auto_save=False,
+            debug_mode=True
+        )
+        blockchain = Blockchain(config=config)
+        genesis = blockchain.get_block_by_index(0)
+
+        def extend(parent, index, tag):
+            block = Block(index=index, m_tree_root=f"{tag}_{index}", miner=tag, pre_hash=parent.get_hash())
+            blockchain.add_block(block)
+            return block
+
+        main_blocks = [genesis]
+        for i in range(1, 4):
+            main_blocks.append(extend(main_blocks[-1], i, "main"))
+        fork_blocks = [main_blocks[1]]
+        for i in range(2, 6):
+            fork_blocks.append(extend(fork_blocks[-1], i, "fork"))
+
+        # The fork from block 1 took over; the old branch is no longer main chain
+        self.assertEqual(blockchain.get_latest_block().get_hash(), fork_blocks[-1].get_hash())
+        for block in main_blocks[2:]:
+            self.assertFalse(blockchain.get_fork_node_by_hash(block.get_hash()).is_main_chain)
+            self.assertFalse(blockchain.is_block_in_main_chain(block.get_hash()))
+        for block in fork_blocks:
+            self.assertTrue(blockchain.get_fork_node_by_hash(block.get_hash()).is_main_chain)
+        self.assertTrue(blockchain.is_valid_chain())
+
+        root = blockchain.fork_tree_root
+        self.assertIs(root.find_by_hash(main_blocks[3].get_hash()).block, main_blocks[3])
+        self.assertEqual(len(blockchain.get_all_forks_at_height(3)), 2)
+        self.assertEqual([node.block for node in root.get_longest_path()], blockchain.main_chain)
+        side_branch = blockchain.get_fork_node_by_hash(main_blocks[2].get_hash())
+        self.assertEqual(len(side_branch.get_longest_path()), 2)
+        self.assertIsNone(side_branch.find_by_hash(fork_blocks[2].get_hash()))
+
+        # Confirmed up to 5 - 4 + 1 = 2, orphaned below 5 - 1 = 4
+        self.assertTrue(blockchain.is_block_confirmed(main_blocks[2].get_hash()))
+        late_block = extend(fork_blocks[0], 2, "late")
+        self.assertTrue(blockchain.is_block_confirmed(late_block.get_hash()))
+        stale_block = extend(main_blocks[3], 4, "stale")
+        self.assertEqual(blockchain.get_fork_node_by_hash(stale_block.get_hash()).consensus_status,
+                         ConsensusStatus.PENDING)
+        extend(fork_blocks[-1], 6, "fork")
+        self.assertIn(stale_block.get_hash(), blockchain.orphaned_blocks)
+
     def test_get_fork_node_methods(self):
         """Test fork node methods."""
         # Add some blocks
@@ -941,6 +993,90 @@ class TestBlockchainPersistence(unittest.TestCase):
         self.assertEqual(stats['total_nodes'], 6)  # 4 main + 2 forks
         self.assertEqual(stats['fork_nodes'], 2)
 
+    def test_save_appends_only_new_blocks(self):
+        """Test that saving after a block appends one record and reload keeps the tie tip."""
+        def extend(parent, index, tag):
+            block = Block(index=index, m_tree_root=f"{tag}_{index}", miner=tag, pre_hash=parent.get_hash())
+            self.blockchain.add_block(block)
+            return block
+
+        genesis = self.blockchain.get_block_by_index(0)
+        main1 = extend(genesis, 1, "main")
+        self.blockchain.save_to_storage()
+        with open(self.blockchain.chain_file, 'rb') as f:
+            saved = f.read()
+        self.assertEqual(saved.count(b"\n"), 2)
+
+        # Equal-height fork: the current main chain keeps the tip
+        fork1 = extend(genesis, 1, "fork")
+        main2 = extend(main1, 2, "main")
+        fork2 = extend(fork1, 2, "fork")
+        self.blockchain.save_to_storage()
+        with open(self.blockchain.chain_file, 'rb') as f:
+            appended = f.read()
+        self.assertTrue(appended.startswith(saved))
+        self.assertEqual(appended.count(b"\n"), 5)
+
+        # A record cut short by a crash is dropped on load
+        with open(self.blockchain.chain_file, 'ab') as f:
+            f.write(b'{"hash": "partial')
+        reloaded = Blockchain(config=self.config)
+        self.assertEqual(reloaded.get_latest_block_hash(), main2.get_hash())
+        self.assertFalse(reloaded.get_fork_node_by_hash(fork2.get_hash()).is_main_chain)
+        self.assertEqual(len(reloaded.hash_to_fork_node), 5)
+        with open(self.blockchain.chain_file, 'rb') as f:
+            self.assertEqual(f.read(), appended)
+
+    def test_legacy_snapshot_is_converted_to_block_log(self):
+        """Test that a full snapshot from an older version loads and is rewritten as a block log."""
+        for i in range(1, 4):
+            block = Block(
+                index=i,
+                m_tree_root=f"merkle_{i}",
+                miner=f"miner_{i}",
+                pre_hash=self.blockchain.get_latest_block_hash()
+            )
+            self.blockchain.add_block(block)
+        self.blockchain.create_backup()
+        backup_file = next(self.blockchain.backup_dir.glob("blockchain_backup_*.json"))
+        os.replace(backup_file, self.blockchain.legacy_chain_file)
+
+        legacy = Blockchain(config=self.config)
+        self.assertEqual(len(legacy.main_chain), 4)
+        self.assertFalse(legacy.chain_file.exists())
+
+        self.assertTrue(legacy.save_to_storage())
+        reloaded = Blockchain(config=self.config)
+        self.assertEqual(reloaded.get_latest_block_hash(), self.blockchain.get_latest_block_hash())
+
+    def test_interrupted_log_rewrite_keeps_previous_log(self):
+        """Test that a full log rewrite failing part-way leaves the old log in place."""
+        for i in range(1, 4):
+            block = Block(index=i, m_tree_root=f"merkle_{i}", miner=f"miner_{i}",
+                          pre_hash=self.blockchain.get_latest_block_hash())
+            self.blockchain.add_block(block)
+        self.assertTrue(self.blockchain.save_to_storage())
+        with open(self.blockchain.chain_file, 'rb') as f:
+            saved = f.read()
+
+        encode = self.blockchain._encode_block_record
+        written = []
+
+        def failing_encode(fork_node):
+            if len(written) == 2:
+                raise OSError("disk full")
+            written.append(fork_node)
+            return encode(fork_node)
+
+        self.blockchain._log_needs_rewrite = True
+        with patch.object(self.blockchain, '_encode_block_record', side_effect=failing_encode):
+            self.assertFalse(self.blockchain.save_to_storage())
+
+        with open(self.blockchain.chain_file, 'rb') as f:
+            self.assertEqual(f.read(), saved)
+        reloaded = Blockchain(config=self.config)
+        self.assertEqual(reloaded.get_latest_block_hash(), self.blockchain.get_latest_block_hash())
+
     def test_data_integrity_check(self):
         """Test data integrity verification."""
         # Add blocks and save
@@ -7,12 +7,14 @@ import pytest
 import sys
 import os
 import json
+import base64
+import pickle
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from EZ_Units.Bloom import BloomFilter, BloomFilterEncoder, bloom_decoder
+    from EZ_Units.Bloom import BloomFilter, BloomFilterEncoder, bloom_decoder, LEGACY_HASH_SCHEME
 except ImportError as e:
     print(f"Error importing Bloom: {e}")
     sys.exit(1)
@@ -72,6 +74,36 @@ class TestBloomFilterBasic:
         # Test chainable add
         result = bloom.add("mango")
         assert result is bloom
+
+    def test_batch_add_and_contains(self, bloom_filter_basic):
+        """Test add_many/contains_many agree with single-item add and membership."""
+        small_size, test_items = bloom_filter_basic
+        batch = BloomFilter(size=small_size, hash_count=3)
+        single = BloomFilter(size=small_size, hash_count=3)
+
+        assert batch.add_many(test_items) is batch
+        for item in test_items:
+            single.add(item)
+
+        assert batch.bit_array == single.bit_array
+        probe = test_items + ["grape", "kiwi", "lemon"]
+        assert batch.contains_many(probe) == [item in single for item in probe]
+        assert batch.contains_many([]) == []
+
+    def test_contains_on_compressed_keeps_storage_state(self, bloom_filter_basic):
+        """Test queries on a compressed filter reuse one decoded copy and stay compressed."""
+        small_size, test_items = bloom_filter_basic
+        bloom = BloomFilter(size=small_size, hash_count=3).add_many(test_items)
+        bloom.compress()
+
+        assert all(item in bloom for item in test_items)
+        assert all(bloom.contains_many(test_items))
+        assert bloom.compressed
+        assert bloom.bit_array is None
+
+        bloom.add("grape")
+        assert not bloom.compressed
+        assert all(bloom.contains_many(test_items + ["grape"]))
         
     def test_iterable_functionality(self, bloom_filter_basic):
         """Test iterator functionality."""
@@ -179,7 +211,9 @@ class TestBloomFilterCompression:
             bloom_dense.add(f"item_{i}")
             
         ratio_dense = bloom_dense.get_compression_ratio()
-        assert ratio_dense > 1.0  # Should still compress
+        # A ~90% full filter is close to random, so whether zlib+base64 still
+        # beats the raw bytes depends on the hash; it must compress worse than sparse data
+        assert ratio_dense < ratio_sparse
         
     def test_statistics(self, bloom_filter_compression):
         """Test statistics functionality."""
@@ -385,6 +419,44 @@ class TestBloomFilterJSON:
         assert data['compressed']
         assert data['compressed_bit_array'] is not None
 
+    def test_decoder_keeps_legacy_hash_scheme(self):
+        """Test filters serialized without hash_scheme are queried with seeded hashes."""
+        legacy = BloomFilter(size=1000, hash_count=3, hash_scheme=LEGACY_HASH_SCHEME)
+        legacy.add_many(["alice", "bob"])
+        data = json.loads(json.dumps(legacy, cls=BloomFilterEncoder))
+        del data['hash_scheme']
+
+        restored = bloom_decoder(data)
+        assert restored.hash_scheme == LEGACY_HASH_SCHEME
+        assert restored.contains_many(["alice", "bob"]) == [True, True]
+
+    def test_pickle_from_set_based_filter_keeps_legacy_hash_scheme(self):
+        """Test pickles from when BloomFilter derived from set still find their items."""
+        # BloomFilter(size=64, hash_count=3) with '0xabc' added, pickled by the
+        # set-based class (protocol 2).
+        legacy_pickle = base64.b64decode(
+            "gAJjRVpfVjEuRVpfVW5pdHMuQmxvb20KQmxvb21GaWx0ZXIKcQBdcQEoSwBLAEsBSwBLAEsASwBLAEsASwBLAEsA"
+            "SwBLAEsASwBLAEsASwBLAEsASwBLAEsASwBLAEsASwBLAEsASwBLAEsBSwFLAEsASwBLAEsASwBLAEsASwBLAEsA"
+            "SwBLAEsASwBLAEsASwBLAEsASwBLAEsASwBLAEsASwBLAEsASwBlhXECUnEDfXEEKFgEAAAAc2l6ZXEFS0BYCgAA"
+            "AGhhc2hfY291bnRxBksDWAoAAABjb21wcmVzc2VkcQeJWAkAAABiaXRfYXJyYXlxCGNiaXRhcnJheS5fYml0YXJy"
+            "YXkKX2JpdGFycmF5X3JlY29uc3RydWN0b3IKcQkoY2JpdGFycmF5CmJpdGFycmF5CnEKY19jb2RlY3MKZW5jb2Rl"
+            "CnELWAkAAAAgAAAAw4AAAABxDFgGAAAAbGF0aW4xcQ2GcQ5ScQ9YAwAAAGJpZ3EQSwBLAHRxEVJxElgUAAAAY29t"
+            "cHJlc3NlZF9iaXRfYXJyYXlxE051Yi4="
+        )
+
+        restored = pickle.loads(legacy_pickle)
+        assert restored.size == 64
+        assert restored.hash_scheme == LEGACY_HASH_SCHEME
+        assert "0xabc" in restored
+        assert restored.contains_many(["0xabc"]) == [True]
+
+        current = BloomFilter(size=64, hash_count=3)
+        current.add("0xabc")
+        current.compress()
+        reloaded = pickle.loads(pickle.dumps(current))
+        assert reloaded.hash_scheme == current.hash_scheme
+        assert "0xabc" in reloaded
+
 
 class TestBloomFilterPerformance:
     """Test suite for performance-related functionality."""
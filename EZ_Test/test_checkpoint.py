@@ -227,6 +227,64 @@ class TestCheckPointStorage:
         loaded_checkpoint = temp_storage.load_checkpoint("0x1000", 100)
         assert loaded_checkpoint is None
 
+    def test_find_containing_prefers_highest_block_and_tracks_writes(self, temp_storage):
+        """包含查询返回最高区块的检查点，SQL路径与内存索引一致，其它实例写入后索引失效"""
+        def record(begin_index, value_num, owner, height):
+            now = datetime.now(timezone.utc)
+            return CheckPointRecord(begin_index, value_num, owner, height, now, now)
+
+        temp_storage.store_checkpoint(record("0x1000", 100, "0xParent", 10))
+        temp_storage.store_checkpoint(record("0x1010", 16, "0xChild", 20))
+        temp_storage.store_checkpoint(record("0x10000000000000000000000000000001", 50, "0xWide", 5))
+        sql_storage = CheckPointStorage(temp_storage.db_path, use_interval_cache=False)
+
+        queries = {
+            Value("0x1012", 4): "0xChild",
+            Value("0x1000", 8): "0xParent",
+            Value("0x1050", 20): "0xParent",
+            Value("0x10000000000000000000000000000010", 10): "0xWide",
+            Value("0x1060", 10): None,
+        }
+        for value, owner in queries.items():
+            for storage in (temp_storage, sql_storage):
+                found = storage.find_checkpoint_containing_value(value)
+                assert (found.owner_address if found else None) == owner
+
+        # 另一个实例的写入通过generation使内存索引失效
+        sql_storage.store_checkpoint(record("0x1012", 2, "0xGrandChild", 30))
+        assert temp_storage.find_checkpoint_containing_value(Value("0x1012", 2)).owner_address == "0xGrandChild"
+        sql_storage.delete_checkpoint("0x1010", 16)
+        assert temp_storage.find_checkpoint_containing_value(Value("0x1014", 2)).owner_address == "0xParent"
+
+    def test_range_columns_backfilled_for_existing_database(self, temp_storage):
+        """旧库（无区间列）打开时回填区间列"""
+        import sqlite3
+
+        with sqlite3.connect(temp_storage.db_path) as conn:
+            conn.execute("DROP TABLE checkpoints")
+            conn.execute("""
+                CREATE TABLE checkpoints (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    value_begin_index TEXT NOT NULL,
+                    value_num INTEGER NOT NULL,
+                    owner_address TEXT NOT NULL,
+                    block_height INTEGER NOT NULL,
+                    created_at TIMESTAMP NOT NULL,
+                    updated_at TIMESTAMP NOT NULL,
+                    UNIQUE(value_begin_index, value_num)
+                )
+            """)
+            now = datetime.now(timezone.utc).isoformat()
+            conn.execute(
+                "INSERT INTO checkpoints (value_begin_index, value_num, owner_address, block_height, created_at, updated_at) "
+                "VALUES ('0x2000', 50, '0xLegacy', 7, ?, ?)",
+                (now, now),
+            )
+
+        storage = CheckPointStorage(temp_storage.db_path, use_interval_cache=False)
+        found = storage.find_checkpoint_containing_value(Value("0x2010", 5))
+        assert found is not None and found.owner_address == "0xLegacy"
+
 
 class TestCheckPoint:
     """测试CheckPoint管理器"""
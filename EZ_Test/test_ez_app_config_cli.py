@@ -176,6 +176,81 @@ def test_cli_blocks_remote_v2_tx_commands_until_tx_path_is_ready():
         assert payload["tx_action"] == "tx_faucet"
         assert payload["tx_action_capability"] == "unsupported"
 
+        batch_file = Path(td) / "payouts.json"
+        batch_file.write_text(json.dumps([{"recipient": "0xabc123", "amount": 1}]), encoding="utf-8")
+        out = StringIO()
+        with redirect_stdout(out):
+            code = main(["--config", str(cfg_path), "tx", "send-batch", "--file", str(batch_file), "--password", "pw123"])
+        assert code == 2
+        payload = json.loads(out.getvalue())
+        assert payload["error"]["code"] == "tx_action_unsupported"
+        assert payload["tx_action"] == "tx_send_batch"
+
+
+def test_cli_v2_tx_send_batch_reads_csv_file():
+    with tempfile.TemporaryDirectory() as td:
+        cfg_path = Path(td) / "ezchain.yaml"
+        data_dir = Path(td) / ".ezcli"
+        cfg_path.write_text(
+            (
+                "network:\n  name: testnet\napp:\n"
+                f"  data_dir: {data_dir}\n"
+                f"  log_dir: {data_dir / 'logs'}\n"
+                f"  api_token_file: {data_dir / 'api.token'}\n"
+                "  api_port: 8787\n"
+                "  protocol_version: v2\n"
+            ),
+            encoding="utf-8",
+        )
+        batch_file = Path(td) / "payouts.csv"
+        batch_file.write_text("recipient,amount\n0xabc123,25\n# skipped\n0xdef456,35\n", encoding="utf-8")
+
+        assert main(["--config", str(cfg_path), "wallet", "create", "--password", "pw123"]) == 0
+        with redirect_stdout(StringIO()):
+            assert main(["--config", str(cfg_path), "tx", "faucet", "--password", "pw123", "--amount", "100"]) == 0
+        out = StringIO()
+        with redirect_stdout(out):
+            code = main(["--config", str(cfg_path), "tx", "send-batch", "--file", str(batch_file), "--password", "pw123"])
+        assert code == 0
+        payload = json.loads(out.getvalue())
+        assert payload["status"] == "confirmed"
+        assert payload["bundle_count"] == 1
+        assert [(item["recipient"], item["amount"]) for item in payload["items"]] == [("0xabc123", 25), ("0xdef456", 35)]
+        assert len(WalletStore(str(data_dir)).get_history()) == 2
+
+
+def test_cli_v2_tx_estimate_reports_package_cost():
+    with tempfile.TemporaryDirectory() as td:
+        cfg_path = Path(td) / "ezchain.yaml"
+        data_dir = Path(td) / ".ezcli"
+        cfg_path.write_text(
+            (
+                "network:\n  name: testnet\napp:\n"
+                f"  data_dir: {data_dir}\n"
+                f"  log_dir: {data_dir / 'logs'}\n"
+                f"  api_token_file: {data_dir / 'api.token'}\n"
+                "  api_port: 8787\n"
+                "  protocol_version: v2\n"
+            ),
+            encoding="utf-8",
+        )
+
+        assert main(["--config", str(cfg_path), "wallet", "create", "--password", "pw123"]) == 0
+        with redirect_stdout(StringIO()):
+            assert main(["--config", str(cfg_path), "tx", "faucet", "--password", "pw123", "--amount", "100"]) == 0
+        out = StringIO()
+        with redirect_stdout(out):
+            code = main(
+                ["--config", str(cfg_path), "tx", "estimate", "--recipient", "0xabc123", "--amount", "40", "--password", "pw123"]
+            )
+        assert code == 0
+        payload = json.loads(out.getvalue())
+        assert payload["amount"] == 40
+        assert payload["package_count"] == 1
+        assert payload["total_confirmed_units"] == payload["outputs"][0]["confirmed_units"] >= 1
+        assert payload["total_package_bytes"] > 0
+        assert WalletStore(str(data_dir)).get_history() == []
+
 
 def test_cli_remote_v2_wallet_balance_reads_shared_account_wallet_db():
     with tempfile.TemporaryDirectory() as td:
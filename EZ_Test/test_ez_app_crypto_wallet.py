@@ -1,7 +1,9 @@
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 from EZ_App.crypto import address_from_public_key, derive_keypair, generate_mnemonic
+from EZ_App.history_store import HistoryStore
 from EZ_App.wallet_store import WalletStore
 
 
@@ -28,3 +30,61 @@ def test_wallet_create_import_and_load():
         store2 = WalletStore(str(Path(td) / "other"))
         imported = store2.import_wallet(mnemonic=mnemonic, password="pw123", name="alice")
         assert imported["address"] == created["address"]
+
+
+def test_wallet_history_is_append_only_and_paginates():
+    with tempfile.TemporaryDirectory() as td:
+        store = WalletStore(td)
+        for index in range(5):
+            store.append_history({"tx_id": f"t{index}", "status": "confirmed", "amount": index})
+
+        assert [item["tx_id"] for item in store.get_history()] == ["t0", "t1", "t2", "t3", "t4"]
+
+        first = store.history_page(limit=2)
+        assert [item["tx_id"] for item in first.items] == ["t0", "t1"]
+        second = store.history_page(cursor=first.next_cursor, limit=2)
+        assert [item["tx_id"] for item in second.items] == ["t2", "t3"]
+        last = store.history_page(cursor=second.next_cursor, limit=2)
+        assert [item["tx_id"] for item in last.items] == ["t4"]
+        assert last.next_cursor is None
+        assert first.items + second.items + last.items == store.list_history()
+
+
+def test_wallet_history_derived_items_dedup_and_yield_to_app_items():
+    with tempfile.TemporaryDirectory() as td:
+        store = WalletStore(td)
+        derived = [
+            {"tx_id": "t1", "status": "confirmed", "amount": 5},
+            {"tx_id": "t2", "status": "confirmed", "amount": 7},
+        ]
+        assert store.append_derived_history(derived) == 2
+        assert store.append_derived_history(derived) == 0
+
+        store.append_history({"tx_id": "t1", "status": "confirmed", "amount": 5, "client_tx_id": "cid-1"})
+
+        items = store.list_history()
+        assert [item["tx_id"] for item in items] == ["t2", "t1"]
+        assert items[1]["client_tx_id"] == "cid-1"
+        assert store.get_history() == [items[1]]
+
+
+def test_wallet_history_imports_legacy_json_once():
+    with tempfile.TemporaryDirectory() as td:
+        (Path(td) / "tx_history.json").write_text('[{"tx_id": "legacy-1", "status": "submitted"}]', encoding="utf-8")
+        store = WalletStore(td)
+        store.append_history({"tx_id": "new-1", "status": "submitted"})
+
+        reopened = WalletStore(td)
+        assert [item["tx_id"] for item in reopened.get_history()] == ["legacy-1", "new-1"]
+
+
+def test_wallet_store_keeps_one_history_connection():
+    with tempfile.TemporaryDirectory() as td:
+        store = WalletStore(td)
+        with patch.object(HistoryStore, "_import_legacy_json", autospec=True, side_effect=HistoryStore._import_legacy_json) as imported:
+            store.append_history({"tx_id": "t0", "status": "confirmed"})
+            store.set_history_marker("records", "1")
+            assert store.get_history_marker("records") == "1"
+            assert [item["tx_id"] for item in store.history_page(limit=5).items] == ["t0"]
+        assert imported.call_count == 1
+        store.close()
@@ -0,0 +1,49 @@
+from EZ_App.metrics import LatencyHistogram, MetricsRegistry
+
+
+def test_latency_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.05, 0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.count == 5
+    assert histogram.bucket_counts == [1, 2, 1, 1]
+    assert histogram.cumulative_counts() == [1, 3, 4, 5]
+    assert histogram.quantile(0.2) == 0.01
+    assert 0.01 < histogram.quantile(0.5) <= 0.1
+    assert histogram.quantile(0.99) == 1.0
+    assert LatencyHistogram().quantile(0.5) is None
+
+
+def test_metrics_registry_renders_prometheus_text():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.describe("ezchain_demo_seconds", "histogram", "Demo latency.")
+    registry.observe("ezchain_demo_seconds", 0.05, {"stage": "submit"})
+    registry.observe("ezchain_demo_seconds", 0.5, {"stage": "submit"})
+    registry.inc("ezchain_demo_total", {"route": '/a"b'})
+    registry.set_gauge("ezchain_demo_bytes", 4096, {"db": "wallet"})
+
+    text = registry.render_prometheus()
+    assert "# HELP ezchain_demo_seconds Demo latency." in text
+    assert "# TYPE ezchain_demo_seconds histogram" in text
+    assert 'ezchain_demo_seconds_bucket{stage="submit",le="0.1"} 1' in text
+    assert 'ezchain_demo_seconds_bucket{stage="submit",le="+Inf"} 2' in text
+    assert 'ezchain_demo_seconds_count{stage="submit"} 2' in text
+    assert 'ezchain_demo_total{route="/a\\"b"} 1' in text
+    assert 'ezchain_demo_bytes{db="wallet"} 4096' in text
+
+    snapshot = registry.histogram_snapshot("ezchain_demo_seconds", "stage")
+    assert snapshot["submit"]["count"] == 2
+
+
+def test_histogram_snapshot_keys_by_every_requested_label():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.observe("ezchain_demo_seconds", 0.05, {"method": "GET", "route": "/contacts"})
+    registry.observe("ezchain_demo_seconds", 0.5, {"method": "POST", "route": "/contacts"})
+    registry.observe("ezchain_demo_seconds", 0.5, {"method": "POST", "route": "/contacts"})
+
+    by_method = registry.histogram_snapshot("ezchain_demo_seconds", "method", "route")
+    assert by_method["GET /contacts"]["count"] == 1
+    assert by_method["POST /contacts"]["count"] == 2
+    # Series sharing the requested label are summed rather than overwritten.
+    assert registry.histogram_snapshot("ezchain_demo_seconds", "route")["/contacts"]["count"] == 3
@@ -213,6 +213,16 @@ def test_service_auth_and_tx_flow():
             assert body["ok"] is True
             assert len(body["data"]["items"]) >= 1
 
+            status, body = _request(port, "GET", "/tx/history?limit=1")
+            assert status == 200
+            assert len(body["data"]["items"]) == 1
+            assert body["data"]["items"][0]["client_tx_id"] == "cid-1"
+            assert "next_cursor" in body["data"]
+
+            status, body = _request(port, "GET", "/tx/history?cursor=not-a-cursor")
+            assert status == 400
+            assert body["error"]["code"] == "invalid_request"
+
             status, body = _request(port, "GET", "/metrics")
             assert status == 200
             assert body["ok"] is True
@@ -222,6 +232,14 @@ def test_service_auth_and_tx_flow():
             assert "transactions" in metrics
             assert metrics["transactions"]["send_success"] >= 1
             assert metrics["transactions"]["success_rate"] >= 0
+            assert metrics["latency"]["endpoints"]["POST /tx/send"]["count"] >= 1
+
+            status, text = _request_text(port, "GET", "/metrics/prometheus")
+            assert status == 200
+            assert "# TYPE ezchain_http_request_seconds histogram" in text
+            assert 'ezchain_http_request_seconds_bucket{method="POST",route="/tx/send",le="+Inf"}' in text
+            assert 'ezchain_tx_send_total{result="success"}' in text
+            assert 'ezchain_db_size_bytes{db="tx_history"}' in text
 
             status, body = _request(port, "GET", "/network/info")
             assert status == 200
@@ -397,6 +415,91 @@ def test_service_v2_local_backend_flow():
             thread.join(timeout=2)
 
 
+def test_service_v2_send_batch_confirms_payments_and_records_history():
+    with tempfile.TemporaryDirectory() as td:
+        cfg_path = Path(td) / "ezchain.yaml"
+        data_dir = Path(td) / ".ezsvc_v2_batch"
+        cfg_path.write_text(
+            (
+                "network:\n  name: testnet\napp:\n"
+                f"  data_dir: {data_dir}\n"
+                f"  log_dir: {data_dir / 'logs'}\n"
+                f"  api_token_file: {data_dir / 'api.token'}\n"
+                "  api_host: 127.0.0.1\n"
+                "  api_port: 0\n"
+                "  protocol_version: v2\n"
+            ),
+            encoding="utf-8",
+        )
+
+        cfg = load_config(cfg_path)
+        ensure_directories(cfg)
+        token = load_api_token(cfg)
+
+        wallet_store = WalletStore(cfg.app.data_dir)
+        node_manager = NodeManager(data_dir=cfg.app.data_dir, project_root=str(Path(__file__).resolve().parent.parent))
+        tx_engine = TxEngine(cfg.app.data_dir, protocol_version="v2")
+        service = LocalService(
+            host="127.0.0.1",
+            port=0,
+            wallet_store=wallet_store,
+            node_manager=node_manager,
+            tx_engine=tx_engine,
+            api_token=token,
+        )
+
+        server, port, thread = _start_server_or_skip(service)
+        try:
+            auth_headers = {"X-EZ-Token": token}
+            status, body = _request(port, "POST", "/wallet/create", {"name": "demo", "password": "pw123"}, auth_headers)
+            assert status == 200
+            status, body = _request(port, "POST", "/tx/faucet", {"password": "pw123", "amount": 300}, auth_headers)
+            assert status == 200
+
+            batch = {
+                "password": "pw123",
+                "client_batch_id": "batch-v2-1",
+                "payments": [
+                    {"recipient": "0xabc123", "amount": 40},
+                    {"recipient": "0xdef456", "amount": 60},
+                ],
+            }
+            status, body = _request(port, "POST", "/tx/send-batch", batch, {**auth_headers, "X-EZ-Nonce": "nonce-batch-0001"})
+            assert status == 200
+            assert body["data"]["status"] == "confirmed"
+            assert body["data"]["bundle_count"] == 1
+            assert [item["amount"] for item in body["data"]["items"]] == [40, 60]
+            assert {item["receipt_height"] for item in body["data"]["items"]} == {1}
+
+            status, body = _request(port, "POST", "/tx/send-batch", batch, {**auth_headers, "X-EZ-Nonce": "nonce-batch-0002"})
+            assert status == 409
+            assert body["error"]["code"] == "duplicate_transaction"
+
+            status, body = _request(
+                port,
+                "POST",
+                "/tx/send-batch",
+                {"password": "pw123", "payments": [{"recipient": "bad recipient", "amount": 1}]},
+                {**auth_headers, "X-EZ-Nonce": "nonce-batch-0003"},
+            )
+            assert status == 400
+            assert body["error"]["code"] == "invalid_recipient"
+
+            status, body = _request(
+                port,
+                "GET",
+                "/wallet/balance",
+                headers={"X-EZ-Token": token, "X-EZ-Password": "pw123"},
+            )
+            assert body["data"]["available_balance"] == 200
+            status, body = _request(port, "GET", "/tx/history")
+            assert [item["client_batch_id"] for item in body["data"]["items"]] == ["batch-v2-1", "batch-v2-1"]
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join(timeout=2)
+
+
 def test_service_contacts_list_and_lookup_require_auth_and_return_saved_contacts():
     with tempfile.TemporaryDirectory() as td:
         cfg_path = Path(td) / "ezchain.yaml"
@@ -3,6 +3,7 @@ import socket
 import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from EZ_App.runtime import TxEngine
@@ -12,7 +13,8 @@ from EZ_V2.network_host import V2AccountHost, V2ConsensusHost
 from EZ_V2.network_transport import TCPNetworkTransport
 from EZ_V2.networking import PeerInfo
 from EZ_V2.transport_peer import TransportPeerNetwork
-from EZ_V2.values import ValueRange
+from EZ_V2.types import OffChainTx
+from EZ_V2.values import LocalValueRecord, LocalValueStatus, ValueRange
 from EZ_V2.wallet import WalletAccountV2
 
 
@@ -77,6 +79,9 @@ class EZV2AppRuntimeTest(unittest.TestCase):
             self.assertTrue(result.submit_hash)
             self.assertEqual(result.receipt_height, 1)
             self.assertTrue(result.receipt_block_hash)
+            stages = engine.metrics.histogram_snapshot("ezchain_tx_stage_seconds", "stage")
+            for stage in ("unlock", "session_open", "bundle_build", "submit", "receipt_wait"):
+                self.assertGreaterEqual(stages[stage]["count"], 1)
 
             confirmed_balance = engine.balance(store, password="pw123")
             self.assertEqual(confirmed_balance["available_balance"], 380)
@@ -546,6 +551,85 @@ class EZV2AppRuntimeTest(unittest.TestCase):
             self.assertEqual(len(bob_store.get_history()), 1)
             self.assertEqual(len(carol_store.get_history()), 1)
 
+    def test_v2_send_batch_pays_many_recipients_in_one_bundle(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            shared_backend = Path(td) / "shared_backend"
+            alice_dir = Path(td) / "alice"
+            bob_dir = Path(td) / "bob"
+            carol_dir = Path(td) / "carol"
+            alice_store = WalletStore(str(alice_dir))
+            bob_store = WalletStore(str(bob_dir))
+            carol_store = WalletStore(str(carol_dir))
+            alice_store.create_wallet(password="pw123", name="alice")
+            bob_store.create_wallet(password="pw123", name="bob")
+            carol_store.create_wallet(password="pw123", name="carol")
+
+            alice_engine = TxEngine(str(alice_dir), max_tx_amount=1000, protocol_version="v2", v2_backend_dir=str(shared_backend))
+            bob_engine = TxEngine(str(bob_dir), max_tx_amount=1000, protocol_version="v2", v2_backend_dir=str(shared_backend))
+            carol_engine = TxEngine(str(carol_dir), max_tx_amount=1000, protocol_version="v2", v2_backend_dir=str(shared_backend))
+            bob_addr = bob_store.summary(protocol_version="v2").address
+            carol_addr = carol_store.summary(protocol_version="v2").address
+            alice_engine.faucet(alice_store, password="pw123", amount=400)
+
+            payments = [
+                {"recipient": bob_addr, "amount": 100},
+                {"recipient": carol_addr, "amount": 50},
+                {"recipient": bob_addr, "amount": "30"},
+            ]
+            result = alice_engine.send_batch(alice_store, password="pw123", payments=payments, client_batch_id="batch-001")
+
+            self.assertEqual(result.status, "confirmed")
+            self.assertEqual(result.bundle_count, 1)
+            self.assertEqual([item.amount for item in result.items], [100, 50, 30])
+            self.assertEqual({item.receipt_height for item in result.items}, {1})
+            self.assertEqual(len({item.submit_hash for item in result.items}), 1)
+            self.assertEqual(alice_engine.balance(alice_store, password="pw123")["available_balance"], 220)
+            self.assertEqual(bob_engine.balance(bob_store, password="pw123")["available_balance"], 130)
+            self.assertEqual(carol_engine.balance(carol_store, password="pw123")["available_balance"], 50)
+            self.assertEqual(len(alice_engine.receipts(alice_store, password="pw123")["items"]), 1)
+            self.assertIn('ezchain_wallet_witness_size{stat="units_max"} 1', alice_engine.metrics.render_prometheus())
+
+            with self.assertRaisesRegex(ValueError, "duplicate_transaction"):
+                alice_engine.send_batch(alice_store, password="pw123", payments=payments, client_batch_id="batch-001")
+            with self.assertRaisesRegex(ValueError, "insufficient_balance"):
+                alice_engine.send_batch(alice_store, password="pw123", payments=[{"recipient": bob_addr, "amount": 999}])
+            with self.assertRaisesRegex(ValueError, "payments_required"):
+                alice_engine.send_batch(alice_store, password="pw123", payments=[])
+
+    def test_v2_send_batch_confirms_one_bundle_per_block(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            shared_backend = Path(td) / "shared_backend"
+            alice_dir = Path(td) / "alice"
+            bob_dir = Path(td) / "bob"
+            alice_store = WalletStore(str(alice_dir))
+            bob_store = WalletStore(str(bob_dir))
+            alice_store.create_wallet(password="pw123", name="alice")
+            bob_store.create_wallet(password="pw123", name="bob")
+
+            alice_engine = TxEngine(str(alice_dir), max_tx_amount=1000, protocol_version="v2", v2_backend_dir=str(shared_backend))
+            bob_engine = TxEngine(str(bob_dir), max_tx_amount=1000, protocol_version="v2", v2_backend_dir=str(shared_backend))
+            bob_addr = bob_store.summary(protocol_version="v2").address
+            alice_engine.faucet(alice_store, password="pw123", amount=300)
+
+            plan_payment_batch = WalletAccountV2.plan_payment_batch
+
+            def plan_one_tx_per_bundle(wallet, payments, **kwargs):
+                return plan_payment_batch(wallet, payments, **{**kwargs, "max_tx_per_bundle": 1})
+
+            # The pool holds one bundle per sender, so a batch that spills over
+            # several bundles confirms them in consecutive blocks.
+            with patch.object(WalletAccountV2, "plan_payment_batch", plan_one_tx_per_bundle):
+                result = alice_engine.send_batch(
+                    alice_store,
+                    password="pw123",
+                    payments=[{"recipient": bob_addr, "amount": amount} for amount in (10, 20, 30)],
+                )
+
+            self.assertEqual(result.status, "confirmed")
+            self.assertEqual(result.bundle_count, 3)
+            self.assertEqual([item.receipt_height for item in result.items], [1, 2, 3])
+            self.assertEqual(bob_engine.balance(bob_store, password="pw123")["available_balance"], 60)
+
     def test_v2_checkpoint_query_reads_persisted_wallet_state(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             shared_backend = Path(td) / "shared_backend"
@@ -645,6 +729,96 @@ class EZV2AppRuntimeTest(unittest.TestCase):
             self.assertEqual(bob_history["items"][0]["amount"], 35)
             self.assertEqual(bob_history["items"][0]["recipient"], bob_addr)
 
+    def test_v2_history_sync_derives_only_records_written_since_the_last_sync(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            shared_backend = Path(td) / "shared_backend"
+            alice_dir = Path(td) / "alice"
+            bob_dir = Path(td) / "bob"
+
+            alice_store = WalletStore(str(alice_dir))
+            bob_store = WalletStore(str(bob_dir))
+            alice_store.create_wallet(password="pw123", name="alice")
+            bob_store.create_wallet(password="pw123", name="bob")
+
+            alice_engine = TxEngine(str(alice_dir), max_tx_amount=1000, protocol_version="v2", v2_backend_dir=str(shared_backend))
+            bob_addr = bob_store.summary(protocol_version="v2").address
+
+            alice_engine.faucet(alice_store, password="pw123", amount=120)
+            alice_engine.send(alice_store, password="pw123", recipient=bob_addr, amount=35, client_tx_id="cid-sync-1")
+            self.assertEqual([item["amount"] for item in alice_engine.history(alice_store)["items"]], [35])
+
+            alice_engine.send(alice_store, password="pw123", recipient=bob_addr, amount=10, client_tx_id="cid-sync-2")
+            derive = TxEngine._derive_v2_history_items
+            derived_batches = []
+
+            def recording_derive(engine, address, records):
+                derived_batches.append(list(records))
+                return derive(engine, address, records)
+
+            with patch.object(TxEngine, "_derive_v2_history_items", recording_derive):
+                history = alice_engine.history(alice_store)
+                self.assertEqual(alice_engine.history(alice_store)["items"], history["items"])
+
+            alice_address = alice_store.summary(protocol_version="v2").address
+            wallet = WalletAccountV2(
+                address=alice_address,
+                genesis_block_hash=alice_engine.v2_genesis_block_hash,
+                db_path=alice_engine._local_v2_wallet_db_path(alice_address),
+            )
+            try:
+                record_count = len(wallet.list_records())
+            finally:
+                wallet.close()
+            self.assertEqual(len(derived_batches), 1)
+            self.assertLess(len(derived_batches[0]), record_count)
+            self.assertEqual([item["amount"] for item in history["items"]], [35, 10])
+            first = alice_engine.history(alice_store, limit=1)
+            second = alice_engine.history(alice_store, cursor=first["next_cursor"], limit=1)
+            self.assertEqual(first["items"] + second["items"], history["items"])
+
+    def test_v2_derived_history_items_follow_receipt_height_and_tx_position(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            engine = TxEngine(td, max_tx_amount=1000, protocol_version="v2", v2_backend_dir=str(Path(td) / "backend"))
+            alice, bob, carol = ("0x" + byte * 20 for byte in ("aa", "bb", "cc"))
+
+            def record(record_id, value, acquisition_height, height, txs):
+                unit = SimpleNamespace(
+                    receipt=SimpleNamespace(header_lite=SimpleNamespace(height=height, block_hash=bytes([height]) * 32)),
+                    bundle_sidecar=SimpleNamespace(tx_list=txs),
+                )
+                return LocalValueRecord(
+                    record_id=record_id,
+                    value=value,
+                    witness_v2=SimpleNamespace(confirmed_bundle_chain=(unit,)),
+                    local_status=LocalValueStatus.ARCHIVED,
+                    acquisition_height=acquisition_height,
+                )
+
+            def tx(sender, recipient, value, index):
+                return OffChainTx(
+                    sender_addr=sender,
+                    recipient_addr=recipient,
+                    value_list=(value,),
+                    tx_local_index=index,
+                    tx_time=1,
+                )
+
+            # Genesis values sent at height 2, in the opposite order of their
+            # ranges, and a value received at height 1; listed in write order.
+            low, high, received = ValueRange(0, 9), ValueRange(10, 19), ValueRange(100, 104)
+            sends = (tx(alice, bob, high, 0), tx(alice, carol, low, 1))
+            records = [
+                record("sent-low", low, 0, 2, sends),
+                record("sent-high", high, 0, 2, sends),
+                record("received", received, 1, 1, (tx(carol, alice, received, 0),)),
+            ]
+
+            items = engine._derive_v2_history_items(alice, records)
+            self.assertEqual(
+                [(item["receipt_height"], item["recipient"], item["amount"]) for item in items],
+                [(1, alice, 5), (2, bob, 10), (2, carol, 10)],
+            )
+
     def test_v2_tx_engine_remote_send_confirms_when_recipient_endpoint_is_given(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             alice_dir = Path(td) / "alice"
@@ -945,6 +1119,9 @@ class EZV2AppRuntimeTest(unittest.TestCase):
                         created_at=created_at - 1,
                     )
 
+                # Page one package at a time so rejected packages have to be
+                # paged past rather than blocking the honest ones behind them.
+                bob_session.mailbox_page_size = 1
                 events = bob_session.sync_wallet_state()
                 self.assertEqual(len(events), 2)
                 self.assertEqual(sorted(event.target_value.size for event in events), [30, 50])
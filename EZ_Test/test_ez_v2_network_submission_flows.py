@@ -8,8 +8,17 @@ import unittest
 from EZ_V2.crypto import address_from_public_key_pem, generate_secp256k1_keypair
 from EZ_V2.network_host import StaticPeerNetwork, V2AccountHost, V2ConsensusHost, open_static_network
 from EZ_V2.network_transport import TCPNetworkTransport
-from EZ_V2.networking import ChainSyncCursor, PeerInfo
+from EZ_V2.networking import (
+    MSG_RECEIPT_SUBSCRIBE,
+    MSG_TRANSFER_PACKAGE_DELIVER,
+    ChainSyncCursor,
+    NetworkEnvelope,
+    PeerInfo,
+    ReceiptSyncCursor,
+)
+from EZ_V2.transport import transfer_package_hash
 from EZ_V2.transport_peer import TransportPeerNetwork
+from EZ_V2.types import CompressedSparseMerkleProof, SparseMerkleProof
 from EZ_V2.values import ValueRange
 
 
@@ -660,6 +669,340 @@ class EZV2NetworkSubmissionFlowTests(unittest.TestCase):
                 alice.close()
                 consensus.close()
 
+    def test_receipt_subscription_pushes_receipts_and_idle_sync_sends_no_requests(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            network, consensus = open_static_network(td, chain_id=905)
+            consensus.auto_dispatch_receipts = False
+            alice = V2AccountHost(
+                node_id="alice",
+                endpoint="mem://alice",
+                wallet_db_path=f"{td}/alice.sqlite3",
+                chain_id=905,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            bob = V2AccountHost(
+                node_id="bob",
+                endpoint="mem://bob",
+                wallet_db_path=f"{td}/bob.sqlite3",
+                chain_id=905,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            sent_types: list[str] = []
+            original_send = network.send
+
+            def _counting_send(envelope):
+                sent_types.append(envelope.msg_type)
+                return original_send(envelope)
+
+            network.send = _counting_send
+            try:
+                minted = ValueRange(0, 199)
+                consensus.register_genesis_value(alice.address, minted)
+                alice.register_genesis_value(minted)
+                self.assertEqual(alice.subscribe_receipts(), 0)
+                self.assertTrue(alice.receipt_subscription_active)
+
+                payment = alice.submit_payment("bob", amount=30, tx_time=1, anti_spam_nonce=12)
+                self.assertEqual(payment.receipt_height, 1)
+                self.assertEqual(len(alice.wallet.list_pending_bundles()), 0)
+                self.assertEqual(bob.wallet.available_balance(), 30)
+
+                sent_types.clear()
+                self.assertEqual(alice.sync_pending_receipts(), 0)
+                self.assertEqual(sent_types, [])
+            finally:
+                network.send = original_send
+                bob.close()
+                alice.close()
+                consensus.close()
+
+    def test_receipt_subscription_replays_receipts_from_resume_cursor(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            network, consensus = open_static_network(td, chain_id=906)
+            consensus.auto_dispatch_receipts = False
+            alice = V2AccountHost(
+                node_id="alice",
+                endpoint="mem://alice",
+                wallet_db_path=f"{td}/alice.sqlite3",
+                chain_id=906,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            bob = V2AccountHost(
+                node_id="bob",
+                endpoint="mem://bob",
+                wallet_db_path=f"{td}/bob.sqlite3",
+                chain_id=906,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            try:
+                minted = ValueRange(0, 199)
+                consensus.register_genesis_value(alice.address, minted)
+                alice.register_genesis_value(minted)
+                payment = alice.submit_payment("bob", amount=40, tx_time=1, anti_spam_nonce=13)
+                self.assertIsNone(payment.receipt_height)
+                self.assertEqual(len(alice.wallet.list_pending_bundles()), 1)
+
+                self.assertEqual(alice.subscribe_receipts(), 1)
+                self.assertEqual(len(alice.wallet.list_pending_bundles()), 0)
+                self.assertEqual(len(alice.wallet.list_receipts()), 1)
+                self.assertEqual(bob.wallet.available_balance(), 40)
+                # Re-subscribing from the advanced cursor replays nothing.
+                self.assertEqual(alice.subscribe_receipts(), 0)
+            finally:
+                bob.close()
+                alice.close()
+                consensus.close()
+
+    def test_receipt_subscription_requires_the_sender_signature_and_keeps_known_peers(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            network, consensus = open_static_network(td, chain_id=907)
+            alice = V2AccountHost(
+                node_id="alice",
+                endpoint="mem://alice",
+                wallet_db_path=f"{td}/alice.sqlite3",
+                chain_id=907,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            mallory = V2AccountHost(
+                node_id="mallory",
+                endpoint="mem://mallory",
+                wallet_db_path=f"{td}/mallory.sqlite3",
+                chain_id=907,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            try:
+                cursor = ReceiptSyncCursor(sender_addr=alice.address, next_seq=1)
+                forged_peer = PeerInfo(
+                    node_id="alice",
+                    role="account",
+                    endpoint="mem://evil",
+                    metadata={"address": alice.address},
+                )
+                unsigned = consensus.handle_envelope(
+                    NetworkEnvelope(
+                        msg_type=MSG_RECEIPT_SUBSCRIBE,
+                        sender_id="alice",
+                        recipient_id=consensus.peer.node_id,
+                        payload={"cursor": cursor, "peer": forged_peer},
+                    )
+                )
+                self.assertEqual(unsigned["error"], "missing_subscription_signature")
+                wrong_key = consensus.handle_envelope(
+                    NetworkEnvelope(
+                        msg_type=MSG_RECEIPT_SUBSCRIBE,
+                        sender_id="mallory",
+                        recipient_id=consensus.peer.node_id,
+                        payload={
+                            "cursor": cursor,
+                            "peer": forged_peer,
+                            "public_key_pem": mallory.public_key_pem,
+                            "signature": b"\x00" * 70,
+                        },
+                    )
+                )
+                self.assertEqual(wrong_key["error"], "subscription_signer_mismatch")
+                self.assertFalse(consensus._has_receipt_subscriber(alice.address))
+
+                # Alice's real request, replayed from another node id, fails verification.
+                captured: list[NetworkEnvelope] = []
+                original_send = network.send
+                network.send = lambda envelope: (captured.append(envelope), original_send(envelope))[1]
+                try:
+                    alice.subscribe_receipts()
+                finally:
+                    network.send = original_send
+                replayed = consensus.handle_envelope(
+                    NetworkEnvelope(
+                        msg_type=MSG_RECEIPT_SUBSCRIBE,
+                        sender_id="mallory",
+                        recipient_id=consensus.peer.node_id,
+                        payload=dict(captured[-1].payload, peer=forged_peer),
+                    )
+                )
+                self.assertEqual(replayed["error"], "invalid_subscription_signature")
+                self.assertTrue(consensus._has_receipt_subscriber(alice.address, "alice"))
+                self.assertEqual(network.peer_info("alice").endpoint, "mem://alice")
+
+                transport_network = TransportPeerNetwork(
+                    TCPNetworkTransport("127.0.0.1", 0),
+                    (PeerInfo(node_id="alice", role="account", endpoint="127.0.0.1:1"),),
+                )
+                transport_network.add_peer(forged_peer)
+                self.assertEqual(transport_network.peer_info("alice").endpoint, "127.0.0.1:1")
+            finally:
+                mallory.close()
+                alice.close()
+                consensus.close()
+
+    def test_sync_pending_receipts_pulls_when_the_consensus_peer_lacks_subscriptions(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            network, consensus = open_static_network(td, chain_id=908)
+            consensus.auto_dispatch_receipts = False
+            alice = V2AccountHost(
+                node_id="alice",
+                endpoint="mem://alice",
+                wallet_db_path=f"{td}/alice.sqlite3",
+                chain_id=908,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            bob = V2AccountHost(
+                node_id="bob",
+                endpoint="mem://bob",
+                wallet_db_path=f"{td}/bob.sqlite3",
+                chain_id=908,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            try:
+                minted = ValueRange(0, 199)
+                consensus.register_genesis_value(alice.address, minted)
+                alice.register_genesis_value(minted)
+                # The account subscribed with an earlier consensus peer; the
+                # current one does not advertise receipt subscriptions.
+                alice._receipt_subscription = ReceiptSyncCursor(sender_addr=alice.address, next_seq=1)
+                alice._receipt_subscription_peer_id = "consensus-old"
+                legacy_peer = PeerInfo(node_id=consensus.peer.node_id, role="consensus", endpoint=consensus.peer.endpoint)
+                network._peers[consensus.peer.node_id] = legacy_peer
+                with self.assertRaisesRegex(ValueError, "receipt_subscribe_unsupported"):
+                    alice.subscribe_receipts()
+
+                payment = alice.submit_payment("bob", amount=25, tx_time=1, anti_spam_nonce=14)
+                self.assertIsNone(payment.receipt_height)
+                self.assertEqual(len(alice.wallet.list_pending_bundles()), 1)
+                self.assertEqual(alice.sync_pending_receipts(), 1)
+                self.assertEqual(len(alice.wallet.list_pending_bundles()), 0)
+                self.assertFalse(alice.receipt_subscription_active)
+            finally:
+                bob.close()
+                alice.close()
+                consensus.close()
+
+    def test_transfer_package_proofs_are_expanded_for_peers_without_compressed_proofs(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            network, consensus = open_static_network(td, chain_id=910)
+            alice = V2AccountHost(
+                node_id="alice",
+                endpoint="mem://alice",
+                wallet_db_path=f"{td}/alice.sqlite3",
+                chain_id=910,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            bob = V2AccountHost(
+                node_id="bob",
+                endpoint="mem://bob",
+                wallet_db_path=f"{td}/bob.sqlite3",
+                chain_id=910,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            delivered = []
+            send = network.send
+
+            def recording_send(envelope: NetworkEnvelope):
+                if envelope.msg_type == MSG_TRANSFER_PACKAGE_DELIVER:
+                    delivered.append(envelope.payload["package"])
+                return send(envelope)
+
+            network.send = recording_send
+            try:
+                minted = ValueRange(0, 199)
+                consensus.register_genesis_value(alice.address, minted)
+                alice.register_genesis_value(minted)
+                bob_peer = network.peer_info("bob")
+                network._peers["bob"] = PeerInfo(
+                    node_id="bob",
+                    role=bob_peer.role,
+                    endpoint=bob_peer.endpoint,
+                    metadata={"address": bob.address},
+                )
+                alice.submit_payment("bob", amount=50, tx_time=1, anti_spam_nonce=15)
+
+                self.assertEqual(len(delivered), 1)
+                package = delivered[0]
+                proof = package.witness_v2.confirmed_bundle_chain[0].receipt.account_state_proof
+                self.assertIsInstance(proof, SparseMerkleProof)
+                local_package = alice.wallet.export_transfer_package(package.target_tx, package.target_value)
+                local_proof = local_package.witness_v2.confirmed_bundle_chain[0].receipt.account_state_proof
+                self.assertIsInstance(local_proof, CompressedSparseMerkleProof)
+                self.assertEqual(transfer_package_hash(package), transfer_package_hash(local_package))
+                self.assertEqual(bob.wallet.available_balance(), 50)
+            finally:
+                network.send = send
+                alice.close()
+                bob.close()
+                consensus.close()
+
+    def test_pipelined_payment_is_submitted_once_the_previous_seq_confirms(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            network, consensus = open_static_network(td, chain_id=909)
+            consensus.auto_dispatch_receipts = False
+            alice = V2AccountHost(
+                node_id="alice",
+                endpoint="mem://alice",
+                wallet_db_path=f"{td}/alice.sqlite3",
+                chain_id=909,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+                max_pending_bundles=2,
+            )
+            bob = V2AccountHost(
+                node_id="bob",
+                endpoint="mem://bob",
+                wallet_db_path=f"{td}/bob.sqlite3",
+                chain_id=909,
+                network=network,
+                consensus_peer_id=consensus.peer.node_id,
+            )
+            try:
+                # Bundles in the window lock disjoint records.
+                for minted in (ValueRange(0, 99), ValueRange(100, 199)):
+                    consensus.register_genesis_value(alice.address, minted)
+                    alice.register_genesis_value(minted)
+                first = alice.submit_payment("bob", amount=30, tx_time=1, anti_spam_nonce=16)
+                second = alice.submit_payment("bob", amount=40, tx_time=2, anti_spam_nonce=17)
+                self.assertIsNone(first.receipt_height)
+                self.assertIsNone(second.receipt_height)
+                self.assertEqual([item.seq for item in alice.wallet.list_pending_bundles()], [1, 2])
+                self.assertEqual(consensus.consensus.get_receipt(alice.address, 2).status, "missing")
+                with self.assertRaisesRegex(ValueError, "pending bundle"):
+                    alice.submit_payment("bob", amount=5, tx_time=3, anti_spam_nonce=18)
+
+                # The queued seq survives a restart of the account host.
+                alice.close()
+                alice = V2AccountHost(
+                    node_id="alice",
+                    endpoint="mem://alice",
+                    wallet_db_path=f"{td}/alice.sqlite3",
+                    chain_id=909,
+                    network=network,
+                    consensus_peer_id=consensus.peer.node_id,
+                    private_key_pem=alice.private_key_pem,
+                    public_key_pem=alice.public_key_pem,
+                    max_pending_bundles=2,
+                )
+                self.assertTrue(alice.wallet.is_pending_bundle_submitted(1))
+                self.assertFalse(alice.wallet.is_pending_bundle_submitted(2))
+
+                # Applying seq 1 releases seq 2 to consensus in the same sync;
+                # its block announce then pulls the seq 2 receipt.
+                self.assertEqual(alice.sync_pending_receipts(), 1)
+                self.assertEqual(consensus.consensus.get_receipt(alice.address, 2).status, "ok")
+                self.assertEqual(alice.wallet.list_pending_bundles(), [])
+                self.assertEqual([receipt.seq for receipt in alice.wallet.list_receipts()], [1, 2])
+                self.assertEqual(bob.wallet.available_balance(), 70)
+            finally:
+                bob.close()
+                alice.close()
+                consensus.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -333,11 +333,14 @@ class EZV2NodeManagerTest(unittest.TestCase):
                     start_port=consensus_port,
                     bootstrap_nodes=[consensus_endpoint],
                 )
+                # An idle subscribed account only contacts consensus on its
+                # periodic full resync, so shorten it to see the loss quickly.
                 account_manager.start(
                     mode="v2-account",
                     network_name="testnet-v2-account",
                     start_port=account_port,
                     bootstrap_nodes=[consensus_endpoint],
+                    v2_full_resync_sec=1.0,
                 )
             except RuntimeError as exc:
                 if isinstance(exc.__cause__, PermissionError):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import replace
 import unittest
 
@@ -16,6 +17,7 @@ from EZ_V2.types import (
     TransferPackage,
     WitnessV2,
 )
+from EZ_V2.storage import LocalWalletDB
 from EZ_V2.validator import V2TransferValidator, ValidationContext
 from EZ_V2.values import ValueRange
 
@@ -83,7 +85,7 @@ class EZV2ProtocolValidatorTests(unittest.TestCase):
             unit_a1.receipt,
             account_state_proof=replace(
                 unit_a1.receipt.account_state_proof,
-                siblings=tuple(reversed(unit_a1.receipt.account_state_proof.siblings)),
+                siblings=tuple(bytes(byte ^ 0xFF for byte in sibling) for sibling in unit_a1.receipt.account_state_proof.siblings),
             ),
         )
         tampered_unit = ConfirmedBundleUnit(receipt=tampered_receipt, bundle_sidecar=unit_a1.bundle_sidecar)
@@ -160,6 +162,119 @@ class EZV2ProtocolValidatorTests(unittest.TestCase):
         self.assertFalse(result.ok)
         self.assertEqual(result.error, "current sender witness segment cannot be empty")
 
+    def _two_hop_packages(self, chain_id: int):
+        chain = ChainStateV2(chain_id=chain_id)
+        grace_priv, grace_pub = generate_secp256k1_keypair()
+        alice_priv, alice_pub = generate_secp256k1_keypair()
+        _, carol_pub = generate_secp256k1_keypair()
+        grace_addr = address_from_public_key_pem(grace_pub)
+        alice_addr = address_from_public_key_pem(alice_pub)
+        carol_addr = address_from_public_key_pem(carol_pub)
+
+        tx_g1 = OffChainTx(
+            sender_addr=grace_addr,
+            recipient_addr=alice_addr,
+            value_list=(ValueRange(6000, 6049),),
+            tx_local_index=0,
+            tx_time=1,
+        )
+        sub_g1 = self._make_submission(grace_priv, grace_pub, chain_id, 1, 10, 1, 1, [tx_g1])
+        chain.submit_bundle(sub_g1)
+        _, receipts_g1 = chain.build_block(timestamp=1)
+        unit_g1 = ConfirmedBundleUnit(receipt=receipts_g1[grace_addr], bundle_sidecar=sub_g1.sidecar)
+
+        tx_a1 = OffChainTx(
+            sender_addr=alice_addr,
+            recipient_addr=carol_addr,
+            value_list=(ValueRange(6000, 6049),),
+            tx_local_index=0,
+            tx_time=2,
+        )
+        sub_a1 = self._make_submission(alice_priv, alice_pub, chain_id, 1, 20, 1, 2, [tx_a1])
+        chain.submit_bundle(sub_a1)
+        _, receipts_a1 = chain.build_block(timestamp=2)
+        unit_a1 = ConfirmedBundleUnit(receipt=receipts_a1[alice_addr], bundle_sidecar=sub_a1.sidecar)
+
+        prior_witness = WitnessV2(
+            value=ValueRange(6000, 6049),
+            current_owner_addr=grace_addr,
+            confirmed_bundle_chain=(unit_g1,),
+            anchor=GenesisAnchor(
+                genesis_block_hash=b"\x57" * 32,
+                first_owner_addr=grace_addr,
+                value_begin=6000,
+                value_end=6099,
+            ),
+        )
+        package = TransferPackage(
+            target_tx=tx_a1,
+            target_value=ValueRange(6000, 6049),
+            witness_v2=WitnessV2(
+                value=ValueRange(6000, 6049),
+                current_owner_addr=alice_addr,
+                confirmed_bundle_chain=(unit_a1,),
+                anchor=PriorWitnessLink(acquire_tx=tx_g1, prior_witness=prior_witness),
+            ),
+        )
+        tampered_receipt = replace(
+            unit_a1.receipt,
+            account_state_proof=replace(
+                unit_a1.receipt.account_state_proof,
+                siblings=tuple(bytes(byte ^ 0xFF for byte in sibling) for sibling in unit_a1.receipt.account_state_proof.siblings),
+            ),
+        )
+        tampered = replace(
+            package,
+            witness_v2=replace(
+                package.witness_v2,
+                confirmed_bundle_chain=(ConfirmedBundleUnit(receipt=tampered_receipt, bundle_sidecar=sub_a1.sidecar),),
+            ),
+        )
+        return package, tampered, grace_addr, carol_addr
+
+    def test_validator_history_cache_skips_previously_validated_segments(self) -> None:
+        package, tampered, grace_addr, carol_addr = self._two_hop_packages(32)
+
+        class CountingValidator(V2TransferValidator):
+            segments_checked = 0
+
+            def _validate_segment(self, *args, **kwargs):
+                CountingValidator.segments_checked += 1
+                return super()._validate_segment(*args, **kwargs)
+
+        db = LocalWalletDB(":memory:")
+        validator = CountingValidator(
+            ValidationContext(genesis_allocations={grace_addr: (ValueRange(6000, 6099),)})
+        )
+        self.assertTrue(validator.validate_transfer_package(package, recipient_addr=carol_addr, history_cache=db).ok)
+        self.assertEqual(CountingValidator.segments_checked, 2)
+
+        CountingValidator.segments_checked = 0
+        self.assertTrue(validator.validate_transfer_package(package, recipient_addr=carol_addr, history_cache=db).ok)
+        self.assertEqual(CountingValidator.segments_checked, 0)
+
+        # A tampered newest segment is still checked even though its ancestry is cached.
+        CountingValidator.segments_checked = 0
+        result = validator.validate_transfer_package(tampered, recipient_addr=carol_addr, history_cache=db)
+        self.assertEqual(result.error, "account state proof does not verify")
+        self.assertEqual(CountingValidator.segments_checked, 1)
+
+        # Cached structure never bypasses the trust check on the root anchor.
+        untrusted = CountingValidator(ValidationContext())
+        result = untrusted.validate_transfer_package(package, recipient_addr=carol_addr, history_cache=db)
+        self.assertEqual(result.error, "genesis anchor mismatch")
+        db.close()
+
+    def test_validator_parallel_proof_checks_match_sequential_results(self) -> None:
+        package, tampered, grace_addr, carol_addr = self._two_hop_packages(33)
+        context = ValidationContext(genesis_allocations={grace_addr: (ValueRange(6000, 6099),)})
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            validator = V2TransferValidator(context, executor=executor, parallel_min_units=1)
+            self.assertTrue(validator.validate_transfer_package(package, recipient_addr=carol_addr).ok)
+            result = validator.validate_transfer_package(tampered, recipient_addr=carol_addr)
+        self.assertEqual(result.error, V2TransferValidator(context).validate_transfer_package(tampered, recipient_addr=carol_addr).error)
+        self.assertEqual(result.error, "account state proof does not verify")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import tempfile
 import unittest
+from dataclasses import replace
 from pathlib import Path
 
 from EZ_V2.chain import ChainStateV2, confirmed_ref
@@ -213,6 +214,72 @@ class EZV2RuntimeTests(unittest.TestCase):
             carol_wallet.close()
             dave_wallet.close()
 
+    def test_runtime_delivers_package_batch_in_one_wallet_commit(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            alice_priv, alice_pub = generate_secp256k1_keypair()
+            alice_addr = address_from_public_key_pem(alice_pub)
+            _, bob_pub = generate_secp256k1_keypair()
+            bob_addr = address_from_public_key_pem(bob_pub)
+            alice_wallet = WalletAccountV2(
+                address=alice_addr,
+                genesis_block_hash=b"\xab" * 32,
+                db_path=str(Path(tmpdir) / "alice.sqlite3"),
+            )
+            bob_wallet = WalletAccountV2(
+                address=bob_addr,
+                genesis_block_hash=b"\xab" * 32,
+                db_path=str(Path(tmpdir) / "bob.sqlite3"),
+            )
+            alice_wallet.add_genesis_value(ValueRange(0, 199))
+            runtime = V2Runtime(chain=ChainStateV2(chain_id=92))
+            runtime.register_wallet(alice_wallet)
+            runtime.register_wallet(bob_wallet)
+
+            packages = []
+            for round_index, amount in enumerate((30, 20)):
+                submission, _, tx = alice_wallet.build_payment_bundle(
+                    recipient_addr=bob_addr,
+                    amount=amount,
+                    private_key_pem=alice_priv,
+                    public_key_pem=alice_pub,
+                    chain_id=92,
+                    expiry_height=100,
+                    fee=1,
+                    anti_spam_nonce=20 + round_index,
+                    tx_time=1 + round_index,
+                )
+                runtime.submit_bundle(submission)
+                runtime.produce_block(timestamp=10 + round_index)
+                packages.append(alice_wallet.export_transfer_package(tx, tx.value_list[0]))
+            tampered = replace(packages[0], target_value=ValueRange(packages[0].target_value.begin, 199))
+
+            persisted_batches = []
+            commit = bob_wallet.db.commit_received_transfers
+            bob_wallet.db.commit_received_transfers = lambda *args, **kwargs: (
+                persisted_batches.append(len(args[3])),
+                commit(*args, **kwargs),
+            )[1]
+            deliveries = runtime.deliver_transfer_packages(
+                (packages[1], tampered, packages[0], packages[0]),
+                bob_addr,
+            )
+
+            self.assertEqual([item.accepted for item in deliveries], [True, False, True, False])
+            self.assertEqual(deliveries[3].error, "transfer package already accepted")
+            self.assertEqual(persisted_batches, [2])
+            self.assertEqual(
+                sorted((record.value.begin, record.value.end) for record in bob_wallet.list_records()),
+                sorted((package.target_value.begin, package.target_value.end) for package in packages),
+            )
+            self.assertEqual(bob_wallet.available_balance(), 50)
+
+            repeated = runtime.deliver_transfer_package(packages[1])
+            self.assertFalse(repeated.accepted)
+            self.assertEqual(repeated.error, "transfer package already accepted")
+
+            alice_wallet.close()
+            bob_wallet.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import itertools
+import random
+import unittest
+
+from EZ_V2.selection import CoinSelector, SelectionCandidate
+from EZ_V2.values import ValueRange
+from EZ_V2.wallet import WalletAccountV2
+
+
+def _candidates(sizes: list[int], costs: list[tuple] | None = None) -> list[SelectionCandidate]:
+    result = []
+    cursor = 0
+    for index, size in enumerate(sizes):
+        cost = costs[index] if costs is not None else (1, 0, 0, 0)
+        result.append(SelectionCandidate(begin=cursor, size=size, cost=cost))
+        cursor += size
+    return result
+
+
+class EZV2CoinSelectorTests(unittest.TestCase):
+    def test_single_exact_input_beats_split_and_multi_input_plans(self) -> None:
+        plan = CoinSelector(_candidates([30, 50, 200, 20])).select(50)
+        self.assertEqual(plan.ranges, (ValueRange(30, 79),))
+        self.assertEqual(plan.split_count, 0)
+
+    def test_single_split_beats_multi_input_exact_fill(self) -> None:
+        plan = CoinSelector(_candidates([60, 40, 200])).select(100)
+        self.assertEqual(plan.ranges, (ValueRange(100, 199),))
+        self.assertEqual(plan.split_count, 1)
+
+    def test_search_finds_exact_fill_at_minimum_input_count(self) -> None:
+        # Largest-first takes 9 + 8 and would split; 8 + 6 fills 14 exactly.
+        plan = CoinSelector(_candidates([9, 8, 6, 4])).select(14)
+        self.assertEqual(plan.ranges, (ValueRange(9, 16), ValueRange(17, 22)))
+        self.assertEqual(plan.split_count, 0)
+        self.assertTrue(plan.exhaustive)
+
+    def test_cheaper_inputs_win_among_equal_count_plans(self) -> None:
+        costs = [(1, 5, 5, 0), (0, 0, 1, 0), (1, 5, 5, 0), (0, 0, 1, 0)]
+        plan = CoinSelector(_candidates([10, 10, 10, 10], costs)).select(20)
+        self.assertEqual(plan.ranges, (ValueRange(10, 19), ValueRange(30, 39)))
+
+    def test_plan_matches_exhaustive_ranking_on_small_wallets(self) -> None:
+        rng = random.Random(11)
+        for _ in range(200):
+            sizes = [rng.randint(1, 12) for _ in range(rng.randint(1, 7))]
+            costs = [(rng.randint(0, 1), rng.randint(0, 3), rng.randint(0, 3), -rng.randint(0, 2)) for _ in sizes]
+            candidates = _candidates(sizes, costs)
+            amount = rng.randint(1, sum(sizes))
+            best = None
+            for width in range(1, len(candidates) + 1):
+                for subset in itertools.combinations(candidates, width):
+                    total = sum(item.size for item in subset)
+                    if total < amount or total - min(item.size for item in subset) >= amount:
+                        continue
+                    cost = tuple(sum(axis) for axis in zip(*(item.cost for item in subset)))
+                    key = (width, 0 if total == amount else 1, cost)
+                    if best is None or key < best:
+                        best = key
+            plan = CoinSelector(candidates).select(amount)
+            by_begin = {item.begin: item for item in candidates}
+            chosen = [by_begin[value.begin] for value in plan.ranges]
+            cost = tuple(sum(axis) for axis in zip(*(item.cost for item in chosen)))
+            self.assertEqual(sum(value.size for value in plan.ranges), amount)
+            self.assertEqual((plan.input_count, plan.split_count, cost), best)
+
+    def test_exhausted_budget_still_returns_a_covering_plan(self) -> None:
+        rng = random.Random(3)
+        selector = CoinSelector(_candidates([rng.randint(50, 150) for _ in range(5_000)]))
+        plan = selector.select(4_321, max_nodes=10)
+        self.assertFalse(plan.exhaustive)
+        self.assertEqual(sum(value.size for value in plan.ranges), 4_321)
+        self.assertLessEqual(plan.split_count, 1)
+
+    def test_rejects_insufficient_balance(self) -> None:
+        with self.assertRaisesRegex(ValueError, "insufficient_balance"):
+            CoinSelector(_candidates([5, 5])).select(11)
+
+    def test_wallet_rebuilds_selector_after_state_changes(self) -> None:
+        wallet = WalletAccountV2(address="0xselector", genesis_block_hash=b"\x01" * 32)
+        try:
+            wallet.add_genesis_value(ValueRange(0, 49))
+            first = wallet.coin_selector()
+            self.assertIs(wallet.coin_selector(), first)
+            wallet.add_genesis_value(ValueRange(100, 199))
+            self.assertIsNot(wallet.coin_selector(), first)
+            self.assertEqual(wallet.select_payment_ranges(100), (ValueRange(100, 199),))
+        finally:
+            wallet.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,12 +19,16 @@ import unittest
 from EZ_V2.smt import (
     EMPTY_LEAF_HASH,
     SparseMerkleTree,
+    _default_hashes,
     _leaf_node_hash,
     _node_hash,
+    compress_proof,
+    expand_proof,
     verify_proof,
 )
 from EZ_V2.crypto import keccak256
-from EZ_V2.types import SparseMerkleProof
+from EZ_V2.serde import dumps_json, loads_json
+from EZ_V2.types import CompressedSparseMerkleProof, SparseMerkleProof
 
 
 class EZV2SMTConstructionTests(unittest.TestCase):
@@ -590,5 +594,82 @@ class EZV2SMTInvariantTests(unittest.TestCase):
             self.assertEqual(retrieved_value, original_value)
 
 
+class EZV2SMTCompressedProofTests(unittest.TestCase):
+    """压缩proof：bitmap + 非默认siblings"""
+
+    def _tree(self) -> SparseMerkleTree:
+        tree = SparseMerkleTree(depth=256)
+        for index in range(5):
+            tree.set(keccak256(bytes([index])), bytes([index + 1]) * 32)
+        return tree
+
+    def test_compressed_proof_keeps_only_non_default_siblings(self) -> None:
+        tree = self._tree()
+        key = keccak256(b"\x02")
+        full = tree.prove(key)
+        compressed = tree.prove_compressed(key)
+
+        self.assertEqual(len(compressed.bitmap), 32)
+        self.assertLessEqual(len(compressed.siblings), 5)
+        self.assertEqual(expand_proof(compressed), full)
+        self.assertEqual(compress_proof(full), compressed)
+        self.assertTrue(verify_proof(tree.root(), key, b"\x03" * 32, compressed))
+        self.assertFalse(verify_proof(tree.root(), key, b"\x04" * 32, compressed))
+
+    def test_compressed_non_existence_proof_verifies(self) -> None:
+        tree = self._tree()
+        key = keccak256(b"missing")
+        proof = tree.prove_compressed(key)
+
+        self.assertFalse(proof.existence)
+        self.assertTrue(verify_proof(tree.root(), key, b"\x00" * 32, proof))
+
+    def test_compressed_proof_rejects_tampered_bitmap_and_siblings(self) -> None:
+        tree = self._tree()
+        key = keccak256(b"\x01")
+        proof = tree.prove_compressed(key)
+        bitmap = int.from_bytes(proof.bitmap, "little")
+        lowest = bitmap & -bitmap
+        moved = ((bitmap ^ lowest) | (lowest >> 1)).to_bytes(32, "little")
+
+        self.assertFalse(verify_proof(tree.root(), key, b"\x02" * 32, CompressedSparseMerkleProof(
+            bitmap=moved, siblings=proof.siblings, existence=True,
+        )))
+        self.assertFalse(verify_proof(tree.root(), key, b"\x02" * 32, CompressedSparseMerkleProof(
+            bitmap=proof.bitmap, siblings=(b"\xff" * 32,) + proof.siblings[1:], existence=True,
+        )))
+        self.assertFalse(verify_proof(tree.root(), key, b"\x02" * 32, CompressedSparseMerkleProof(
+            bitmap=proof.bitmap + b"\x00", siblings=proof.siblings, existence=True,
+        )))
+        with self.assertRaises(ValueError):
+            CompressedSparseMerkleProof(bitmap=proof.bitmap, siblings=proof.siblings[1:], existence=True)
+
+    def test_compressed_proof_rejects_listed_default_sibling(self) -> None:
+        tree = self._tree()
+        key = keccak256(b"\x01")
+        proof = tree.prove_compressed(key)
+        bitmap = int.from_bytes(proof.bitmap, "little")
+        level = next(level for level in range(256) if not (bitmap >> level) & 1)
+        position = (bitmap & ((1 << level) - 1)).bit_count()
+        padded = CompressedSparseMerkleProof(
+            bitmap=(bitmap | (1 << level)).to_bytes(32, "little"),
+            siblings=proof.siblings[:position] + (_default_hashes(256)[level],) + proof.siblings[position:],
+            existence=True,
+        )
+
+        self.assertEqual(expand_proof(proof).siblings, tree.prove(key).siblings)
+        self.assertFalse(verify_proof(tree.root(), key, b"\x02" * 32, padded))
+        with self.assertRaises(ValueError):
+            expand_proof(padded)
+
+    def test_compressed_proof_serde_roundtrip_is_smaller(self) -> None:
+        tree = self._tree()
+        key = keccak256(b"\x03")
+        compressed = tree.prove_compressed(key)
+
+        self.assertEqual(loads_json(dumps_json(compressed)), compressed)
+        self.assertLess(len(dumps_json(compressed)) * 10, len(dumps_json(tree.prove(key))))
+
+
 if __name__ == "__main__":
     unittest.main()
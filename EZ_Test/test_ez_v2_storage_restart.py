@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import sqlite3
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
 from EZ_V2.chain import compute_bundle_hash, confirmed_ref
 from EZ_V2.crypto import keccak256
-from EZ_V2.storage import LocalWalletDB
+from EZ_V2.storage import LocalWalletDB, SidecarGarbageCollector
 from EZ_V2.types import (
     BundleEnvelope,
     BundleSidecar,
@@ -179,6 +181,271 @@ class EZV2StorageRestartTests(unittest.TestCase):
             self.assertEqual(reopened.list_value_records(owner_addr)[0].record_id, "record-1")
             reopened.close()
 
+    def test_status_flips_and_spendable_ordering_do_not_decode_witnesses(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            owner_addr = "0x" + "79" * 20
+            db_path = str(Path(tmpdir) / "wallet.sqlite3")
+            db = LocalWalletDB(db_path)
+            value = ValueRange(0, 9)
+            witness = WitnessV2(
+                value=value,
+                current_owner_addr=owner_addr,
+                confirmed_bundle_chain=(),
+                anchor=GenesisAnchor(
+                    genesis_block_hash=b"\xcd" * 32,
+                    first_owner_addr=owner_addr,
+                    value_begin=0,
+                    value_end=9,
+                ),
+            )
+            db.replace_value_records(
+                owner_addr,
+                [
+                    LocalValueRecord(
+                        record_id="record-a",
+                        value=value,
+                        witness_v2=witness,
+                        local_status=LocalValueStatus.VERIFIED_SPENDABLE,
+                        acquisition_height=0,
+                    )
+                ],
+            )
+
+            listed = db.list_value_records(owner_addr)[0]
+            flipped = listed.with_status(LocalValueStatus.PENDING_BUNDLE)
+            self.assertNotEqual(flipped, listed)
+            self.assertEqual(flipped.with_status(LocalValueStatus.VERIFIED_SPENDABLE), listed)
+            self.assertEqual(flipped.witness_chain_length, 0)
+            self.assertFalse(listed.witness_loaded or flipped.witness_loaded)
+
+            # The flipped copy keeps its witness when the row is rewritten under it.
+            db.replace_value_records(owner_addr, [])
+            self.assertEqual(flipped.witness_v2, witness)
+            db.replace_value_records(owner_addr, [flipped])
+            db.close()
+
+            # Databases from before the chain length column get it filled on open.
+            conn = sqlite3.connect(db_path)
+            conn.execute("ALTER TABLE value_records DROP COLUMN witness_chain_length")
+            conn.commit()
+            conn.close()
+            reopened = LocalWalletDB(db_path)
+            record = reopened.list_value_records(owner_addr)[0]
+            self.assertEqual(record.witness_chain_length, 0)
+            self.assertFalse(record.witness_loaded)
+            reopened.close()
+
+    def test_listed_records_decode_witness_lazily_and_keep_it_across_rewrites(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            owner_addr = "0x" + "77" * 20
+            db = LocalWalletDB(str(Path(tmpdir) / "wallet.sqlite3"))
+
+            def make_record(record_id: str, begin: int) -> LocalValueRecord:
+                value = ValueRange(begin, begin + 9)
+                return LocalValueRecord(
+                    record_id=record_id,
+                    value=value,
+                    witness_v2=WitnessV2(
+                        value=value,
+                        current_owner_addr=owner_addr,
+                        confirmed_bundle_chain=(),
+                        anchor=GenesisAnchor(
+                            genesis_block_hash=b"\xcc" * 32,
+                            first_owner_addr=owner_addr,
+                            value_begin=begin,
+                            value_end=begin + 9,
+                        ),
+                    ),
+                    local_status=LocalValueStatus.VERIFIED_SPENDABLE,
+                    acquisition_height=0,
+                )
+
+            originals = [make_record("record-a", 0), make_record("record-b", 10)]
+            db.replace_value_records(owner_addr, originals)
+
+            listed = db.list_value_records(owner_addr)
+            self.assertEqual([record.value for record in listed], [ValueRange(0, 9), ValueRange(10, 19)])
+            self.assertFalse(any(record.witness_loaded for record in listed))
+            self.assertFalse(hasattr(listed[0], "__dict__"))
+
+            # Header-only change on an undecoded record, rewrite of the other.
+            listed[0].local_status = LocalValueStatus.ARCHIVED
+            replacement = make_record("record-b", 10)
+            replacement.witness_v2 = WitnessV2(
+                value=ValueRange(10, 19),
+                current_owner_addr="0x" + "88" * 20,
+                confirmed_bundle_chain=(),
+                anchor=replacement.witness_v2.anchor,
+            )
+            db.replace_value_records(owner_addr, [listed[0], replacement])
+
+            self.assertFalse(listed[0].witness_loaded)
+            self.assertTrue(listed[1].witness_loaded)
+            self.assertEqual(listed[1].witness_v2, originals[1].witness_v2)
+
+            reloaded = db.list_value_records(owner_addr)
+            self.assertEqual(reloaded[0].local_status, LocalValueStatus.ARCHIVED)
+            self.assertEqual(reloaded[0].witness_v2, originals[0].witness_v2)
+            self.assertEqual(reloaded[1].witness_v2.current_owner_addr, "0x" + "88" * 20)
+            self.assertEqual(reloaded, [listed[0], replacement])
+            db.close()
+
+
+    def test_record_write_seq_moves_only_when_a_witness_is_rewritten(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            owner_addr = "0x" + "76" * 20
+            db = LocalWalletDB(str(Path(tmpdir) / "wallet.sqlite3"))
+
+            def make_record(record_id: str, begin: int, current_owner_addr: str = owner_addr) -> LocalValueRecord:
+                value = ValueRange(begin, begin + 9)
+                return LocalValueRecord(
+                    record_id=record_id,
+                    value=value,
+                    witness_v2=WitnessV2(
+                        value=value,
+                        current_owner_addr=current_owner_addr,
+                        confirmed_bundle_chain=(),
+                        anchor=GenesisAnchor(
+                            genesis_block_hash=b"\xcb" * 32,
+                            first_owner_addr=owner_addr,
+                            value_begin=begin,
+                            value_end=begin + 9,
+                        ),
+                    ),
+                    local_status=LocalValueStatus.VERIFIED_SPENDABLE,
+                    acquisition_height=0,
+                )
+
+            self.assertEqual(db.last_record_write_seq(owner_addr), 0)
+            originals = [make_record("record-a", 0), make_record("record-b", 10)]
+            db.replace_value_records(owner_addr, originals)
+            self.assertEqual(db.last_record_write_seq(owner_addr), 1)
+
+            # Reading a witness or flipping a status leaves the rows as they are.
+            listed = db.list_value_records(owner_addr)
+            self.assertEqual(listed[0].witness_v2, originals[0].witness_v2)
+            db.replace_value_records(owner_addr, [listed[0], listed[1].with_status(LocalValueStatus.ARCHIVED)])
+            self.assertEqual(db.last_record_write_seq(owner_addr), 1)
+            self.assertEqual(db.list_value_records_written_since(owner_addr, 1, upto_write_seq=1), [])
+
+            db.replace_value_records(owner_addr, [listed[0], make_record("record-b", 10, "0x" + "88" * 20)])
+            self.assertEqual(db.last_record_write_seq(owner_addr), 2)
+            written = db.list_value_records_written_since(owner_addr, 1, upto_write_seq=2)
+            self.assertEqual([record.record_id for record in written], ["record-b"])
+
+            # The copy listed before the rewrite was detached from the row, so
+            # persisting it again writes its own witness back.
+            self.assertIsNone(listed[1].witness_source)
+            db.replace_value_records(owner_addr, [listed[0], listed[1]])
+            self.assertEqual(db.last_record_write_seq(owner_addr), 3)
+            reloaded = db.list_value_records(owner_addr)
+            self.assertEqual(reloaded[1].witness_v2, originals[1].witness_v2)
+            self.assertEqual(
+                [record.record_id for record in db.list_value_records_written_since(owner_addr, -1, upto_write_seq=3)],
+                ["record-a", "record-b"],
+            )
+            db.close()
+
+    def test_sidecar_ref_counts_follow_writes_and_match_fsck(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "wallet.sqlite3")
+            owner_addr = "alice"
+            db = LocalWalletDB(db_path)
+            shared_sidecar = _make_sidecar(owner_addr, "bob", ValueRange(0, 9))
+            dropped_sidecar = _make_sidecar(owner_addr, "carol", ValueRange(10, 19))
+            shared_hash = compute_bundle_hash(shared_sidecar)
+            dropped_hash = compute_bundle_hash(dropped_sidecar)
+
+            def make_record(record_id: str, value: ValueRange, sidecar: BundleSidecar) -> LocalValueRecord:
+                receipt = Receipt(
+                    header_lite=HeaderLite(height=1, block_hash=b"\x11" * 32, state_root=b"\x22" * 32),
+                    seq=1,
+                    prev_ref=None,
+                    account_state_proof=SparseMerkleProof(siblings=(), existence=True),
+                )
+                db.save_sidecar(sidecar)
+                return LocalValueRecord(
+                    record_id=record_id,
+                    value=value,
+                    witness_v2=WitnessV2(
+                        value=value,
+                        current_owner_addr=owner_addr,
+                        confirmed_bundle_chain=(ConfirmedBundleUnit(receipt=receipt, bundle_sidecar=sidecar),),
+                        anchor=GenesisAnchor(
+                            genesis_block_hash=b"\xcc" * 32,
+                            first_owner_addr=owner_addr,
+                            value_begin=value.begin,
+                            value_end=value.end,
+                        ),
+                    ),
+                    local_status=LocalValueStatus.VERIFIED_SPENDABLE,
+                    acquisition_height=1,
+                )
+
+            db.save_pending_bundle(
+                PendingBundleContext(
+                    sender_addr=owner_addr,
+                    bundle_hash=shared_hash,
+                    seq=2,
+                    envelope=_make_envelope(shared_hash, seq=2),
+                    sidecar=shared_sidecar,
+                    sender_public_key_pem=b"sender-pub",
+                    pending_record_ids=(),
+                    outgoing_record_ids=(),
+                    outgoing_values=(ValueRange(0, 9),),
+                    created_at=20,
+                )
+            )
+            kept = make_record("kept", ValueRange(0, 9), shared_sidecar)
+            dropped = make_record("dropped", ValueRange(10, 19), dropped_sidecar)
+            db.replace_value_records(owner_addr, [kept, dropped])
+            self.assertEqual(db.recompute_sidecar_ref_counts(), 0)
+
+            db.delete_pending_bundle(owner_addr, 2)
+            db.replace_value_records(owner_addr, [db.list_value_records(owner_addr)[0]])
+            self.assertEqual(db.recompute_sidecar_ref_counts(), 0)
+
+            # Freshly released sidecars stay inside the grace window.
+            collector = SidecarGarbageCollector(db, interval_sec=60.0, min_unreferenced_sec=60.0)
+            self.assertEqual(collector.collect_once(), 0)
+            collector.min_unreferenced_sec = 0.0
+            self.assertEqual(collector.collect_once(), 1)
+            self.assertIsNotNone(db.get_sidecar(shared_hash))
+            self.assertIsNone(db.get_sidecar(dropped_hash))
+            db.close()
+
+            # A database from before incremental counting derives its refs on open.
+            conn = sqlite3.connect(db_path)
+            conn.execute("DROP TABLE value_record_sidecar_refs")
+            conn.execute("UPDATE bundle_sidecars SET ref_count = 0")
+            conn.commit()
+            conn.close()
+            reopened = LocalWalletDB(db_path)
+            self.assertEqual(reopened.recompute_sidecar_ref_counts(), 0)
+            self.assertEqual(reopened.gc_unused_sidecars(), 0)
+            self.assertIsNotNone(reopened.get_sidecar(shared_hash))
+            reopened.close()
+
+    def test_wallet_writers_wait_for_a_gc_transaction_on_the_shared_connection(self):
+        with tempfile.TemporaryDirectory() as td:
+            db = LocalWalletDB(str(Path(td) / "wallet.sqlite3"))
+            owner_addr = "0x" + "aa" * 20
+            header = HeaderLite(height=1, block_hash=b"\x01" * 32, state_root=b"\x02" * 32)
+            saved = threading.Event()
+
+            def save_header():
+                db.save_canonical_header(owner_addr, header)
+                saved.set()
+
+            # Stand-in for a collector pass holding its transaction open.
+            with db._lock:
+                writer = threading.Thread(target=save_header)
+                writer.start()
+                self.assertFalse(saved.wait(0.2))
+            writer.join(timeout=5.0)
+            self.assertTrue(saved.is_set())
+            self.assertTrue(db.has_canonical_header(owner_addr, header))
+            db.close()
 
 if __name__ == "__main__":
     unittest.main()
@@ -20,6 +20,7 @@ from EZ_V2.values import (
     LocalValueStatus,
     LocalValueRecord,
     ValueRange,
+    ValueRecordIndex,
 )
 
 
@@ -375,5 +376,77 @@ class EZV2ValueRangeCombinatoricsTests(unittest.TestCase):
                     break
 
 
+
+class EZV2ValueRecordIndexTests(unittest.TestCase):
+    """
+    [design-conformance] 值记录区间索引测试
+
+    验证按状态分桶的区间查询与线性扫描结果一致
+    """
+
+    @staticmethod
+    def _record(record_id: str, begin: int, end: int, status: LocalValueStatus) -> LocalValueRecord:
+        return LocalValueRecord(
+            record_id=record_id,
+            value=ValueRange(begin, end),
+            witness_v2={},
+            local_status=status,
+            acquisition_height=0,
+        )
+
+    def test_overlapping_matches_linear_scan(self) -> None:
+        """验证区间查询结果与线性扫描一致（含重叠的归档记录）"""
+        records = [
+            self._record(f"s{i}", i * 10, i * 10 + 9, LocalValueStatus.VERIFIED_SPENDABLE)
+            for i in range(0, 50, 2)
+        ]
+        records += [
+            self._record("a-wide", 0, 400, LocalValueStatus.ARCHIVED),
+            self._record("a-small", 15, 18, LocalValueStatus.ARCHIVED),
+            self._record("p", 10, 19, LocalValueStatus.PENDING_BUNDLE),
+        ]
+        index = ValueRecordIndex(records)
+        for query in (ValueRange(0, 0), ValueRange(12, 17), ValueRange(95, 130), ValueRange(399, 1000), ValueRange(501, 600)):
+            expected = sorted(record.record_id for record in records if record.value.intersects(query))
+            self.assertEqual(sorted(record.record_id for record in index.overlapping(query)), expected)
+
+    def test_containing_and_exact_filter_by_status(self) -> None:
+        """验证包含查询与精确查询只返回指定状态的记录"""
+        index = ValueRecordIndex(
+            [
+                self._record("spendable", 0, 99, LocalValueStatus.VERIFIED_SPENDABLE),
+                self._record("archived", 20, 29, LocalValueStatus.ARCHIVED),
+            ]
+        )
+        spendable_only = (LocalValueStatus.VERIFIED_SPENDABLE,)
+        self.assertEqual([r.record_id for r in index.containing(ValueRange(20, 29), spendable_only)], ["spendable"])
+        self.assertEqual([r.record_id for r in index.exact(ValueRange(20, 29))], ["archived"])
+        self.assertEqual(index.containing(ValueRange(90, 110)), [])
+        self.assertEqual(index.get("archived").value, ValueRange(20, 29))
+        self.assertEqual(len(index), 2)
+
+    def test_incremental_updates_match_a_rebuilt_index(self) -> None:
+        """验证增量增删记录后的查询结果与重建索引一致"""
+        records = [
+            self._record(f"s{i}", i * 10, i * 10 + 9, LocalValueStatus.VERIFIED_SPENDABLE)
+            for i in range(40)
+        ]
+        index = ValueRecordIndex(records)
+        index.overlapping(ValueRange(0, 0))
+        records = [record for record in records if record.record_id not in {"s3", "s17", "s39"}]
+        records.append(self._record("s17", 170, 179, LocalValueStatus.PENDING_BUNDLE))
+        records.append(self._record("a-wide", 5, 300, LocalValueStatus.ARCHIVED))
+        records.append(self._record("a-late", 395, 399, LocalValueStatus.ARCHIVED))
+        index.sync(records)
+        rebuilt = ValueRecordIndex(records)
+        self.assertEqual(len(index), len(records))
+        self.assertEqual(index.get("s17").local_status, LocalValueStatus.PENDING_BUNDLE)
+        for query in (ValueRange(0, 40), ValueRange(170, 175), ValueRange(299, 310), ValueRange(390, 500)):
+            self.assertEqual(
+                [record.record_id for record in index.overlapping(query)],
+                [record.record_id for record in rebuilt.overlapping(query)],
+            )
+        self.assertIsNone(index.discard("missing"))
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,7 +5,9 @@ import threading
 import unittest
 from dataclasses import replace
 from pathlib import Path
+from unittest.mock import patch
 
+from EZ_V2.checkpoint_policy import CheckpointPolicy
 from EZ_V2.chain import (
     ChainStateV2,
     compute_addr_key,
@@ -15,6 +17,7 @@ from EZ_V2.chain import (
     reconstructed_leaf,
 )
 from EZ_V2.crypto import address_from_public_key_pem, generate_secp256k1_keypair
+from EZ_V2.encoding import canonical_encode
 from EZ_V2.smt import SparseMerkleTree
 from EZ_V2.types import ConfirmedBundleUnit, HeaderLite, OffChainTx, Receipt
 from EZ_V2.values import LocalValueStatus, ValueRange
@@ -334,6 +337,309 @@ class EZV2WalletStorageTests(unittest.TestCase):
             )
             wallet.close()
 
+    def test_pending_window_pipelines_bundles_over_disjoint_records(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "wallet.sqlite3")
+            chain = ChainStateV2(chain_id=72)
+            alice_priv, alice_pub = generate_secp256k1_keypair()
+            alice_addr = address_from_public_key_pem(alice_pub)
+            _, bob_pub = generate_secp256k1_keypair()
+            bob_addr = address_from_public_key_pem(bob_pub)
+
+            wallet = WalletAccountV2(
+                address=alice_addr,
+                genesis_block_hash=b"\x89" * 32,
+                db_path=db_path,
+                max_pending_bundles=2,
+            )
+            wallet.add_genesis_value(ValueRange(0, 99))
+            wallet.add_genesis_value(ValueRange(100, 199))
+            wallet.add_genesis_value(ValueRange(200, 299))
+
+            submission1, _, _ = wallet.build_payment_bundle(
+                recipient_addr=bob_addr,
+                amount=100,
+                private_key_pem=alice_priv,
+                public_key_pem=alice_pub,
+                chain_id=72,
+                expiry_height=10,
+                tx_time=1,
+            )
+            submission2, context2, tx2 = wallet.build_payment_bundle(
+                recipient_addr=bob_addr,
+                amount=100,
+                private_key_pem=alice_priv,
+                public_key_pem=alice_pub,
+                chain_id=72,
+                expiry_height=10,
+                tx_time=2,
+            )
+            self.assertEqual([item.seq for item in wallet.list_pending_bundles()], [1, 2])
+            self.assertEqual(wallet.pending_window_available(), 0)
+            self.assertTrue(
+                set(submission1.sidecar.tx_list[0].value_list).isdisjoint(submission2.sidecar.tx_list[0].value_list)
+            )
+            with self.assertRaisesRegex(ValueError, "wallet already has a pending bundle"):
+                wallet.build_payment_bundle(
+                    recipient_addr=bob_addr,
+                    amount=100,
+                    private_key_pem=alice_priv,
+                    public_key_pem=alice_pub,
+                    chain_id=72,
+                    expiry_height=10,
+                )
+
+            chain.submit_bundle(submission1)
+            block1, receipts1 = chain.build_block(timestamp=1)
+            wallet.observe_canonical_block(block1)
+            wallet.on_receipt_confirmed(receipts1[alice_addr])
+            # seq 2 is still pending, so the size estimate must come from seq 1's proof.
+            self.assertEqual(
+                wallet._estimated_proof_siblings(),
+                len(receipts1[alice_addr].account_state_proof.siblings),
+            )
+            locked = [record for record in wallet.list_records() if record.record_id in context2.pending_record_ids]
+            self.assertTrue(all(record.local_status == LocalValueStatus.PENDING_BUNDLE for record in locked))
+            self.assertTrue(
+                all([unit.receipt.seq for unit in record.witness_v2.confirmed_bundle_chain] == [1] for record in locked)
+            )
+
+            chain.submit_bundle(submission2)
+            block2, receipts2 = chain.build_block(timestamp=2)
+            wallet.observe_canonical_block(block2)
+            wallet.on_receipt_confirmed(receipts2[alice_addr])
+            self.assertEqual(wallet.list_pending_bundles(), [])
+            self.assertEqual(wallet.available_balance(), 100)
+            package = wallet.export_transfer_package(tx2, tx2.value_list[0])
+            self.assertEqual([unit.receipt.seq for unit in package.witness_v2.confirmed_bundle_chain], [2, 1])
+            wallet.close()
+
+    def test_checkpoint_policy_checkpoints_records_after_receipts_and_prunes_superseded(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "wallet.sqlite3")
+            chain = ChainStateV2(chain_id=73)
+            alice_priv, alice_pub = generate_secp256k1_keypair()
+            alice_addr = address_from_public_key_pem(alice_pub)
+            _, bob_pub = generate_secp256k1_keypair()
+            bob_addr = address_from_public_key_pem(bob_pub)
+
+            wallet = WalletAccountV2(
+                address=alice_addr,
+                genesis_block_hash=b"\x8a" * 32,
+                db_path=db_path,
+                checkpoint_policy=CheckpointPolicy(max_witness_units=1),
+            )
+            wallet.add_genesis_value(ValueRange(0, 49))
+            wallet.add_genesis_value(ValueRange(50, 99))
+            wallet.add_genesis_value(ValueRange(1000, 1999))
+            self.assertEqual(wallet.witness_size_stats().units_max, 0)
+
+            for timestamp in (1, 2):
+                submission, _, _ = wallet.build_payment_bundle(
+                    recipient_addr=bob_addr,
+                    amount=50,
+                    private_key_pem=alice_priv,
+                    public_key_pem=alice_pub,
+                    chain_id=73,
+                    expiry_height=10,
+                    tx_time=timestamp,
+                )
+                chain.submit_bundle(submission)
+                block, receipts = chain.build_block(timestamp=timestamp)
+                wallet.observe_canonical_block(block)
+                wallet.on_receipt_confirmed(receipts[alice_addr])
+
+            checkpoints = {
+                (checkpoint.value_begin, checkpoint.value_end): checkpoint.checkpoint_height
+                for checkpoint in wallet.list_checkpoints()
+            }
+            # 50..99 was checkpointed at height 1 and spent at height 2; the
+            # untouched 1000..1999 was re-checkpointed and its height-1 entry pruned.
+            self.assertEqual(checkpoints, {(50, 99): 1, (1000, 1999): 2})
+            self.assertEqual(len(wallet.list_checkpoints()), 2)
+            self.assertEqual(wallet.apply_checkpoint_policy(current_height=2), ())
+
+            stats = wallet.witness_size_stats()
+            self.assertEqual(stats.record_count, 1)
+            self.assertEqual(stats.units_max, 2)
+            self.assertEqual(stats.checkpoint_count, 2)
+            self.assertGreater(stats.bytes_max, 0)
+            wallet.close()
+
+    def test_estimate_payment_cost_predicts_exported_package(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "wallet.sqlite3")
+            chain = ChainStateV2(chain_id=74)
+            alice_priv, alice_pub = generate_secp256k1_keypair()
+            alice_addr = address_from_public_key_pem(alice_pub)
+            _, bob_pub = generate_secp256k1_keypair()
+            bob_addr = address_from_public_key_pem(bob_pub)
+
+            wallet = WalletAccountV2(address=alice_addr, genesis_block_hash=b"\x8b" * 32, db_path=db_path)
+            wallet.add_genesis_value(ValueRange(0, 99))
+            wallet.add_genesis_value(ValueRange(100, 149))
+
+            def pay(amount: int, timestamp: int):
+                submission, _, tx = wallet.build_payment_bundle(
+                    recipient_addr=bob_addr,
+                    amount=amount,
+                    private_key_pem=alice_priv,
+                    public_key_pem=alice_pub,
+                    chain_id=74,
+                    expiry_height=10,
+                    tx_time=timestamp,
+                )
+                chain.submit_bundle(submission)
+                block, receipts = chain.build_block(timestamp=timestamp)
+                wallet.observe_canonical_block(block)
+                wallet.on_receipt_confirmed(receipts[alice_addr])
+                return tx
+
+            pay(10, 1)
+            estimate = wallet.estimate_payment_cost(bob_addr, 30, tx_time=2)
+            self.assertEqual(estimate.package_count, 1)
+            output = estimate.outputs[0]
+            self.assertEqual(output.confirmed_units, 2)
+            self.assertEqual(output.proof_verifications, 2)
+            self.assertEqual(output.hash_ops, 2 * 256)
+            self.assertEqual(estimate.to_dict()["total_package_bytes"], output.package_bytes)
+
+            tx = pay(30, 2)
+            self.assertEqual(tx.value_list, (output.value,))
+            package = wallet.export_transfer_package(tx, output.value)
+            actual_bytes = len(canonical_encode(package))
+            self.assertEqual(len(package.witness_v2.confirmed_bundle_chain), output.confirmed_units)
+            self.assertLess(abs(output.package_bytes - actual_bytes), actual_bytes // 20)
+
+            with self.assertRaisesRegex(ValueError, "insufficient_balance"):
+                wallet.estimate_payment_cost(bob_addr, 30, max_package_bytes=64)
+            wallet.close()
+
+    def test_rollback_cascades_to_later_pending_bundles(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "wallet.sqlite3")
+            alice_priv, alice_pub = generate_secp256k1_keypair()
+            alice_addr = address_from_public_key_pem(alice_pub)
+            _, bob_pub = generate_secp256k1_keypair()
+            bob_addr = address_from_public_key_pem(bob_pub)
+
+            wallet = WalletAccountV2(
+                address=alice_addr,
+                genesis_block_hash=b"\x8a" * 32,
+                db_path=db_path,
+                max_pending_bundles=3,
+            )
+            wallet.add_genesis_value(ValueRange(0, 299))
+            wallet.add_genesis_value(ValueRange(300, 599))
+            wallet.add_genesis_value(ValueRange(600, 899))
+            for tx_time in (1, 2, 3):
+                wallet.build_payment_bundle(
+                    recipient_addr=bob_addr,
+                    amount=50,
+                    private_key_pem=alice_priv,
+                    public_key_pem=alice_pub,
+                    chain_id=73,
+                    expiry_height=10,
+                    tx_time=tx_time,
+                )
+            self.assertEqual([item.seq for item in wallet.list_pending_bundles()], [1, 2, 3])
+            with self.assertRaisesRegex(ValueError, "must follow the last pending bundle"):
+                wallet.rollback_pending_bundle(3)
+                wallet.build_payment_bundle(
+                    recipient_addr=bob_addr,
+                    amount=50,
+                    private_key_pem=alice_priv,
+                    public_key_pem=alice_pub,
+                    chain_id=73,
+                    expiry_height=10,
+                    seq=5,
+                )
+
+            rolled_back = wallet.rollback_pending_bundle(1)
+
+            self.assertEqual(rolled_back.seq, 1)
+            self.assertEqual(wallet.list_pending_bundles(), [])
+            self.assertEqual(wallet.available_balance(), 900)
+            self.assertEqual(wallet.next_sequence(), 1)
+            wallet.close()
+
+    def test_plan_payment_batch_packs_disjoint_ranges_within_pool_limits(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "wallet.sqlite3")
+            alice_priv, alice_pub = generate_secp256k1_keypair()
+            alice_addr = address_from_public_key_pem(alice_pub)
+            recipients = [address_from_public_key_pem(generate_secp256k1_keypair()[1]) for _ in range(3)]
+
+            wallet = WalletAccountV2(address=alice_addr, genesis_block_hash=b"\x8b" * 32, db_path=db_path)
+            for begin in range(0, 100, 10):
+                wallet.add_genesis_value(ValueRange(begin, begin + 9))
+
+            payments = [(recipients[0], 25), (recipients[1], 5), (recipients[2], 40), (recipients[0], 7)]
+            plan = wallet.plan_payment_batch(payments, tx_time=5, max_tx_per_bundle=2, max_value_entries_per_tx=2)
+
+            txs = [tx for bundle in plan for tx in bundle]
+            self.assertTrue(all(len(bundle) <= 2 for bundle in plan))
+            self.assertTrue(all(tx.tx_local_index == index for bundle in plan for index, tx in enumerate(bundle)))
+            self.assertTrue(all(len(tx.value_list) <= 2 for tx in txs))
+            paid: dict[str, int] = {}
+            for tx in txs:
+                paid[tx.recipient_addr] = paid.get(tx.recipient_addr, 0) + sum(value.size for value in tx.value_list)
+            self.assertEqual(paid, {recipients[0]: 32, recipients[1]: 5, recipients[2]: 40})
+            ranges = sorted((value for tx in txs for value in tx.value_list), key=lambda item: item.begin)
+            self.assertTrue(all(left.end < right.begin for left, right in zip(ranges, ranges[1:])))
+
+            submission, _ = wallet.build_bundle(
+                tx_list=plan[0],
+                private_key_pem=alice_priv,
+                public_key_pem=alice_pub,
+                chain_id=74,
+                seq=1,
+                expiry_height=10,
+                fee=0,
+                anti_spam_nonce=1,
+            )
+            self.assertEqual(submission.sidecar.tx_list, plan[0])
+
+            byte_limited = wallet.plan_payment_batch(payments[:2], tx_time=5, max_bundle_bytes=600)
+            self.assertEqual([len(bundle) for bundle in byte_limited], [1, 1])
+            with self.assertRaisesRegex(ValueError, "insufficient_balance"):
+                wallet.plan_payment_batch([(recipients[0], 1_000)])
+            wallet.close()
+
+    def test_persisting_records_updates_the_index_without_reloading(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = str(Path(tmpdir) / "wallet.sqlite3")
+            _, alice_pub = generate_secp256k1_keypair()
+            alice_addr = address_from_public_key_pem(alice_pub)
+            wallet = WalletAccountV2(address=alice_addr, genesis_block_hash=b"\x8c" * 32, db_path=db_path)
+            for begin in range(0, 1000, 10):
+                wallet.add_genesis_value(ValueRange(begin, begin + 9))
+            listed = wallet.db.list_value_records(alice_addr)[0]
+            archived = replace(listed, record_id="archived-copy", local_status=LocalValueStatus.ARCHIVED)
+            with patch.object(wallet.db, "list_value_records", side_effect=AssertionError("full reload")):
+                wallet._persist_records(wallet.records + [replace(archived, value=ValueRange(0, 500))])
+                flipped = wallet.record_index.exact(ValueRange(10, 19))[0].with_status(LocalValueStatus.PENDING_BUNDLE)
+                wallet._persist_records([flipped if record.record_id == flipped.record_id else record for record in wallet.records])
+
+            spendable = (LocalValueStatus.VERIFIED_SPENDABLE,)
+            self.assertEqual(
+                [record.value for record in wallet.record_index.overlapping(ValueRange(5, 34), spendable)],
+                [ValueRange(0, 9), ValueRange(20, 29), ValueRange(30, 39)],
+            )
+            self.assertEqual(
+                sorted((record.value for record in wallet.record_index.overlapping(ValueRange(495, 505))), key=lambda v: (v.begin, v.end)),
+                [ValueRange(0, 500), ValueRange(490, 499), ValueRange(500, 509)],
+            )
+            self.assertEqual(wallet.record_index.get(flipped.record_id).local_status, LocalValueStatus.PENDING_BUNDLE)
+            self.assertFalse(any(record.witness_loaded for record in wallet.records))
+
+            expected = wallet.db.list_value_records(alice_addr)
+            self.assertEqual(
+                [(record.record_id, record.value, record.local_status) for record in wallet.records],
+                [(record.record_id, record.value, record.local_status) for record in expected],
+            )
+            wallet.close()
+
     def test_has_genesis_value_survives_spent_subrange_split(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             db_path = str(Path(tmpdir) / "wallet.sqlite3")
@@ -316,6 +316,23 @@ class TestMerkleTree:
         # Root should be the parent of the two parent nodes
         assert tree.root == leaf0_parent.father
         assert tree.root == leaf2_parent.father
+
+    def test_lazy_proofs_verify_against_root(self):
+        """Test on-demand proofs for odd and even sizes check against the root."""
+        from EZ_Units.MerkleProof import MerkleTreeProof
+
+        for size in (1, 2, 3, 5, 6, 7, 33):
+            data = [f"leaf_{i}" for i in range(size)]
+            tree = MerkleTree(data)
+            root_hash = tree.get_root_hash()
+
+            assert tree.leaf_count == size
+            assert len(tree.prf_list) == size
+            for i in range(size):
+                proof = MerkleTreeProof(tree.get_proof(i))
+                assert proof.mt_prf_list == tree.prf_list[i]
+                assert proof.mt_prf_list[-1] == root_hash
+                assert proof.check_prf(data[i], root_hash)
         
 
 class TestMerkleTreeEdgeCases:
@@ -1,9 +1,18 @@
+import asyncio
 import copy
+import json
+import time
 
 from EZ_Tool_Box.SecureSignature import secure_signature_handler
 from modules.ez_p2p.config import P2PConfig
 from modules.ez_p2p.router import Router
-from modules.ez_p2p.security import SUPPORTED_ALGORITHM, sign_envelope, verify_envelope_signature
+from modules.ez_p2p.security import (
+    SUPPORTED_ALGORITHM,
+    EnvelopeVerifier,
+    load_identity_private_key,
+    sign_envelope,
+    verify_envelope_signature,
+)
 
 
 def _build_signed_message(private_pem: str, public_pem: str):
@@ -67,3 +76,65 @@ def test_router_enforces_signed_hello_when_enabled():
     missing_auth = copy.deepcopy(signed)
     missing_auth.pop("auth", None)
     assert router._validate_envelope(missing_auth) is False
+
+
+def test_envelope_verifier_caches_keys_and_results_per_content():
+    private_pem, public_pem = secure_signature_handler.signer.generate_key_pair()
+    msg = _build_signed_message(private_pem.decode("utf-8"), public_pem.decode("utf-8"))
+    # A key object loaded once signs exactly like the PEM form.
+    key = load_identity_private_key(private_pem)
+    resigned = sign_envelope(msg, key)
+    assert verify_envelope_signature(msg, resigned, msg["auth"]["public_key"]) is True
+
+    verifier = EnvelopeVerifier(max_results=8)
+    sig, pub = msg["auth"]["signature"], msg["auth"]["public_key"]
+    assert verifier.verify(msg, sig, pub) is True
+    assert verifier.verify(copy.deepcopy(msg), sig, pub) is True
+    assert verifier.stats["verifications"] == 1
+    assert verifier.stats["result_hits"] == 1
+
+    # Same msg_id and signature over different content is a cache miss, and fails.
+    tampered = copy.deepcopy(msg)
+    tampered["payload"]["latest_index"] = 99
+    assert verifier.verify(tampered, sig, pub) is False
+    assert verifier.stats["verifications"] == 2
+    assert verifier.stats["key_loads"] == 1
+
+
+def test_router_offloads_verification_when_inbound_is_deep():
+    private_pem, public_pem = secure_signature_handler.signer.generate_key_pair()
+    router = Router(
+        P2PConfig(
+            node_role="consensus",
+            enforce_identity_verification=True,
+            verify_offload_inflight=1,
+        )
+    )
+    received = []
+
+    async def on_hello(msg, remote_addr, writer):
+        received.append(msg["msg_id"])
+
+    router.register_handler("HELLO", on_hello)
+
+    signed = _build_signed_message(private_pem.decode("utf-8"), public_pem.decode("utf-8"))
+    signed["timestamp"] = int(time.time() * 1000)
+    signed["auth"]["signature"] = sign_envelope(signed, private_pem.decode("utf-8"))
+    tampered = copy.deepcopy(signed)
+    tampered["msg_id"] = "msg-2"
+
+    async def run_case():
+        router._inflight_frames = 1
+        assert router._should_offload_verification(signed) is False
+        # Pretend another frame is already being handled so these go to the pool.
+        router._inflight_frames = 2
+        assert router._should_offload_verification(signed) is True
+        for msg in (signed, tampered):
+            await router._on_frame(json.dumps(msg).encode("utf-8"), "127.0.0.1:1", None)
+        assert router._verify_executor is not None
+        await router.stop()
+
+    asyncio.run(run_case())
+    assert router._verify_executor is None
+    assert received == ["msg-1"]
+    assert router.get_health_status()["verify"]["verifications"] == 2
@@ -2,6 +2,7 @@ import asyncio
 import time
 
 from modules.ez_p2p.config import P2PConfig
+from modules.ez_p2p.dedup import MessageIdCache
 from modules.ez_p2p.peer_manager import PeerInfo
 from modules.ez_p2p.router import Router
 
@@ -74,3 +75,132 @@ def test_router_not_degraded_with_active_peer():
     status = router.get_health_status()
     assert status["degraded"] is False
     assert status["peer_count"] == 1
+
+
+def _add_consensus_peer(router: Router, node_id: str, address: str):
+    router.peer_manager.add_peer(
+        PeerInfo(
+            node_id=node_id,
+            role="consensus",
+            network_id="devnet",
+            latest_index=0,
+            address=address,
+        )
+    )
+
+
+def test_broadcast_fans_out_without_waiting_for_slow_peer():
+    router = Router(
+        P2PConfig(
+            node_role="consensus",
+            send_timeout_ms=2000,
+            retry_count=0,
+        )
+    )
+    _add_consensus_peer(router, "fast", "127.0.0.1:19101")
+    _add_consensus_peer(router, "slow", "127.0.0.1:19102")
+    sent = []
+
+    async def fake_send(addr: str, data: bytes):
+        if addr.endswith("19102"):
+            await asyncio.sleep(1.0)
+        sent.append((addr, data))
+
+    router.transport.send = fake_send  # type: ignore[assignment]
+
+    async def run_case():
+        started = time.monotonic()
+        result = await router.broadcastToConsensus({"x": 1}, "NEW_BLOCK", min_acks=1)
+        assert time.monotonic() - started < 0.5
+        assert result["delivered"] == ["127.0.0.1:19101"]
+        assert result["pending"] == ["127.0.0.1:19102"]
+
+        result = await router.broadcastToConsensus({"x": 2}, "NEW_BLOCK")
+        assert sorted(result["delivered"]) == ["127.0.0.1:19101", "127.0.0.1:19102"]
+        assert result["failed"] == {}
+        await router.stop()
+
+    asyncio.run(run_case())
+    # Every peer gets the same envelope for one broadcast, in order per peer.
+    slow_frames = [data for addr, data in sent if addr.endswith("19102")]
+    fast_frames = [data for addr, data in sent if addr.endswith("19101")]
+    assert slow_frames == fast_frames
+
+
+def test_broadcast_circuit_breaker_skips_failing_peer_until_cooldown():
+    router = Router(
+        P2PConfig(
+            node_role="consensus",
+            retry_count=0,
+            breaker_failure_threshold=2,
+            breaker_cooldown_sec=30.0,
+        )
+    )
+    _add_consensus_peer(router, "good", "127.0.0.1:19201")
+    _add_consensus_peer(router, "bad", "127.0.0.1:19202")
+    calls = {"bad": 0}
+
+    async def fake_send(addr: str, data: bytes):
+        if addr.endswith("19202"):
+            calls["bad"] += 1
+            raise ConnectionRefusedError("refused")
+
+    router.transport.send = fake_send  # type: ignore[assignment]
+
+    async def run_case():
+        for _ in range(2):
+            result = await router.broadcastToConsensus({"x": 1}, "NEW_BLOCK")
+            assert result["delivered"] == ["127.0.0.1:19201"]
+            assert "127.0.0.1:19202" in result["failed"]
+
+        result = await router.broadcastToConsensus({"x": 1}, "NEW_BLOCK")
+        assert result["skipped"] == ["127.0.0.1:19202"]
+        assert calls["bad"] == 2
+        assert router.get_health_status()["outbox_state"]["127.0.0.1:19202"]["breaker_open"] is True
+
+        # Past the cooldown one probe goes through; success closes the breaker.
+        router._outboxes["127.0.0.1:19202"].open_until_monotonic = time.monotonic() - 1.0
+        router.transport.send = lambda addr, data: asyncio.sleep(0)  # type: ignore[assignment]
+        result = await router.broadcastToConsensus({"x": 1}, "NEW_BLOCK")
+        assert sorted(result["delivered"]) == ["127.0.0.1:19201", "127.0.0.1:19202"]
+        assert router._outboxes["127.0.0.1:19202"].failures == 0
+        await router.stop()
+
+    asyncio.run(run_case())
+
+
+def test_message_id_cache_expires_buckets_and_caps_size():
+    cache = MessageIdCache(window_ms=10_000, max_entries=3)
+    assert cache.add("a", 1_000) is True
+    assert cache.add("a", 1_000) is False
+    cache.add("b", 2_500)
+    cache.add("c", 9_000)
+    assert len(cache) == 3
+
+    # Over the cap the id from the oldest bucket is dropped first.
+    cache.add("d", 9_500)
+    assert "a" not in cache
+    assert cache.capacity_evictions == 1
+
+    # At now=13s the window starts at 3s: the 2s bucket expires, the 9s ones stay.
+    assert cache.expire(13_000) == 1
+    assert "b" not in cache
+    assert "c" in cache and "d" in cache
+    assert cache.expire(13_000) == 0
+
+
+def test_router_counts_duplicate_and_stale_frames():
+    router = Router(P2PConfig(node_role="account", dedup_window_ms=60_000))
+    now_ms = int(time.time() * 1000)
+    msg = {"msg_id": "m-1", "timestamp": now_ms}
+
+    assert router._is_replay_or_duplicate(msg) is False
+    assert router._is_replay_or_duplicate(dict(msg)) is True
+    assert router._is_replay_or_duplicate({"msg_id": "m-2", "timestamp": now_ms - 120_000}) is True
+    assert router._is_replay_or_duplicate({"msg_id": "m-3", "timestamp": now_ms + 120_000}) is True
+
+    dedup = router.get_health_status()["dedup"]
+    assert dedup["duplicates_dropped"] == 1
+    assert dedup["stale_dropped"] == 1
+    assert dedup["future_dropped"] == 1
+    assert dedup["tracked_ids"] == 1
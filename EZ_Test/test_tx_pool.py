@@ -832,6 +832,87 @@ class TestTxPool(unittest.TestCase):
         self.assertEqual(message, "SubmitTxInfo added successfully")
 
 
+    def test_removal_keeps_keys_and_group_commit_persists(self):
+        """Test removals leave other pool keys intact and queued writes reach the database."""
+        import sqlite3
+
+        private_key2 = ec.generate_private_key(ec.SECP256R1())
+        private_key_pem2 = private_key2.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        )
+        public_key_pem2 = private_key2.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        txn = Transaction.new_transaction(
+            sender="sender_test_2", recipient=self.test_recipient, value=[self.test_value1], nonce=1
+        )
+        txn.sig_txn(private_key_pem2)
+        multi_txn2 = MultiTransactions(sender="sender_test_2", multi_txns=[txn])
+        multi_txn2.sig_acc_txn(private_key_pem2)
+        submit_tx_info2 = SubmitTxInfo.create_from_multi_transactions(multi_txn2, private_key_pem2, public_key_pem2)
+
+        self.assertTrue(self.pool.add_submit_tx_info(self.submit_tx_info, self.multi_txn)[0])
+        self.assertTrue(self.pool.add_submit_tx_info(submit_tx_info2, multi_txn2)[0])
+        key2 = self.pool.hash_index[submit_tx_info2.get_hash()]
+
+        self.assertTrue(self.pool.remove_submit_tx_info(self.submit_tx_info.get_hash()))
+        self.assertEqual(self.pool.hash_index[submit_tx_info2.get_hash()], key2)
+        self.assertIs(self.pool.pool[key2], submit_tx_info2)
+        self.assertEqual(self.pool.submitter_index, {"sender_test_2": [key2]})
+
+        self.pool.flush()
+        conn = sqlite3.connect(self.temp_db.name)
+        try:
+            rows = dict(conn.execute("SELECT submit_hash, processed FROM submit_tx_infos").fetchall())
+        finally:
+            conn.close()
+        self.assertEqual(rows, {self.submit_tx_info.get_hash(): 1, submit_tx_info2.get_hash(): 0})
+
+        reopened = TxPool(self.temp_db.name)
+        self.assertEqual([info.get_hash() for info in reopened.pool], [submit_tx_info2.get_hash()])
+
+    def test_closing_one_pool_keeps_shared_store_open(self):
+        """Test a pool closed on a shared database file does not stop the others persisting."""
+        import sqlite3
+
+        other = TxPool(self.temp_db.name)
+        other.close()
+        self.assertTrue(self.pool.add_submit_tx_info(self.submit_tx_info, self.multi_txn)[0])
+        self.pool.flush()
+        conn = sqlite3.connect(self.temp_db.name)
+        try:
+            rows = conn.execute("SELECT submit_hash FROM submit_tx_infos").fetchall()
+        finally:
+            conn.close()
+        self.assertEqual(rows, [(self.submit_tx_info.get_hash(),)])
+
+    def test_unvalidated_add_indexes_by_stable_key(self):
+        """Test entries added without validation are indexed by their pool key after removals."""
+        infos = []
+        for sender in ("sim_a", "sim_b", "sim_c"):
+            info = SubmitTxInfo.__new__(SubmitTxInfo)
+            info.multi_transactions_hash = f"multi_{sender}"
+            info.submit_timestamp = "2023-01-01T00:00:00"
+            info.version = SubmitTxInfo.VERSION
+            info.submitter_address = sender
+            info.signature = b"sig"
+            info.public_key = b"pub"
+            info._hash = None
+            infos.append(info)
+
+        self.pool.add_unvalidated_submit_tx_info(infos[0])
+        self.pool.add_unvalidated_submit_tx_info(infos[1])
+        self.assertTrue(self.pool.remove_submit_tx_info(infos[0].get_hash()))
+        key = self.pool.add_unvalidated_submit_tx_info(infos[2])
+
+        self.assertIs(self.pool.pool[key], infos[2])
+        self.assertIs(self.pool.get_submit_tx_info(infos[2].get_hash()), infos[2])
+        self.assertIs(self.pool.get_submit_tx_info(infos[1].get_hash()), infos[1])
+        self.assertEqual(self.pool.get_submit_tx_infos_by_submitter("sim_c"), [infos[2]])
+
 if __name__ == '__main__':
     # 设置更详细的日志输出
     
@@ -444,6 +444,48 @@ class TestValueErrorHandling:
         with pytest.raises(TypeError):
             Value("0x1000", 100, "invalid_state")  # state should be ValueState
 
+class TestValueIntegerBounds:
+    """Test suite for cached integer bounds behind the hex string API."""
+
+    def test_from_decimal_matches_hex_constructor(self):
+        """Test from_decimal builds the same value as the hex constructor."""
+        value = Value.from_decimal(0x1000, 100, ValueState.PENDING)
+        assert value.is_same_value(Value("0x1000", 100))
+        assert value.state == ValueState.PENDING
+        with pytest.raises(ValueError):
+            Value.from_decimal(-1, 10)
+
+    def test_assigning_hex_refreshes_bounds(self):
+        """Test that assigning begin_index/end_index invalidates the cached integers."""
+        value = Value("0x1000", 100)
+        value.begin_index = "0x2000"
+        value.end_index = "0x2063"
+        assert value.get_decimal_begin_index() == 0x2000
+        assert value.is_intersect_value(Value("0x2063", 1))
+        assert not value.is_intersect_value(Value("0x1000", 1))
+
+    def test_pickle_round_trip_and_legacy_state(self):
+        """Test pickling keeps the pre-__slots__ state layout in both directions."""
+        import pickle
+
+        value = Value("0xABC", 10, ValueState.VERIFIED, verified_timestamp=12.5)
+        restored = pickle.loads(pickle.dumps(value))
+        assert restored.is_same_value(value)
+        assert restored.verified_timestamp == 12.5
+        assert value.__getstate__() == {
+            "begin_index": "0xABC",
+            "end_index": "0xac5",
+            "value_num": 10,
+            "state": ValueState.VERIFIED,
+            "verified_timestamp": 12.5,
+        }
+
+        legacy = Value.__new__(Value)
+        legacy.__setstate__({"begin_index": "0x10", "end_index": "0x19", "value_num": 10, "state": ValueState.UNSPENT})
+        assert legacy.get_decimal_end_index() == 0x19
+        assert legacy.verified_timestamp is None
+
+
 def main():
     """Simple entry function to run tests."""
     print("Running Test_value tests...")
@@ -1,3 +1,9 @@
-from EZ_V1.EZ_Units.Bloom import BloomFilter, BloomFilterEncoder, bloom_decoder
+from EZ_V1.EZ_Units.Bloom import (
+    DOUBLE_HASH_SCHEME,
+    LEGACY_HASH_SCHEME,
+    BloomFilter,
+    BloomFilterEncoder,
+    bloom_decoder,
+)
 
-__all__ = ["BloomFilter", "BloomFilterEncoder", "bloom_decoder"]
+__all__ = ["BloomFilter", "BloomFilterEncoder", "bloom_decoder", "DOUBLE_HASH_SCHEME", "LEGACY_HASH_SCHEME"]
@@ -24,6 +24,7 @@ Checkpoint生成、触发、更新等均需对外提供接口。
 import sqlite3
 import json
 import threading
+from bisect import bisect_right
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass
@@ -34,6 +35,17 @@ sys.path.insert(0, os.path.dirname(__file__) + '/..')
 
 from EZ_VPB.values.Value import Value
 
+# Value indices are arbitrary-size hex; range columns hold them as fixed-width
+# big-endian blobs so SQLite's memcmp ordering equals numeric ordering.
+RANGE_KEY_BYTES = 32
+
+
+def _range_key(index: int) -> Optional[bytes]:
+    """Sortable key for a decimal Value index, or None if it does not fit in RANGE_KEY_BYTES."""
+    if index < 0 or index.bit_length() > RANGE_KEY_BYTES * 8:
+        return None
+    return index.to_bytes(RANGE_KEY_BYTES, "big")
+
 
 @dataclass
 class CheckPointRecord:
@@ -93,12 +105,59 @@ class CheckPointRecord:
         )
 
 
+class CheckPointIntervalIndex:
+    """
+    检查点区间的内存有序索引
+
+    按begin排序，并维护end的前缀最大值：从最后一个begin<=查询begin的位置向前扫描，
+    一旦前缀最大end小于查询end即可停止，不相交或浅嵌套的检查点只需O(log n)。
+    """
+
+    def __init__(self, generation: int, rows: List[Tuple[int, int, int, CheckPointRecord]]):
+        # rows: (begin, end, row_id, record)
+        rows = sorted(rows, key=lambda row: (row[0], row[2]))
+        self.generation = generation
+        self._begins = [row[0] for row in rows]
+        self._ends = [row[1] for row in rows]
+        self._row_ids = [row[2] for row in rows]
+        self._records = [row[3] for row in rows]
+        self._max_end_prefix = []
+        running_max = -1
+        for end in self._ends:
+            running_max = max(running_max, end)
+            self._max_end_prefix.append(running_max)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def find_containing(self, begin: int, end: int) -> Optional[CheckPointRecord]:
+        """返回包含[begin, end]的区块高度最高的检查点（同高度取最早插入的）"""
+        best_index = None
+        position = bisect_right(self._begins, begin) - 1
+        while position >= 0 and self._max_end_prefix[position] >= end:
+            if self._ends[position] >= end:
+                if best_index is None or self._better(position, best_index):
+                    best_index = position
+            position -= 1
+        return self._records[best_index] if best_index is not None else None
+
+    def _better(self, candidate: int, current: int) -> bool:
+        candidate_height = self._records[candidate].block_height
+        current_height = self._records[current].block_height
+        if candidate_height != current_height:
+            return candidate_height > current_height
+        return self._row_ids[candidate] < self._row_ids[current]
+
+
 class CheckPointStorage:
     """检查点永久存储管理器，使用SQLite提供持久化存储"""
 
-    def __init__(self, db_path: str = "ez_checkpoint_storage.db"):
+    def __init__(self, db_path: str = "ez_checkpoint_storage.db", use_interval_cache: bool = True):
         self.db_path = db_path
         self._lock = threading.RLock()
+        # 包含查询的内存区间索引；checkpoint_meta.generation变化（任意连接写入）时失效
+        self.use_interval_cache = use_interval_cache
+        self._interval_index: Optional[CheckPointIntervalIndex] = None
         self._init_database()
 
     def _init_database(self):
@@ -134,6 +193,44 @@ class CheckPointStorage:
                     ON checkpoints(block_height)
                 """)
 
+                # 区间列：旧库补列并回填
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(checkpoints)")}
+                if "begin_key" not in columns:
+                    conn.execute("ALTER TABLE checkpoints ADD COLUMN begin_key BLOB")
+                if "end_key" not in columns:
+                    conn.execute("ALTER TABLE checkpoints ADD COLUMN end_key BLOB")
+                missing = conn.execute("""
+                    SELECT id, value_begin_index, value_num FROM checkpoints WHERE begin_key IS NULL
+                """).fetchall()
+                for row_id, value_begin_index, value_num in missing:
+                    begin = int(value_begin_index, 16)
+                    conn.execute(
+                        "UPDATE checkpoints SET begin_key = ?, end_key = ? WHERE id = ?",
+                        (_range_key(begin), _range_key(begin + value_num - 1), row_id),
+                    )
+
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_checkpoints_range
+                    ON checkpoints(begin_key, end_key)
+                """)
+
+                # 写入计数：任何连接修改checkpoints都会递增，用于判断内存区间索引是否过期
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS checkpoint_meta (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        generation INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("INSERT OR IGNORE INTO checkpoint_meta (id, generation) VALUES (1, 0)")
+                for event in ("INSERT", "UPDATE", "DELETE"):
+                    conn.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS trg_checkpoints_generation_{event.lower()}
+                        AFTER {event} ON checkpoints
+                        BEGIN
+                            UPDATE checkpoint_meta SET generation = generation + 1 WHERE id = 1;
+                        END
+                    """)
+
                 conn.commit()
 
     def store_checkpoint(self, checkpoint: CheckPointRecord) -> bool:
@@ -166,17 +263,21 @@ class CheckPointStorage:
 
                     # 如果更新了0行，说明记录不存在，执行INSERT
                     if cursor.rowcount == 0:
+                        begin = int(checkpoint.value_begin_index, 16)
                         conn.execute("""
                             INSERT INTO checkpoints
-                            (value_begin_index, value_num, owner_address, block_height, created_at, updated_at)
-                            VALUES (?, ?, ?, ?, ?, ?)
+                            (value_begin_index, value_num, owner_address, block_height, created_at, updated_at,
+                             begin_key, end_key)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                         """, (
                             checkpoint.value_begin_index,
                             checkpoint.value_num,
                             checkpoint.owner_address,
                             checkpoint.block_height,
                             checkpoint.created_at,
-                            checkpoint.updated_at
+                            checkpoint.updated_at,
+                            _range_key(begin),
+                            _range_key(begin + checkpoint.value_num - 1)
                         ))
 
                     conn.commit()
@@ -282,6 +383,8 @@ class CheckPointStorage:
         """
         查找包含给定Value的检查点记录
 
+        多个检查点都包含该Value时，返回区块高度最高的一个。
+
         Args:
             value: Value对象（可能是拆分后的子Value）
 
@@ -295,32 +398,76 @@ class CheckPointStorage:
                     input_begin = int(value.begin_index, 16)
                     input_end = int(value.end_index, 16)
 
-                    # 查找所有可能的包含检查点
-                    cursor = conn.execute("""
-                        SELECT value_begin_index, value_num, owner_address, block_height, created_at, updated_at
-                        FROM checkpoints
-                        ORDER BY block_height DESC
-                    """)
-
-                    for row in cursor.fetchall():
-                        checkpoint = CheckPointRecord(
-                            value_begin_index=row[0],
-                            value_num=row[1],
-                            owner_address=row[2],
-                            block_height=row[3],
-                            created_at=datetime.fromisoformat(row[4]),
-                            updated_at=datetime.fromisoformat(row[5])
-                        )
-
-                        # 检查是否包含输入Value
-                        if checkpoint.contains_value(value):
-                            return checkpoint
-
-                    return None
+                    if self.use_interval_cache:
+                        return self._load_interval_index(conn).find_containing(input_begin, input_end)
+                    return self._query_containing(conn, input_begin, input_end)
         except Exception as e:
             print(f"查找包含检查点失败: {e}")
             return None
 
+    def invalidate_interval_cache(self):
+        """丢弃内存区间索引，下次包含查询时重建"""
+        with self._lock:
+            self._interval_index = None
+
+    @staticmethod
+    def _row_to_record(row) -> CheckPointRecord:
+        return CheckPointRecord(
+            value_begin_index=row[0],
+            value_num=row[1],
+            owner_address=row[2],
+            block_height=row[3],
+            created_at=datetime.fromisoformat(row[4]),
+            updated_at=datetime.fromisoformat(row[5])
+        )
+
+    def _load_interval_index(self, conn: sqlite3.Connection) -> CheckPointIntervalIndex:
+        """返回与数据库当前generation一致的区间索引，过期时重建"""
+        generation = conn.execute("SELECT generation FROM checkpoint_meta WHERE id = 1").fetchone()[0]
+        if self._interval_index is not None and self._interval_index.generation == generation:
+            return self._interval_index
+
+        cursor = conn.execute("""
+            SELECT value_begin_index, value_num, owner_address, block_height, created_at, updated_at, id
+            FROM checkpoints
+        """)
+        rows = []
+        for row in cursor.fetchall():
+            begin = int(row[0], 16)
+            rows.append((begin, begin + row[1] - 1, row[6], self._row_to_record(row)))
+        self._interval_index = CheckPointIntervalIndex(generation, rows)
+        return self._interval_index
+
+    def _query_containing(self, conn: sqlite3.Connection, input_begin: int, input_end: int) -> Optional[CheckPointRecord]:
+        """不使用内存索引时，直接在SQLite中按区间列查询"""
+        columns = "value_begin_index, value_num, owner_address, block_height, created_at, updated_at, id"
+        candidates = []
+        begin_key = _range_key(input_begin)
+        end_key = _range_key(input_end)
+        if begin_key is not None and end_key is not None:
+            row = conn.execute(f"""
+                SELECT {columns}
+                FROM checkpoints INDEXED BY idx_checkpoints_range
+                WHERE begin_key <= ? AND end_key >= ?
+                ORDER BY block_height DESC, id ASC
+                LIMIT 1
+            """, (begin_key, end_key)).fetchone()
+            if row:
+                candidates.append(row)
+
+        # 超出RANGE_KEY_BYTES的Value没有区间列，逐条比较
+        for row in conn.execute(f"""
+            SELECT {columns} FROM checkpoints WHERE begin_key IS NULL OR end_key IS NULL
+        """).fetchall():
+            begin = int(row[0], 16)
+            if begin <= input_begin and input_end <= begin + row[1] - 1:
+                candidates.append(row)
+
+        if not candidates:
+            return None
+        best = min(candidates, key=lambda row: (-row[3], row[6]))
+        return self._row_to_record(best)
+
 
 class CheckPoint:
     """
@@ -141,6 +141,10 @@ class Block:
         """Add an item to the block's Bloom filter."""
         self.bloom.add(item)
 
+    def add_items_to_bloom(self, items):
+        """Add several items to the block's Bloom filter in one batch."""
+        self.bloom.add_many(items)
+
     def is_in_bloom(self, item):
         """Check if an item is in the block's Bloom filter."""
         return item in self.bloom
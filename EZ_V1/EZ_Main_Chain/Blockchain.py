@@ -53,6 +53,43 @@ class ChainConfig:
     max_backups: int = 10  # Maximum number of backup files to keep
     compression_enabled: bool = False  # Enable data compression
     integrity_check: bool = True  # Enable data integrity checks
+    metadata_snapshot_interval: int = 100  # Rewrite the metadata snapshot every N appended blocks
+
+
+class ForkTreeIndex:
+    """
+    Lookup tables shared by every node of one fork tree.
+
+    Nodes are registered when they are attached with ForkNode.add_child, so
+    hash and height lookups never walk the tree. The deepest node (first
+    block to reach the greatest height) is tracked on insertion and serves
+    longest-path queries.
+    """
+
+    def __init__(self):
+        self.by_hash: Dict[str, 'ForkNode'] = {}
+        self.by_height: Dict[int, List['ForkNode']] = {}
+        self.deepest: Optional['ForkNode'] = None
+
+    def __len__(self) -> int:
+        return len(self.by_hash)
+
+    def register(self, node: 'ForkNode') -> None:
+        """Add a node to the index."""
+        self.by_hash[node.block_hash] = node
+        self.by_height.setdefault(node.height, []).append(node)
+        if self.deepest is None or node.height > self.deepest.height:
+            self.deepest = node
+
+    def absorb(self, other: 'ForkTreeIndex') -> None:
+        """Move every node of another tree's index into this one."""
+        for node in other.by_hash.values():
+            self.register(node)
+            node._tree_index = self
+
+    def nodes_at_height(self, height: int) -> List['ForkNode']:
+        """Nodes at a height, in the order they joined the tree."""
+        return self.by_height.get(height, [])
 
 
 class ForkNode:
@@ -60,22 +97,51 @@ class ForkNode:
     Represents a node in the fork tree structure.
 
     Each ForkNode contains a block and references to its parent and children,
-    enabling efficient fork traversal and resolution.
+    enabling efficient fork traversal and resolution. Nodes joined through
+    add_child share a ForkTreeIndex for hash and height lookups.
     """
 
     def __init__(self, block: Block, parent: Optional['ForkNode'] = None):
         self.block = block
+        self.block_hash = block.get_hash()
         self.parent = parent
         self.children: List['ForkNode'] = []
         self.is_main_chain = False  # Flag indicating if this node is part of main chain
         self.height = block.get_index()
         self.consensus_status = ConsensusStatus.PENDING
+        self._tree_index: Optional[ForkTreeIndex] = None
+
+    @property
+    def tree_index(self) -> ForkTreeIndex:
+        """Index of the tree this node belongs to, created on first use for a detached node."""
+        if self._tree_index is None:
+            self._tree_index = ForkTreeIndex()
+            self._tree_index.register(self)
+        return self._tree_index
 
     def add_child(self, child: 'ForkNode') -> None:
         """Add a child fork node."""
         self.children.append(child)
         child.parent = self
 
+        # Merge the smaller index into the larger one so rebuilding a tree
+        # from nodes attached in arbitrary order stays O(n log n).
+        own_index = self.tree_index
+        child_index = child.tree_index
+        if own_index is child_index:
+            return
+        if len(own_index) >= len(child_index):
+            own_index.absorb(child_index)
+        else:
+            child_index.absorb(own_index)
+
+    def is_ancestor_of(self, node: 'ForkNode') -> bool:
+        """Whether node lies in this node's subtree (a node is its own ancestor)."""
+        current = node
+        while current is not None and current.height > self.height:
+            current = current.parent
+        return current is self
+
     def get_chain_path(self) -> List[Block]:
         """Get the chain path from genesis to this node."""
         path = []
@@ -87,38 +153,42 @@ class ForkNode:
 
     def find_by_hash(self, block_hash: str) -> Optional['ForkNode']:
         """Find a fork node by block hash in this subtree."""
-        if self.block.get_hash() == block_hash:
-            return self
-
-        for child in self.children:
-            result = child.find_by_hash(block_hash)
-            if result:
-                return result
+        node = self.tree_index.by_hash.get(block_hash)
+        if node is not None and (self.parent is None or self.is_ancestor_of(node)):
+            return node
         return None
 
     def find_by_index(self, index: int) -> Optional['ForkNode']:
         """Find a fork node by block index in this subtree."""
-        if self.block.get_index() == index:
-            return self
-
-        for child in self.children:
-            result = child.find_by_index(index)
-            if result:
-                return result
+        for node in self.tree_index.nodes_at_height(index):
+            if self.parent is None or self.is_ancestor_of(node):
+                return node
         return None
 
     def get_longest_path(self) -> List['ForkNode']:
         """Get the longest path from this node to any leaf."""
-        if not self.children:
-            return [self]
+        deepest = self.tree_index.deepest
+        if deepest is None or not self.is_ancestor_of(deepest):
+            # The tree's deepest block is elsewhere; side branches are short, so search them directly.
+            deepest = self._find_deepest_descendant()
 
-        longest_child_path = []
-        for child in self.children:
-            child_path = child.get_longest_path()
-            if len(child_path) > len(longest_child_path):
-                longest_child_path = child_path
+        path = []
+        current = deepest
+        while current is not self:
+            path.append(current)
+            current = current.parent
+        path.append(self)
+        return list(reversed(path))
 
-        return [self] + longest_child_path
+    def _find_deepest_descendant(self) -> 'ForkNode':
+        deepest = self
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.height > deepest.height:
+                deepest = node
+            stack.extend(reversed(node.children))
+        return deepest
 
     def __str__(self) -> str:
         return f"ForkNode(Block#{self.block.get_index()}, Hash:{self.block.get_hash()[:8]}...)"
@@ -163,9 +233,19 @@ class Blockchain:
         self.hash_to_fork_node: Dict[str, ForkNode] = {}
         self.index_to_fork_node: Dict[int, ForkNode] = {}
 
+        # Fork nodes not yet appended to the block log, parents before children
+        self._unsaved_nodes: List[ForkNode] = []
+        # Set until the block log is known to match memory; the next save rewrites it
+        self._log_needs_rewrite = True
+        self._appended_since_snapshot = 0
+
         # Consensus tracking
         self.confirmed_blocks: Set[str] = set()
         self.orphaned_blocks: Set[str] = set()
+        # Highest heights already swept by _update_consensus_status; both
+        # thresholds only grow with the main chain tip.
+        self._confirmed_sweep_height = -1
+        self._orphan_sweep_height = -1
 
         # Try to load existing data or initialize with genesis block
         if not self._load_from_storage():
@@ -182,9 +262,13 @@ class Blockchain:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
 
-        # File paths
-        self.chain_file = self.data_dir / "blockchain_data.json"
+        # File paths: an append-only block log (one JSON record per fork node)
+        # plus a small metadata snapshot refreshed every few appends
+        self.chain_file = self.data_dir / "blockchain_blocks.jsonl"
         self.metadata_file = self.data_dir / "blockchain_metadata.json"
+
+        # Full snapshots written by earlier versions; still read when no block log exists
+        self.legacy_chain_file = self.data_dir / "blockchain_data.json"
         self.chain_file_pkl = self.data_dir / "blockchain_data.pkl"
         self.metadata_file_pkl = self.data_dir / "blockchain_metadata.pkl"
 
@@ -314,6 +398,7 @@ class Blockchain:
         # Update caches
         self.hash_to_fork_node[genesis_block.get_hash()] = genesis_node
         self.index_to_fork_node[0] = genesis_node
+        self._unsaved_nodes.append(genesis_node)
 
         self.confirmed_blocks.add(genesis_block.get_hash())
 
@@ -362,6 +447,7 @@ class Blockchain:
         # Update caches
         self.hash_to_fork_node[genesis_block.get_hash()] = genesis_node
         self.index_to_fork_node[0] = genesis_node
+        self._unsaved_nodes.append(genesis_node)
 
         # Mark as confirmed
         self.confirmed_blocks.add(genesis_block.get_hash())
@@ -417,16 +503,10 @@ class Blockchain:
         Returns:
             The block if found, None otherwise.
         """
-        # First search in main chain (most common case)
-        for block in self.main_chain:
-            if block.get_hash() == block_hash:
-                return block
-
-        # Search in fork tree
-        if self.fork_tree_root:
-            fork_node = self.fork_tree_root.find_by_hash(block_hash)
-            if fork_node:
-                return fork_node.block
+        # Every main chain and fork block is registered in the hash index
+        fork_node = self.hash_to_fork_node.get(block_hash)
+        if fork_node:
+            return fork_node.block
 
         return None
 
@@ -464,10 +544,16 @@ class Blockchain:
         Returns:
             True if the block is in the main chain, False otherwise.
         """
-        for block in self.main_chain:
-            if block.get_hash() == block_hash:
-                return True
-        return False
+        fork_node = self.hash_to_fork_node.get(block_hash)
+        if fork_node is None:
+            return False
+        return self._main_chain_hash_at(fork_node.height) == block_hash
+
+    def _main_chain_hash_at(self, height: int) -> Optional[str]:
+        """Hash of the main chain block at a height, or None past the tip."""
+        if not 0 <= height < len(self.main_chain):
+            return None
+        return self.main_chain[height].get_hash()
 
     def is_block_confirmed(self, block_hash: str) -> bool:
         """
@@ -548,6 +634,7 @@ class Blockchain:
         # Update caches
         self.hash_to_fork_node[block.get_hash()] = fork_node
         self.index_to_fork_node[block.get_index()] = fork_node
+        self._unsaved_nodes.append(fork_node)
 
         return fork_node
 
@@ -558,31 +645,27 @@ class Blockchain:
         Args:
             new_tip: The new fork node to set as main chain tip.
         """
-        # Get the new main chain path
-        new_chain = new_tip.get_chain_path()
+        # Walk back from the new tip to the fork point instead of rebuilding
+        # the whole path from genesis; only the switched branch is touched.
+        new_branch = []
+        current = new_tip
+        while current is not None and self._main_chain_hash_at(current.height) != current.block_hash:
+            new_branch.append(current)
+            current = current.parent
+        fork_height = current.height if current is not None else -1
 
-        # Find the common ancestor
-        common_ancestor_index = 0
-        for i, (old_block, new_block) in enumerate(zip(self.main_chain, new_chain)):
-            if old_block.get_hash() == new_block.get_hash():
-                common_ancestor_index = i
-            else:
-                break
+        # Blocks of the old branch above the fork point leave the main chain
+        for old_block in self.main_chain[fork_height + 1:]:
+            old_node = self.hash_to_fork_node.get(old_block.get_hash())
+            if old_node:
+                old_node.is_main_chain = False
 
-        # Update main chain
-        self.main_chain = new_chain
+        new_branch.reverse()
+        for fork_node in new_branch:
+            fork_node.is_main_chain = True
 
-        # Update main chain flags
-        current = new_tip
-        while current and current.block.get_index() > common_ancestor_index:
-            current.is_main_chain = True
-            # Mark old chain nodes as no longer main chain
-            old_hash = self.main_chain[current.block.get_index()].get_hash() if current.block.get_index() < len(self.main_chain) else None
-            if old_hash and old_hash != current.block.get_hash():
-                old_node = self.hash_to_fork_node.get(old_hash)
-                if old_node:
-                    old_node.is_main_chain = False
-            current = current.parent
+        # Update main chain
+        self.main_chain = self.main_chain[:fork_height + 1] + [fork_node.block for fork_node in new_branch]
 
         self.main_chain_tip = new_tip
         self.logger.info(f"Updated main chain to new tip: Block#{new_tip.block.get_index()}")
@@ -699,7 +782,7 @@ class Blockchain:
                 main_chain_updated = self._process_fork_resolution(new_fork_node)
 
         # Update consensus status
-        self._update_consensus_status()
+        self._update_consensus_status(new_fork_node)
 
         # Auto save if enabled
         if self.config.auto_save:
@@ -726,25 +809,49 @@ class Blockchain:
         parent_hash = block.get_pre_hash()
         return self.hash_to_fork_node.get(parent_hash)
 
-    def _update_consensus_status(self) -> None:
-        """Update consensus status for blocks based on confirmation rules."""
+    def _update_consensus_status(self, new_fork_node: Optional[ForkNode] = None) -> None:
+        """
+        Update consensus status for blocks based on confirmation rules.
+
+        Both thresholds only move up with the main chain tip, so each call
+        sweeps just the heights that crossed them since the previous call,
+        plus the newly added node (which may sit below an old threshold).
+        """
         confirmed_index = self.get_latest_confirmed_block_index()
-        if confirmed_index is None:
+        if confirmed_index is None or self.fork_tree_root is None:
             return
+        tree_index = self.fork_tree_root.tree_index
 
         # Mark blocks up to confirmed index as confirmed
-        for fork_node in self.hash_to_fork_node.values():
-            if fork_node.block.get_index() <= confirmed_index:
-                if fork_node.consensus_status != ConsensusStatus.CONFIRMED:
-                    fork_node.consensus_status = ConsensusStatus.CONFIRMED
-                    self.confirmed_blocks.add(fork_node.block.get_hash())
-
-            # Mark orphaned blocks (blocks that are too far from main chain)
-            elif (self.main_chain_tip and
-                  fork_node.block.get_index() < self.main_chain_tip.height - self.config.max_fork_height):
-                if fork_node.consensus_status != ConsensusStatus.ORPHANED:
-                    fork_node.consensus_status = ConsensusStatus.ORPHANED
-                    self.orphaned_blocks.add(fork_node.block.get_hash())
+        for height in range(self._confirmed_sweep_height + 1, confirmed_index + 1):
+            for fork_node in tree_index.nodes_at_height(height):
+                self._mark_confirmed(fork_node)
+        self._confirmed_sweep_height = max(self._confirmed_sweep_height, confirmed_index)
+
+        # Mark orphaned blocks (blocks that are too far from main chain)
+        orphan_limit = None
+        if self.main_chain_tip:
+            orphan_limit = self.main_chain_tip.height - self.config.max_fork_height
+            for height in range(max(self._orphan_sweep_height, confirmed_index) + 1, orphan_limit):
+                for fork_node in tree_index.nodes_at_height(height):
+                    self._mark_orphaned(fork_node)
+            self._orphan_sweep_height = max(self._orphan_sweep_height, orphan_limit - 1)
+
+        if new_fork_node is not None:
+            if new_fork_node.height <= confirmed_index:
+                self._mark_confirmed(new_fork_node)
+            elif orphan_limit is not None and new_fork_node.height < orphan_limit:
+                self._mark_orphaned(new_fork_node)
+
+    def _mark_confirmed(self, fork_node: ForkNode) -> None:
+        if fork_node.consensus_status != ConsensusStatus.CONFIRMED:
+            fork_node.consensus_status = ConsensusStatus.CONFIRMED
+            self.confirmed_blocks.add(fork_node.block_hash)
+
+    def _mark_orphaned(self, fork_node: ForkNode) -> None:
+        if fork_node.consensus_status != ConsensusStatus.ORPHANED:
+            fork_node.consensus_status = ConsensusStatus.ORPHANED
+            self.orphaned_blocks.add(fork_node.block_hash)
 
     def get_all_forks_at_height(self, height: int) -> List[ForkNode]:
         """
@@ -756,7 +863,9 @@ class Blockchain:
         Returns:
             List of fork nodes at the specified height.
         """
-        return [node for node in self.hash_to_fork_node.values() if node.height == height]
+        if self.fork_tree_root is None:
+            return []
+        return list(self.fork_tree_root.tree_index.nodes_at_height(height))
 
     def get_main_chain_blocks(self) -> List[Block]:
         """Get all blocks in the main chain."""
@@ -908,14 +1017,110 @@ class Blockchain:
 
     def save_to_storage(self, backup: bool = False) -> bool:
         """
-        Save the entire blockchain state to persistent storage.
+        Save the blockchain state to persistent storage.
+
+        Fork nodes added since the last save are appended to the block log,
+        one record each, so saving after a new block writes only that block.
+        The metadata snapshot is refreshed every metadata_snapshot_interval
+        appended blocks.
 
         Args:
-            backup: If True, create a backup instead of main save
+            backup: If True, write a full snapshot to the backup directory instead
 
         Returns:
             True if save was successful, False otherwise
         """
+        if backup:
+            return self._save_backup_snapshot()
+
+        with self._lock:
+            try:
+                rewrite = self._log_needs_rewrite
+                if rewrite:
+                    # Cleared first: a node added meanwhile is written again by
+                    # the next save, and replay skips the duplicate record
+                    self._unsaved_nodes = []
+                    nodes = self._nodes_in_replay_order()
+                    # Built beside the log and swapped in, so a crash mid-rewrite
+                    # never leaves a valid-looking prefix of a shorter chain
+                    temp_file = self.chain_file.with_name(self.chain_file.name + ".tmp")
+                    with open(temp_file, 'w', encoding='utf-8') as f:
+                        for fork_node in nodes:
+                            f.write(self._encode_block_record(fork_node) + "\n")
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temp_file, self.chain_file)
+                else:
+                    # Nodes appended while this save runs land in either list and are kept
+                    nodes = self._unsaved_nodes
+                    self._unsaved_nodes = []
+                    with open(self.chain_file, 'a', encoding='utf-8') as f:
+                        for fork_node in nodes:
+                            f.write(self._encode_block_record(fork_node) + "\n")
+
+                self._log_needs_rewrite = False
+                self._appended_since_snapshot += len(nodes)
+                if (rewrite or not self.metadata_file.exists() or
+                        self._appended_since_snapshot >= self.config.metadata_snapshot_interval):
+                    self._write_metadata_snapshot()
+
+                self.logger.info(f"Blockchain saved to {self.chain_file} ({len(nodes)} new block records)")
+                return True
+
+            except Exception as e:
+                # A partial append cannot be trusted; rewrite the whole log on the next save
+                self._log_needs_rewrite = True
+                temp_file = self.chain_file.with_name(self.chain_file.name + ".tmp")
+                if temp_file.exists():
+                    temp_file.unlink()
+                self.logger.error(f"Failed to save blockchain: {str(e)}")
+                return False
+
+    def _nodes_in_replay_order(self) -> List[ForkNode]:
+        """
+        All fork nodes ordered so replaying them rebuilds the current state.
+
+        Parents come before children (ascending height), and at each height the
+        main chain node comes first, so replay picks the same tip among equally
+        long branches.
+        """
+        main_chain_nodes = set()
+        current = self.main_chain_tip
+        while current is not None:
+            main_chain_nodes.add(id(current))
+            current = current.parent
+        return sorted(self.hash_to_fork_node.values(),
+                      key=lambda node: (node.height, id(node) not in main_chain_nodes))
+
+    def _encode_block_record(self, fork_node: ForkNode) -> str:
+        """Serialize one fork node as a single-line block log record."""
+        record = {
+            "hash": fork_node.block_hash,
+            "parent_hash": fork_node.parent.block_hash if fork_node.parent else None,
+            "block": self._serialize_block(fork_node.block),
+        }
+        record["checksum"] = self._calculate_data_checksum(record)
+        return json.dumps(record, sort_keys=True, default=str)
+
+    def _write_metadata_snapshot(self) -> None:
+        """Atomically replace the metadata snapshot."""
+        metadata = {
+            "version": "2.0",
+            "saved_at": datetime.datetime.now().isoformat(),
+            "chain_length": len(self.main_chain),
+            "latest_block_hash": self.main_chain_tip.block_hash if self.main_chain_tip else None,
+            "block_records": len(self.hash_to_fork_node),
+            "block_log_bytes": self.chain_file.stat().st_size if self.chain_file.exists() else 0,
+            "fork_statistics": self.get_fork_statistics() if self.main_chain else {}
+        }
+        temp_file = self.metadata_file.with_name(self.metadata_file.name + ".tmp")
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, default=str)
+        os.replace(temp_file, self.metadata_file)
+        self._appended_since_snapshot = 0
+
+    def _save_backup_snapshot(self) -> bool:
+        """Write a full, self-contained snapshot of the blockchain to the backup directory."""
         with self._lock:
             try:
                 # Prepare blockchain data
@@ -946,18 +1151,11 @@ class Blockchain:
                     "fork_statistics": self.get_fork_statistics()
                 }
 
-                # Choose file paths based on backup flag
-                if backup:
-                    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                    chain_file = self.backup_dir / f"blockchain_backup_{timestamp}.json"
-                    metadata_file = self.backup_dir / f"metadata_backup_{timestamp}.json"
-                    chain_file_pkl = self.backup_dir / f"blockchain_backup_{timestamp}.pkl"
-                    metadata_file_pkl = self.backup_dir / f"metadata_backup_{timestamp}.pkl"
-                else:
-                    chain_file = self.chain_file
-                    metadata_file = self.metadata_file
-                    chain_file_pkl = self.chain_file_pkl
-                    metadata_file_pkl = self.metadata_file_pkl
+                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                chain_file = self.backup_dir / f"blockchain_backup_{timestamp}.json"
+                metadata_file = self.backup_dir / f"metadata_backup_{timestamp}.json"
+                chain_file_pkl = self.backup_dir / f"blockchain_backup_{timestamp}.pkl"
+                metadata_file_pkl = self.backup_dir / f"metadata_backup_{timestamp}.pkl"
 
                 # Save as JSON (human readable)
                 with open(chain_file, 'w', encoding='utf-8') as f:
@@ -973,7 +1171,7 @@ class Blockchain:
                 with open(metadata_file_pkl, 'wb') as f:
                     pickle.dump(metadata, f)
 
-                self.logger.info(f"Blockchain saved to {chain_file}")
+                self.logger.info(f"Blockchain backup saved to {chain_file}")
                 return True
 
             except Exception as e:
@@ -984,76 +1182,180 @@ class Blockchain:
         """
         Load blockchain state from persistent storage.
 
+        The block log is preferred; full snapshots written by earlier versions
+        are read when no log exists and are converted on the next save.
+
         Returns:
             True if load was successful, False otherwise
         """
         with self._lock:
-            try:
-                # Try pickle first (faster), fall back to JSON
-                if self.chain_file_pkl.exists() and self.metadata_file_pkl.exists():
-                    try:
-                        with open(self.chain_file_pkl, 'rb') as f:
-                            blockchain_data = pickle.load(f)
-                        with open(self.metadata_file_pkl, 'rb') as f:
-                            metadata = pickle.load(f)
-                        self.logger.info("Loaded blockchain from pickle files")
-                    except Exception:
-                        # Fall back to JSON
-                        with open(self.chain_file, 'r', encoding='utf-8') as f:
-                            blockchain_data = json.load(f)
-                        with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                        self.logger.info("Loaded blockchain from JSON files")
-
-                elif self.chain_file.exists() and self.metadata_file.exists():
-                    with open(self.chain_file, 'r', encoding='utf-8') as f:
+            if self.chain_file.exists():
+                loaded = self._load_block_log()
+            else:
+                loaded = self._load_legacy_snapshot()
+            if not loaded:
+                self._reset_chain_state()
+            return loaded
+
+    def _reset_chain_state(self) -> None:
+        """Drop any partially loaded state before starting fresh."""
+        self.main_chain = []
+        self.fork_tree_root = None
+        self.main_chain_tip = None
+        self.hash_to_fork_node = {}
+        self.index_to_fork_node = {}
+        self.confirmed_blocks = set()
+        self.orphaned_blocks = set()
+        self._confirmed_sweep_height = -1
+        self._orphan_sweep_height = -1
+        self._unsaved_nodes = []
+        self._log_needs_rewrite = True
+
+    def _load_block_log(self) -> bool:
+        """
+        Stream the block log and replay each record into the fork tree.
+
+        Main chain, tip and consensus status are derived by the replay rather
+        than stored. A partial last record (a crash during append) is dropped
+        and cut from the file; any other bad record fails the load.
+        """
+        try:
+            valid_bytes = 0
+            torn_tail = False
+            with open(self.chain_file, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        torn_tail = True
+                        break
+                    record = json.loads(line)
+                    stored_checksum = record.pop("checksum", None)
+                    if self.config.integrity_check and stored_checksum != self._calculate_data_checksum(record):
+                        self.logger.error("Data integrity check failed - block record checksum mismatch")
+                        return False
+                    self._replay_block_record(record)
+                    valid_bytes += len(line)
+
+            if torn_tail:
+                self.logger.warning(f"Dropping partial block record at byte {valid_bytes} of {self.chain_file}")
+                with open(self.chain_file, 'r+b') as f:
+                    f.truncate(valid_bytes)
+
+            if not self.main_chain:
+                self.logger.info("Block log is empty, starting fresh")
+                return False
+
+            self._update_consensus_status()
+            self._unsaved_nodes = []
+            self._log_needs_rewrite = False
+
+            # Validate loaded chain
+            if not self.is_valid_chain():
+                self.logger.error("Loaded chain failed validation")
+                return False
+
+            self.logger.info(f"Successfully loaded blockchain with {len(self.main_chain)} blocks")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to load blockchain: {str(e)}")
+            return False
+
+    def _replay_block_record(self, record: dict) -> None:
+        """Attach one block log record, applying the same main chain rules as add_block."""
+        if record["hash"] in self.hash_to_fork_node:
+            return
+        block = self._deserialize_block(record["block"])
+        parent_hash = record["parent_hash"]
+
+        if parent_hash is None:
+            if self.fork_tree_root is not None:
+                raise ValueError("Block log contains more than one genesis block")
+            self._add_first_genesis_block(block)
+            return
+
+        parent_fork_node = self.hash_to_fork_node.get(parent_hash)
+        if parent_fork_node is None:
+            raise ValueError(f"Block log references unknown parent: {parent_hash}")
+
+        fork_node = self._add_fork_node(block, parent_fork_node)
+        if parent_fork_node is self.main_chain_tip:
+            self.main_chain.append(block)
+            fork_node.is_main_chain = True
+            self.main_chain_tip = fork_node
+        elif self.config.enable_fork_resolution and fork_node.height > self.main_chain_tip.height:
+            self._update_main_chain(fork_node)
+
+    def _load_legacy_snapshot(self) -> bool:
+        """
+        Load a full snapshot written before the block log existed.
+
+        Returns:
+            True if load was successful, False otherwise
+        """
+        try:
+            # Try pickle first (faster), fall back to JSON
+            if self.chain_file_pkl.exists() and self.metadata_file_pkl.exists():
+                try:
+                    with open(self.chain_file_pkl, 'rb') as f:
+                        blockchain_data = pickle.load(f)
+                    self.logger.info("Loaded blockchain from pickle files")
+                except Exception:
+                    # Fall back to JSON
+                    with open(self.legacy_chain_file, 'r', encoding='utf-8') as f:
                         blockchain_data = json.load(f)
-                    with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
                     self.logger.info("Loaded blockchain from JSON files")
-                else:
-                    self.logger.info("No existing blockchain data found, starting fresh")
-                    return False
-
-                # Verify data integrity
-                if self.config.integrity_check:
-                    stored_checksum = blockchain_data.get("checksum")
-                    if stored_checksum:
-                        # Temporarily remove checksum for verification
-                        temp_checksum = blockchain_data.pop("checksum")
-                        calculated_checksum = self._calculate_data_checksum(blockchain_data)
-                        blockchain_data["checksum"] = temp_checksum
-
-                        if stored_checksum != calculated_checksum:
-                            self.logger.error("Data integrity check failed - checksum mismatch")
-                            return False
-                        self.logger.info("Data integrity check passed")
-
-                # Load main chain
-                self.main_chain = []
-                for block_data in blockchain_data["main_chain"]:
-                    block = self._deserialize_block(block_data)
-                    self.main_chain.append(block)
-
-                # Load sets
-                self.confirmed_blocks = set(blockchain_data.get("confirmed_blocks", []))
-                self.orphaned_blocks = set(blockchain_data.get("orphaned_blocks", []))
-
-                # Rebuild fork tree from saved fork nodes
-                self._rebuild_fork_tree_from_saved_data(blockchain_data)
-
-                # Validate loaded chain
-                if not self.is_valid_chain():
-                    self.logger.error("Loaded chain failed validation")
-                    return False
-
-                self.logger.info(f"Successfully loaded blockchain with {len(self.main_chain)} blocks")
-                return True
 
-            except Exception as e:
-                self.logger.error(f"Failed to load blockchain: {str(e)}")
+            elif self.legacy_chain_file.exists():
+                with open(self.legacy_chain_file, 'r', encoding='utf-8') as f:
+                    blockchain_data = json.load(f)
+                self.logger.info("Loaded blockchain from JSON files")
+            else:
+                self.logger.info("No existing blockchain data found, starting fresh")
+                return False
+
+            # Verify data integrity
+            if self.config.integrity_check:
+                stored_checksum = blockchain_data.get("checksum")
+                if stored_checksum:
+                    # Temporarily remove checksum for verification
+                    temp_checksum = blockchain_data.pop("checksum")
+                    calculated_checksum = self._calculate_data_checksum(blockchain_data)
+                    blockchain_data["checksum"] = temp_checksum
+
+                    if stored_checksum != calculated_checksum:
+                        self.logger.error("Data integrity check failed - checksum mismatch")
+                        return False
+                    self.logger.info("Data integrity check passed")
+
+            # Load main chain
+            self.main_chain = []
+            for block_data in blockchain_data["main_chain"]:
+                block = self._deserialize_block(block_data)
+                self.main_chain.append(block)
+
+            # Load sets
+            self.confirmed_blocks = set(blockchain_data.get("confirmed_blocks", []))
+            self.orphaned_blocks = set(blockchain_data.get("orphaned_blocks", []))
+
+            # Rebuild fork tree from saved fork nodes
+            self._rebuild_fork_tree_from_saved_data(blockchain_data)
+
+            # Validate loaded chain
+            if not self.is_valid_chain():
+                self.logger.error("Loaded chain failed validation")
                 return False
 
+            # The next save writes every node into a fresh block log
+            self._unsaved_nodes = []
+            self._log_needs_rewrite = True
+
+            self.logger.info(f"Successfully loaded blockchain with {len(self.main_chain)} blocks")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to load blockchain: {str(e)}")
+            return False
+
     def _rebuild_fork_tree_from_saved_data(self, blockchain_data: dict) -> None:
         """
         Rebuild the fork tree structure from loaded saved data.
@@ -1080,8 +1382,7 @@ class Blockchain:
             parent_hash = fork_node_data.get("parent_hash")
             if parent_hash and parent_hash in hash_to_fork_node:
                 parent_node = hash_to_fork_node[parent_hash]
-                fork_node.parent = parent_node
-                parent_node.children.append(fork_node)
+                parent_node.add_child(fork_node)
 
         # Set root and main structures
         if self.main_chain:
@@ -139,12 +139,11 @@ class TransactionPicker:
 
             # Generate MerkleTreeProof for each selected transaction
             picked_txs_mt_proofs = []
-            if merkle_tree and merkle_tree.prf_list:
+            if merkle_tree and merkle_tree.leaf_count:
                 for multi_transactions_hash, leaf_index in leaf_info_list:
-                    if leaf_index < len(merkle_tree.prf_list):
-                        proof_hashes = merkle_tree.prf_list[leaf_index]
-                        # Wrap the hash list in a MerkleTreeProof object
-                        merkle_tree_proof = MerkleTreeProof(mt_prf_list=proof_hashes)
+                    if leaf_index < merkle_tree.leaf_count:
+                        # Proofs are extracted from the level arrays on demand
+                        merkle_tree_proof = MerkleTreeProof(mt_prf_list=merkle_tree.get_proof(leaf_index))
                         picked_txs_mt_proofs.append((multi_transactions_hash, merkle_tree_proof))
 
             package_data = PackagedBlockData(
@@ -309,8 +308,7 @@ class TransactionPicker:
         )
 
         # Add all SubmitTxInfo's submitter_address to bloom filter
-        for submitter in package_data.submitter_addresses:
-            block.add_item_to_bloom(submitter)
+        block.add_items_to_bloom(package_data.submitter_addresses)
 
         return block
 
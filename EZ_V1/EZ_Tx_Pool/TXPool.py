@@ -1,7 +1,10 @@
+import atexit
 import copy
+import sqlite3
 import time
 import threading
-from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Iterable
 from dataclasses import dataclass, asdict
 import json
 import os
@@ -16,6 +19,10 @@ from EZ_Transaction.MultiTransactions import MultiTransactions
 from EZ_Transaction.SingleTransaction import Transaction
 from EZ_Tool_Box.Hash import sha256_hash
 
+# How long accepted submissions wait in memory so several share one commit.
+# 0 writes every submission synchronously.
+DEFAULT_PERSIST_INTERVAL_MS = 5.0
+
 @dataclass
 class ValidationResult:
     """Validation result dataclass"""
@@ -30,14 +37,246 @@ class ValidationResult:
         if self.duplicates_found is None:
             self.duplicates_found = []
 
+
+class PoolEntries:
+    """
+    Insertion-ordered SubmitTxInfo container addressed by stable integer keys.
+
+    Keys are handed out by append() and never reused while the entry lives, so
+    removing one entry does not shift the keys held by hash_index and friends.
+    Iteration yields the SubmitTxInfos in arrival order, like the list it replaces.
+    """
+
+    def __init__(self, items: Iterable[SubmitTxInfo] = ()):
+        self._entries: "OrderedDict[int, SubmitTxInfo]" = OrderedDict()
+        self._next_key = 0
+        for item in items:
+            self.append(item)
+
+    def append(self, submit_tx_info: SubmitTxInfo) -> int:
+        key = self._next_key
+        self._next_key += 1
+        self._entries[key] = submit_tx_info
+        return key
+
+    def pop(self, key: int, default=None) -> Optional[SubmitTxInfo]:
+        return self._entries.pop(key, default)
+
+    def get(self, key: int, default=None) -> Optional[SubmitTxInfo]:
+        return self._entries.get(key, default)
+
+    def keys(self):
+        return self._entries.keys()
+
+    def items(self):
+        return self._entries.items()
+
+    def clear(self):
+        self._entries.clear()
+        self._next_key = 0
+
+    def copy(self) -> "PoolEntries":
+        duplicate = PoolEntries()
+        duplicate._entries = self._entries.copy()
+        duplicate._next_key = self._next_key
+        return duplicate
+
+    def __getitem__(self, key: int) -> SubmitTxInfo:
+        return self._entries[key]
+
+    def __delitem__(self, key: int):
+        del self._entries[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TxPoolStore:
+    """
+    One long-lived WAL connection per pool database with a write-behind queue.
+
+    Writes are queued and a background thread commits everything queued during
+    the last flush interval in a single transaction. Every synchronous
+    statement flushes the queue first, so statements reach SQLite in the order
+    they were issued. Pools opened on the same file share one store, which
+    stays open until the last of them releases it.
+    """
+
+    _stores: Dict[str, "TxPoolStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, db_path: str, flush_interval_ms: float = DEFAULT_PERSIST_INTERVAL_MS):
+        self.db_path = db_path
+        self.flush_interval_sec = max(0.0, float(flush_interval_ms)) / 1000.0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._identity = self._file_identity(db_path)
+        self._db_lock = threading.RLock()
+        self._pending: List[Tuple[str, tuple]] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._users = 0
+        self._writer = None
+        if self.flush_interval_sec > 0:
+            self._writer = threading.Thread(target=self._run_writer, name="ez-v1-txpool-writer", daemon=True)
+            self._writer.start()
+
+    @staticmethod
+    def _file_identity(db_path: str):
+        try:
+            stat = os.stat(db_path)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    @classmethod
+    def open(cls, db_path: str, flush_interval_ms: float = DEFAULT_PERSIST_INTERVAL_MS) -> "TxPoolStore":
+        """Return the shared store for db_path, reopening it if the file was replaced.
+
+        Each call counts as one user; pair it with release().
+        """
+        key = os.path.abspath(db_path)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None or store._identity != cls._file_identity(db_path) or store._closed:
+                if store is not None:
+                    store._close_connection()
+                store = cls(db_path, flush_interval_ms)
+                cls._stores[key] = store
+            store._users += 1
+            return store
+
+    @classmethod
+    def close_all(cls):
+        with cls._stores_lock:
+            stores = list(cls._stores.values())
+            cls._stores.clear()
+        for store in stores:
+            store._close_connection()
+
+    def submit(self, statements: List[Tuple[str, tuple]]):
+        """Queue insert statements for the next group commit."""
+        if self._closed:
+            print(f"Database persistence error: store for {self.db_path} is closed")
+            return
+        if self._writer is None:
+            with self._db_lock:
+                self._write_locked(statements)
+            return
+        with self._cond:
+            self._pending.extend(statements)
+            self._cond.notify()
+
+    def flush(self):
+        """Commit everything queued so far."""
+        # Draining under the connection lock keeps batches in submission order
+        with self._db_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if batch:
+                self._write_locked(batch)
+
+    def execute(self, sql: str, params: tuple = ()) -> int:
+        """Run one write statement synchronously, after the queued ones."""
+        with self._db_lock:
+            self.flush()
+            with self._conn:
+                return self._conn.execute(sql, params).rowcount
+
+    def execute_script(self, statements: List[Tuple[str, tuple]]):
+        """Run several write statements synchronously in one transaction."""
+        with self._db_lock:
+            self.flush()
+            with self._conn:
+                for sql, params in statements:
+                    self._conn.execute(sql, params)
+
+    def query(self, sql: str, params: tuple = ()) -> list:
+        with self._db_lock:
+            self.flush()
+            return self._conn.execute(sql, params).fetchall()
+
+    def release(self):
+        """Drop one user; the last one closes the store, the others only flush."""
+        key = os.path.abspath(self.db_path)
+        with self._stores_lock:
+            self._users = max(0, self._users - 1)
+            last_user = self._users == 0
+            if last_user and self._stores.get(key) is self:
+                del self._stores[key]
+        if last_user:
+            self._close_connection()
+        elif not self._closed:
+            self.flush()
+
+    def close(self):
+        """Close the store for every user."""
+        key = os.path.abspath(self.db_path)
+        with self._stores_lock:
+            self._users = 0
+            if self._stores.get(key) is self:
+                del self._stores[key]
+        self._close_connection()
+
+    def _close_connection(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        try:
+            self.flush()
+        finally:
+            with self._db_lock:
+                self._conn.close()
+
+    def _write_locked(self, statements: List[Tuple[str, tuple]]):
+        # Rows of the same statement go through one executemany; only
+        # order-independent inserts are queued, so regrouping them is safe.
+        grouped: Dict[str, List[tuple]] = {}
+        for sql, params in statements:
+            grouped.setdefault(sql, []).append(params)
+        try:
+            with self._conn:
+                for sql, rows in grouped.items():
+                    self._conn.executemany(sql, rows)
+        except sqlite3.Error as e:
+            print(f"Database persistence error: {e}")
+
+    def _run_writer(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            # Let submissions arriving within the interval join this commit
+            time.sleep(self.flush_interval_sec)
+            try:
+                self.flush()
+            except sqlite3.ProgrammingError:
+                # Connection closed underneath us during shutdown
+                return
+
+
+atexit.register(TxPoolStore.close_all)
+
+
 class TxPool:
     """Transaction pool for SubmitTxInfo with validation and database storage"""
 
-    def __init__(self, db_path: str = "tx_pool.db"):
-        self.pool: List[SubmitTxInfo] = []
-        self.submitter_index: Dict[str, List[int]] = {}  # submitter -> indices in pool
-        self.hash_index: Dict[str, int] = {}  # SubmitTxInfo hash -> index in pool
-        self.multi_tx_hash_index: Dict[str, int] = {}  # MultiTransactions hash -> index in pool
+    def __init__(self, db_path: str = "tx_pool.db", persist_interval_ms: float = DEFAULT_PERSIST_INTERVAL_MS):
+        self.pool: PoolEntries = PoolEntries()
+        self.submitter_index: Dict[str, List[int]] = {}  # submitter -> keys in pool
+        self.hash_index: Dict[str, int] = {}  # SubmitTxInfo hash -> key in pool
+        self.multi_tx_hash_index: Dict[str, int] = {}  # MultiTransactions hash -> key in pool
         self.db_path = db_path
         self.lock = threading.Lock()
         self.stats = {
@@ -46,9 +285,10 @@ class TxPool:
             'invalid_received': 0,
             'duplicates': 0
         }
+        self._store: Optional[TxPoolStore] = None
 
         # Initialize database
-        self._init_database()
+        self._init_database(persist_interval_ms)
 
         # Load existing data from database
         self._load_from_database()
@@ -56,16 +296,13 @@ class TxPool:
         # Start periodic cleanup
         self._start_cleanup_thread()
 
-    def _init_database(self):
-        """Initialize SQLite database for SubmitTxInfo persistence"""
-        import sqlite3
-
+    def _init_database(self, persist_interval_ms: float = DEFAULT_PERSIST_INTERVAL_MS):
+        """Open the shared SQLite store and create the SubmitTxInfo tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            self._store = TxPoolStore.open(self.db_path, persist_interval_ms)
 
             # Create tables
-            cursor.execute('''
+            self._store.execute_script([('''
                 CREATE TABLE IF NOT EXISTS submit_tx_infos (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     submit_hash TEXT UNIQUE NOT NULL,
@@ -80,9 +317,7 @@ class TxPool:
                     validation_time TEXT,
                     processed BOOLEAN DEFAULT FALSE
                 )
-            ''')
-
-            cursor.execute('''
+            ''', ()), ('''
                 CREATE TABLE IF NOT EXISTS validation_results (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     submit_hash TEXT NOT NULL,
@@ -92,32 +327,34 @@ class TxPool:
                     validation_time TEXT NOT NULL,
                     FOREIGN KEY (submit_hash) REFERENCES submit_tx_infos(submit_hash)
                 )
-            ''')
-
-            conn.commit()
-            conn.close()
+            ''', ())])
 
         except Exception as e:
             print(f"Database initialization error: {e}")
 
+    def flush(self):
+        """Block until every accepted SubmitTxInfo has been committed to the database"""
+        if self._store is not None:
+            self._store.flush()
+
+    def close(self):
+        """Flush pending writes and release this pool's use of the shared store"""
+        if self._store is not None:
+            self._store.release()
+            self._store = None
+
     def _load_from_database(self):
         """Load existing SubmitTxInfos from database into memory"""
         try:
-            import sqlite3
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-
                 # Load all valid, unprocessed SubmitTxInfos
-                cursor.execute('''
+                rows = self._store.query('''
                     SELECT submit_hash, multi_tx_hash, submitter_address, submit_timestamp,
                            version, signature, public_key, submit_tx_info_blob
                     FROM submit_tx_infos
                     WHERE is_valid = TRUE AND processed = FALSE
                 ''')
 
-                rows = cursor.fetchall()
-
                 for row in rows:
                     (submit_hash, multi_tx_hash, submitter_address, submit_timestamp,
                      version, signature_hex, public_key_hex, submit_tx_info_blob) = row
@@ -139,39 +376,18 @@ class TxPool:
                         if not submit_tx_info.get_hash():
                             submit_tx_info._hash = submit_hash
 
-                        # Add to pool
-                        self.pool.append(submit_tx_info)
-                        index = len(self.pool) - 1
-
-                        # Update indices
-                        if submitter_address not in self.submitter_index:
-                            self.submitter_index[submitter_address] = []
-                        self.submitter_index[submitter_address].append(index)
-                        self.hash_index[submit_hash] = index
-                        self.multi_tx_hash_index[multi_tx_hash] = index
+                        # Add to pool and indices
+                        self._index_entry(self.pool.append(submit_tx_info), submit_tx_info, submit_hash)
 
                     except Exception as e:
                         print(f"Error decoding SubmitTxInfo with hash {submit_hash}: {e}")
                         continue
 
                 # Load stats from database
-                cursor.execute('''
-                    SELECT COUNT(*) FROM submit_tx_infos
-                    WHERE is_valid = TRUE AND processed = FALSE
-                ''')
-                valid_count = cursor.fetchone()[0]
-
-                cursor.execute('''
-                    SELECT COUNT(*) FROM submit_tx_infos
-                    WHERE is_valid = FALSE AND processed = FALSE
-                ''')
-                invalid_count = cursor.fetchone()[0]
-
-                cursor.execute('''
+                total_count = self._store.query('''
                     SELECT COUNT(*) FROM submit_tx_infos
                     WHERE processed = FALSE
-                ''')
-                total_count = cursor.fetchone()[0]
+                ''')[0][0]
 
                 # Update stats - transactions in pool are all valid (invalid ones are filtered out)
                 loaded_count = len(self.pool)
@@ -179,9 +395,6 @@ class TxPool:
                 self.stats['valid_received'] = loaded_count  # All loaded transactions are valid
                 self.stats['invalid_received'] = total_count - loaded_count  # Invalid transactions are not loaded
 
-                conn.commit()
-                conn.close()
-
         except Exception as e:
             print(f"Error loading from database: {e}")
 
@@ -198,112 +411,101 @@ class TxPool:
     def _cleanup_old_transactions(self, max_age_hours: int = 24):
         """Clean up transactions older than max_age_hours"""
         try:
-            import sqlite3
-
             cutoff_time = time.time() - (max_age_hours * 3600)
             cutoff_iso = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(cutoff_time))
 
             with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-
                 # Get old submit hashes
-                cursor.execute('''
+                old_hashes = [row[0] for row in self._store.query('''
                     SELECT submit_hash FROM submit_tx_infos
                     WHERE submit_timestamp < ? AND processed = FALSE
-                ''', (cutoff_iso,))
-
-                old_hashes = [row[0] for row in cursor.fetchall()]
+                ''', (cutoff_iso,))]
 
                 # Remove from database
-                cursor.execute('''
+                self._store.execute('''
                     DELETE FROM submit_tx_infos WHERE submit_timestamp < ? AND processed = FALSE
                 ''', (cutoff_iso,))
 
                 # Remove from memory
                 for submit_hash in old_hashes:
-                    if submit_hash in self.hash_index:
-                        index = self.hash_index[submit_hash]
-                        del self.hash_index[submit_hash]
-
-                        submit_tx_info = self.pool[index]
-                        if submit_tx_info.multi_transactions_hash in self.multi_tx_hash_index:
-                            del self.multi_tx_hash_index[submit_tx_info.multi_transactions_hash]
-
-                        # Remove from pool first
-                        del self.pool[index]
-
-                        # Rebuild indices
-                        self._rebuild_indices()
-
-                conn.commit()
-                conn.close()
+                    self._remove_entry(submit_hash)
 
         except Exception as e:
             print(f"Cleanup error: {e}")
 
+    def _index_entry(self, key: int, submit_tx_info: SubmitTxInfo, submit_hash: str):
+        """Point the lookup indices at a pool entry"""
+        self.submitter_index.setdefault(submit_tx_info.submitter_address, []).append(key)
+        self.hash_index[submit_hash] = key
+        self.multi_tx_hash_index[submit_tx_info.multi_transactions_hash] = key
+
+    def _remove_entry(self, submit_hash: str) -> Optional[SubmitTxInfo]:
+        """Drop one entry from the pool and its indices; other keys stay valid"""
+        key = self.hash_index.pop(submit_hash, None)
+        if key is None:
+            return None
+        submit_tx_info = self.pool.pop(key)
+        if submit_tx_info is None:
+            return None
+
+        if self.multi_tx_hash_index.get(submit_tx_info.multi_transactions_hash) == key:
+            del self.multi_tx_hash_index[submit_tx_info.multi_transactions_hash]
+        submitter_keys = self.submitter_index.get(submit_tx_info.submitter_address)
+        if submitter_keys is not None:
+            if key in submitter_keys:
+                submitter_keys.remove(key)
+            if not submitter_keys:
+                del self.submitter_index[submit_tx_info.submitter_address]
+        return submit_tx_info
+
     def _rebuild_indices(self):
-        """Rebuild indices after pool modification"""
+        """Rebuild indices from the pool entries"""
         self.submitter_index.clear()
         self.hash_index.clear()
         self.multi_tx_hash_index.clear()
 
-        for i, submit_tx_info in enumerate(self.pool):
-            if submit_tx_info.submitter_address not in self.submitter_index:
-                self.submitter_index[submit_tx_info.submitter_address] = []
-            self.submitter_index[submit_tx_info.submitter_address].append(i)
-            submit_hash = submit_tx_info.get_hash()
-            self.hash_index[submit_hash] = i
-            self.multi_tx_hash_index[submit_tx_info.multi_transactions_hash] = i
+        for key, submit_tx_info in self.pool.items():
+            self._index_entry(key, submit_tx_info, submit_tx_info.get_hash())
 
     def _persist_to_database(self, submit_tx_info: SubmitTxInfo, validation_result: ValidationResult):
-        """Persist SubmitTxInfo and validation result to database"""
-        try:
-            import sqlite3
-            import pickle
-            with self.lock:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-
-                submit_hash = submit_tx_info.get_hash()
-
-                # Insert or replace SubmitTxInfo
-                cursor.execute('''
-                    INSERT OR REPLACE INTO submit_tx_infos
-                    (submit_hash, multi_tx_hash, submitter_address, submit_timestamp,
-                     version, signature, public_key, submit_tx_info_blob, is_valid, validation_time)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    submit_hash,
-                    submit_tx_info.multi_transactions_hash,
-                    submit_tx_info.submitter_address,
-                    submit_tx_info.submit_timestamp,
-                    submit_tx_info.version,
-                    submit_tx_info.signature.hex() if submit_tx_info.signature else None,
-                    submit_tx_info.public_key.hex() if submit_tx_info.public_key else None,
-                    submit_tx_info.encode(),
-                    validation_result.is_valid,
-                    time.strftime('%Y-%m-%dT%H:%M:%S')
-                ))
-
-                # Insert validation result
-                cursor.execute('''
-                    INSERT INTO validation_results
-                    (submit_hash, validation_type, is_valid, error_message, validation_time)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    submit_hash,
-                    'submit_tx_info_validation',
-                    validation_result.is_valid,
-                    validation_result.error_message,
-                    time.strftime('%Y-%m-%dT%H:%M:%S')
-                ))
-
-                conn.commit()
-                conn.close()
-
-        except sqlite3.Error as e:
-            print(f"Database persistence error: {e}")
+        """Queue SubmitTxInfo and validation result for the next group commit"""
+        if self._store is None:
+            return
+        submit_hash = submit_tx_info.get_hash()
+        validation_time = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+        self._store.submit([
+            # Insert or replace SubmitTxInfo
+            ('''
+                INSERT OR REPLACE INTO submit_tx_infos
+                (submit_hash, multi_tx_hash, submitter_address, submit_timestamp,
+                 version, signature, public_key, submit_tx_info_blob, is_valid, validation_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                submit_hash,
+                submit_tx_info.multi_transactions_hash,
+                submit_tx_info.submitter_address,
+                submit_tx_info.submit_timestamp,
+                submit_tx_info.version,
+                submit_tx_info.signature.hex() if submit_tx_info.signature else None,
+                submit_tx_info.public_key.hex() if submit_tx_info.public_key else None,
+                submit_tx_info.encode(),
+                validation_result.is_valid,
+                validation_time
+            )),
+            # Insert validation result
+            ('''
+                INSERT INTO validation_results
+                (submit_hash, validation_type, is_valid, error_message, validation_time)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (
+                submit_hash,
+                'submit_tx_info_validation',
+                validation_result.is_valid,
+                validation_result.error_message,
+                validation_time
+            )),
+        ])
 
     def validate_submit_tx_info(self, submit_tx_info: SubmitTxInfo,
                                multi_transactions: Optional[MultiTransactions] = None) -> ValidationResult:
@@ -421,18 +623,9 @@ class TxPool:
 
             # Add to pool
             with self.lock:
-                self.pool.append(submit_tx_info)
-                index = len(self.pool) - 1
-
-                # Update indices
-                if submit_tx_info.submitter_address not in self.submitter_index:
-                    self.submitter_index[submit_tx_info.submitter_address] = []
-                self.submitter_index[submit_tx_info.submitter_address].append(index)
-                submit_hash = submit_tx_info.get_hash()
-                self.hash_index[submit_hash] = index
-                self.multi_tx_hash_index[submit_tx_info.multi_transactions_hash] = index
-
-            # Persist to database (outside the lock to avoid deadlock)
+                self._index_entry(self.pool.append(submit_tx_info), submit_tx_info, submit_tx_info.get_hash())
+
+            # Queue for the write-behind store (outside the lock to avoid deadlock)
             self._persist_to_database(submit_tx_info, validation_result)
             self.stats['valid_received'] += 1
             return True, "SubmitTxInfo added successfully"
@@ -440,6 +633,18 @@ class TxPool:
         except Exception as e:
             return False, f"Error adding SubmitTxInfo: {str(e)}"
 
+    def add_unvalidated_submit_tx_info(self, submit_tx_info: SubmitTxInfo) -> int:
+        """
+        Add SubmitTxInfo to the in-memory pool without validation or persistence
+        (used by simulations that skip signing). Returns the entry's pool key.
+        """
+        with self.lock:
+            key = self.pool.append(submit_tx_info)
+            self._index_entry(key, submit_tx_info, submit_tx_info.get_hash())
+            self.stats['total_received'] += 1
+            self.stats['valid_received'] += 1
+        return key
+
     def get_submit_tx_info(self, submit_hash: str) -> Optional[SubmitTxInfo]:
         """Get SubmitTxInfo by hash"""
         return self.pool[self.hash_index[submit_hash]] if submit_hash in self.hash_index else None
@@ -450,7 +655,8 @@ class TxPool:
 
     def get_submit_tx_infos_by_multi_tx_hash(self, multi_tx_hash: str) -> List[SubmitTxInfo]:
         """Get SubmitTxInfos by MultiTransactions hash"""
-        return [self.pool[index] for index in self.multi_tx_hash_index[multi_tx_hash]] if multi_tx_hash in self.multi_tx_hash_index else []
+        submit_tx_info = self.get_submit_tx_info_by_multi_tx_hash(multi_tx_hash)
+        return [submit_tx_info] if submit_tx_info is not None else []
 
     def get_submit_tx_info_by_multi_tx_hash(self, multi_tx_hash: str) -> Optional[SubmitTxInfo]:
         """Get single SubmitTxInfo by MultiTransactions hash"""
@@ -460,11 +666,11 @@ class TxPool:
 
     def get_submit_tx_infos_by_submitter(self, submitter_address: str) -> List[SubmitTxInfo]:
         """Get SubmitTxInfos by submitter address"""
-        return [self.pool[index] for index in self.submitter_index.get(submitter_address, [])]
+        return [self.pool[key] for key in self.submitter_index.get(submitter_address, [])]
 
     def get_all_submit_tx_infos(self) -> List[SubmitTxInfo]:
         """Get all SubmitTxInfos in the pool"""
-        return copy.deepcopy(self.pool)
+        return copy.deepcopy(list(self.pool))
 
     def get_submit_tx_infos_by_time_range(self, start_time: str, end_time: str) -> List[SubmitTxInfo]:
         """Get SubmitTxInfos by time range"""
@@ -491,28 +697,18 @@ class TxPool:
             if submit_hash not in self.hash_index:
                 return False
 
-            index = self.hash_index[submit_hash]
-
             # Mark as processed in database
             try:
-                import sqlite3
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('''
+                self._store.execute('''
                     UPDATE submit_tx_infos
                     SET processed = TRUE
                     WHERE submit_hash = ?
                 ''', (submit_hash,))
-                conn.commit()
-                conn.close()
             except Exception as e:
                 print(f"Error marking transaction as processed: {e}")
 
-            # Remove from memory
-            del self.pool[index]
-
-            # Rebuild indices
-            self._rebuild_indices()
+            # Remove from memory; keys of the remaining entries are unchanged
+            self._remove_entry(submit_hash)
 
             return True
 
@@ -521,7 +717,6 @@ class TxPool:
         # Calculate pool size in bytes
         pool_size_bytes = 0
         try:
-            import pickle
             for submit_tx_info in self.pool:
                 pool_size_bytes += len(pickle.dumps(submit_tx_info))
         except Exception:
@@ -544,13 +739,10 @@ class TxPool:
 
             # Clear database
             try:
-                import sqlite3
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM submit_tx_infos')
-                cursor.execute('DELETE FROM validation_results')
-                conn.commit()
-                conn.close()
+                self._store.execute_script([
+                    ('DELETE FROM submit_tx_infos', ()),
+                    ('DELETE FROM validation_results', ()),
+                ])
             except Exception as e:
                 print(f"Error clearing database: {e}")
 
@@ -560,4 +752,4 @@ class TxPool:
             'valid_received': 0,
             'invalid_received': 0,
             'duplicates': 0
-        }
\ No newline at end of file
+        }
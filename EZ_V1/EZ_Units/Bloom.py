@@ -1,20 +1,56 @@
+from functools import lru_cache
+
 from bitarray import bitarray
 import mmh3
+import numpy as np
 import zlib
 import base64
 
-class BloomFilter(set):  # Inherits from the set class
+# Bit positions from seeding mmh3.hash with 0..hash_count-1 (one hash call per position).
+# Kept so filters serialized before double hashing still answer membership queries.
+LEGACY_HASH_SCHEME = "mmh3_seeded"
+# Bit positions h1 + i * h2 (mod 2**64, mod size) from a single 128-bit mmh3 call per item.
+DOUBLE_HASH_SCHEME = "mmh3_128_double"
+
+_UINT64_MASK = (1 << 64) - 1
+
+
+@lru_cache(maxsize=65536)
+def _hash_pair(item):
+    """Both 64-bit halves of mmh3's 128-bit hash; cached so an address checked against many blocks hashes once."""
+    return mmh3.hash64(item, 0, signed=False)
+
+
+def _byte_masks(bit_array, indexes):
+    """Byte offsets and in-byte masks of bit positions inside a bitarray's buffer."""
+    endian = bit_array.endian
+    if callable(endian):  # bitarray < 3 exposes endian() as a method
+        endian = endian()
+    offsets = (indexes >> np.uint64(3)).astype(np.intp)
+    shifts = (indexes & np.uint64(7)).astype(np.uint8)
+    if endian == "big":
+        masks = np.right_shift(np.uint8(0x80), shifts)
+    else:
+        masks = np.left_shift(np.uint8(1), shifts)
+    return offsets, masks.astype(np.uint8)
+
+
+class BloomFilter:
     """
     A Bloom Filter implementation.
 
     Attributes:
         size (int): Length of the binary vector.
         hash_count (int): Number of hash functions.
-    
+        hash_scheme (str): How bit positions are derived from an item.
+
     The number of hash functions should satisfy:
     (hash_count = binary_vector_length * ln(2) / number_of_elements_inserted)
+
+    Bits live in a bitarray; batch operations (add_many / contains_many) index
+    its buffer through a NumPy view instead of looping per hash function.
     """
-    def __init__(self, size=1024 * 1024, hash_count=5, compressed=False):
+    def __init__(self, size=1024 * 1024, hash_count=5, compressed=False, hash_scheme=DOUBLE_HASH_SCHEME):
         """
         Initializes the Bloom Filter with a given size and hash count.
 
@@ -22,12 +58,17 @@ class BloomFilter(set):  # Inherits from the set class
             size (int): The size of the bit array. Default is 1024 * 1024.
             hash_count (int): The number of hash functions to use. Default is 5.
             compressed (bool): Whether to use compressed storage. Default is False.
+            hash_scheme (str): DOUBLE_HASH_SCHEME for new filters, LEGACY_HASH_SCHEME for old data.
         """
-        super(BloomFilter, self).__init__()  # Calling the constructor of the superclass 'set'
+        if hash_scheme not in (DOUBLE_HASH_SCHEME, LEGACY_HASH_SCHEME):
+            raise ValueError(f"unknown bloom hash scheme: {hash_scheme}")
         self.size = size
         self.hash_count = hash_count  # hash_count = size * ln(2) / num_elements
         self.compressed = compressed
-        
+        self.hash_scheme = hash_scheme
+        # Decompressed bits of a compressed filter, kept for read-only queries
+        self._decompressed_cache = None
+
         # Initialize either bit_array or compressed_bit_array, not both
         if compressed:
             self.compressed_bit_array = ""
@@ -37,14 +78,31 @@ class BloomFilter(set):  # Inherits from the set class
             self.bit_array.setall(0)  # Initialize all bits to 0
             self.compressed_bit_array = None
 
+    def __setstate__(self, state):
+        """
+        Restores a pickled filter.
+
+        Pickles from when the filter derived from set run __init__ (which picks
+        the new hash scheme) before this and carry no hash_scheme of their own;
+        their bits were set with seeded mmh3 hashes, so fall back to that.
+        """
+        state = dict(state)
+        state.setdefault('hash_scheme', LEGACY_HASH_SCHEME)
+        state.setdefault('_decompressed_cache', None)
+        self.__dict__.update(state)
+
     def __len__(self):
         """ Returns the size of the binary vector. """
         return self.size
 
+    def __repr__(self):
+        # Matches the repr the filter had while it derived from set; block
+        # hashes are computed over str(block.bloom), so it must stay stable.
+        return f"{self.__class__.__name__}()"
+
     def __iter__(self):
         """ Makes the Bloom Filter iterable. """
-        self._ensure_uncompressed()
-        return iter(self.bit_array)
+        return iter(self._readable_bits())
 
     def _ensure_uncompressed(self):
         """Ensure the bloom filter is in uncompressed state for operations."""
@@ -56,100 +114,124 @@ class BloomFilter(set):  # Inherits from the set class
         if not self.compressed:
             self.compress()
 
+    def _decode_compressed(self):
+        """Decode compressed_bit_array into a bitarray, or None if it is empty or corrupt."""
+        try:
+            # Decode from base64
+            compressed_data = base64.b64decode(self.compressed_bit_array.encode('utf-8'))
+
+            # Decompress using zlib
+            bit_bytes = zlib.decompress(compressed_data)
+        except (zlib.error, base64.binascii.Error):
+            return None
+
+        # Convert back to bitarray
+        bits = bitarray()
+        bits.frombytes(bit_bytes)
+        return bits
+
+    def _empty_bits(self):
+        bits = bitarray(self.size)
+        bits.setall(0)
+        return bits
+
+    def _readable_bits(self):
+        """
+        Bits for read-only access without changing the storage state.
+
+        A compressed filter is decoded once and the result is kept until the
+        filter is modified, so repeated membership checks do not re-run zlib.
+        """
+        if not self.compressed:
+            return self.bit_array
+        if self._decompressed_cache is None:
+            if self.compressed_bit_array is None:
+                return self._empty_bits()
+            bits = self._decode_compressed()
+            self._decompressed_cache = bits if bits is not None else self._empty_bits()
+        return self._decompressed_cache
+
+    def clear_decompressed_cache(self):
+        """Drop the decoded bits kept for a compressed filter."""
+        self._decompressed_cache = None
+
     def compress(self):
         """
         Compress the bit array and free up memory.
-        
+
         After compression, self.bit_array becomes None and self.compressed_bit_array
         contains the compressed data.
         """
         if self.compressed or self.bit_array is None:
             return
-            
+
         # Convert bitarray to bytes
         bit_bytes = self.bit_array.tobytes()
-        
+
         # Compress using zlib
         compressed_data = zlib.compress(bit_bytes)
-        
+
         # Encode as base64 for safe storage/transmission
         self.compressed_bit_array = base64.b64encode(compressed_data).decode('utf-8')
-        
+
         # Free up memory
         self.bit_array = None
+        self._decompressed_cache = None
         self.compressed = True
 
     def decompress(self):
         """
         Decompress the bit array for operations.
-        
+
         After decompression, self.compressed_bit_array becomes None and self.bit_array
         contains the uncompressed data.
         """
         if not self.compressed or self.compressed_bit_array is None:
             return
-            
-        try:
-            # Decode from base64
-            compressed_data = base64.b64decode(self.compressed_bit_array.encode('utf-8'))
-            
-            # Decompress using zlib
-            bit_bytes = zlib.decompress(compressed_data)
-            
-            # Convert back to bitarray
-            self.bit_array = bitarray()
-            self.bit_array.frombytes(bit_bytes)
-            
-            # Free up memory
-            self.compressed_bit_array = None
-            self.compressed = False
-        except (zlib.error, base64.binascii.Error):
-            # If decompression fails, create a fresh bitarray
-            self.bit_array = bitarray(self.size)
-            self.bit_array.setall(0)
-            self.compressed_bit_array = None
-            self.compressed = False
+
+        bits = self._decompressed_cache
+        if bits is None:
+            bits = self._decode_compressed()
+        # If decompression fails, start from a fresh bitarray
+        self.bit_array = bits if bits is not None else self._empty_bits()
+
+        # Free up memory
+        self.compressed_bit_array = None
+        self._decompressed_cache = None
+        self.compressed = False
 
     def get_compression_ratio(self):
         """
         Calculate the compression ratio for the current bit array.
-        
+
         Returns:
             float: Compression ratio (original size / compressed size)
         """
         if not self.compressed:
             self._ensure_compressed()
-            
+
         original_size = (self.size + 7) // 8  # Convert bits to bytes
         compressed_size = len(self.compressed_bit_array.encode('utf-8'))
-        
+
         if compressed_size == 0:
             return float('inf')
-        
+
         return original_size / compressed_size
 
     def get_statistics(self):
         """
         Get statistics about the bit array including density and compression info.
-        
+
         Returns:
             dict: Dictionary containing bit array statistics
         """
         total_bits = self.size
-        
-        # Ensure uncompressed for density calculation
-        was_compressed = self.compressed
-        if was_compressed:
-            self._ensure_uncompressed()
-            
-        set_bits = sum(1 for bit in self.bit_array if bit == 1)
+
+        # Count on the readable bits so a compressed filter is not decompressed
+        set_bits = self._readable_bits().count(1)
         density = set_bits / total_bits if total_bits > 0 else 0
         compression_ratio = self.get_compression_ratio()
-        
-        # Restore original state
-        if was_compressed:
-            self._ensure_compressed()
-        
+
         return {
             'total_bits': total_bits,
             'set_bits': set_bits,
@@ -159,6 +241,25 @@ class BloomFilter(set):  # Inherits from the set class
             'compressed_storage': self.compressed
         }
 
+    def _item_indexes(self, item):
+        """Bit positions of a single item."""
+        if self.hash_scheme == LEGACY_HASH_SCHEME:
+            return [mmh3.hash(item, ii) % self.size for ii in range(self.hash_count)]
+        h1, h2 = _hash_pair(item)
+        return [((h1 + ii * h2) & _UINT64_MASK) % self.size for ii in range(self.hash_count)]
+
+    def _batch_indexes(self, items):
+        """Bit positions of many items as a (len(items), hash_count) uint64 array."""
+        if self.hash_scheme == LEGACY_HASH_SCHEME:
+            return np.array(
+                [[mmh3.hash(item, ii) % self.size for ii in range(self.hash_count)] for item in items],
+                dtype=np.uint64,
+            ).reshape(len(items), self.hash_count)
+        pairs = np.array([_hash_pair(item) for item in items], dtype=np.uint64).reshape(len(items), 2)
+        rounds = np.arange(self.hash_count, dtype=np.uint64)
+        # uint64 arithmetic wraps mod 2**64, matching _item_indexes
+        return (pairs[:, :1] + rounds * pairs[:, 1:]) % np.uint64(self.size)
+
     def add(self, item):
         """
         Adds an item to the Bloom Filter.
@@ -167,13 +268,31 @@ class BloomFilter(set):  # Inherits from the set class
             item: The item to be added to the Bloom Filter.
         """
         self._ensure_uncompressed()
-        
-        for ii in range(self.hash_count):
-            index = mmh3.hash(item, ii) % self.size  # Calculate the bit position to set
+
+        for index in self._item_indexes(item):
             self.bit_array[index] = 1  # Set the bit at the calculated position
 
         return self
 
+    def add_many(self, items):
+        """
+        Adds several items to the Bloom Filter in one vectorized pass.
+
+        Parameters:
+            items: Iterable of items to be added to the Bloom Filter.
+        """
+        items = list(items)
+        self._ensure_uncompressed()
+        if not items:
+            return self
+
+        offsets, masks = _byte_masks(self.bit_array, self._batch_indexes(items).ravel())
+        view = np.frombuffer(self.bit_array, dtype=np.uint8)
+        np.bitwise_or.at(view, offsets, masks)
+        del view  # release the buffer export so the bitarray can be resized again
+
+        return self
+
     def __contains__(self, item):
         """
         Checks if an item is in the Bloom Filter.
@@ -184,15 +303,36 @@ class BloomFilter(set):  # Inherits from the set class
         Returns:
             bool: True if the item might be in the filter, False if it's definitely not.
         """
-        self._ensure_uncompressed()
-        
-        for ii in range(self.hash_count):
-            index = mmh3.hash(item, ii) % self.size
-            if self.bit_array[index] == 0:
+        bits = self._readable_bits()
+
+        for index in self._item_indexes(item):
+            if bits[index] == 0:
                 return False  # Item is definitely not in the filter
 
         return True  # Item might be in the filter (subject to false positives)
 
+    def contains_many(self, items):
+        """
+        Checks several items against the Bloom Filter in one vectorized pass.
+
+        Parameters:
+            items: Iterable of items to check.
+
+        Returns:
+            list[bool]: Per item, True if it might be in the filter, False if it's definitely not.
+        """
+        items = list(items)
+        if not items:
+            return []
+
+        bits = self._readable_bits()
+        indexes = self._batch_indexes(items)
+        offsets, masks = _byte_masks(bits, indexes.ravel())
+        view = np.frombuffer(bits, dtype=np.uint8)
+        hits = (view[offsets] & masks) != 0
+        del view
+        return hits.reshape(indexes.shape).all(axis=1).tolist()
+
 import json
 
 class BloomFilterEncoder(json.JSONEncoder):
@@ -203,6 +343,7 @@ class BloomFilterEncoder(json.JSONEncoder):
             return {
                 'size': obj.size,
                 'hash_count': obj.hash_count,
+                'hash_scheme': obj.hash_scheme,
                 'compressed_bit_array': obj.compressed_bit_array,
                 'compressed': obj.compressed,
                 '__class__': obj.__class__.__name__,
@@ -214,22 +355,25 @@ class BloomFilterEncoder(json.JSONEncoder):
 def bloom_decoder(dct):
     """
     JSON decoder for BloomFilter that handles compressed data.
-    
+
     Parameters:
         dct (dict): Dictionary to decode
-        
+
     Returns:
         BloomFilter or dict: Decoded BloomFilter or original dict
     """
     if dct.get('__class__') == 'BloomFilter':
-        # Create a new BloomFilter with the same parameters and compressed state
-        bloom = BloomFilter(dct['size'], dct['hash_count'], compressed=dct.get('compressed', False))
-        
+        # Create a new BloomFilter with the same parameters and compressed state.
+        # Filters serialized without a hash_scheme were built with seeded mmh3 hashes.
+        bloom = BloomFilter(dct['size'], dct['hash_count'], compressed=dct.get('compressed', False),
+                            hash_scheme=dct.get('hash_scheme', LEGACY_HASH_SCHEME))
+
         # Set the compressed data if available
         if 'compressed_bit_array' in dct and dct['compressed_bit_array'] is not None:
             bloom.compressed_bit_array = dct['compressed_bit_array']
             bloom.compressed = True
             bloom.bit_array = None
-        
+            bloom.clear_decompressed_cache()
+
         return bloom
-    return dct
\ No newline at end of file
+    return dct
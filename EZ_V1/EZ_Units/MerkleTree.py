@@ -1,4 +1,3 @@
-import copy
 import sys
 import os
 import re
@@ -26,93 +25,150 @@ class MerkleTreeNode:
         return str(self.value)
 
 
+class MerkleTreeProofList:
+    """Read-only, list-like view of every leaf's proof, built on first access per leaf."""
+
+    def __init__(self, tree):
+        self._tree = tree
+
+    def __len__(self):
+        return self._tree.leaf_count
+
+    def __bool__(self):
+        return self._tree.leaf_count > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._tree.get_proof(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("merkle proof index out of range")
+        return self._tree.get_proof(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._tree.get_proof(index)
+
+
 class MerkleTree:
     def __init__(self, values, values_are_hashed: Optional[bool] = None):
-        self.leaves = []
+        self.levels = []
         self.prf_list = None
+        self._contents = []
+        self._prehashed = False
+        self._leaves = None
+        self._root = None
         self.build_tree(values, values_are_hashed)
 
     def _looks_like_hash(self, value):
         return isinstance(value, str) and re.fullmatch(r"[0-9a-fA-F]{64}", value) is not None
 
     def build_tree(self, leaves, values_are_hashed: Optional[bool] = None):
+        leaves = list(leaves)
         if values_are_hashed is None:
             values_are_hashed = bool(leaves) and all(self._looks_like_hash(e) for e in leaves)
-        if values_are_hashed:
-            # Input values are already hashed, use them directly
-            leaves = [MerkleTreeNode(None, None, e, e, leaf_index=index, prehashed=True) for index, e in
-                      enumerate(leaves, start=0)]
-        else:
-            # Input values are not hashed, hash them first
-            leaves = [MerkleTreeNode(None, None, sha256_hash(e), e, leaf_index=index, prehashed=False) for index, e in
-                      enumerate(leaves, start=0)]
-
-        for item in leaves:
-            self.leaves.append(item)
+        self._contents = leaves
+        self._prehashed = bool(values_are_hashed)
+        self._leaves = None
+        self._root = None
 
         if not leaves:
-            self.root = None
+            self.levels = []
+            self.prf_list = None
             return
 
         # 修复：即使是创世块也要正常构建默克尔树，而不是简化处理
         # 创世块的特殊性应该体现在数据内容上，而不是树结构上
         # 创世块也需要完整的默克尔证明路径用于验证
 
-        org_leaves_len = len(leaves)
-        pop_leave_num = 0
-        prf_list = []
-
-        while len(leaves) > 1:
-            length = len(leaves)
+        # Each level is a flat list of hashes. Nodes are paired left to right;
+        # an odd trailing node is carried unchanged to the end of the next level.
+        level = list(leaves) if values_are_hashed else [sha256_hash(e) for e in leaves]
+        levels = [level]
+        while len(level) > 1:
+            length = len(level)
+            parents = [sha256_hash(level[i] + level[i + 1]) for i in range(0, length - 1, 2)]
+            if length % 2 == 1:
+                parents.append(level[-1])
+            levels.append(parents)
+            level = parents
+
+        self.levels = levels
+        self.prf_list = MerkleTreeProofList(self)
+
+    @property
+    def leaf_count(self):
+        return len(self.levels[0]) if self.levels else 0
+
+    def get_proof(self, leaf_index):
+        """Proof hashes for one leaf: [leaf, sibling, parent, sibling, parent, ..., root]."""
+        levels = self.levels
+        proof = [levels[0][leaf_index]]
+        position = leaf_index
+        for depth in range(len(levels) - 1):
+            level = levels[depth]
+            length = len(level)
+            if length % 2 == 1 and position == length - 1:
+                # Carried up without a sibling; contributes nothing to the proof.
+                position = length // 2
+                continue
+            proof.append(level[position ^ 1])
+            position //= 2
+            proof.append(levels[depth + 1][position])
+        return proof
+
+    @property
+    def leaves(self):
+        if self._leaves is None:
+            self._materialize_nodes()
+        return self._leaves
+
+    @property
+    def root(self):
+        if self._leaves is None:
+            self._materialize_nodes()
+        return self._root
+
+    def _materialize_nodes(self):
+        """Build the linked MerkleTreeNode view of the levels (only used by callers that walk nodes)."""
+        if not self.levels:
+            self._leaves = []
+            self._root = None
+            return
+        nodes = [
+            MerkleTreeNode(None, None, value, content, path=[], leaf_index=index, prehashed=self._prehashed)
+            for index, (value, content) in enumerate(zip(self.levels[0], self._contents))
+        ]
+        self._leaves = list(nodes)
+        # Leaf index span [begin, end) under each node; pairing keeps spans contiguous.
+        spans = [(index, index + 1) for index in range(len(nodes))]
+        for parents in self.levels[1:]:
+            length = len(nodes)
+            next_nodes = []
+            next_spans = []
             for i in range(length // 2):
-                if leaves[0].content is not None:
-                    leaves[0].path = [pop_leave_num]
-                    pop_leave_num += 1
-                left = leaves.pop(0)
-                if leaves[0].content is not None:
-                    leaves[0].path = [pop_leave_num]
-                    pop_leave_num += 1
-                right = leaves.pop(0)
-                value = sha256_hash(left.value + right.value)
-                com_path = left.path + right.path
+                left, right = nodes[2 * i], nodes[2 * i + 1]
+                span = (spans[2 * i][0], spans[2 * i + 1][1])
+                com_path = list(range(*span))
+                parent = MerkleTreeNode(left, right, parents[i], path=com_path)
                 left.path = com_path
                 right.path = com_path
-                new_mtree_node = MerkleTreeNode(left, right, value, path=com_path)
-                left.father = new_mtree_node
-                right.father = new_mtree_node
-                leaves.append(new_mtree_node)
+                left.father = parent
+                right.father = parent
+                next_nodes.append(parent)
+                next_spans.append(span)
             if length % 2 == 1:
-                leaves.append(leaves.pop(0))
-
-        self.root = leaves[0]
-
-        tmp_list = []
-        for i in range(org_leaves_len):
-            prf_list.append(copy.deepcopy(tmp_list))
-
-        def add_unit_prf_list(tmp_prf_list, now_node, round_index):
-            father = now_node.father
-            father_right_child = father.right
-            father_left_child = father.left
-            another_child = None
-            if father_right_child == now_node:
-                another_child = father_left_child
-            if father_left_child == now_node:
-                another_child = father_right_child
-            tmp_prf_list[round_index].append(another_child.value)
-            tmp_prf_list[round_index].append(father.value)
-
-        for leaf in self.leaves:
-            prf_list[leaf.leaf_index].append(leaf.value)
-            now_node = leaf
-            while now_node != self.root:
-                add_unit_prf_list(tmp_prf_list=prf_list, now_node=now_node, round_index=leaf.leaf_index)
-                now_node = now_node.father
-
-        self.prf_list = prf_list
+                next_nodes.append(nodes[-1])
+                next_spans.append(spans[-1])
+            nodes = next_nodes
+            spans = next_spans
+        self._root = nodes[0]
 
     def get_root_hash(self):
-        return self.root.value
+        if not self.levels:
+            return self.root.value
+        return self.levels[-1][0]
 
     def check_tree(self, node=None):
         if node is None:
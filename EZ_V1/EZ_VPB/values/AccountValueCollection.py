@@ -1,5 +1,7 @@
 from typing import List, Tuple, Optional, Dict
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from itertools import accumulate
 import uuid
 import sqlite3
 import json
@@ -19,6 +21,74 @@ class ValueNode:
         self.next = None
         self.prev = None
 
+class ValueRangeIndex:
+    """
+    按十进制起点排序的区间索引，用于范围/交集查询
+
+    begins/ends/node_ids为按begin排序的平行数组；ends的前缀最大值在查询时按需重建，
+    查询从最后一个begin<=查询终点的位置向前扫描，前缀最大end小于查询起点即停止。
+    """
+
+    def __init__(self):
+        self._begins: List[int] = []
+        self._ends: List[int] = []
+        self._node_ids: List[str] = []
+        self._max_end_prefix: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._node_ids)
+
+    def add(self, node_id: str, value: Value):
+        begin = value.get_decimal_begin_index()
+        position = bisect_right(self._begins, begin)
+        self._begins.insert(position, begin)
+        self._ends.insert(position, value.get_decimal_end_index())
+        self._node_ids.insert(position, node_id)
+        self._max_end_prefix = None
+
+    def remove(self, node_id: str, value: Value) -> bool:
+        begin = value.get_decimal_begin_index()
+        position = bisect_left(self._begins, begin)
+        while position < len(self._begins) and self._begins[position] == begin:
+            if self._node_ids[position] == node_id:
+                del self._begins[position]
+                del self._ends[position]
+                del self._node_ids[position]
+                self._max_end_prefix = None
+                return True
+            position += 1
+        return False
+
+    def clear(self):
+        self._begins.clear()
+        self._ends.clear()
+        self._node_ids.clear()
+        self._max_end_prefix = None
+
+    def node_ids_sorted(self) -> List[str]:
+        return list(self._node_ids)
+
+    def find_intersecting(self, start_decimal: int, end_decimal: int) -> List[str]:
+        """与[start_decimal, end_decimal]相交的node_id，按begin升序"""
+        if self._max_end_prefix is None:
+            self._max_end_prefix = list(accumulate(self._ends, max))
+        result = []
+        position = bisect_right(self._begins, end_decimal) - 1
+        while position >= 0 and self._max_end_prefix[position] >= start_decimal:
+            if self._ends[position] >= start_decimal:
+                result.append(self._node_ids[position])
+            position -= 1
+        result.reverse()
+        return result
+
+    def find_by_begin(self, begin_decimal: int) -> List[str]:
+        position = bisect_left(self._begins, begin_decimal)
+        result = []
+        while position < len(self._begins) and self._begins[position] == begin_decimal:
+            result.append(self._node_ids[position])
+            position += 1
+        return result
+
 class AccountValueCollectionStorage:
     """
     AccountValueCollection的持久化存储管理器
@@ -377,6 +447,7 @@ class AccountValueCollection:
         self._index_map = {}  # node_id到节点的映射
         self._state_index = defaultdict(set)  # 按状态快速索引
         self._decimal_begin_map = {}  # 按起始十进制值映射，用于快速查找
+        self._range_index = ValueRangeIndex()  # 按起点排序的区间索引，用于范围/交集查询
 
         # 加载现有的Value数据
         self._load_existing_values()
@@ -402,6 +473,7 @@ class AccountValueCollection:
                 self._index_map[node.node_id] = node
                 self._state_index[value.state].add(node.node_id)
                 self._decimal_begin_map[value.get_decimal_begin_index()] = node.node_id
+                self._range_index.add(node.node_id, value)
                 self.size += 1
 
         except Exception as e:
@@ -440,6 +512,7 @@ class AccountValueCollection:
             self._index_map[node.node_id] = node
             self._state_index[value.state].add(node.node_id)
             self._decimal_begin_map[value.get_decimal_begin_index()] = node.node_id
+            self._range_index.add(node.node_id, value)
             self.size += 1
 
             return True
@@ -485,6 +558,7 @@ class AccountValueCollection:
                 self._index_map[node.node_id] = node
                 self._state_index[value.state].add(node.node_id)
                 self._decimal_begin_map[value.get_decimal_begin_index()] = node.node_id
+                self._range_index.add(node.node_id, value)
 
                 node_ids.append(node.node_id)
 
@@ -516,6 +590,7 @@ class AccountValueCollection:
             decimal_begin = node.value.get_decimal_begin_index()
             if decimal_begin in self._decimal_begin_map and self._decimal_begin_map[decimal_begin] == node_id:
                 del self._decimal_begin_map[decimal_begin]
+            self._range_index.remove(node_id, node.value)
 
             # 从链表中移除节点
             if node.prev:
@@ -543,33 +618,13 @@ class AccountValueCollection:
         return [self._index_map[node_id].value for node_id in node_ids]
     
     def find_by_range(self, start_decimal: int, end_decimal: int) -> List[Value]:
-        """根据十进制范围查找Value"""
-        result = []
-        current = self.head
-        
-        while current:
-            value = current.value
-            val_start = value.get_decimal_begin_index()
-            val_end = value.get_decimal_end_index()
-            
-            if not (val_end < start_decimal or val_start > end_decimal):
-                result.append(value)
-                
-            current = current.next
-            
-        return result
+        """根据十进制范围查找Value（按起点升序）"""
+        return [self._index_map[node_id].value
+                for node_id in self._range_index.find_intersecting(start_decimal, end_decimal)]
     
     def find_intersecting_values(self, target: Value) -> List[Value]:
-        """查找与target有交集的所有Value"""
-        result = []
-        current = self.head
-        
-        while current:
-            if current.value.is_intersect_value(target):
-                result.append(current.value)
-            current = current.next
-            
-        return result
+        """查找与target有交集的所有Value（按起点升序）"""
+        return self.find_by_range(target.get_decimal_begin_index(), target.get_decimal_end_index())
     
     def split_value(self, node_id: str, change: int) -> Tuple[Optional[Value], Optional[Value]]:
         """分裂指定Value并持久化"""
@@ -591,7 +646,9 @@ class AccountValueCollection:
                 return None, None
 
             # 更新原节点为V1
+            self._range_index.remove(node.node_id, original_value)
             node.value = v1
+            self._range_index.add(node.node_id, v1)
 
             # 创建新节点存放V2
             new_node = ValueNode(v2)
@@ -613,6 +670,7 @@ class AccountValueCollection:
             self._index_map[new_node.node_id] = new_node
             self._state_index[v2.state].add(new_node.node_id)
             self._decimal_begin_map[v2.get_decimal_begin_index()] = new_node.node_id
+            self._range_index.add(new_node.node_id, v2)
             self.size += 1
 
             return v1, v2
@@ -639,7 +697,9 @@ class AccountValueCollection:
         merged_value = Value(new_begin, new_num, node1.value.state)
         
         # 更新第一个节点
+        self._range_index.remove(node_id1, node1.value)
         node1.value = merged_value
+        self._range_index.add(node_id1, merged_value)
         
         # 移除第二个节点
         self.remove_value(node_id2)
@@ -683,7 +743,7 @@ class AccountValueCollection:
     
     def get_values_sorted_by_begin_index(self) -> List[Value]:
         """按起始索引排序获取所有Value"""
-        return sorted(self.get_all_values(), key=lambda v: v.get_decimal_begin_index())
+        return [self._index_map[node_id].value for node_id in self._range_index.node_ids_sorted()]
     
     def get_balance_by_state(self, state: ValueState = ValueState.UNSPENT) -> int:
         """计算指定状态的总余额"""
@@ -718,12 +778,10 @@ class AccountValueCollection:
             current = current.next
     
     def __contains__(self, value: Value) -> bool:
-        current = self.head
-        while current:
-            if current.value.is_same_value(value):
-                return True
-            current = current.next
-        return False
+        if not isinstance(value, Value):
+            return False
+        return any(self._index_map[node_id].value.is_same_value(value)
+                   for node_id in self._range_index.find_by_begin(value.get_decimal_begin_index()))
 
     def revert_pending_to_unspent(self) -> int:
         """
@@ -885,6 +943,7 @@ class AccountValueCollection:
             self._index_map.clear()
             self._state_index.clear()
             self._decimal_begin_map.clear()
+            self._range_index.clear()
 
             return True
         except Exception as e:
@@ -966,6 +1025,7 @@ class AccountValueCollection:
                         self._index_map[node.node_id] = node
                         self._state_index[value.state].add(node.node_id)
                         self._decimal_begin_map[value.get_decimal_begin_index()] = node.node_id
+                        self._range_index.add(node.node_id, value)
                         self.size += 1
 
             if missing_in_storage:
@@ -1006,6 +1066,7 @@ class AccountValueCollection:
             self._index_map.clear()
             self._state_index.clear()
             self._decimal_begin_map.clear()
+            self._range_index.clear()
 
             # 重新加载数据
             self._load_existing_values()
@@ -12,7 +12,26 @@ class ValueState(Enum):
     VERIFIED = "verified"  # 已验证状态，表示该value已被交易的接收方成功验证通过（vpb合法性验证通过）
     CONFIRMED = "confirmed"  # 已确认状态，表示value已在主链上被确认超过制定区块数（e.g.,3块），表示该value已被用于交易
 
+_HEX_PATTERN = re.compile(r"^0x[0-9A-Fa-f]+$")
+
+
+def _decimal_bounds(target):
+    """(begin, end) of a Value, or of any object exposing hex begin_index/end_index."""
+    if isinstance(target, Value):
+        return target.get_decimal_begin_index(), target.get_decimal_end_index()
+    return int(target.begin_index, 16), int(target.end_index, 16)
+
+
 class Value:  # 针对VCB区块链的专门设计的值结构，总量2^259 = 16^65（总量暂未定）
+    """
+    begin_index/end_index是十进制整数区间的16进制视图。
+
+    整数边界在构造时解析一次并缓存，区间比较不再反复int(x, 16)；
+    直接给begin_index/end_index赋值时缓存失效，下次访问重新解析。
+    """
+
+    __slots__ = ("_begin_hex", "_end_hex", "_begin", "_end", "value_num", "state", "verified_timestamp")
+
     def __init__(self, beginIndex, valueNum, state=ValueState.UNSPENT, verified_timestamp: Optional[float] = None):  # beginIndex是16进制str，valueNum是10进制int，state是ValueState枚举
         # 输入参数验证
         if not isinstance(beginIndex, str):
@@ -29,11 +48,38 @@ class Value:  # 针对VCB区块链的专门设计的值结构，总量2^259 = 16
             raise ValueError("beginIndex must be a valid hexadecimal string starting with '0x'")
 
         # 值的开始和结束index都包含在值内
-        self.begin_index = beginIndex
-        self.value_num = valueNum
+        self._set_bounds(beginIndex, int(beginIndex, 16), valueNum)
         self.state = state
-        self.end_index = self.get_end_index(beginIndex, valueNum)
+        self._set_verified_timestamp(state, verified_timestamp)
+
+    @classmethod
+    def from_decimal(cls, begin: int, valueNum: int, state=ValueState.UNSPENT,
+                     verified_timestamp: Optional[float] = None) -> 'Value':
+        """由十进制起点构造Value，跳过16进制字符串的校验与解析"""
+        if not isinstance(begin, int) or begin < 0:
+            raise ValueError("begin must be a non-negative integer")
+        if not isinstance(valueNum, int):
+            raise TypeError("valueNum must be an integer")
+        if not isinstance(state, ValueState):
+            raise TypeError("state must be a ValueState enum")
+        if valueNum <= 0:
+            raise ValueError("valueNum must be positive")
+
+        value = cls.__new__(cls)
+        value._set_bounds(hex(begin), begin, valueNum)
+        value.state = state
+        value._set_verified_timestamp(state, verified_timestamp)
+        return value
+
+    def _set_bounds(self, begin_hex: str, begin: int, value_num: int):
+        end = begin + value_num - 1
+        self._begin_hex = begin_hex
+        self._begin = begin
+        self._end_hex = hex(end)
+        self._end = end
+        self.value_num = value_num
 
+    def _set_verified_timestamp(self, state, verified_timestamp):
         # 记录设置为VERIFIED状态的时间戳（用于自动转换为UNSPENT）
         # 如果状态为VERIFIED但没有提供时间戳，则使用当前时间
         if state == ValueState.VERIFIED and verified_timestamp is None:
@@ -41,6 +87,43 @@ class Value:  # 针对VCB区块链的专门设计的值结构，总量2^259 = 16
         else:
             self.verified_timestamp = verified_timestamp
 
+    @property
+    def begin_index(self) -> str:
+        return self._begin_hex
+
+    @begin_index.setter
+    def begin_index(self, begin_hex: str):
+        self._begin_hex = begin_hex
+        self._begin = None
+
+    @property
+    def end_index(self) -> str:
+        return self._end_hex
+
+    @end_index.setter
+    def end_index(self, end_hex: str):
+        self._end_hex = end_hex
+        self._end = None
+
+    def __getstate__(self):
+        # 与改用__slots__之前的实例字典保持同一形状，新旧pickle互相可读
+        return {
+            "begin_index": self._begin_hex,
+            "end_index": self._end_hex,
+            "value_num": self.value_num,
+            "state": self.state,
+            "verified_timestamp": self.verified_timestamp,
+        }
+
+    def __setstate__(self, state):
+        self._begin_hex = state["begin_index"]
+        self._end_hex = state["end_index"]
+        self._begin = None
+        self._end = None
+        self.value_num = state["value_num"]
+        self.state = state["state"]
+        self.verified_timestamp = state.get("verified_timestamp")
+
     def print_value(self):
         print('value #begin:' + str(self.begin_index))
         print('value #end:' + str(self.end_index))
@@ -48,18 +131,21 @@ class Value:  # 针对VCB区块链的专门设计的值结构，总量2^259 = 16
         print('value state:' + str(self.state.value))
 
     def get_decimal_begin_index(self):
-        return int(self.begin_index, 16)
+        if self._begin is None:
+            self._begin = int(self._begin_hex, 16)
+        return self._begin
 
     def get_decimal_end_index(self):
-        return int(self.end_index, 16)
+        if self._end is None:
+            self._end = int(self._end_hex, 16)
+        return self._end
 
     def split_value(self, change):  # 对此值进行分割
         # 边缘值检测
         if change <= 0 or change >= self.value_num:
             raise ValueError("Invalid change value")
         V1 = Value(self.begin_index, self.value_num - change, self.state)
-        tmpIndex = hex(V1.get_decimal_end_index() + 1)
-        V2 = Value(tmpIndex, change, self.state)
+        V2 = Value.from_decimal(V1.get_decimal_end_index() + 1, change, self.state)
         return V1, V2  # V2是找零
 
     def get_end_index(self, begin_index, value_num):
@@ -68,7 +154,7 @@ class Value:  # 针对VCB区块链的专门设计的值结构，总量2^259 = 16
         return hex(result)
 
     def _is_valid_hex(self, hex_string):
-        return re.match(r"^0x[0-9A-Fa-f]+$", hex_string) is not None
+        return _HEX_PATTERN.match(hex_string) is not None
         
     def check_value(self):  # 检测Value的合法性
         if self.value_num <= 0 or not self._is_valid_hex(self.begin_index) or not self._is_valid_hex(self.end_index):
@@ -121,8 +207,7 @@ class Value:  # 针对VCB区块链的专门设计的值结构，总量2^259 = 16
     def get_intersect_value(self, target):  # target是Value类型, 获取和target有交集的值的部分
         decimal_begin = self.get_decimal_begin_index()
         decimal_end = self.get_decimal_end_index()
-        decimal_target_begin = int(target.begin_index, 16)
-        decimal_target_end = int(target.end_index, 16)
+        decimal_target_begin, decimal_target_end = _decimal_bounds(target)
         
         intersect_begin = max(decimal_target_begin, decimal_begin)
         intersect_end = min(decimal_target_end, decimal_end)
@@ -130,28 +215,26 @@ class Value:  # 针对VCB区块链的专门设计的值结构，总量2^259 = 16
         if intersect_begin > intersect_end:
             return None
             
-        intersect_value = Value(hex(intersect_begin), intersect_end - intersect_begin + 1)
+        intersect_value = Value.from_decimal(intersect_begin, intersect_end - intersect_begin + 1)
         
         rest_values = []
         if decimal_begin < intersect_begin:
-            rest_values.append(Value(hex(decimal_begin), intersect_begin - decimal_begin))
+            rest_values.append(Value.from_decimal(decimal_begin, intersect_begin - decimal_begin))
         if intersect_end < decimal_end:
-            rest_values.append(Value(hex(intersect_end + 1), decimal_end - intersect_end))
+            rest_values.append(Value.from_decimal(intersect_end + 1, decimal_end - intersect_end))
             
         return (intersect_value, rest_values)
 
     def is_intersect_value(self, target):  # target是Value类型, 判断target是否和本value有交集
         decimal_begin = self.get_decimal_begin_index()
         decimal_end = self.get_decimal_end_index()
-        decimal_target_begin = int(target.begin_index, 16)
-        decimal_target_end = int(target.end_index, 16)
+        decimal_target_begin, decimal_target_end = _decimal_bounds(target)
         return decimal_end >= decimal_target_begin and decimal_target_end >= decimal_begin
 
     def is_in_value(self, target):  # target是Value类型, 判断target是否在本value内
         decimal_begin = self.get_decimal_begin_index()
         decimal_end = self.get_decimal_end_index()
-        decimal_target_begin = int(target.begin_index, 16)
-        decimal_target_end = int(target.end_index, 16)
+        decimal_target_begin, decimal_target_end = _decimal_bounds(target)
         return decimal_target_begin >= decimal_begin and decimal_target_end <= decimal_end
 
     def is_same_value(self, target):  # target是Value类型, 判断target是否就是本value
@@ -38,6 +38,7 @@ from .types import (
     PendingBundleContext,
     Checkpoint,
     CheckpointAnchor,
+    CompressedSparseMerkleProof,
     ConfirmedBundleUnit,
     DiffEntry,
     DiffPackage,
@@ -56,11 +57,16 @@ from .types import (
     WitnessV2,
 )
 from .validator import V2TransferValidator, ValidationContext, ValidationResult
-from .values import LocalValueStatus, LocalValueRecord, ValueRange
+from .values import LocalValueStatus, LocalValueRecord, ValueRange, ValueRecordIndex
+from .selection import CoinSelector, SelectionCandidate, SelectionPlan
+from .checkpoint_policy import CheckpointPolicy, WitnessSizeStats
+from .transfer_cost import OutputCostEstimate, PaymentCostEstimate
 from .storage import LocalWalletDB
 from .consensus_store import ConsensusStateMetadata, ConsensusStateStore
 from .app_client import (
+    V2ConfirmedBatchBundle,
     V2ConfirmedPayment,
+    V2ConfirmedPaymentBatch,
     V2LocalAppClient,
     V2LocalAppSession,
     V2ReceivedTransferEvent,
@@ -83,8 +89,10 @@ from .networking import (
     ChainSyncCursor,
     ConsensusAdapter,
     FEATURE_CLAIM_SET_V1,
+    FEATURE_COMPRESSED_SMT_PROOF_V1,
     FEATURE_RECEIPT_INDEX_PULL_V1,
     FEATURE_RECEIPT_MULTIPROOF_V1,
+    FEATURE_RECEIPT_SUBSCRIBE_V1,
     NetworkEnvelope,
     PeerInfo,
     ReceiptSyncCursor,
@@ -117,6 +125,7 @@ __all__ = [
     "CheckpointAnchor",
     "ClaimRangeSet",
     "ChainSyncCursor",
+    "CompressedSparseMerkleProof",
     "ConfirmedBundleUnit",
     "ConsensusRuntimeSnapshot",
     "ConsensusAdapter",
@@ -159,7 +168,9 @@ __all__ = [
     "StaticPeerNetwork",
     "V2AccountHost",
     "V2AccountNode",
+    "V2ConfirmedBatchBundle",
     "V2ConfirmedPayment",
+    "V2ConfirmedPaymentBatch",
     "V2ConsensusHost",
     "V2ConsensusNode",
     "V2LocalAppClient",
@@ -172,6 +183,14 @@ __all__ = [
     "V2Runtime",
     "V2TransferValidator",
     "ValueRange",
+    "ValueRecordIndex",
+    "CoinSelector",
+    "SelectionCandidate",
+    "SelectionPlan",
+    "CheckpointPolicy",
+    "WitnessSizeStats",
+    "OutputCostEstimate",
+    "PaymentCostEstimate",
     "WitnessV2",
     "address_from_public_key_pem",
     "build_claim_range_set",
@@ -195,8 +214,10 @@ __all__ = [
     "decode_envelope",
     "encode_envelope",
     "FEATURE_CLAIM_SET_V1",
+    "FEATURE_COMPRESSED_SMT_PROOF_V1",
     "FEATURE_RECEIPT_INDEX_PULL_V1",
     "FEATURE_RECEIPT_MULTIPROOF_V1",
+    "FEATURE_RECEIPT_SUBSCRIBE_V1",
     "peer_features",
     "peer_supports",
 ]
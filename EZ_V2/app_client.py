@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Callable, ContextManager, Mapping, Sequence
 
 from .control import read_backend_metadata
 from .localnet import SubmittedPayment, V2AccountNode, V2ConsensusNode
 from .runtime_v2 import ReceiptDeliveryResult
-from .transport import TransferMailboxStore
-from .types import OffChainTx, Receipt
+from .transport import TransferMailboxStore, pending_package_cursor
+from .types import BundleSubmission, OffChainTx, Receipt
 from .values import ValueRange
 from .wallet import WalletAccountV2
 
+DEFAULT_MAILBOX_PAGE_SIZE = 256
+
 
 @dataclass(frozen=True, slots=True)
 class V2ReceivedTransferEvent:
@@ -29,6 +33,20 @@ class V2ConfirmedPayment:
     receipt: Receipt | None
 
 
+@dataclass(frozen=True, slots=True)
+class V2ConfirmedBatchBundle:
+    submission: BundleSubmission
+    target_txs: tuple[OffChainTx, ...]
+    receipt: Receipt | None
+
+
+@dataclass(frozen=True, slots=True)
+class V2ConfirmedPaymentBatch:
+    bundles: tuple[V2ConfirmedBatchBundle, ...]
+    unsent_txs: tuple[OffChainTx, ...] = ()
+    error: str | None = None
+
+
 @dataclass(frozen=True, slots=True)
 class V2WalletRecovery:
     receipt_results: tuple[ReceiptDeliveryResult, ...]
@@ -49,7 +67,13 @@ class V2LocalAppSession:
         chain_id: int,
         genesis_block_hash: bytes,
         auto_confirm_receipts: bool = True,
+        validation_workers: int = 0,
+        mailbox_page_size: int = DEFAULT_MAILBOX_PAGE_SIZE,
     ):
+        if validation_workers < 0:
+            raise ValueError("validation_workers must be non-negative")
+        if mailbox_page_size <= 0:
+            raise ValueError("mailbox_page_size must be positive")
         self.wallet_identity = dict(wallet_identity)
         self.backend_dir = Path(backend_dir)
         self.backend_dir.mkdir(parents=True, exist_ok=True)
@@ -76,12 +100,18 @@ class V2LocalAppSession:
             consensus=self.consensus,
         )
         self.mailbox = TransferMailboxStore(str(self.backend_dir / "transfer_mailbox.sqlite3"))
+        self.mailbox_page_size = mailbox_page_size
+        self.validation_workers = validation_workers
+        self._validation_executor: ProcessPoolExecutor | None = None
 
     @property
     def address(self) -> str:
         return self.wallet.address
 
     def close(self) -> None:
+        if self._validation_executor is not None:
+            self._validation_executor.shutdown(wait=False, cancel_futures=True)
+            self._validation_executor = None
         try:
             self.mailbox.close()
         finally:
@@ -96,34 +126,48 @@ class V2LocalAppSession:
         return ()
 
     def sync_incoming_transfers(self) -> tuple[V2ReceivedTransferEvent, ...]:
-        pending_packages = list(self.mailbox.list_pending_packages(self.address))
-        pending_packages.sort(
-            key=lambda item: (
-                item[3].witness_v2.confirmed_bundle_chain[0].receipt.header_lite.height
-                if item[3].witness_v2.confirmed_bundle_chain else -1,
-                item[2],
-                item[0],
-            )
-        )
+        """Drain the mailbox in height order, one page-sized batch at a time.
+
+        Packages that fail validation stay pending and are paged past, so they
+        never block the packages behind them.
+        """
         accepted_events: list[V2ReceivedTransferEvent] = []
-        for package_hash, sender_addr, _, package in pending_packages:
-            result = self.account_node.receive_transfer_package(package)
-            if result.accepted and result.record is not None:
-                accepted_events.append(
-                    V2ReceivedTransferEvent(
-                        package_hash=package_hash,
-                        sender_addr=sender_addr,
-                        recipient_addr=self.address,
-                        target_tx=package.target_tx,
-                        target_value=package.target_value,
+        cursor = None
+        while True:
+            page = self.mailbox.list_pending_packages(self.address, limit=self.mailbox_page_size, after=cursor)
+            if not page:
+                break
+            cursor = pending_package_cursor(page[-1])
+            results = self.account_node.receive_transfer_packages(
+                [package for _, _, _, package in page],
+                executor=self._validation_pool(),
+            )
+            claimed: list[bytes] = []
+            for (package_hash, sender_addr, _, package), result in zip(page, results):
+                if result.accepted and result.record is not None:
+                    accepted_events.append(
+                        V2ReceivedTransferEvent(
+                            package_hash=package_hash,
+                            sender_addr=sender_addr,
+                            recipient_addr=self.address,
+                            target_tx=package.target_tx,
+                            target_value=package.target_value,
+                        )
                     )
-                )
-                self.mailbox.mark_claimed(package_hash, claimed_at=int(time.time()))
-                continue
-            if result.error == "transfer package already accepted":
-                self.mailbox.mark_claimed(package_hash, claimed_at=int(time.time()))
+                    claimed.append(package_hash)
+                elif result.error == "transfer package already accepted":
+                    claimed.append(package_hash)
+            if claimed:
+                self.mailbox.mark_claimed_many(claimed, claimed_at=int(time.time()))
+            if len(page) < self.mailbox_page_size:
+                break
         return tuple(accepted_events)
 
+    def _validation_pool(self) -> ProcessPoolExecutor | None:
+        if self.validation_workers and self._validation_executor is None:
+            self._validation_executor = ProcessPoolExecutor(max_workers=self.validation_workers)
+        return self._validation_executor
+
     def recover_wallet_state(self) -> V2WalletRecovery:
         receipt_results = self.sync_receipts()
         received_events = self.sync_incoming_transfers()
@@ -157,6 +201,7 @@ class V2LocalAppSession:
         expiry_height: int,
         fee: int = 0,
         anti_spam_nonce: int | None = None,
+        stage_timer: Callable[[str], ContextManager[Any]] | None = None,
     ) -> V2ConfirmedPayment:
         submitted = self.account_node.submit_payment(
             recipient_addr,
@@ -164,19 +209,73 @@ class V2LocalAppSession:
             fee=fee,
             expiry_height=expiry_height,
             anti_spam_nonce=anti_spam_nonce,
+            stage_timer=stage_timer,
         )
-        produced = self.consensus.produce_block()
-        delivery = produced.deliveries.get(self.address)
-        if delivery is None:
-            raise RuntimeError("sender_receipt_delivery_missing")
-        if not delivery.applied:
-            self.sync_receipts()
-            if self.wallet.list_pending_bundles():
-                raise RuntimeError(f"sender_receipt_not_applied:{delivery.error or 'unknown'}")
-        receipt = delivery.receipt or self.consensus.get_receipt(self.address, submitted.submission.envelope.seq).receipt
+        receipt = self._produce_sender_receipt(submitted.submission.envelope.seq, stage_timer)
         self.queue_outgoing_transfer_packages(submitted.target_tx)
         return V2ConfirmedPayment(submitted=submitted, receipt=receipt)
 
+    def _produce_sender_receipt(
+        self,
+        seq: int,
+        stage_timer: Callable[[str], ContextManager[Any]] | None = None,
+    ) -> Receipt | None:
+        with stage_timer("receipt_wait") if stage_timer is not None else nullcontext():
+            produced = self.consensus.produce_block()
+            delivery = produced.deliveries.get(self.address)
+            if delivery is None:
+                raise RuntimeError("sender_receipt_delivery_missing")
+            if not delivery.applied:
+                self.sync_receipts()
+                if self.wallet.list_pending_bundles():
+                    raise RuntimeError(f"sender_receipt_not_applied:{delivery.error or 'unknown'}")
+            return delivery.receipt or self.consensus.get_receipt(self.address, seq).receipt
+
+    def submit_confirmed_payment_batch(
+        self,
+        *,
+        payments: Sequence[tuple[str, int]],
+        expiry_height: int,
+        fee: int = 0,
+        stage_timer: Callable[[str], ContextManager[Any]] | None = None,
+    ) -> V2ConfirmedPaymentBatch:
+        """Pay many recipients with as few bundles as the pool limits allow.
+
+        The mempool keeps one bundle per sender, so bundles go out one block at
+        a time. If a later bundle fails, the confirmed ones are returned along
+        with the txs that were never sent.
+        """
+        pool = self.consensus.chain.bundle_pool
+        with stage_timer("bundle_plan") if stage_timer is not None else nullcontext():
+            plan = self.wallet.plan_payment_batch(
+                payments,
+                max_tx_per_bundle=pool.max_tx_per_bundle,
+                max_value_entries_per_tx=pool.max_value_entries_per_tx,
+                max_bundle_bytes=pool.max_bundle_bytes,
+            )
+        confirmed: list[V2ConfirmedBatchBundle] = []
+        for index, tx_list in enumerate(plan):
+            try:
+                submission = self.account_node.submit_bundle(
+                    tx_list,
+                    fee=fee,
+                    expiry_height=expiry_height,
+                    stage_timer=stage_timer,
+                )
+                receipt = self._produce_sender_receipt(submission.envelope.seq, stage_timer)
+            except Exception as exc:
+                if not confirmed:
+                    raise
+                return V2ConfirmedPaymentBatch(
+                    bundles=tuple(confirmed),
+                    unsent_txs=tuple(tx for remaining in plan[index:] for tx in remaining),
+                    error=str(exc),
+                )
+            for tx in tx_list:
+                self.queue_outgoing_transfer_packages(tx)
+            confirmed.append(V2ConfirmedBatchBundle(submission=submission, target_txs=tx_list, receipt=receipt))
+        return V2ConfirmedPaymentBatch(bundles=tuple(confirmed))
+
     def register_genesis_value(self, value: ValueRange) -> None:
         self.wallet.add_genesis_value(value)
         self.consensus.register_genesis_allocation(self.address, value)
@@ -207,6 +306,7 @@ class V2LocalAppClient:
         wallet_identity: Mapping[str, Any],
         wallet_db_path: str,
         auto_confirm_receipts: bool = True,
+        validation_workers: int = 0,
     ) -> V2LocalAppSession:
         return V2LocalAppSession(
             wallet_identity=wallet_identity,
@@ -215,4 +315,5 @@ class V2LocalAppClient:
             chain_id=self.chain_id,
             genesis_block_hash=self.genesis_block_hash,
             auto_confirm_receipts=auto_confirm_receipts,
+            validation_workers=validation_workers,
         )
@@ -28,6 +28,9 @@ from .types import (
 ZERO_HASH32 = b"\x00" * 32
 EMPTY_DIFF_ROOT = keccak256(b"EZCHAIN_EMPTY_DIFF_ROOT_V2")
 MERKLE_EMPTY = keccak256(b"EZCHAIN_EMPTY_MERKLE_V2")
+DEFAULT_MAX_BUNDLE_BYTES = 32_768
+DEFAULT_MAX_TX_PER_BUNDLE = 128
+DEFAULT_MAX_VALUE_ENTRIES_PER_TX = 64
 
 
 def merkle_root(leaf_hashes: Iterable[bytes], domain: bytes = b"EZCHAIN_MERKLE_NODE_V2") -> bytes:
@@ -214,9 +217,9 @@ class BundlePool:
     def __init__(
         self,
         chain_id: int,
-        max_bundle_bytes: int = 32_768,
-        max_tx_per_bundle: int = 128,
-        max_value_entries_per_tx: int = 64,
+        max_bundle_bytes: int = DEFAULT_MAX_BUNDLE_BYTES,
+        max_tx_per_bundle: int = DEFAULT_MAX_TX_PER_BUNDLE,
+        max_value_entries_per_tx: int = DEFAULT_MAX_VALUE_ENTRIES_PER_TX,
     ):
         self.chain_id = chain_id
         self.max_bundle_bytes = max_bundle_bytes
@@ -304,9 +307,9 @@ class ChainStateV2:
         version: int = 2,
         chain_id: int = 1,
         receipt_cache_blocks: int = 32,
-        max_bundle_bytes: int = 32_768,
-        max_tx_per_bundle: int = 128,
-        max_value_entries_per_tx: int = 64,
+        max_bundle_bytes: int = DEFAULT_MAX_BUNDLE_BYTES,
+        max_tx_per_bundle: int = DEFAULT_MAX_TX_PER_BUNDLE,
+        max_value_entries_per_tx: int = DEFAULT_MAX_VALUE_ENTRIES_PER_TX,
         genesis_block_hash: bytes = ZERO_HASH32,
     ):
         self.version = version
@@ -485,7 +488,7 @@ class ChainStateV2:
             )
             self.receipt_cache.add_proof_batch(height, proof_batch)
         for entry in entries:
-            proof = temp_tree.prove(entry.addr_key)
+            proof = temp_tree.prove_compressed(entry.addr_key)
             receipt = Receipt(
                 header_lite=HeaderLite(height=height, block_hash=block_hash, state_root=state_root),
                 seq=entry.bundle_envelope.seq,
@@ -587,7 +590,7 @@ class ChainStateV2:
             )
             self.receipt_cache.add_proof_batch(block.header.height, proof_batch)
         for entry in entries:
-            proof = temp_tree.prove(entry.addr_key)
+            proof = temp_tree.prove_compressed(entry.addr_key)
             leaf_hash = hash_account_leaf(entry.new_leaf)
             if not verify_proof(block.header.state_root, entry.addr_key, leaf_hash, proof):
                 raise ValueError("generated receipt proof does not verify")
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Sequence
+
+
+@dataclass(frozen=True, slots=True)
+class CheckpointPolicy:
+    """Thresholds after which a spendable record gets an automatic exact checkpoint.
+
+    Any threshold that is set and reached makes a record due; ``None`` disables it.
+    Units and age are counted from the record's latest checkpoint (or, without
+    one, from the start of its witness and its acquisition height).
+    """
+
+    max_witness_units: int | None = None
+    max_witness_bytes: int | None = None
+    max_age_blocks: int | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("max_witness_units", "max_witness_bytes", "max_age_blocks"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+
+    @property
+    def enabled(self) -> bool:
+        return any(
+            value is not None
+            for value in (self.max_witness_units, self.max_witness_bytes, self.max_age_blocks)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class WitnessSizeStats:
+    record_count: int
+    checkpoint_count: int
+    units_p50: int
+    units_p90: int
+    units_max: int
+    bytes_p50: int
+    bytes_p90: int
+    bytes_max: int
+    bytes_total: int
+
+    def to_dict(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _nearest_rank(ordered: Sequence[int], q: float) -> int:
+    if not ordered:
+        return 0
+    index = max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize_witness_sizes(units: Sequence[int], sizes: Sequence[int], checkpoint_count: int) -> WitnessSizeStats:
+    ordered_units = sorted(units)
+    ordered_sizes = sorted(sizes)
+    return WitnessSizeStats(
+        record_count=len(ordered_units),
+        checkpoint_count=checkpoint_count,
+        units_p50=_nearest_rank(ordered_units, 0.50),
+        units_p90=_nearest_rank(ordered_units, 0.90),
+        units_max=ordered_units[-1] if ordered_units else 0,
+        bytes_p50=_nearest_rank(ordered_sizes, 0.50),
+        bytes_p90=_nearest_rank(ordered_sizes, 0.90),
+        bytes_max=ordered_sizes[-1] if ordered_sizes else 0,
+        bytes_total=sum(ordered_sizes),
+    )
@@ -7,7 +7,7 @@ from typing import Mapping
 
 from .chain import ZERO_HASH32, ChainStateV2, compute_addr_key
 from .serde import dumps_json, loads_json
-from .smt import materialize_proof
+from .smt import compress_proof, materialize_proof
 from .types import BlockV2, BundleRef, Receipt, ReceiptProofBatch, ReceiptProofRef, ReceiptResponse
 from .values import ValueRange
 
@@ -28,7 +28,7 @@ def _compact_receipt_with_batch(
         return receipt
     key = compute_addr_key(sender_addr)
     materialized = materialize_proof(proof_batch.multi_proof, key)
-    if materialized != receipt.account_state_proof:
+    if compress_proof(materialized) != compress_proof(receipt.account_state_proof):
         return receipt
     return replace(
         receipt,
@@ -45,7 +45,7 @@ def _materialize_receipt_with_lookup(receipt: Receipt, lookup_batch) -> Receipt:
         return receipt
     return replace(
         receipt,
-        account_state_proof=materialize_proof(proof_batch.multi_proof, receipt.proof_batch_ref.key),
+        account_state_proof=compress_proof(materialize_proof(proof_batch.multi_proof, receipt.proof_batch_ref.key)),
         proof_batch_ref=None,
     )
 
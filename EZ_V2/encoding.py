@@ -34,6 +34,7 @@ def canonicalize(obj: Any) -> Any:
         return {
             field.name: canonicalize(getattr(obj, field.name))
             for field in fields(obj)
+            if field.init
         }
     if isinstance(obj, (list, tuple)):
         return [canonicalize(item) for item in obj]
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import time
+import uuid
+from concurrent.futures import Executor
+from contextlib import nullcontext
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable, ContextManager, Sequence
 
 from .chain import ZERO_HASH32
 from .consensus_store import ConsensusStateStore
@@ -62,21 +66,24 @@ class V2AccountNode:
         expiry_height: int = 1_000_000,
         anti_spam_nonce: int | None = None,
         tx_time: int | None = None,
+        stage_timer: Callable[[str], ContextManager[Any]] | None = None,
     ) -> SubmittedPayment:
         if self.consensus is None:
             raise ValueError("consensus_not_attached")
-        submission, _, tx = self.wallet.build_payment_bundle(
-            recipient_addr=recipient_addr,
-            amount=amount,
-            private_key_pem=self.private_key_pem,
-            public_key_pem=self.public_key_pem,
-            chain_id=self.chain_id,
-            expiry_height=expiry_height,
-            fee=fee,
-            anti_spam_nonce=anti_spam_nonce,
-            tx_time=tx_time,
-        )
-        self.consensus.submit_bundle(submission)
+        with stage_timer("bundle_build") if stage_timer is not None else nullcontext():
+            submission, _, tx = self.wallet.build_payment_bundle(
+                recipient_addr=recipient_addr,
+                amount=amount,
+                private_key_pem=self.private_key_pem,
+                public_key_pem=self.public_key_pem,
+                chain_id=self.chain_id,
+                expiry_height=expiry_height,
+                fee=fee,
+                anti_spam_nonce=anti_spam_nonce,
+                tx_time=tx_time,
+            )
+        with stage_timer("submit") if stage_timer is not None else nullcontext():
+            self.consensus.submit_bundle(submission)
         return SubmittedPayment(
             sender_name=self.name,
             recipient_addr=recipient_addr,
@@ -84,6 +91,36 @@ class V2AccountNode:
             target_tx=tx,
         )
 
+    def submit_bundle(
+        self,
+        tx_list: tuple[OffChainTx, ...],
+        *,
+        fee: int = 0,
+        expiry_height: int = 1_000_000,
+        anti_spam_nonce: int | None = None,
+        stage_timer: Callable[[str], ContextManager[Any]] | None = None,
+    ) -> BundleSubmission:
+        if self.consensus is None:
+            raise ValueError("consensus_not_attached")
+        with stage_timer("bundle_build") if stage_timer is not None else nullcontext():
+            submission, context = self.wallet.build_bundle(
+                tx_list=tx_list,
+                private_key_pem=self.private_key_pem,
+                public_key_pem=self.public_key_pem,
+                chain_id=self.chain_id,
+                seq=self.wallet.next_sequence(),
+                expiry_height=expiry_height,
+                fee=fee,
+                anti_spam_nonce=(uuid.uuid4().int & ((1 << 63) - 1)) if anti_spam_nonce is None else anti_spam_nonce,
+            )
+        with stage_timer("submit") if stage_timer is not None else nullcontext():
+            try:
+                self.consensus.submit_bundle(submission)
+            except Exception:
+                self.wallet.rollback_pending_bundle(context.seq)
+                raise
+        return submission
+
     def sync_receipts(self) -> tuple[ReceiptDeliveryResult, ...]:
         if self.consensus is None:
             raise ValueError("consensus_not_attached")
@@ -123,6 +160,16 @@ class V2AccountNode:
             trusted_checkpoints=trusted_checkpoints,
         )
 
+    def receive_transfer_packages(
+        self,
+        packages: Sequence[TransferPackage],
+        *,
+        executor: Executor | None = None,
+    ) -> tuple[TransferDeliveryResult, ...]:
+        if self.consensus is None:
+            raise ValueError("consensus_not_attached")
+        return self.consensus.deliver_transfer_packages(packages, self.address, executor=executor)
+
     def close(self) -> None:
         self.wallet.close()
 
@@ -280,6 +327,20 @@ class V2ConsensusNode:
             trusted_checkpoints=trusted_checkpoints,
         )
 
+    def deliver_transfer_packages(
+        self,
+        packages: Sequence[TransferPackage],
+        recipient_addr: str,
+        trusted_checkpoints=(),
+        executor: Executor | None = None,
+    ) -> tuple[TransferDeliveryResult, ...]:
+        return self.runtime.deliver_transfer_packages(
+            packages,
+            recipient_addr,
+            trusted_checkpoints=trusted_checkpoints,
+            executor=executor,
+        )
+
 
 class V2LocalNetwork:
     def __init__(
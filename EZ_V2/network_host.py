@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import secrets
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 import threading
@@ -23,12 +24,21 @@ from .consensus import (
 )
 from .consensus.store import SQLiteConsensusStore
 from .chain import compute_addr_key
-from .crypto import derive_secp256k1_keypair_from_mnemonic, generate_secp256k1_keypair, keccak256
+from .crypto import (
+    address_from_public_key_pem,
+    derive_secp256k1_keypair_from_mnemonic,
+    generate_secp256k1_keypair,
+    keccak256,
+    sign_message_secp256k1,
+    verify_message_secp256k1,
+)
 from .encoding import canonical_encode
 from .localnet import V2ConsensusNode
 from .networking import (
+    FEATURE_COMPRESSED_SMT_PROOF_V1,
     FEATURE_RECEIPT_INDEX_PULL_V1,
     FEATURE_RECEIPT_MULTIPROOF_V1,
+    FEATURE_RECEIPT_SUBSCRIBE_V1,
     MSG_BLOCK_ANNOUNCE,
     MSG_BLOCK_FETCH_REQ,
     MSG_BLOCK_FETCH_RESP,
@@ -47,19 +57,21 @@ from .networking import (
     MSG_RECEIPT_DELIVER,
     MSG_RECEIPT_REQ,
     MSG_RECEIPT_RESP,
+    MSG_RECEIPT_SUBSCRIBE,
     MSG_TRANSFER_PACKAGE_DELIVER,
     ChainSyncCursor,
     ConsensusAdapter,
     NetworkEnvelope,
     PeerInfo,
+    ReceiptSyncCursor,
     TransferMailboxEvent,
     peer_supports,
     with_v2_features,
 )
 from .runtime_v2 import V2Runtime
 from .serde import dumps_json, loads_json
-from .smt import materialize_proof
-from .transport import transfer_package_hash
+from .smt import compress_proof, expand_proof, materialize_proof
+from .transport import package_with_proofs, receipt_with_proof, transfer_package_hash
 from .types import (
     BlockV2,
     BundleSubmission,
@@ -70,9 +82,10 @@ from .types import (
     Receipt,
     ReceiptProofBatch,
     ReceiptProofRef,
+    TransferPackage,
 )
 from .values import ValueRange
-from .wallet import WalletAccountV2
+from .wallet import DEFAULT_MAX_PENDING_BUNDLES, WalletAccountV2
 
 
 class StaticPeerNetwork:
@@ -84,6 +97,9 @@ class StaticPeerNetwork:
         self._peers[peer.node_id] = peer
         self._handlers[peer.node_id] = handler
 
+    def add_peer(self, peer: PeerInfo) -> None:
+        self._peers.setdefault(peer.node_id, peer)
+
     def peer_info(self, node_id: str) -> PeerInfo:
         peer = self._peers.get(node_id)
         if peer is None:
@@ -198,6 +214,41 @@ class PendingConsensusPreview:
     sender_peer_ids: dict[str, str]
 
 
+RECEIPT_SUBSCRIBE_DOMAIN = b"EZCHAIN_V2_RECEIPT_SUBSCRIBE"
+
+
+def _receipt_subscribe_message(*, chain_id: int, subscriber_id: str, cursor: ReceiptSyncCursor) -> bytes:
+    # Binding the subscriber's node id means a captured request cannot move
+    # the address's receipt stream to some other peer.
+    return canonical_encode(
+        {
+            "chain_id": int(chain_id),
+            "subscriber_id": subscriber_id,
+            "sender_addr": cursor.sender_addr,
+            "next_seq": int(cursor.next_seq),
+        }
+    )
+
+
+def _peer_info_or_none(network: Any, peer_id: str) -> PeerInfo | None:
+    try:
+        return network.peer_info(peer_id)
+    except Exception:
+        return None
+
+
+def _receipt_for_peer(receipt: Receipt, peer: PeerInfo | None) -> Receipt:
+    if peer_supports(peer, FEATURE_COMPRESSED_SMT_PROOF_V1):
+        return receipt
+    return receipt_with_proof(receipt, expand_proof)
+
+
+def _package_for_peer(package: TransferPackage, peer: PeerInfo | None) -> TransferPackage:
+    if peer_supports(peer, FEATURE_COMPRESSED_SMT_PROOF_V1):
+        return package
+    return package_with_proofs(package, expand_proof)
+
+
 def _mvp_cluster_secret_path(*, store_path: str, chain_id: int) -> Path:
     store = Path(store_path)
     return store.parent / f".ezchain_v2_mvp_cluster_secret.chain{int(chain_id)}.hex"
@@ -298,6 +349,9 @@ class V2ConsensusHost:
         self.auto_run_mvp_consensus_window_sec = max(0.0, float(auto_run_mvp_consensus_window_sec))
         self.fetched_blocks: dict[int, BlockV2] = {}
         self.fetched_blocks_by_hash: dict[str, BlockV2] = {}
+        self._fetched_block_cond = threading.Condition()
+        self._receipt_subscriptions: dict[str, str] = {}
+        self._receipt_subscription_lock = threading.Lock()
         self._pending_previews: dict[str, PendingConsensusPreview] = {}
         self._mvp_sortition_claims: dict[tuple[int, int, bytes], Any] = {}
         self._auto_run_snapshot_key: bytes | None = None
@@ -408,6 +462,7 @@ class V2ConsensusHost:
         if block is None:
             return None
         self._broadcast_block_announce(block)
+        self._push_subscribed_receipts(block)
         return block
 
     def handle_envelope(self, envelope: NetworkEnvelope) -> dict[str, Any] | None:
@@ -415,6 +470,8 @@ class V2ConsensusHost:
             return self._on_bundle_submit(envelope)
         if envelope.msg_type == MSG_RECEIPT_REQ:
             return self._on_receipt_request(envelope)
+        if envelope.msg_type == MSG_RECEIPT_SUBSCRIBE:
+            return self._on_receipt_subscribe(envelope)
         if envelope.msg_type == MSG_BLOCK_FETCH_REQ:
             return self._on_block_fetch_request(envelope)
         if envelope.msg_type == MSG_BLOCK_FETCH_RESP:
@@ -473,7 +530,7 @@ class V2ConsensusHost:
         block = self.produce_pending_block()
         if block is None:
             return {"ok": True, "status": "accepted_no_block"}
-        if self.auto_dispatch_receipts:
+        if self.auto_dispatch_receipts and not self._has_receipt_subscriber(result.sender_addr, envelope.sender_id):
             receipt = self.consensus.get_receipt(result.sender_addr, result.seq).receipt
             if receipt is not None:
                 try:
@@ -482,7 +539,7 @@ class V2ConsensusHost:
                             msg_type=MSG_RECEIPT_DELIVER,
                             sender_id=self.peer.node_id,
                             recipient_id=envelope.sender_id,
-                            payload={"receipt": receipt},
+                            payload={"receipt": _receipt_for_peer(receipt, _peer_info_or_none(self.network, envelope.sender_id))},
                         )
                     )
                 except Exception:
@@ -522,6 +579,28 @@ class V2ConsensusHost:
         round_result["forwarded"] = True
         return round_result
 
+    def _receipt_payload_for_peer(self, sender_addr: str, receipt: Receipt, peer_id: str) -> dict[str, Any]:
+        recipient_peer = _peer_info_or_none(self.network, peer_id)
+        if not peer_supports(recipient_peer, FEATURE_RECEIPT_MULTIPROOF_V1):
+            return {"receipt": _receipt_for_peer(receipt, recipient_peer)}
+        batch_id = f"{receipt.header_lite.height}:{receipt.header_lite.block_hash.hex()}"
+        proof_batch = self.consensus.get_receipt_proof_batch(batch_id)
+        if proof_batch is None:
+            raise ValueError("receipt proof batch missing")
+        return {
+            "receipt": Receipt(
+                header_lite=receipt.header_lite,
+                seq=receipt.seq,
+                prev_ref=receipt.prev_ref,
+                claim_set_hash=receipt.claim_set_hash,
+                proof_batch_ref=ReceiptProofRef(
+                    batch_id=proof_batch.batch_id,
+                    key=compute_addr_key(sender_addr),
+                ),
+            ),
+            "proof_batch": proof_batch,
+        }
+
     def _on_receipt_request(self, envelope: NetworkEnvelope) -> dict[str, Any]:
         sender_addr = str(envelope.payload["sender_addr"])
         seq = int(envelope.payload["seq"])
@@ -529,29 +608,7 @@ class V2ConsensusHost:
         receipt = response.receipt
         payload: dict[str, Any] = {"status": response.status, "sender_addr": sender_addr, "seq": seq}
         if receipt is not None:
-            recipient_peer = None
-            try:
-                recipient_peer = self.network.peer_info(envelope.sender_id)
-            except Exception:
-                recipient_peer = None
-            if peer_supports(recipient_peer, FEATURE_RECEIPT_MULTIPROOF_V1):
-                batch_id = f"{receipt.header_lite.height}:{receipt.header_lite.block_hash.hex()}"
-                proof_batch = self.consensus.get_receipt_proof_batch(batch_id)
-                if proof_batch is None:
-                    raise ValueError("receipt proof batch missing")
-                payload["receipt"] = Receipt(
-                    header_lite=receipt.header_lite,
-                    seq=receipt.seq,
-                    prev_ref=receipt.prev_ref,
-                    claim_set_hash=receipt.claim_set_hash,
-                    proof_batch_ref=ReceiptProofRef(
-                        batch_id=proof_batch.batch_id,
-                        key=compute_addr_key(sender_addr),
-                    ),
-                )
-                payload["proof_batch"] = proof_batch
-            else:
-                payload["receipt"] = receipt
+            payload.update(self._receipt_payload_for_peer(sender_addr, receipt, envelope.sender_id))
         self.network.send(
             NetworkEnvelope(
                 msg_type=MSG_RECEIPT_RESP,
@@ -563,6 +620,105 @@ class V2ConsensusHost:
         )
         return {"ok": True, "status": response.status}
 
+    def _on_receipt_subscribe(self, envelope: NetworkEnvelope) -> dict[str, Any]:
+        cursor = envelope.payload.get("cursor")
+        if not isinstance(cursor, ReceiptSyncCursor):
+            return {"ok": False, "error": "missing_receipt_cursor"}
+        public_key_pem = envelope.payload.get("public_key_pem")
+        signature = envelope.payload.get("signature")
+        if not isinstance(public_key_pem, bytes) or not isinstance(signature, bytes):
+            return {"ok": False, "error": "missing_subscription_signature"}
+        try:
+            signer_addr = address_from_public_key_pem(public_key_pem)
+        except Exception:
+            signer_addr = None
+        if signer_addr != cursor.sender_addr:
+            return {"ok": False, "error": "subscription_signer_mismatch"}
+        message = _receipt_subscribe_message(
+            chain_id=self.consensus.chain.chain_id,
+            subscriber_id=envelope.sender_id,
+            cursor=cursor,
+        )
+        if not verify_message_secp256k1(public_key_pem, message, signature, domain=RECEIPT_SUBSCRIBE_DOMAIN):
+            return {"ok": False, "error": "invalid_subscription_signature"}
+        peer = envelope.payload.get("peer")
+        if (
+            isinstance(peer, PeerInfo)
+            and peer.node_id == envelope.sender_id
+            and peer.role == "account"
+            and peer.metadata.get("address") == cursor.sender_addr
+        ):
+            # add_peer only fills in unknown node ids; known entries keep their endpoint.
+            add_peer = getattr(self.network, "add_peer", None)
+            if callable(add_peer):
+                add_peer(peer)
+        with self._receipt_subscription_lock:
+            self._receipt_subscriptions[cursor.sender_addr] = envelope.sender_id
+        # Replay everything finalized since the subscriber's cursor so a
+        # reconnecting account catches up without per-seq receipt requests.
+        next_seq = max(1, int(cursor.next_seq))
+        replayed = 0
+        while True:
+            receipt = self.consensus.get_receipt(cursor.sender_addr, next_seq).receipt
+            if receipt is None:
+                break
+            if not self._push_receipt(cursor.sender_addr, receipt, envelope.sender_id):
+                break
+            replayed += 1
+            next_seq += 1
+        return {
+            "ok": True,
+            "status": "subscribed",
+            "replayed": replayed,
+            "next_seq": next_seq,
+            "height": self.consensus.chain.current_height,
+        }
+
+    def _has_receipt_subscriber(self, sender_addr: str, peer_id: str | None = None) -> bool:
+        with self._receipt_subscription_lock:
+            subscribed_peer_id = self._receipt_subscriptions.get(sender_addr)
+        return subscribed_peer_id is not None and (peer_id is None or subscribed_peer_id == peer_id)
+
+    def _push_receipt(self, sender_addr: str, receipt: Receipt, peer_id: str) -> bool:
+        try:
+            payload = self._receipt_payload_for_peer(sender_addr, receipt, peer_id)
+            payload["subscription"] = True
+            response = self.network.send(
+                NetworkEnvelope(
+                    msg_type=MSG_RECEIPT_DELIVER,
+                    sender_id=self.peer.node_id,
+                    recipient_id=peer_id,
+                    payload=payload,
+                )
+            )
+        except Exception:
+            return False
+        return not (isinstance(response, dict) and str(response.get("error", "")).startswith("send_failed:"))
+
+    def _push_subscribed_receipts(self, block: BlockV2, *, skip_addrs: frozenset[str] = frozenset()) -> int:
+        with self._receipt_subscription_lock:
+            subscriptions = dict(self._receipt_subscriptions)
+        if not subscriptions:
+            return 0
+        pushed = 0
+        for entry in block.diff_package.diff_entries:
+            sender_addr = entry.new_leaf.addr
+            peer_id = subscriptions.get(sender_addr)
+            if peer_id is None or sender_addr in skip_addrs:
+                continue
+            receipt = self.consensus.get_receipt(sender_addr, entry.bundle_envelope.seq).receipt
+            if receipt is None:
+                continue
+            if self._push_receipt(sender_addr, receipt, peer_id):
+                pushed += 1
+            else:
+                # The subscriber went away; it re-subscribes with its resume
+                # cursor on reconnect and gets the missed receipts replayed.
+                with self._receipt_subscription_lock:
+                    if self._receipt_subscriptions.get(sender_addr) == peer_id:
+                        self._receipt_subscriptions.pop(sender_addr, None)
+        return pushed
+
     def _on_chain_state_request(self, envelope: NetworkEnvelope) -> dict[str, Any]:
         cursor = self.chain_cursor()
         payload = {
@@ -708,6 +864,7 @@ class V2ConsensusHost:
         if not isinstance(commit_qc, QC) or commit_qc.phase is not VotePhase.COMMIT:
             return {"ok": False, "error": "missing_commit_qc"}
         snapshot = self._finalize_committed_block(block=block, commit_qc=commit_qc)
+        self._push_subscribed_receipts(block)
         return {
             "ok": True,
             "height": block.header.height,
@@ -1209,11 +1366,14 @@ class V2ConsensusHost:
             raise ValueError(f"missing_qc:{phase.value}")
         return qc
 
-    def _dispatch_finalized_receipts(self, block: BlockV2, *, sender_peer_ids: dict[str, str]) -> None:
+    def _dispatch_finalized_receipts(self, block: BlockV2, *, sender_peer_ids: dict[str, str]) -> frozenset[str]:
+        dispatched: set[str] = set()
         for entry in block.diff_package.diff_entries:
             sender_peer_id = sender_peer_ids.get(entry.new_leaf.addr)
             if sender_peer_id is None:
                 continue
+            if self._has_receipt_subscriber(entry.new_leaf.addr, sender_peer_id):
+                continue
             sender_peer = None
             try:
                 sender_peer = self.network.peer_info(sender_peer_id)
@@ -1230,7 +1390,7 @@ class V2ConsensusHost:
                         msg_type=MSG_RECEIPT_DELIVER,
                         sender_id=self.peer.node_id,
                         recipient_id=sender_peer_id,
-                        payload={"receipt": receipt},
+                        payload={"receipt": _receipt_for_peer(receipt, sender_peer)},
                     )
                 )
             except Exception:
@@ -1239,10 +1399,14 @@ class V2ConsensusHost:
                 # case the account can still recover the receipt by polling the
                 # consensus endpoint after block finalization.
                 continue
+            dispatched.add(entry.new_leaf.addr)
+        return frozenset(dispatched)
 
     def _remember_fetched_block(self, block: BlockV2) -> None:
-        self.fetched_blocks[block.header.height] = block
-        self.fetched_blocks_by_hash[block.block_hash.hex()] = block
+        with self._fetched_block_cond:
+            self.fetched_blocks[block.header.height] = block
+            self.fetched_blocks_by_hash[block.block_hash.hex()] = block
+            self._fetched_block_cond.notify_all()
 
     def _await_fetched_block(
         self,
@@ -1251,23 +1415,12 @@ class V2ConsensusHost:
         block_hash_hex: str | None = None,
         timeout_sec: float = 1.0,
     ) -> BlockV2 | None:
-        deadline = time.time() + timeout_sec
-        height = int(height) if height is not None else None
-        block_hash_hex = str(block_hash_hex) if block_hash_hex is not None else None
-        while time.time() < deadline:
-            block = None
-            if height is not None:
-                block = self.fetched_blocks.get(height)
-            elif block_hash_hex is not None:
-                block = self.fetched_blocks_by_hash.get(block_hash_hex)
-            if block is not None:
-                return block
-            time.sleep(0.01)
-        if height is not None:
-            return self.fetched_blocks.get(height)
-        if block_hash_hex is not None:
-            return self.fetched_blocks_by_hash.get(block_hash_hex)
-        return None
+        with self._fetched_block_cond:
+            self._fetched_block_cond.wait_for(
+                lambda: self._get_fetched_block(height=height, block_hash_hex=block_hash_hex) is not None,
+                timeout=max(0.0, float(timeout_sec)),
+            )
+        return self._get_fetched_block(height=height, block_hash_hex=block_hash_hex)
 
     def _get_fetched_block(
         self,
@@ -1416,7 +1569,8 @@ class V2ConsensusHost:
     ) -> None:
         self._finalize_committed_block(block=block, commit_qc=commit_qc)
         self._broadcast_block_announce(block)
-        self._dispatch_finalized_receipts(block, sender_peer_ids=preview.sender_peer_ids)
+        dispatched = self._dispatch_finalized_receipts(block, sender_peer_ids=preview.sender_peer_ids)
+        self._push_subscribed_receipts(block, skip_addrs=dispatched)
         for peer_id in consensus_peer_ids[1:]:
             try:
                 self.network.send(
@@ -1459,12 +1613,17 @@ class V2AccountHost:
         public_key_pem: bytes | None = None,
         auto_accept_receipts: bool = True,
         state_path: str | None = None,
+        validation_workers: int = 0,
+        sidecar_gc_interval_sec: float = 0.0,
+        max_pending_bundles: int = DEFAULT_MAX_PENDING_BUNDLES,
     ):
+        if validation_workers < 0:
+            raise ValueError("validation_workers must be non-negative")
+        if sidecar_gc_interval_sec < 0:
+            raise ValueError("sidecar_gc_interval_sec must be non-negative")
         if private_key_pem is None or public_key_pem is None:
             private_key_pem, public_key_pem = generate_secp256k1_keypair()
         if address is None:
-            from .crypto import address_from_public_key_pem
-
             address = address_from_public_key_pem(public_key_pem)
         self.network = network
         self.consensus_peer_ids = self._normalize_consensus_peer_ids(consensus_peer_id, consensus_peer_ids)
@@ -1477,7 +1636,17 @@ class V2AccountHost:
                 metadata={"address": address},
             )
         )
-        self.wallet = WalletAccountV2(address=address, genesis_block_hash=b"\x00" * 32, db_path=wallet_db_path)
+        self.wallet = WalletAccountV2(
+            address=address,
+            genesis_block_hash=b"\x00" * 32,
+            db_path=wallet_db_path,
+            max_pending_bundles=max_pending_bundles,
+        )
+        if sidecar_gc_interval_sec > 0:
+            self.wallet.start_sidecar_gc(
+                interval_sec=sidecar_gc_interval_sec,
+                min_unreferenced_sec=sidecar_gc_interval_sec,
+            )
         self.private_key_pem = private_key_pem
         self.public_key_pem = public_key_pem
         self.chain_id = chain_id
@@ -1487,8 +1656,13 @@ class V2AccountHost:
         self.received_transfers: list[TransferMailboxEvent] = []
         self.fetched_blocks: dict[int, BlockV2] = {}
         self.fetched_blocks_by_hash: dict[str, BlockV2] = {}
+        self._fetched_block_cond = threading.Condition()
         self._detected_chain_reset = False
         self._suppress_block_announce_receipt_pull = 0
+        self._receipt_subscription: ReceiptSyncCursor | None = None
+        self._receipt_subscription_peer_id: str | None = None
+        self.validation_workers = validation_workers
+        self._validation_executor: ProcessPoolExecutor | None = None
         self._load_network_state()
         self.network.register(self.peer, self.handle_envelope)
 
@@ -1686,6 +1860,9 @@ class V2AccountHost:
         try:
             self._persist_network_state()
         finally:
+            if self._validation_executor is not None:
+                self._validation_executor.shutdown(wait=False, cancel_futures=True)
+                self._validation_executor = None
             self.wallet.close()
 
     def register_genesis_value(self, value: ValueRange) -> None:
@@ -1768,6 +1945,12 @@ class V2AccountHost:
             for block in self.fetched_blocks.values()
         }
 
+    def _remember_fetched_block(self, block: BlockV2) -> None:
+        with self._fetched_block_cond:
+            self.fetched_blocks[block.header.height] = block
+            self.fetched_blocks_by_hash[block.block_hash.hex()] = block
+            self._fetched_block_cond.notify_all()
+
     def _reconcile_fetched_blocks_with_chain_cursor(
         self,
         cursor: ChainSyncCursor | None,
@@ -1840,23 +2023,12 @@ class V2AccountHost:
         block_hash_hex: str | None = None,
         timeout_sec: float = 1.0,
     ) -> BlockV2 | None:
-        deadline = time.time() + timeout_sec
-        height = int(height) if height is not None else None
-        block_hash_hex = str(block_hash_hex) if block_hash_hex is not None else None
-        while time.time() < deadline:
-            block = None
-            if height is not None:
-                block = self.fetched_blocks.get(height)
-            elif block_hash_hex is not None:
-                block = self.fetched_blocks_by_hash.get(block_hash_hex)
-            if block is not None:
-                return block
-            time.sleep(0.01)
-        if height is not None:
-            return self.fetched_blocks.get(height)
-        if block_hash_hex is not None:
-            return self.fetched_blocks_by_hash.get(block_hash_hex)
-        return None
+        with self._fetched_block_cond:
+            self._fetched_block_cond.wait_for(
+                lambda: self._get_fetched_block(height=height, block_hash_hex=block_hash_hex) is not None,
+                timeout=max(0.0, float(timeout_sec)),
+            )
+        return self._get_fetched_block(height=height, block_hash_hex=block_hash_hex)
 
     def _get_fetched_block(
         self,
@@ -1891,8 +2063,7 @@ class V2AccountHost:
         if envelope.msg_type == MSG_BLOCK_ANNOUNCE:
             block = envelope.payload.get("block")
             if isinstance(block, BlockV2):
-                self.fetched_blocks[block.header.height] = block
-                self.fetched_blocks_by_hash[block.block_hash.hex()] = block
+                self._remember_fetched_block(block)
                 self.wallet.observe_canonical_block(block)
                 self._maybe_request_receipts_from_block(block, sender_peer_id=envelope.sender_id)
             self.last_seen_chain = ChainSyncCursor(
@@ -1914,6 +2085,7 @@ class V2AccountHost:
         tx_time: int | None = None,
     ) -> V2NetworkPayment:
         self.wallet.reload_state()
+        self.submit_pipelined_bundles()
         recipient_peer = self.network.peer_info(recipient_peer_id)
         recipient_addr = str(recipient_peer.metadata["address"])
         submission, context, tx = self.wallet.build_payment_bundle(
@@ -1927,6 +2099,18 @@ class V2AccountHost:
             anti_spam_nonce=anti_spam_nonce,
             tx_time=tx_time,
         )
+        if not self.wallet.is_pending_bundle_submitted(context.seq):
+            # An earlier seq is still in flight; this one goes out once that
+            # confirms (see submit_pipelined_bundles).
+            return V2NetworkPayment(
+                tx_hash_hex=self._tx_hash_hex(tx),
+                submit_hash_hex=submission.envelope.bundle_hash.hex(),
+                sender_addr=self.address,
+                recipient_addr=recipient_addr,
+                amount=amount,
+                receipt_height=None,
+                receipt_block_hash_hex=None,
+            )
         self._refresh_best_peer_if_preferred_stale()
         self._suppress_block_announce_receipt_pull += 1
         try:
@@ -1963,9 +2147,106 @@ class V2AccountHost:
             receipt_block_hash_hex=receipt.header_lite.block_hash.hex() if receipt is not None else None,
         )
 
+    def submit_pipelined_bundles(self) -> int:
+        """Send the oldest pending bundle if it is still waiting to go out.
+
+        Consensus only executes the sender's next seq, so one pending bundle is
+        outstanding there at a time and the window confirms one per block.
+
+        Returns 1 when a bundle was submitted. A bundle consensus refuses is
+        rolled back along with every later pending seq; a transport failure
+        leaves it queued for the next call.
+        """
+        pending = self.wallet.list_pending_bundles()
+        if not pending or self.wallet.is_pending_bundle_submitted(pending[0].seq):
+            return 0
+        head = pending[0]
+        submission = BundleSubmission(
+            envelope=head.envelope,
+            sidecar=head.sidecar,
+            sender_public_key_pem=head.sender_public_key_pem,
+        )
+        self._refresh_best_peer_if_preferred_stale()
+        try:
+            response = self._send_to_consensus(MSG_BUNDLE_SUBMIT, {"submission": submission})
+        except Exception:
+            return 0
+        if isinstance(response, dict) and response.get("ok") is False:
+            error = str(response.get("error", "bundle_submit_failed"))
+            if error != "bundle seq is not currently executable":
+                self.wallet.rollback_pending_bundle(head.seq)
+                return 0
+        self.wallet.mark_pending_bundle_submitted(head.seq)
+        return 1
+
+    @property
+    def receipt_subscription_active(self) -> bool:
+        return self._receipt_subscription is not None and self._receipt_subscription_peer_id == self.consensus_peer_id
+
+    def _receipt_resume_seq(self) -> int:
+        pending = self.wallet.list_pending_bundles()
+        if pending:
+            return min(item.seq for item in pending)
+        return self.wallet.next_sequence()
+
+    def subscribe_receipts(self) -> int:
+        """Register for pushed receipts and return how many were replayed.
+
+        The resume cursor is the first seq still waiting for a receipt, so a
+        reconnect replays exactly the receipts finalized while we were away.
+        Raises ValueError when the consensus peer does not advertise
+        receipt subscriptions or refuses the signed request.
+        """
+        try:
+            consensus_peer = self.network.peer_info(self.consensus_peer_id)
+        except Exception:
+            consensus_peer = None
+        if not peer_supports(consensus_peer, FEATURE_RECEIPT_SUBSCRIBE_V1):
+            raise ValueError("receipt_subscribe_unsupported")
+        cursor = ReceiptSyncCursor(sender_addr=self.address, next_seq=self._receipt_resume_seq())
+        signature = sign_message_secp256k1(
+            self.private_key_pem,
+            _receipt_subscribe_message(chain_id=self.chain_id, subscriber_id=self.peer.node_id, cursor=cursor),
+            domain=RECEIPT_SUBSCRIBE_DOMAIN,
+        )
+        response = self._send_to_consensus(
+            MSG_RECEIPT_SUBSCRIBE,
+            {"cursor": cursor, "peer": self.peer, "public_key_pem": self.public_key_pem, "signature": signature},
+        )
+        if not isinstance(response, dict) or response.get("ok") is not True:
+            error = response.get("error", "receipt_subscribe_failed") if isinstance(response, dict) else "receipt_subscribe_failed"
+            raise ValueError(str(error))
+        self._receipt_subscription = ReceiptSyncCursor(
+            sender_addr=self.address,
+            next_seq=max(cursor.next_seq, int(response.get("next_seq", cursor.next_seq))),
+        )
+        self._receipt_subscription_peer_id = self.consensus_peer_id
+        return int(response.get("replayed", 0))
+
     def sync_pending_receipts(self) -> int:
+        if self._receipt_subscription is not None:
+            # Subscribed accounts get receipts pushed as blocks finalize; only
+            # re-subscribe (one message, replaying from the resume cursor)
+            # when something is still pending or the consensus peer changed.
+            pending_before = len(self.wallet.list_pending_bundles())
+            if self.receipt_subscription_active and pending_before == 0:
+                return 0
+            try:
+                self.subscribe_receipts()
+            except Exception:
+                # The (possibly new) consensus peer cannot take the
+                # subscription; drop it and pull per seq below.
+                self._receipt_subscription = None
+                self._receipt_subscription_peer_id = None
+            else:
+                applied = max(0, pending_before - len(self.wallet.list_pending_bundles()))
+                self.submit_pipelined_bundles()
+                return applied
         applied = 0
         for pending in self.wallet.list_pending_bundles():
+            if not self.wallet.is_pending_bundle_submitted(pending.seq):
+                # Never submitted, so there is no receipt to ask for yet.
+                break
             self._refresh_best_peer_if_preferred_stale()
             applied_now = self._request_receipt_for_seq(pending.seq, mark_missing_on_miss=False)
             if applied_now:
@@ -1980,6 +2261,7 @@ class V2AccountHost:
                         applied += 1
                         continue
             self.wallet.mark_receipt_missing(pending.seq)
+        self.submit_pipelined_bundles()
         return applied
 
     def recover_network_state(
@@ -2075,7 +2357,7 @@ class V2AccountHost:
             seq=receipt.seq,
             prev_ref=receipt.prev_ref,
             claim_set_hash=receipt.claim_set_hash,
-            account_state_proof=materialize_proof(proof_batch.multi_proof, proof_ref.key),
+            account_state_proof=compress_proof(materialize_proof(proof_batch.multi_proof, proof_ref.key)),
         )
 
     def _request_receipt_for_seq(
@@ -2130,6 +2412,8 @@ class V2AccountHost:
                 sender_peer = None
         if not peer_supports(sender_peer, FEATURE_RECEIPT_INDEX_PULL_V1):
             return
+        if self.receipt_subscription_active and sender_peer_id == self._receipt_subscription_peer_id:
+            return
         pending_by_seq = {pending.seq for pending in self.wallet.list_pending_bundles()}
         if not pending_by_seq:
             return
@@ -2162,6 +2446,9 @@ class V2AccountHost:
                 return {"ok": False, "error": f"invalid_receipt_proof_batch:{exc}"}
         if not self.auto_accept_receipts:
             return {"ok": True, "status": "receipt_seen_not_applied"}
+        if envelope.payload.get("subscription") and self.wallet.db.get_pending_bundle(self.address, receipt.seq) is None:
+            # Replays can overlap receipts we already applied through another path.
+            return {"ok": True, "status": "receipt_already_applied", "seq": receipt.seq}
         if not self.wallet.knows_canonical_header(receipt.header_lite):
             block = self._get_fetched_block(
                 height=receipt.header_lite.height,
@@ -2198,6 +2485,8 @@ class V2AccountHost:
             ):
                 self.wallet.observe_canonical_block(block)
         confirmed_unit = self.wallet.on_receipt_confirmed(receipt)
+        if self._receipt_subscription is not None and receipt.seq >= self._receipt_subscription.next_seq:
+            self._receipt_subscription = ReceiptSyncCursor(sender_addr=self.address, next_seq=receipt.seq + 1)
         delivery_errors: list[str] = []
         delivered_packages = 0
         for tx in confirmed_unit.bundle_sidecar.tx_list:
@@ -2205,12 +2494,13 @@ class V2AccountHost:
                 package = self.wallet.export_transfer_package(tx, value)
                 try:
                     recipient_peer_id = self._find_peer_id_by_address(tx.recipient_addr)
+                    recipient_package = _package_for_peer(package, _peer_info_or_none(self.network, recipient_peer_id))
                     self.network.send(
                         NetworkEnvelope(
                             msg_type=MSG_TRANSFER_PACKAGE_DELIVER,
                             sender_id=self.peer.node_id,
                             recipient_id=recipient_peer_id,
-                            payload={"package": package},
+                            payload={"package": recipient_package},
                         )
                     )
                     delivered_packages += 1
@@ -2254,8 +2544,7 @@ class V2AccountHost:
         block = envelope.payload.get("block")
         if not isinstance(block, BlockV2):
             return {"ok": False, "error": "missing_block"}
-        self.fetched_blocks[block.header.height] = block
-        self.fetched_blocks_by_hash[block.block_hash.hex()] = block
+        self._remember_fetched_block(block)
         self.wallet.observe_canonical_block(block)
         if self.last_seen_chain is None or block.header.height >= self.last_seen_chain.height:
             self.last_seen_chain = ChainSyncCursor(
@@ -2281,8 +2570,11 @@ class V2AccountHost:
         runtime = V2Runtime()
         for owner_addr, value in self._extract_genesis_allocations(package.witness_v2.anchor):
             runtime.register_genesis_allocation(owner_addr, value)
+        if self.validation_workers and self._validation_executor is None:
+            self._validation_executor = ProcessPoolExecutor(max_workers=self.validation_workers)
         return runtime.build_validator(
-            trusted_checkpoints=self.wallet.trusted_checkpoints_for_witness(package.witness_v2)
+            trusted_checkpoints=self.wallet.trusted_checkpoints_for_witness(package.witness_v2),
+            executor=self._validation_executor,
         )
 
     def _extract_genesis_allocations(self, anchor) -> tuple[tuple[str, ValueRange], ...]:
@@ -25,6 +25,7 @@ MSG_CONSENSUS_VOTE = "consensus_vote"
 MSG_RECEIPT_DELIVER = "receipt_deliver"
 MSG_RECEIPT_REQ = "receipt_req"
 MSG_RECEIPT_RESP = "receipt_resp"
+MSG_RECEIPT_SUBSCRIBE = "receipt_subscribe"
 MSG_TRANSFER_PACKAGE_DELIVER = "transfer_package_deliver"
 MSG_CHECKPOINT_REQ = "checkpoint_req"
 MSG_CHECKPOINT_RESP = "checkpoint_resp"
@@ -35,12 +36,16 @@ MSG_PEER_INFO = "peer_info"
 MSG_PEER_HEALTH = "peer_health"
 
 FEATURE_CLAIM_SET_V1 = "claim_set_hash_v1"
+FEATURE_COMPRESSED_SMT_PROOF_V1 = "compressed_smt_proof_v1"
 FEATURE_RECEIPT_INDEX_PULL_V1 = "receipt_index_pull_v1"
 FEATURE_RECEIPT_MULTIPROOF_V1 = "receipt_multiproof_v1"
+FEATURE_RECEIPT_SUBSCRIBE_V1 = "receipt_subscribe_v1"
 DEFAULT_V2_FEATURES = (
     FEATURE_CLAIM_SET_V1,
+    FEATURE_COMPRESSED_SMT_PROOF_V1,
     FEATURE_RECEIPT_INDEX_PULL_V1,
     FEATURE_RECEIPT_MULTIPROOF_V1,
+    FEATURE_RECEIPT_SUBSCRIBE_V1,
 )
 
 
@@ -165,13 +170,16 @@ __all__ = [
     "MSG_RECEIPT_DELIVER",
     "MSG_RECEIPT_REQ",
     "MSG_RECEIPT_RESP",
+    "MSG_RECEIPT_SUBSCRIBE",
     "MSG_TRANSFER_PACKAGE_DELIVER",
     "NetworkEnvelope",
     "NodeRole",
     "PeerInfo",
     "FEATURE_CLAIM_SET_V1",
+    "FEATURE_COMPRESSED_SMT_PROOF_V1",
     "FEATURE_RECEIPT_INDEX_PULL_V1",
     "FEATURE_RECEIPT_MULTIPROOF_V1",
+    "FEATURE_RECEIPT_SUBSCRIBE_V1",
     "peer_features",
     "peer_supports",
     "with_v2_features",
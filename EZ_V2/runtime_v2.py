@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import time
+from concurrent.futures import Executor
 from dataclasses import dataclass
+from typing import Sequence
 
 from .chain import ChainStateV2, compute_bundle_hash
 from .types import BlockV2, BundleSubmission, ConfirmedBundleUnit, GenesisAnchor, Receipt, TransferPackage
@@ -93,8 +95,11 @@ class V2Runtime:
             trusted_checkpoints=tuple(trusted_checkpoints),
         )
 
-    def build_validator(self, trusted_checkpoints=()) -> V2TransferValidator:
-        return V2TransferValidator(self.build_validation_context(trusted_checkpoints=trusted_checkpoints))
+    def build_validator(self, trusted_checkpoints=(), executor=None) -> V2TransferValidator:
+        return V2TransferValidator(
+            self.build_validation_context(trusted_checkpoints=trusted_checkpoints),
+            executor=executor,
+        )
 
     def submit_bundle(self, submission: BundleSubmission) -> BundleSubmitResult:
         sender_addr = self.chain.submit_bundle(submission)
@@ -177,35 +182,68 @@ class V2Runtime:
         recipient_addr: str | None = None,
         trusted_checkpoints=(),
     ) -> TransferDeliveryResult:
-        resolved_recipient = recipient_addr or package.target_tx.recipient_addr
-        wallet = self._wallets.get(resolved_recipient)
+        return self.deliver_transfer_packages(
+            (package,),
+            recipient_addr or package.target_tx.recipient_addr,
+            trusted_checkpoints=trusted_checkpoints,
+        )[0]
+
+    def deliver_transfer_packages(
+        self,
+        packages: Sequence[TransferPackage],
+        recipient_addr: str,
+        trusted_checkpoints=(),
+        executor: Executor | None = None,
+    ) -> tuple[TransferDeliveryResult, ...]:
+        wallet = self._wallets.get(recipient_addr)
         if wallet is None:
-            return TransferDeliveryResult(
-                recipient_addr=resolved_recipient,
-                package=package,
-                accepted=False,
-                error="wallet_not_registered",
+            return tuple(
+                TransferDeliveryResult(
+                    recipient_addr=recipient_addr,
+                    package=package,
+                    accepted=False,
+                    error="wallet_not_registered",
+                )
+                for package in packages
             )
         resolved_trusted_checkpoints = tuple(trusted_checkpoints)
         if not resolved_trusted_checkpoints:
-            resolved_trusted_checkpoints = wallet.trusted_checkpoints_for_witness(package.witness_v2)
+            matched: dict = {}
+            for package in packages:
+                for checkpoint in wallet.trusted_checkpoints_for_witness(package.witness_v2):
+                    matched.setdefault(checkpoint, None)
+            resolved_trusted_checkpoints = tuple(matched)
         try:
-            record = wallet.receive_transfer(
-                package=package,
-                validator=self.build_validator(trusted_checkpoints=resolved_trusted_checkpoints),
+            outcomes = wallet.receive_transfers(
+                packages,
+                validator=self.build_validator(trusted_checkpoints=resolved_trusted_checkpoints, executor=executor),
             )
         except Exception as exc:
-            return TransferDeliveryResult(
-                recipient_addr=resolved_recipient,
+            if len(packages) > 1:
+                # A package that breaks validation outright must not hold back
+                # the rest of the batch.
+                return tuple(
+                    self.deliver_transfer_packages((package,), recipient_addr, trusted_checkpoints, executor)[0]
+                    for package in packages
+                )
+            return tuple(
+                TransferDeliveryResult(
+                    recipient_addr=recipient_addr,
+                    package=package,
+                    accepted=False,
+                    error=str(exc),
+                )
+                for package in packages
+            )
+        return tuple(
+            TransferDeliveryResult(
+                recipient_addr=recipient_addr,
                 package=package,
-                accepted=False,
-                error=str(exc),
+                accepted=record is not None,
+                record=record,
+                error=error,
             )
-        return TransferDeliveryResult(
-            recipient_addr=resolved_recipient,
-            package=package,
-            accepted=True,
-            record=record,
+            for package, (record, error) in zip(packages, outcomes)
         )
 
     def _deliver_receipts(self, receipts: dict[str, Receipt]) -> dict[str, ReceiptDeliveryResult]:
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Sequence
+
+from .values import ValueRange
+
+DEFAULT_SELECTION_TIME_BUDGET_SECONDS = 0.0005
+DEFAULT_SELECTION_MAX_NODES = 20_000
+DEFAULT_SELECTION_MAX_SEARCH_INPUTS = 64
+
+_DEADLINE_CHECK_MASK = 0x3F
+
+
+@dataclass(frozen=True, slots=True)
+class SelectionCandidate:
+    """One spendable range with its precomputed selection cost.
+
+    ``cost`` is ``(checkpoint_miss, anchor_cost, witness_units, witness_bytes,
+    freshness_penalty)``; plan costs are the component-wise sum over the chosen
+    inputs.
+    """
+
+    begin: int
+    size: int
+    cost: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class SelectionPlan:
+    ranges: tuple[ValueRange, ...]
+    input_count: int
+    split_count: int
+    searched_nodes: int
+    exhaustive: bool
+
+
+def _add_cost(left: tuple, right: tuple) -> tuple:
+    return tuple(a + b for a, b in zip(left, right))
+
+
+class CoinSelector:
+    """Picks the inputs for a payment from a fixed candidate set.
+
+    Plans are ranked like the wallet always ranked them: fewest inputs, then no
+    split, then the summed candidate cost, then the sorted ``(begin, take)``
+    list.  The fewest-inputs count is the smallest prefix of the candidates by
+    size that covers the amount, so only same-cardinality subsets are searched:
+    a bounded branch-and-bound looks for an exact (split-free) or cheaper
+    subset, starting from the largest-first greedy plan, and returns the best
+    plan found when the node or time budget runs out.
+    """
+
+    def __init__(self, candidates: Sequence[SelectionCandidate]):
+        ordered = sorted(candidates, key=lambda item: (-item.size, item.cost, item.begin))
+        self.candidates: tuple[SelectionCandidate, ...] = tuple(ordered)
+        self._neg_sizes = [-item.size for item in ordered]
+        self._prefix = [0]
+        for item in ordered:
+            self._prefix.append(self._prefix[-1] + item.size)
+        self._cheapest_prefix: list[int] = []
+        best = -1
+        for position, item in enumerate(ordered):
+            if best < 0 or (item.cost, item.begin) < (ordered[best].cost, ordered[best].begin):
+                best = position
+            self._cheapest_prefix.append(best)
+        self._cheapest_by_size: dict[int, int] = {}
+        for position, item in enumerate(ordered):
+            current = self._cheapest_by_size.get(item.size)
+            if current is None or (item.cost, item.begin) < (ordered[current].cost, ordered[current].begin):
+                self._cheapest_by_size[item.size] = position
+        width = len(ordered[0].cost) if ordered else 0
+        self._min_cost = tuple(min(item.cost[axis] for item in ordered) for axis in range(width))
+        self._zero_cost = tuple(0 for _ in range(width))
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    @property
+    def total(self) -> int:
+        return self._prefix[-1]
+
+    def select(
+        self,
+        amount: int,
+        *,
+        time_budget: float = DEFAULT_SELECTION_TIME_BUDGET_SECONDS,
+        max_nodes: int = DEFAULT_SELECTION_MAX_NODES,
+        max_search_inputs: int = DEFAULT_SELECTION_MAX_SEARCH_INPUTS,
+    ) -> SelectionPlan:
+        if amount <= 0:
+            raise ValueError("amount must be positive")
+        if amount > self.total:
+            raise ValueError("insufficient_balance")
+
+        exact = self._cheapest_by_size.get(amount)
+        if exact is not None:
+            return self._plan((exact,), None, 0, True)
+        larger = bisect_left(self._neg_sizes, -amount)
+        if larger > 0:
+            return self._plan((), (self._cheapest_prefix[larger - 1], amount), 0, True)
+
+        input_count = bisect_left(self._prefix, amount)
+        greedy = tuple(range(input_count))
+        if input_count > max_search_inputs:
+            return self._finish(greedy, amount, 0, False)
+
+        deadline = time.perf_counter() + max(0.0, time_budget)
+        state = _SearchState(
+            chosen=greedy,
+            key=(0 if self._prefix[input_count] == amount else 1, self._sum_cost(greedy)),
+        )
+        self._search(state, amount, input_count, deadline, max_nodes)
+        return self._finish(state.chosen, amount, state.nodes, not state.stopped)
+
+    def _sum_cost(self, positions: Sequence[int]) -> tuple:
+        total = self._zero_cost
+        for position in positions:
+            total = _add_cost(total, self.candidates[position].cost)
+        return total
+
+    def _cost_floor(self, count: int) -> tuple:
+        if count <= 0:
+            return self._zero_cost
+        return tuple(value * count for value in self._min_cost)
+
+    def _search(self, state: "_SearchState", amount: int, slots: int, deadline: float, max_nodes: int) -> None:
+        candidates = self.candidates
+        neg_sizes = self._neg_sizes
+        prefix = self._prefix
+        count = len(candidates)
+        chosen: list[int] = []
+
+        def smallest(width: int) -> int:
+            return prefix[count] - prefix[count - width] if width else 0
+
+        def visit(start: int, remaining: int, need: int, cost: tuple) -> None:
+            if remaining == 0:
+                if need <= 0:
+                    state.offer(tuple(chosen), (0 if need == 0 else 1, cost), self, amount)
+                return
+            position = start
+            last = count - remaining
+            while position <= last:
+                if state.stopped:
+                    return
+                state.nodes += 1
+                if state.nodes >= max_nodes or (
+                    state.nodes & _DEADLINE_CHECK_MASK == 0 and time.perf_counter() > deadline
+                ):
+                    state.stopped = True
+                    return
+                # Sizes only shrink to the right, so neither the amount nor a
+                # cheaper exact fill can be reached once these bounds fail.
+                if prefix[position + remaining] - prefix[position] < need:
+                    return
+                exact_only = state.key[0] == 0
+                if exact_only:
+                    tail = smallest(remaining - 1)
+                    if smallest(remaining) > need:
+                        return
+                    limit = need - tail
+                    if candidates[position].size > limit:
+                        position = max(position + 1, bisect_left(neg_sizes, -limit, position))
+                        continue
+                item = candidates[position]
+                if (
+                    position > start
+                    and item.size == candidates[position - 1].size
+                    and item.cost == candidates[position - 1].cost
+                ):
+                    position += 1
+                    continue
+                next_cost = _add_cost(cost, item.cost)
+                if exact_only and _add_cost(next_cost, self._cost_floor(remaining - 1)) > state.key[1]:
+                    position += 1
+                    continue
+                chosen.append(position)
+                visit(position + 1, remaining - 1, need - item.size, next_cost)
+                chosen.pop()
+                position += 1
+
+        visit(0, slots, amount, self._zero_cost)
+
+    def _best_split(self, positions: Sequence[int], amount: int) -> tuple[tuple, tuple[int, ...], tuple[int, int]]:
+        # Begins are distinct, so trimming the lowest-begin input gives the
+        # smallest sorted ``(begin, take)`` list of all possible splits.
+        candidates = self.candidates
+        total = sum(candidates[position].size for position in positions)
+        partial = min(positions, key=lambda position: candidates[position].begin)
+        take = amount - (total - candidates[partial].size)
+        full = tuple(position for position in positions if position != partial)
+        order = tuple(
+            sorted(
+                [(candidates[position].begin, candidates[position].size) for position in full]
+                + [(candidates[partial].begin, take)]
+            )
+        )
+        return order, full, (partial, take)
+
+    def _range_key(self, positions: Sequence[int], amount: int) -> tuple:
+        candidates = self.candidates
+        if sum(candidates[position].size for position in positions) == amount:
+            return tuple(sorted((candidates[position].begin, candidates[position].size) for position in positions))
+        return self._best_split(positions, amount)[0]
+
+    def _finish(self, positions: tuple[int, ...], amount: int, nodes: int, exhaustive: bool) -> SelectionPlan:
+        total = sum(self.candidates[position].size for position in positions)
+        if total == amount:
+            return self._plan(positions, None, nodes, exhaustive)
+        _, full, partial = self._best_split(positions, amount)
+        return self._plan(full, partial, nodes, exhaustive)
+
+    def _plan(
+        self,
+        full: Sequence[int],
+        partial: tuple[int, int] | None,
+        nodes: int,
+        exhaustive: bool,
+    ) -> SelectionPlan:
+        ranges = [
+            ValueRange(item.begin, item.begin + item.size - 1)
+            for item in (self.candidates[position] for position in full)
+        ]
+        if partial is not None:
+            position, take = partial
+            begin = self.candidates[position].begin
+            ranges.append(ValueRange(begin, begin + take - 1))
+        return SelectionPlan(
+            ranges=tuple(sorted(ranges, key=lambda item: (item.begin, item.end))),
+            input_count=len(ranges),
+            split_count=0 if partial is None else 1,
+            searched_nodes=nodes,
+            exhaustive=exhaustive,
+        )
+
+
+class _SearchState:
+    __slots__ = ("chosen", "key", "nodes", "stopped", "_range_key")
+
+    def __init__(self, chosen: tuple[int, ...], key: tuple):
+        self.chosen = chosen
+        self.key = key
+        self.nodes = 0
+        self.stopped = False
+        self._range_key: tuple | None = None
+
+    def offer(self, chosen: tuple[int, ...], key: tuple, selector: CoinSelector, amount: int) -> None:
+        if key > self.key:
+            return
+        if key == self.key:
+            if self._range_key is None:
+                self._range_key = selector._range_key(self.chosen, amount)
+            candidate_range_key = selector._range_key(chosen, amount)
+            if candidate_range_key >= self._range_key:
+                return
+            self._range_key = candidate_range_key
+        else:
+            self._range_key = None
+        self.chosen = chosen
+        self.key = key
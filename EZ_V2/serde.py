@@ -16,6 +16,7 @@ from .types import (
     ClaimRangeSet,
     Checkpoint,
     CheckpointAnchor,
+    CompressedSparseMerkleProof,
     ConfirmedBundleUnit,
     DiffEntry,
     DiffPackage,
@@ -69,6 +70,7 @@ _DATACLASS_REGISTRY = {
         ClaimRangeSet,
         Checkpoint,
         CheckpointAnchor,
+        CompressedSparseMerkleProof,
         ConfirmedBundleUnit,
         DiffEntry,
         DiffPackage,
@@ -120,6 +122,7 @@ _TUPLE_FIELDS = {
     "OffChainTx": {"value_list"},
     "BundleSidecar": {"tx_list"},
     "ClaimRangeSet": {"ranges"},
+    "CompressedSparseMerkleProof": {"siblings"},
     "DiffPackage": {"diff_entries", "sidecars", "sender_public_keys"},
     "PendingBundleContext": {"pending_record_ids", "outgoing_record_ids", "outgoing_values"},
     "QC": {"signers"},
@@ -148,6 +151,9 @@ def to_json_obj(value: Any) -> Any:
     if is_dataclass(value):
         payload = {"__type__": value.__class__.__name__}
         for field in fields(value):
+            if not field.init:
+                # Derived or cached state (e.g. a record's lazy witness backing); rebuilt on load.
+                continue
             payload[field.name] = to_json_obj(getattr(value, field.name))
         return payload
     if isinstance(value, tuple):
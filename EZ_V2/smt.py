@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from functools import lru_cache
 
 from .crypto import keccak256
-from .types import SparseMerkleMultiProof, SparseMerkleMultiProofNode, SparseMerkleProof
+from .types import (
+    CompressedSparseMerkleProof,
+    SparseMerkleMultiProof,
+    SparseMerkleMultiProofNode,
+    SparseMerkleProof,
+)
 
 
 EMPTY_LEAF_HASH = keccak256(b"EZCHAIN_SMT_EMPTY_LEAF_V2")
@@ -53,6 +58,9 @@ class SparseMerkleTree:
         siblings = tuple(self._prove_recursive(0, key_int, self._values))
         return SparseMerkleProof(siblings=siblings, existence=key_int in self._values)
 
+    def prove_compressed(self, key: bytes) -> CompressedSparseMerkleProof:
+        return compress_proof(self.prove(key))
+
     def _split_items(self, node_depth: int, items: dict[int, bytes]) -> tuple[dict[int, bytes], dict[int, bytes]]:
         left: dict[int, bytes] = {}
         right: dict[int, bytes] = {}
@@ -96,14 +104,27 @@ class SparseMerkleTree:
         return proof
 
 
-def verify_proof(root: bytes, key: bytes, value_hash: bytes, proof: SparseMerkleProof, depth: int = 256) -> bool:
+def verify_proof(
+    root: bytes,
+    key: bytes,
+    value_hash: bytes,
+    proof: SparseMerkleProof | CompressedSparseMerkleProof,
+    depth: int = 256,
+) -> bool:
     if len(root) != 32 or len(key) * 8 != depth or len(value_hash) != 32:
         return False
-    if len(proof.siblings) != depth:
-        return False
+    if isinstance(proof, CompressedSparseMerkleProof):
+        try:
+            siblings = iter(_expanded_siblings(proof, depth))
+        except ValueError:
+            return False
+    else:
+        if len(proof.siblings) != depth:
+            return False
+        siblings = iter(proof.siblings)
     current = _leaf_node_hash(key, value_hash) if proof.existence else EMPTY_LEAF_HASH
     key_int = int.from_bytes(key, byteorder="big", signed=False)
-    for level, sibling in enumerate(proof.siblings):
+    for level, sibling in enumerate(siblings):
         bit = (key_int >> level) & 1
         if bit == 0:
             current = _node_hash(current, sibling)
@@ -112,12 +133,63 @@ def verify_proof(root: bytes, key: bytes, value_hash: bytes, proof: SparseMerkle
     return current == root
 
 
-def _default_hashes(depth: int) -> list[bytes]:
+@lru_cache(maxsize=8)
+def _default_hashes(depth: int) -> tuple[bytes, ...]:
     defaults = [EMPTY_LEAF_HASH]
     for _ in range(depth):
         previous = defaults[-1]
         defaults.append(_node_hash(previous, previous))
-    return defaults
+    return tuple(defaults)
+
+
+def _bitmap_length(depth: int) -> int:
+    return (depth + 7) // 8
+
+
+def compress_proof(proof: SparseMerkleProof | CompressedSparseMerkleProof) -> CompressedSparseMerkleProof:
+    if isinstance(proof, CompressedSparseMerkleProof):
+        return proof
+    depth = len(proof.siblings)
+    defaults = _default_hashes(depth)
+    bitmap = 0
+    kept = []
+    for level, sibling in enumerate(proof.siblings):
+        if sibling != defaults[level]:
+            bitmap |= 1 << level
+            kept.append(sibling)
+    return CompressedSparseMerkleProof(
+        bitmap=bitmap.to_bytes(_bitmap_length(depth), byteorder="little"),
+        siblings=tuple(kept),
+        existence=proof.existence,
+    )
+
+
+def expand_proof(proof: SparseMerkleProof | CompressedSparseMerkleProof, depth: int = 256) -> SparseMerkleProof:
+    if isinstance(proof, SparseMerkleProof):
+        return proof
+    return SparseMerkleProof(siblings=_expanded_siblings(proof, depth), existence=proof.existence)
+
+
+def _expanded_siblings(proof: CompressedSparseMerkleProof, depth: int) -> tuple[bytes, ...]:
+    # Only the form compress_proof emits is accepted: a listed sibling equal to
+    # the default hash would verify the same but encode (and hash) differently.
+    if len(proof.bitmap) != _bitmap_length(depth):
+        raise ValueError("bitmap length does not match tree depth")
+    bitmap = int.from_bytes(proof.bitmap, byteorder="little")
+    if bitmap >> depth:
+        raise ValueError("bitmap has bits beyond tree depth")
+    defaults = _default_hashes(depth)
+    listed = iter(proof.siblings)
+    siblings = []
+    for level in range(depth):
+        if (bitmap >> level) & 1:
+            sibling = next(listed)
+            if sibling == defaults[level]:
+                raise ValueError("compressed proof lists a default sibling")
+            siblings.append(sibling)
+        else:
+            siblings.append(defaults[level])
+    return tuple(siblings)
 
 
 def _key_bits(key: bytes, depth: int) -> str:
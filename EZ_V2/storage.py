@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import sqlite3
 import threading
+import time
+import weakref
 from dataclasses import replace
 from pathlib import Path
 from typing import Iterable
@@ -13,7 +15,7 @@ from .claim_set import (
 )
 from .chain import compute_addr_key, compute_bundle_hash, confirmed_ref
 from .serde import dumps_json, loads_json
-from .smt import materialize_proof
+from .smt import compress_proof, materialize_proof
 from .types import (
     Checkpoint,
     ClaimRangeSet,
@@ -28,7 +30,7 @@ from .types import (
     ReceiptProofRef,
     WitnessV2,
 )
-from .values import LocalValueRecord
+from .values import LocalValueRecord, LocalValueStatus, ValueRange
 
 
 def _bundle_ref_key_from_fields(height: int, block_hash: bytes, bundle_hash: bytes, seq: int) -> str:
@@ -56,7 +58,7 @@ def _compact_receipt_with_batch(
         return receipt
     key = compute_addr_key(sender_addr)
     materialized = materialize_proof(proof_batch.multi_proof, key)
-    if materialized != receipt.account_state_proof:
+    if compress_proof(materialized) != compress_proof(receipt.account_state_proof):
         return receipt
     return replace(
         receipt,
@@ -80,7 +82,7 @@ def _materialize_receipt_with_lookup(
         return receipt
     return replace(
         receipt,
-        account_state_proof=materialize_proof(proof_batch.multi_proof, receipt.proof_batch_ref.key),
+        account_state_proof=compress_proof(materialize_proof(proof_batch.multi_proof, receipt.proof_batch_ref.key)),
         proof_batch_ref=None,
     )
 
@@ -146,8 +148,23 @@ def _compact_record_with_batches(record: LocalValueRecord, lookup_batch) -> Loca
     return replace(record, witness_v2=_compact_witness_with_batch(record.witness_v2, lookup_batch))
 
 
-def _materialize_record_with_batches(record: LocalValueRecord, lookup_batch) -> LocalValueRecord:
-    return replace(record, witness_v2=_materialize_witness_with_lookup(record.witness_v2, lookup_batch))
+_RECORD_HEADER_COLUMNS = "record_id, value_begin, value_end, local_status, acquisition_height, witness_chain_length"
+
+
+class _StoredWitness:
+    """Decodes one record's witness from its ``value_records`` row on demand."""
+
+    __slots__ = ("db", "record_id")
+
+    def __init__(self, db: "LocalWalletDB", record_id: str):
+        self.db = db
+        self.record_id = record_id
+
+    def __call__(self) -> WitnessV2:
+        return self.db._load_record_witness(self.record_id)
+
+    def track(self, record: LocalValueRecord) -> None:
+        self.db._track_deferred_record(record)
 
 
 class LocalWalletDB:
@@ -157,14 +174,23 @@ class LocalWalletDB:
         self.db_path = db_path
         self._conn = sqlite3.connect(db_path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        # Every write transaction on the shared connection holds this lock, so the
+        # sidecar collector's commits on its own thread cannot split another writer's.
         self._lock = threading.RLock()
         self._before_sidecar_refcount_recompute_hook = None
+        self._deferred_records: dict[str, list[weakref.ref]] = {}
         self._init_schema()
 
     def close(self) -> None:
         self._conn.close()
 
     def _init_schema(self) -> None:
+        has_sidecar_refs = (
+            self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'value_record_sidecar_refs'"
+            ).fetchone()
+            is not None
+        )
         with self._conn:
             self._conn.executescript(
                 """
@@ -175,10 +201,13 @@ class LocalWalletDB:
                     value_end INTEGER NOT NULL,
                     local_status TEXT NOT NULL,
                     acquisition_height INTEGER NOT NULL,
+                    witness_chain_length INTEGER,
                     record_json TEXT NOT NULL
                 );
                 CREATE INDEX IF NOT EXISTS idx_value_records_owner_status
                     ON value_records (owner_addr, local_status);
+                CREATE INDEX IF NOT EXISTS idx_value_records_owner_range
+                    ON value_records (owner_addr, value_begin, value_end);
 
                 CREATE TABLE IF NOT EXISTS bundle_sidecars (
                     bundle_hash BLOB PRIMARY KEY,
@@ -186,6 +215,12 @@ class LocalWalletDB:
                     ref_count INTEGER NOT NULL DEFAULT 0
                 );
 
+                CREATE TABLE IF NOT EXISTS value_record_sidecar_refs (
+                    record_id TEXT NOT NULL,
+                    bundle_hash BLOB NOT NULL,
+                    PRIMARY KEY (record_id, bundle_hash)
+                );
+
                 CREATE TABLE IF NOT EXISTS receipts (
                     sender_addr TEXT NOT NULL,
                     seq INTEGER NOT NULL,
@@ -207,6 +242,7 @@ class LocalWalletDB:
                     seq INTEGER NOT NULL,
                     bundle_hash BLOB NOT NULL UNIQUE,
                     context_json TEXT NOT NULL,
+                    submitted INTEGER NOT NULL DEFAULT 1,
                     PRIMARY KEY (sender_addr, seq)
                 );
 
@@ -235,6 +271,16 @@ class LocalWalletDB:
                     PRIMARY KEY (owner_addr, height)
                 );
 
+                CREATE TABLE IF NOT EXISTS validated_witness_segments (
+                    segment_key BLOB PRIMARY KEY,
+                    validated_at INTEGER NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS value_record_write_seqs (
+                    owner_addr TEXT PRIMARY KEY,
+                    write_seq INTEGER NOT NULL
+                );
+
                 CREATE TABLE IF NOT EXISTS receipt_proof_batches (
                     batch_id TEXT PRIMARY KEY,
                     height INTEGER NOT NULL,
@@ -243,36 +289,107 @@ class LocalWalletDB:
                 """
             )
             self._ensure_column("bundle_sidecars", "claim_ranges_json", "TEXT")
+            self._ensure_column("bundle_sidecars", "zero_since", "INTEGER")
+            self._ensure_column("pending_bundles", "submitted", "INTEGER NOT NULL DEFAULT 1")
+            if self._ensure_column("value_records", "witness_chain_length", "INTEGER"):
+                self._backfill_witness_chain_lengths_locked()
+            self._ensure_column("value_records", "write_seq", "INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_value_records_owner_write_seq ON value_records (owner_addr, write_seq)"
+            )
+            if not has_sidecar_refs:
+                # Databases from before incremental ref counting have no per-record
+                # refs yet; derive them (and the counts) once.
+                self._recompute_sidecar_ref_counts_locked()
 
-    def _ensure_column(self, table: str, column: str, column_sql: str) -> None:
+    def _ensure_column(self, table: str, column: str, column_sql: str) -> bool:
+        """Add a column if it is missing; returns True when it was added."""
         rows = self._conn.execute(f"PRAGMA table_info({table})").fetchall()
         existing = {str(row["name"]) for row in rows}
         if column not in existing:
             self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_sql}")
+            return True
+        return False
 
-    def replace_value_records(self, owner_addr: str, records: Iterable[LocalValueRecord]) -> None:
-        records = list(records)
-        with self._lock:
-            with self._conn:
-                self._replace_value_records_locked(owner_addr, records)
+    def _backfill_witness_chain_lengths_locked(self) -> None:
+        # One-off decode of rows written before the header column existed.
+        rows = self._conn.execute("SELECT record_id, record_json FROM value_records").fetchall()
+        self._conn.executemany(
+            "UPDATE value_records SET witness_chain_length = ? WHERE record_id = ?",
+            [
+                (len(loads_json(row["record_json"]).witness_v2.confirmed_bundle_chain), row["record_id"])
+                for row in rows
+            ],
+        )
 
-    def replace_value_records_and_recompute_sidecar_refs(self, owner_addr: str, records: Iterable[LocalValueRecord]) -> None:
+    def replace_value_records(self, owner_addr: str, records: Iterable[LocalValueRecord]) -> list[LocalValueRecord]:
+        """Store ``records`` as the owner's full record set and return them as stored.
+
+        Records whose witness was rewritten come back deferred on their new
+        rows; the rest are returned as passed in.
+        """
         records = list(records)
         with self._lock:
             with self._conn:
-                self._replace_value_records_locked(owner_addr, records)
-                if callable(self._before_sidecar_refcount_recompute_hook):
-                    self._before_sidecar_refcount_recompute_hook()
-                self._recompute_sidecar_ref_counts_locked()
-
-    def _replace_value_records_locked(self, owner_addr: str, records: list[LocalValueRecord]) -> None:
-        self._conn.execute("DELETE FROM value_records WHERE owner_addr = ?", (owner_addr,))
+                return self._replace_value_records_locked(owner_addr, records)
+
+    def _replace_value_records_locked(self, owner_addr: str, records: list[LocalValueRecord]) -> list[LocalValueRecord]:
+        existing = {
+            row["record_id"]
+            for row in self._conn.execute("SELECT record_id FROM value_records WHERE owner_addr = ?", (owner_addr,))
+        }
+        # A record whose witness still comes from its stored row (decoded or
+        # not) matches that row, so only its header columns need writing.
+        kept: list[LocalValueRecord] = []
+        rewritten: list[LocalValueRecord] = []
+        for record in records:
+            source = record.witness_source
+            if isinstance(source, _StoredWitness) and source.db is self and record.record_id in existing:
+                kept.append(record)
+            else:
+                rewritten.append(record)
+        dropped = existing - {record.record_id for record in kept}
+        write_seq = self._next_record_write_seq_locked(owner_addr) if rewritten else 0
+        self._resolve_deferred_records(dropped)
+        ref_deltas: dict[bytes, int] = {}
+        for record_id in dropped:
+            for row in self._conn.execute(
+                "SELECT bundle_hash FROM value_record_sidecar_refs WHERE record_id = ?",
+                (record_id,),
+            ):
+                bundle_hash = bytes(row["bundle_hash"])
+                ref_deltas[bundle_hash] = ref_deltas.get(bundle_hash, 0) - 1
+        self._conn.executemany(
+            "DELETE FROM value_records WHERE record_id = ?",
+            [(record_id,) for record_id in dropped],
+        )
+        self._conn.executemany(
+            "DELETE FROM value_record_sidecar_refs WHERE record_id = ?",
+            [(record_id,) for record_id in dropped],
+        )
+        self._conn.executemany(
+            """
+            UPDATE value_records
+            SET value_begin = ?, value_end = ?, local_status = ?, acquisition_height = ?
+            WHERE record_id = ?
+            """,
+            [
+                (
+                    record.value.begin,
+                    record.value.end,
+                    record.local_status.value,
+                    record.acquisition_height,
+                    record.record_id,
+                )
+                for record in kept
+            ],
+        )
         self._conn.executemany(
             """
             INSERT INTO value_records (
                 owner_addr, record_id, value_begin, value_end,
-                local_status, acquisition_height, record_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                local_status, acquisition_height, witness_chain_length, record_json, write_seq
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             [
                 (
@@ -282,48 +399,220 @@ class LocalWalletDB:
                     record.value.end,
                     record.local_status.value,
                     record.acquisition_height,
+                    record.witness_chain_length,
                     dumps_json(_compact_record_with_batches(record, self.get_receipt_proof_batch)),
+                    write_seq,
                 )
-                for record in records
+                for record in rewritten
             ],
         )
+        ref_rows: list[tuple[str, sqlite3.Binary]] = []
+        for record in rewritten:
+            for bundle_hash in _collect_bundle_hashes_from_witness(record.witness_v2):
+                ref_rows.append((record.record_id, sqlite3.Binary(bundle_hash)))
+                ref_deltas[bundle_hash] = ref_deltas.get(bundle_hash, 0) + 1
+        self._conn.executemany(
+            "INSERT INTO value_record_sidecar_refs (record_id, bundle_hash) VALUES (?, ?)",
+            ref_rows,
+        )
+        if callable(self._before_sidecar_refcount_recompute_hook):
+            self._before_sidecar_refcount_recompute_hook()
+        self._adjust_sidecar_ref_counts_locked(ref_deltas)
+        rewritten_ids = {record.record_id for record in rewritten}
+        return [
+            self._stored_copy(record) if record.record_id in rewritten_ids else record
+            for record in records
+        ]
+
+    def _adjust_sidecar_ref_counts_locked(self, deltas: dict[bytes, int]) -> None:
+        now = int(time.time())
+        for bundle_hash, delta in deltas.items():
+            if delta > 0:
+                # A record can reference a sidecar this DB never stored; keep a
+                # placeholder row so the count is not lost.
+                self._conn.execute(
+                    """
+                    INSERT INTO bundle_sidecars (bundle_hash, sidecar_json, claim_ranges_json, ref_count, zero_since)
+                    VALUES (?, ?, NULL, ?, NULL)
+                    ON CONFLICT(bundle_hash) DO UPDATE SET
+                        ref_count = MAX(ref_count, 0) + excluded.ref_count,
+                        zero_since = NULL
+                    """,
+                    (sqlite3.Binary(bundle_hash), dumps_json(None), delta),
+                )
+            elif delta < 0:
+                self._conn.execute(
+                    """
+                    UPDATE bundle_sidecars
+                    SET ref_count = MAX(ref_count + ?, 0),
+                        zero_since = CASE
+                            WHEN ref_count + ? > 0 THEN NULL
+                            ELSE COALESCE(zero_since, ?)
+                        END
+                    WHERE bundle_hash = ?
+                    """,
+                    (delta, delta, now, sqlite3.Binary(bundle_hash)),
+                )
+
+    def _resolve_deferred_records(self, record_ids: Iterable[str]) -> None:
+        # Rows are about to be deleted or rewritten; decode any record still
+        # pointing at them and detach it, so it keeps the witness it was listed
+        # with and is written back in full if persisted again.
+        for record_id in record_ids:
+            for ref in self._deferred_records.pop(record_id, ()):
+                record = ref()
+                if record is not None and record.witness_source is not None:
+                    record.detach_witness()
+
+    def _deferred_record(self, row: sqlite3.Row) -> LocalValueRecord:
+        chain_length = row["witness_chain_length"]
+        return LocalValueRecord.deferred(
+            record_id=row["record_id"],
+            value=ValueRange(row["value_begin"], row["value_end"]),
+            local_status=LocalValueStatus(row["local_status"]),
+            acquisition_height=row["acquisition_height"],
+            witness_loader=_StoredWitness(self, row["record_id"]),
+            chain_length=int(chain_length) if chain_length is not None else None,
+        )
+
+    def _stored_copy(self, record: LocalValueRecord) -> LocalValueRecord:
+        return LocalValueRecord.deferred(
+            record_id=record.record_id,
+            value=record.value,
+            local_status=record.local_status,
+            acquisition_height=record.acquisition_height,
+            witness_loader=_StoredWitness(self, record.record_id),
+            chain_length=record.witness_chain_length,
+        )
+
+    def _track_deferred_record(self, record: LocalValueRecord) -> None:
+        # Records are unhashable, so track them as weakrefs and drop dead ones here.
+        with self._lock:
+            refs = [ref for ref in self._deferred_records.get(record.record_id, ()) if ref() is not None]
+            refs.append(weakref.ref(record))
+            self._deferred_records[record.record_id] = refs
+
+    def _load_record_witness(self, record_id: str) -> WitnessV2:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record_json FROM value_records WHERE record_id = ?",
+                (record_id,),
+            ).fetchone()
+        if row is None:
+            raise LookupError(f"value record {record_id} is no longer stored")
+        return _materialize_witness_with_lookup(loads_json(row["record_json"]).witness_v2, self.get_receipt_proof_batch)
 
     def list_value_records(self, owner_addr: str) -> list[LocalValueRecord]:
         rows = self._conn.execute(
-            """
-            SELECT record_json
+            f"""
+            SELECT {_RECORD_HEADER_COLUMNS}
             FROM value_records
             WHERE owner_addr = ?
             ORDER BY value_begin, value_end, record_id
             """,
             (owner_addr,),
         ).fetchall()
-        return [
-            _materialize_record_with_batches(loads_json(row["record_json"]), self.get_receipt_proof_batch)
-            for row in rows
-        ]
+        return [self._deferred_record(row) for row in rows]
+
+    def _next_record_write_seq_locked(self, owner_addr: str) -> int:
+        # A counter rather than MAX(write_seq): dropping the newest rows must
+        # not hand their sequence to the next write.
+        self._conn.execute(
+            """
+            INSERT INTO value_record_write_seqs (owner_addr, write_seq) VALUES (?, 1)
+            ON CONFLICT(owner_addr) DO UPDATE SET write_seq = write_seq + 1
+            """,
+            (owner_addr,),
+        )
+        return self.last_record_write_seq(owner_addr)
+
+    def last_record_write_seq(self, owner_addr: str) -> int:
+        """Write sequence of the owner's most recently (re)written value records."""
+        row = self._conn.execute(
+            "SELECT write_seq FROM value_record_write_seqs WHERE owner_addr = ?",
+            (owner_addr,),
+        ).fetchone()
+        return 0 if row is None else int(row["write_seq"])
+
+    def list_value_records_written_since(
+        self,
+        owner_addr: str,
+        after_write_seq: int,
+        *,
+        upto_write_seq: int,
+    ) -> list[LocalValueRecord]:
+        """Records whose witness was written in ``(after_write_seq, upto_write_seq]``.
+
+        A record's write sequence only moves when its witness is rewritten, so
+        readers can follow witness changes without listing every record.
+        """
+        rows = self._conn.execute(
+            f"""
+            SELECT {_RECORD_HEADER_COLUMNS}
+            FROM value_records
+            WHERE owner_addr = ? AND write_seq > ? AND write_seq <= ?
+            ORDER BY write_seq, value_begin, value_end, record_id
+            """,
+            (owner_addr, after_write_seq, upto_write_seq),
+        ).fetchall()
+        return [self._deferred_record(row) for row in rows]
 
     def save_sidecar(self, sidecar) -> bytes:
+        with self._lock:
+            with self._conn:
+                return self._save_sidecar_locked(sidecar)
+
+    def _save_sidecar_locked(self, sidecar) -> bytes:
         bundle_hash = compute_bundle_hash(sidecar)
         claim_ranges = claim_range_set_from_sidecar(sidecar)
-        with self._conn:
-            self._conn.execute(
-                """
-                INSERT INTO bundle_sidecars (bundle_hash, sidecar_json, claim_ranges_json, ref_count)
-                VALUES (?, ?, ?, COALESCE((SELECT ref_count FROM bundle_sidecars WHERE bundle_hash = ?), 0))
-                ON CONFLICT(bundle_hash) DO UPDATE SET
-                    sidecar_json = excluded.sidecar_json,
-                    claim_ranges_json = excluded.claim_ranges_json
-                """,
-                (
-                    sqlite3.Binary(bundle_hash),
-                    dumps_json(sidecar),
-                    dumps_json(claim_range_set_json_obj(claim_ranges)),
-                    sqlite3.Binary(bundle_hash),
-                ),
-            )
+        self._conn.execute(
+            """
+            INSERT INTO bundle_sidecars (bundle_hash, sidecar_json, claim_ranges_json, ref_count, zero_since)
+            VALUES (?, ?, ?, 0, ?)
+            ON CONFLICT(bundle_hash) DO UPDATE SET
+                sidecar_json = excluded.sidecar_json,
+                claim_ranges_json = excluded.claim_ranges_json
+            """,
+            (
+                sqlite3.Binary(bundle_hash),
+                dumps_json(sidecar),
+                dumps_json(claim_range_set_json_obj(claim_ranges)),
+                int(time.time()),
+            ),
+        )
         return bundle_hash
 
+    def commit_received_transfers(
+        self,
+        owner_addr: str,
+        records: Iterable[LocalValueRecord],
+        sidecars: Iterable[object],
+        package_hashes: Iterable[bytes],
+        accepted_at: int,
+    ) -> list[LocalValueRecord]:
+        """Store accepted incoming transfers in one transaction.
+
+        ``records`` is the owner's full record set after the transfers; the
+        packages' sidecars and accepted-package markers land alongside it, so a
+        crash never leaves a record without its marker or the other way round.
+        Returns the records as stored, like ``replace_value_records``.
+        """
+        records = list(records)
+        with self._lock:
+            with self._conn:
+                for sidecar in sidecars:
+                    self._save_sidecar_locked(sidecar)
+                stored = self._replace_value_records_locked(owner_addr, records)
+                self._conn.executemany(
+                    """
+                    INSERT INTO accepted_transfer_packages (owner_addr, package_hash, accepted_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(owner_addr, package_hash) DO NOTHING
+                    """,
+                    [(owner_addr, sqlite3.Binary(package_hash), accepted_at) for package_hash in package_hashes],
+                )
+        return stored
+
     def get_sidecar(self, bundle_hash: bytes):
         row = self._conn.execute(
             "SELECT sidecar_json FROM bundle_sidecars WHERE bundle_hash = ?",
@@ -361,17 +650,18 @@ class LocalWalletDB:
             bundle_hash,
             compact_receipt.seq,
         )
-        with self._conn:
-            self._conn.execute(
-                """
-                INSERT INTO receipts (sender_addr, seq, bundle_ref_key, receipt_json)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(sender_addr, seq) DO UPDATE SET
-                    bundle_ref_key = excluded.bundle_ref_key,
-                    receipt_json = excluded.receipt_json
-                """,
-                (sender_addr, compact_receipt.seq, bundle_ref_key, dumps_json(compact_receipt)),
-            )
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    """
+                    INSERT INTO receipts (sender_addr, seq, bundle_ref_key, receipt_json)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(sender_addr, seq) DO UPDATE SET
+                        bundle_ref_key = excluded.bundle_ref_key,
+                        receipt_json = excluded.receipt_json
+                    """,
+                    (sender_addr, compact_receipt.seq, bundle_ref_key, dumps_json(compact_receipt)),
+                )
 
     def get_receipt(self, sender_addr: str, seq: int) -> Receipt | None:
         row = self._conn.execute(
@@ -425,23 +715,24 @@ class LocalWalletDB:
             unit,
             self.get_receipt_proof_batch(f"{bundle_ref.height}:{bundle_ref.block_hash.hex()}"),
         )
-        with self._conn:
-            self._conn.execute(
-                """
-                INSERT INTO confirmed_units (sender_addr, seq, bundle_ref_key, bundle_hash, unit_json)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(bundle_ref_key) DO UPDATE SET
-                    unit_json = excluded.unit_json,
-                    bundle_hash = excluded.bundle_hash
-                """,
-                (
-                    compact_unit.bundle_sidecar.sender_addr,
-                    compact_unit.receipt.seq,
-                    _bundle_ref_key(bundle_ref),
-                    sqlite3.Binary(bundle_ref.bundle_hash),
-                    dumps_json(compact_unit),
-                ),
-            )
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    """
+                    INSERT INTO confirmed_units (sender_addr, seq, bundle_ref_key, bundle_hash, unit_json)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(bundle_ref_key) DO UPDATE SET
+                        unit_json = excluded.unit_json,
+                        bundle_hash = excluded.bundle_hash
+                    """,
+                    (
+                        compact_unit.bundle_sidecar.sender_addr,
+                        compact_unit.receipt.seq,
+                        _bundle_ref_key(bundle_ref),
+                        sqlite3.Binary(bundle_ref.bundle_hash),
+                        dumps_json(compact_unit),
+                    ),
+                )
 
     def get_confirmed_unit_by_ref(self, bundle_ref) -> ConfirmedBundleUnit | None:
         row = self._conn.execute(
@@ -465,23 +756,49 @@ class LocalWalletDB:
             return None
         return _materialize_unit_with_lookup(loads_json(row["unit_json"]), self.get_receipt_proof_batch)
 
-    def save_pending_bundle(self, context: PendingBundleContext) -> None:
-        with self._conn:
-            self._conn.execute(
-                """
-                INSERT INTO pending_bundles (sender_addr, seq, bundle_hash, context_json)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(sender_addr, seq) DO UPDATE SET
-                    bundle_hash = excluded.bundle_hash,
-                    context_json = excluded.context_json
-                """,
-                (
-                    context.sender_addr,
-                    context.seq,
-                    sqlite3.Binary(context.bundle_hash),
-                    dumps_json(context),
-                ),
-            )
+    def last_confirmed_sequence(self, sender_addr: str) -> int:
+        """Highest seq with a confirmed unit for the sender, or 0 before the first."""
+        row = self._conn.execute(
+            "SELECT MAX(seq) AS max_seq FROM confirmed_units WHERE sender_addr = ?",
+            (sender_addr,),
+        ).fetchone()
+        return 0 if row is None or row["max_seq"] is None else int(row["max_seq"])
+
+    def save_pending_bundle(self, context: PendingBundleContext, *, submitted: bool = True) -> None:
+        """Store a pending bundle together with its sidecar and the sidecar's ref.
+
+        ``submitted=False`` marks a pipelined bundle still waiting for its
+        predecessor to confirm before it is sent to consensus.
+        """
+        with self._lock:
+            with self._conn:
+                previous = self._conn.execute(
+                    "SELECT bundle_hash FROM pending_bundles WHERE sender_addr = ? AND seq = ?",
+                    (context.sender_addr, context.seq),
+                ).fetchone()
+                self._save_sidecar_locked(context.sidecar)
+                self._conn.execute(
+                    """
+                    INSERT INTO pending_bundles (sender_addr, seq, bundle_hash, context_json, submitted)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(sender_addr, seq) DO UPDATE SET
+                        bundle_hash = excluded.bundle_hash,
+                        context_json = excluded.context_json,
+                        submitted = excluded.submitted
+                    """,
+                    (
+                        context.sender_addr,
+                        context.seq,
+                        sqlite3.Binary(context.bundle_hash),
+                        dumps_json(context),
+                        int(submitted),
+                    ),
+                )
+                deltas = {context.bundle_hash: 1}
+                if previous is not None:
+                    previous_hash = bytes(previous["bundle_hash"])
+                    deltas[previous_hash] = deltas.get(previous_hash, 0) - 1
+                self._adjust_sidecar_ref_counts_locked(deltas)
 
     def get_pending_bundle(self, sender_addr: str, seq: int) -> PendingBundleContext | None:
         row = self._conn.execute(
@@ -490,6 +807,21 @@ class LocalWalletDB:
         ).fetchone()
         return loads_json(row["context_json"]) if row else None
 
+    def is_pending_bundle_submitted(self, sender_addr: str, seq: int) -> bool:
+        row = self._conn.execute(
+            "SELECT submitted FROM pending_bundles WHERE sender_addr = ? AND seq = ?",
+            (sender_addr, seq),
+        ).fetchone()
+        return bool(row["submitted"]) if row else False
+
+    def mark_pending_bundle_submitted(self, sender_addr: str, seq: int) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE pending_bundles SET submitted = 1 WHERE sender_addr = ? AND seq = ?",
+                    (sender_addr, seq),
+                )
+
     def list_pending_bundles(self, sender_addr: str) -> list[PendingBundleContext]:
         rows = self._conn.execute(
             "SELECT context_json FROM pending_bundles WHERE sender_addr = ? ORDER BY seq",
@@ -524,48 +856,70 @@ class LocalWalletDB:
         return row is not None
 
     def save_accepted_transfer_package(self, owner_addr: str, package_hash: bytes, accepted_at: int) -> None:
-        with self._conn:
-            self._conn.execute(
-                """
-                INSERT INTO accepted_transfer_packages (owner_addr, package_hash, accepted_at)
-                VALUES (?, ?, ?)
-                ON CONFLICT(owner_addr, package_hash) DO NOTHING
-                """,
-                (owner_addr, sqlite3.Binary(package_hash), accepted_at),
-            )
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    """
+                    INSERT INTO accepted_transfer_packages (owner_addr, package_hash, accepted_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(owner_addr, package_hash) DO NOTHING
+                    """,
+                    (owner_addr, sqlite3.Binary(package_hash), accepted_at),
+                )
+
+    def has_validated_witness_segment(self, segment_key: bytes) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM validated_witness_segments WHERE segment_key = ?",
+            (sqlite3.Binary(segment_key),),
+        ).fetchone()
+        return row is not None
+
+    def save_validated_witness_segments(self, segment_keys: Iterable[bytes], validated_at: int) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    """
+                    INSERT INTO validated_witness_segments (segment_key, validated_at)
+                    VALUES (?, ?)
+                    ON CONFLICT(segment_key) DO NOTHING
+                    """,
+                    [(sqlite3.Binary(segment_key), validated_at) for segment_key in segment_keys],
+                )
 
     def save_canonical_header(self, owner_addr: str, header: HeaderLite) -> None:
-        with self._conn:
-            self._conn.execute(
-                """
-                INSERT INTO canonical_headers_v2 (owner_addr, height, block_hash, state_root, header_json)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(owner_addr, height) DO UPDATE SET
-                    block_hash = excluded.block_hash,
-                    state_root = excluded.state_root,
-                    header_json = excluded.header_json
-                """,
-                (
-                    owner_addr,
-                    header.height,
-                    sqlite3.Binary(header.block_hash),
-                    sqlite3.Binary(header.state_root),
-                    dumps_json(header),
-                ),
-            )
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    """
+                    INSERT INTO canonical_headers_v2 (owner_addr, height, block_hash, state_root, header_json)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(owner_addr, height) DO UPDATE SET
+                        block_hash = excluded.block_hash,
+                        state_root = excluded.state_root,
+                        header_json = excluded.header_json
+                    """,
+                    (
+                        owner_addr,
+                        header.height,
+                        sqlite3.Binary(header.block_hash),
+                        sqlite3.Binary(header.state_root),
+                        dumps_json(header),
+                    ),
+                )
 
     def save_receipt_proof_batch(self, height: int, batch: ReceiptProofBatch) -> None:
-        with self._conn:
-            self._conn.execute(
-                """
-                INSERT INTO receipt_proof_batches (batch_id, height, batch_json)
-                VALUES (?, ?, ?)
-                ON CONFLICT(batch_id) DO UPDATE SET
-                    height = excluded.height,
-                    batch_json = excluded.batch_json
-                """,
-                (batch.batch_id, int(height), dumps_json(batch)),
-            )
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    """
+                    INSERT INTO receipt_proof_batches (batch_id, height, batch_json)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(batch_id) DO UPDATE SET
+                        height = excluded.height,
+                        batch_json = excluded.batch_json
+                    """,
+                    (batch.batch_id, int(height), dumps_json(batch)),
+                )
 
     def get_receipt_proof_batch(self, batch_id: str) -> ReceiptProofBatch | None:
         row = self._conn.execute(
@@ -606,11 +960,19 @@ class LocalWalletDB:
         return row is not None
 
     def delete_pending_bundle(self, sender_addr: str, seq: int) -> None:
-        with self._conn:
-            self._conn.execute(
-                "DELETE FROM pending_bundles WHERE sender_addr = ? AND seq = ?",
-                (sender_addr, seq),
-            )
+        with self._lock:
+            with self._conn:
+                row = self._conn.execute(
+                    "SELECT bundle_hash FROM pending_bundles WHERE sender_addr = ? AND seq = ?",
+                    (sender_addr, seq),
+                ).fetchone()
+                if row is None:
+                    return
+                self._conn.execute(
+                    "DELETE FROM pending_bundles WHERE sender_addr = ? AND seq = ?",
+                    (sender_addr, seq),
+                )
+                self._adjust_sidecar_ref_counts_locked({bytes(row["bundle_hash"]): -1})
 
     def save_checkpoint(self, checkpoint: Checkpoint) -> None:
         checkpoint_key = "|".join(
@@ -622,24 +984,37 @@ class LocalWalletDB:
                 checkpoint.checkpoint_bundle_hash.hex(),
             ]
         )
-        with self._conn:
-            self._conn.execute(
-                """
-                INSERT INTO checkpoints_v2 (
-                    owner_addr, checkpoint_key, value_begin, value_end,
-                    checkpoint_height, checkpoint_json
-                ) VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(checkpoint_key) DO UPDATE SET checkpoint_json = excluded.checkpoint_json
-                """,
-                (
-                    checkpoint.owner_addr,
-                    checkpoint_key,
-                    checkpoint.value_begin,
-                    checkpoint.value_end,
-                    checkpoint.checkpoint_height,
-                    dumps_json(checkpoint),
-                ),
-            )
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    """
+                    INSERT INTO checkpoints_v2 (
+                        owner_addr, checkpoint_key, value_begin, value_end,
+                        checkpoint_height, checkpoint_json
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(checkpoint_key) DO UPDATE SET checkpoint_json = excluded.checkpoint_json
+                    """,
+                    (
+                        checkpoint.owner_addr,
+                        checkpoint_key,
+                        checkpoint.value_begin,
+                        checkpoint.value_end,
+                        checkpoint.checkpoint_height,
+                        dumps_json(checkpoint),
+                    ),
+                )
+
+    def delete_checkpoints_before(self, owner_addr: str, value_begin: int, value_end: int, checkpoint_height: int) -> int:
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    """
+                    DELETE FROM checkpoints_v2
+                    WHERE owner_addr = ? AND value_begin = ? AND value_end = ? AND checkpoint_height < ?
+                    """,
+                    (owner_addr, value_begin, value_end, checkpoint_height),
+                )
+        return int(cursor.rowcount)
 
     def list_checkpoints(self, owner_addr: str) -> list[Checkpoint]:
         rows = self._conn.execute(
@@ -653,48 +1028,117 @@ class LocalWalletDB:
         ).fetchall()
         return [loads_json(row["checkpoint_json"]) for row in rows]
 
-    def recompute_sidecar_ref_counts(self) -> None:
+    def recompute_sidecar_ref_counts(self) -> int:
+        """Offline fsck: rebuild sidecar refs from every record and pending bundle.
+
+        Wallet writes keep the counts up to date incrementally; this full pass
+        is only for checking or repairing a database.  Returns the number of
+        sidecars whose stored count was wrong.
+        """
         with self._lock:
             with self._conn:
-                self._recompute_sidecar_ref_counts_locked()
+                return self._recompute_sidecar_ref_counts_locked()
 
-    def _recompute_sidecar_ref_counts_locked(self) -> None:
+    def _recompute_sidecar_ref_counts_locked(self) -> int:
         counts: dict[bytes, int] = {}
-        for row in self._conn.execute("SELECT record_json FROM value_records"):
+        ref_rows: list[tuple[str, sqlite3.Binary]] = []
+        for row in self._conn.execute("SELECT record_id, record_json FROM value_records"):
             record = loads_json(row["record_json"])
             for bundle_hash in _collect_bundle_hashes_from_witness(record.witness_v2):
+                ref_rows.append((row["record_id"], sqlite3.Binary(bundle_hash)))
                 counts[bundle_hash] = counts.get(bundle_hash, 0) + 1
-        for row in self._conn.execute("SELECT context_json FROM pending_bundles"):
-            context = loads_json(row["context_json"])
-            counts[context.bundle_hash] = counts.get(context.bundle_hash, 0) + 1
-        self._conn.execute("UPDATE bundle_sidecars SET ref_count = 0")
-        for bundle_hash, ref_count in counts.items():
-            sidecar = self.get_sidecar(bundle_hash)
-            claim_ranges = None if sidecar is None else claim_range_set_from_sidecar(sidecar)
-            self._conn.execute(
-                """
-                INSERT INTO bundle_sidecars (bundle_hash, sidecar_json, claim_ranges_json, ref_count)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(bundle_hash) DO UPDATE SET
-                    sidecar_json = excluded.sidecar_json,
-                    claim_ranges_json = excluded.claim_ranges_json,
-                    ref_count = excluded.ref_count
-                """,
-                (
-                    sqlite3.Binary(bundle_hash),
-                    dumps_json(sidecar),
-                    None if claim_ranges is None else dumps_json(claim_range_set_json_obj(claim_ranges)),
-                    ref_count,
-                ),
-            )
-
-    def gc_unused_sidecars(self) -> int:
+        for row in self._conn.execute("SELECT bundle_hash FROM pending_bundles"):
+            bundle_hash = bytes(row["bundle_hash"])
+            counts[bundle_hash] = counts.get(bundle_hash, 0) + 1
+        self._conn.execute("DELETE FROM value_record_sidecar_refs")
+        self._conn.executemany(
+            "INSERT INTO value_record_sidecar_refs (record_id, bundle_hash) VALUES (?, ?)",
+            ref_rows,
+        )
+        stored = {
+            bytes(row["bundle_hash"]): int(row["ref_count"])
+            for row in self._conn.execute("SELECT bundle_hash, ref_count FROM bundle_sidecars")
+        }
+        deltas = {
+            bundle_hash: counts.get(bundle_hash, 0) - stored.get(bundle_hash, 0)
+            for bundle_hash in stored.keys() | counts.keys()
+        }
+        deltas = {bundle_hash: delta for bundle_hash, delta in deltas.items() if delta}
+        self._adjust_sidecar_ref_counts_locked(deltas)
+        return len(deltas)
+
+    def gc_unused_sidecars(self, min_unreferenced_sec: float = 0.0) -> int:
+        """Delete sidecars with no refs, optionally only those idle for a while.
+
+        ``min_unreferenced_sec`` leaves recently released or freshly saved
+        sidecars alone, so a collector running alongside wallet writes cannot
+        drop one that the next write in a multi-step update will reference.
+        """
+        cutoff = int(time.time() - max(0.0, min_unreferenced_sec))
         with self._lock:
             with self._conn:
-                cursor = self._conn.execute("DELETE FROM bundle_sidecars WHERE ref_count <= 0")
+                cursor = self._conn.execute(
+                    """
+                    DELETE FROM bundle_sidecars
+                    WHERE ref_count <= 0 AND (zero_since IS NULL OR zero_since <= ?)
+                    """,
+                    (cutoff,),
+                )
         return cursor.rowcount
 
 
+class SidecarGarbageCollector:
+    """Background thread that periodically deletes unreferenced sidecars."""
+
+    def __init__(
+        self,
+        db: LocalWalletDB,
+        *,
+        interval_sec: float = 60.0,
+        min_unreferenced_sec: float = 60.0,
+    ):
+        if interval_sec <= 0:
+            raise ValueError("interval_sec must be positive")
+        self.db = db
+        self.interval_sec = interval_sec
+        self.min_unreferenced_sec = min_unreferenced_sec
+        self.removed_total = 0
+        self.last_error = ""
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ez-v2-sidecar-gc", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def collect_once(self) -> int:
+        removed = self.db.gc_unused_sidecars(self.min_unreferenced_sec)
+        self.removed_total += removed
+        return removed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            try:
+                self.collect_once()
+            except sqlite3.Error as exc:
+                # The DB may be closing underneath us; the next pass retries.
+                self.last_error = str(exc)
+
+
 def _collect_bundle_hashes_from_witness(witness) -> set[bytes]:
     hashes: set[bytes] = set()
     for unit in witness.confirmed_bundle_chain:
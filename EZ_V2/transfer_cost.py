@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .encoding import canonical_encode
+from .serde import dumps_json
+from .types import (
+    BundleRef,
+    CompressedSparseMerkleProof,
+    HeaderLite,
+    Receipt,
+    TransferPackage,
+)
+from .values import ValueRange
+
+SMT_DEPTH = 256
+# Non-default siblings of a single-key proof grow with log2(accounts touched);
+# used when the wallet has no compressed receipt of its own to copy.
+DEFAULT_ESTIMATED_PROOF_SIBLINGS = 24
+
+_PLACEHOLDER_HASH32 = b"\x00" * 32
+
+
+def verification_hash_ops(confirmed_units: int, smt_depth: int = SMT_DEPTH) -> int:
+    """Hashes a recipient spends on receipt proofs: one depth-long path per unit."""
+    return confirmed_units * smt_depth
+
+
+def placeholder_receipt(
+    *,
+    height: int,
+    seq: int,
+    proof_siblings: int,
+    claim_set_hash: bytes | None,
+    smt_depth: int = SMT_DEPTH,
+) -> Receipt:
+    """A receipt with the same encoded size as the one the pending bundle will get."""
+    proof_siblings = max(0, min(proof_siblings, smt_depth))
+    return Receipt(
+        header_lite=HeaderLite(height=height, block_hash=_PLACEHOLDER_HASH32, state_root=_PLACEHOLDER_HASH32),
+        seq=seq,
+        prev_ref=(
+            None
+            if seq == 1
+            else BundleRef(height=height, block_hash=_PLACEHOLDER_HASH32, bundle_hash=_PLACEHOLDER_HASH32, seq=seq - 1)
+        ),
+        claim_set_hash=claim_set_hash,
+        account_state_proof=CompressedSparseMerkleProof(
+            bitmap=((1 << proof_siblings) - 1).to_bytes((smt_depth + 7) // 8, byteorder="little"),
+            siblings=(_PLACEHOLDER_HASH32,) * proof_siblings,
+            existence=True,
+        ),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class OutputCostEstimate:
+    """Predicted cost of the transfer package for one output value."""
+
+    value: ValueRange
+    source_record_id: str
+    package_bytes: int
+    package_json_bytes: int
+    confirmed_units: int
+    proof_verifications: int
+    hash_ops: int
+
+    @classmethod
+    def from_package(cls, package: TransferPackage, source_record_id: str, confirmed_units: int) -> "OutputCostEstimate":
+        return cls(
+            value=package.target_value,
+            source_record_id=source_record_id,
+            package_bytes=len(canonical_encode(package)),
+            package_json_bytes=len(dumps_json(package).encode("utf-8")),
+            confirmed_units=confirmed_units,
+            proof_verifications=confirmed_units,
+            hash_ops=verification_hash_ops(confirmed_units),
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "value_begin": self.value.begin,
+            "value_end": self.value.end,
+            "source_record_id": self.source_record_id,
+            "package_bytes": self.package_bytes,
+            "package_json_bytes": self.package_json_bytes,
+            "confirmed_units": self.confirmed_units,
+            "proof_verifications": self.proof_verifications,
+            "hash_ops": self.hash_ops,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class PaymentCostEstimate:
+    recipient_addr: str
+    amount: int
+    outputs: tuple[OutputCostEstimate, ...]
+
+    @property
+    def package_count(self) -> int:
+        return len(self.outputs)
+
+    @property
+    def total_package_bytes(self) -> int:
+        return sum(item.package_bytes for item in self.outputs)
+
+    @property
+    def max_package_bytes(self) -> int:
+        return max((item.package_bytes for item in self.outputs), default=0)
+
+    @property
+    def total_confirmed_units(self) -> int:
+        return sum(item.confirmed_units for item in self.outputs)
+
+    @property
+    def total_proof_verifications(self) -> int:
+        return sum(item.proof_verifications for item in self.outputs)
+
+    @property
+    def total_hash_ops(self) -> int:
+        return sum(item.hash_ops for item in self.outputs)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "recipient": self.recipient_addr,
+            "amount": self.amount,
+            "package_count": self.package_count,
+            "total_package_bytes": self.total_package_bytes,
+            "max_package_bytes": self.max_package_bytes,
+            "total_confirmed_units": self.total_confirmed_units,
+            "total_proof_verifications": self.total_proof_verifications,
+            "total_hash_ops": self.total_hash_ops,
+            "outputs": [item.to_dict() for item in self.outputs],
+        }
@@ -1,16 +1,88 @@
 from __future__ import annotations
 
 import sqlite3
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import Callable, Iterable
 
 from .crypto import keccak256
 from .encoding import canonical_encode
 from .serde import dumps_json, loads_json
-from .types import TransferPackage
+from .smt import compress_proof
+from .types import (
+    CompressedSparseMerkleProof,
+    ConfirmedBundleUnit,
+    PriorWitnessLink,
+    Receipt,
+    SparseMerkleProof,
+    TransferPackage,
+    WitnessV2,
+)
+
+ProofConverter = Callable[[SparseMerkleProof | CompressedSparseMerkleProof], SparseMerkleProof | CompressedSparseMerkleProof]
 
 
 def transfer_package_hash(package: TransferPackage) -> bytes:
-    return keccak256(b"EZCHAIN_TRANSFER_PACKAGE_V2" + canonical_encode(package))
+    # Hash the compressed form so a package keeps one identity whether it
+    # arrived from a peer that sends compressed proofs or one that does not.
+    return keccak256(b"EZCHAIN_TRANSFER_PACKAGE_V2" + canonical_encode(package_with_proofs(package, compress_proof)))
+
+
+def receipt_with_proof(receipt: Receipt, convert: ProofConverter) -> Receipt:
+    proof = receipt.account_state_proof
+    if proof is None:
+        return receipt
+    converted = convert(proof)
+    return receipt if converted is proof else replace(receipt, account_state_proof=converted)
+
+
+def _unit_with_proof(unit: ConfirmedBundleUnit, convert: ProofConverter) -> ConfirmedBundleUnit:
+    receipt = receipt_with_proof(unit.receipt, convert)
+    return unit if receipt is unit.receipt else replace(unit, receipt=receipt)
+
+
+def witness_with_proofs(witness: WitnessV2, convert: ProofConverter) -> WitnessV2:
+    chain = tuple(_unit_with_proof(unit, convert) for unit in witness.confirmed_bundle_chain)
+    anchor = witness.anchor
+    if isinstance(anchor, PriorWitnessLink):
+        prior_witness = witness_with_proofs(anchor.prior_witness, convert)
+        if prior_witness is not anchor.prior_witness:
+            anchor = replace(anchor, prior_witness=prior_witness)
+    if anchor is witness.anchor and all(new is old for new, old in zip(chain, witness.confirmed_bundle_chain)):
+        return witness
+    return replace(witness, confirmed_bundle_chain=chain, anchor=anchor)
+
+
+def package_with_proofs(package: TransferPackage, convert: ProofConverter) -> TransferPackage:
+    """Return ``package`` with every receipt proof passed through ``convert``.
+
+    Unchanged parts are shared, so converting an already-converted package
+    returns it as is.
+    """
+    witness = witness_with_proofs(package.witness_v2, convert)
+    return package if witness is package.witness_v2 else replace(package, witness_v2=witness)
+
+
+def package_confirmed_height(package: TransferPackage) -> int:
+    """Height of the package's latest confirmed unit, or -1 when it has none."""
+    chain = package.witness_v2.confirmed_bundle_chain
+    return chain[0].receipt.header_lite.height if chain else -1
+
+
+@dataclass(frozen=True, slots=True)
+class PendingPackageCursor:
+    confirmed_height: int
+    created_at: int
+    package_hash: bytes
+
+
+def pending_package_cursor(item: tuple[bytes, str, int, TransferPackage]) -> PendingPackageCursor:
+    package_hash, _, created_at, package = item
+    return PendingPackageCursor(
+        confirmed_height=package_confirmed_height(package),
+        created_at=created_at,
+        package_hash=package_hash,
+    )
 
 
 class TransferMailboxStore:
@@ -41,6 +113,21 @@ class TransferMailboxStore:
                     ON transfer_mailbox (recipient_addr, claimed_at, created_at);
                 """
             )
+            columns = {str(row["name"]) for row in self._conn.execute("PRAGMA table_info(transfer_mailbox)")}
+            if "confirmed_height" not in columns:
+                self._conn.execute("ALTER TABLE transfer_mailbox ADD COLUMN confirmed_height INTEGER NOT NULL DEFAULT -1")
+                rows = self._conn.execute("SELECT package_hash, package_json FROM transfer_mailbox").fetchall()
+                self._conn.executemany(
+                    "UPDATE transfer_mailbox SET confirmed_height = ? WHERE package_hash = ?",
+                    [(package_confirmed_height(loads_json(row["package_json"])), row["package_hash"]) for row in rows],
+                )
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_transfer_mailbox_pending
+                    ON transfer_mailbox (recipient_addr, confirmed_height, created_at, package_hash)
+                    WHERE claimed_at IS NULL
+                """
+            )
 
     def enqueue_package(
         self,
@@ -55,12 +142,13 @@ class TransferMailboxStore:
             self._conn.execute(
                 """
                 INSERT INTO transfer_mailbox (
-                    package_hash, sender_addr, recipient_addr, created_at, claimed_at, package_json
-                ) VALUES (?, ?, ?, ?, NULL, ?)
+                    package_hash, sender_addr, recipient_addr, created_at, claimed_at, package_json, confirmed_height
+                ) VALUES (?, ?, ?, ?, NULL, ?, ?)
                 ON CONFLICT(package_hash) DO UPDATE SET
                     sender_addr = excluded.sender_addr,
                     recipient_addr = excluded.recipient_addr,
-                    package_json = excluded.package_json
+                    package_json = excluded.package_json,
+                    confirmed_height = excluded.confirmed_height
                 """,
                 (
                     sqlite3.Binary(package_hash),
@@ -68,20 +156,38 @@ class TransferMailboxStore:
                     recipient_addr,
                     created_at,
                     dumps_json(package),
+                    package_confirmed_height(package),
                 ),
             )
         return package_hash
 
-    def list_pending_packages(self, recipient_addr: str) -> list[tuple[bytes, str, int, TransferPackage]]:
-        rows = self._conn.execute(
-            """
+    def list_pending_packages(
+        self,
+        recipient_addr: str,
+        *,
+        limit: int | None = None,
+        after: PendingPackageCursor | None = None,
+    ) -> list[tuple[bytes, str, int, TransferPackage]]:
+        """Unclaimed packages for ``recipient_addr`` in height order.
+
+        Packages are ordered by the height of their latest confirmed unit, then
+        ``created_at`` and hash.  Pass ``limit`` and the ``after`` cursor from
+        :func:`pending_package_cursor` of the last item to page through them.
+        """
+        query = """
             SELECT package_hash, sender_addr, created_at, package_json
             FROM transfer_mailbox
             WHERE recipient_addr = ? AND claimed_at IS NULL
-            ORDER BY created_at, package_hash
-            """,
-            (recipient_addr,),
-        ).fetchall()
+        """
+        params: list[object] = [recipient_addr]
+        if after is not None:
+            query += " AND (confirmed_height, created_at, package_hash) > (?, ?, ?)"
+            params.extend((after.confirmed_height, after.created_at, sqlite3.Binary(after.package_hash)))
+        query += " ORDER BY confirmed_height, created_at, package_hash"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(max(0, int(limit)))
+        rows = self._conn.execute(query, params).fetchall()
         return [
             (
                 bytes(row["package_hash"]),
@@ -93,14 +199,17 @@ class TransferMailboxStore:
         ]
 
     def mark_claimed(self, package_hash: bytes, *, claimed_at: int) -> None:
+        self.mark_claimed_many((package_hash,), claimed_at=claimed_at)
+
+    def mark_claimed_many(self, package_hashes: Iterable[bytes], *, claimed_at: int) -> None:
         with self._conn:
-            self._conn.execute(
+            self._conn.executemany(
                 """
                 UPDATE transfer_mailbox
                 SET claimed_at = ?
                 WHERE package_hash = ?
                 """,
-                (claimed_at, sqlite3.Binary(package_hash)),
+                [(claimed_at, sqlite3.Binary(package_hash)) for package_hash in package_hashes],
             )
 
     def pending_count(self, recipient_addr: str) -> int:
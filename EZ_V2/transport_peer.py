@@ -81,6 +81,13 @@ class TransportPeerNetwork:
         self._local_peer_id = peer.node_id
         self._handler = handler
 
+    def add_peer(self, peer: PeerInfo) -> None:
+        # Learned peers never replace a known entry, so nobody can repoint an
+        # account's endpoint by announcing itself under that node id.
+        if peer.node_id == self._local_peer_id:
+            return
+        self._peers.setdefault(peer.node_id, peer)
+
     def peer_info(self, node_id: str) -> PeerInfo:
         peer = self._peers.get(node_id)
         if peer is None:
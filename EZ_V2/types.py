@@ -180,6 +180,26 @@ class SparseMerkleProof:
             _require_hash32("sibling", sibling)
 
 
+@dataclass(frozen=True, slots=True)
+class CompressedSparseMerkleProof:
+    """Single-key proof that omits default siblings.
+
+    Bit ``level`` of ``bitmap`` (little-endian) is set when the sibling at that
+    level differs from the empty-subtree hash; only those siblings are listed,
+    leaf level first.
+    """
+
+    bitmap: bytes
+    siblings: Tuple[bytes, ...]
+    existence: bool
+
+    def __post_init__(self) -> None:
+        for sibling in self.siblings:
+            _require_hash32("sibling", sibling)
+        if int.from_bytes(self.bitmap, byteorder="little").bit_count() != len(self.siblings):
+            raise ValueError("bitmap does not match sibling count")
+
+
 @dataclass(frozen=True, slots=True)
 class ClaimRangeSet:
     ranges: Tuple[ValueRange, ...]
@@ -259,7 +279,7 @@ class Receipt:
     seq: int
     prev_ref: BundleRef | None
     claim_set_hash: bytes | None = None
-    account_state_proof: SparseMerkleProof | None = None
+    account_state_proof: SparseMerkleProof | CompressedSparseMerkleProof | None = None
     proof_batch_ref: ReceiptProofRef | None = None
 
     def __post_init__(self) -> None:
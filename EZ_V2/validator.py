@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import os
+import time
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
+from typing import Iterable, Protocol, Sequence
 
 from .claim_set import claim_range_set_from_sidecar, claim_range_set_intersects, claim_range_set_hash
 from .chain import compute_addr_key, confirmed_ref, hash_account_leaf, reconstructed_leaf
+from .crypto import keccak256
+from .encoding import canonical_encode
 from .smt import verify_proof
 from .types import (
     Checkpoint,
@@ -17,6 +23,74 @@ from .types import (
 from .values import ValueRange
 
 
+class ValidatedHistoryCache(Protocol):
+    def has_validated_witness_segment(self, segment_key: bytes) -> bool:
+        ...
+
+    def save_validated_witness_segments(self, segment_keys: Iterable[bytes], validated_at: int) -> None:
+        ...
+
+
+def witness_segment_hashes(witness: WitnessV2) -> dict[int, bytes]:
+    """Hash every level of a witness chain, keyed by ``id()`` of the level.
+
+    Each level commits to its own units and anchor plus the hash of its prior
+    witness, so the whole chain is encoded once rather than once per level.
+    """
+    levels: list[WitnessV2] = []
+    node: WitnessV2 | None = witness
+    while node is not None:
+        levels.append(node)
+        anchor = node.anchor
+        node = anchor.prior_witness if isinstance(anchor, PriorWitnessLink) else None
+    hashes: dict[int, bytes] = {}
+    prior_hash = b""
+    for level in reversed(levels):
+        anchor = level.anchor
+        anchor_bytes = canonical_encode(anchor.acquire_tx if isinstance(anchor, PriorWitnessLink) else anchor)
+        prior_hash = keccak256(
+            b"EZCHAIN_WITNESS_SEGMENT_V2"
+            + canonical_encode(level.value)
+            + level.current_owner_addr.encode("utf-8")
+            + canonical_encode(level.confirmed_bundle_chain)
+            + anchor_bytes
+            + prior_hash
+        )
+        hashes[id(level)] = prior_hash
+    return hashes
+
+
+def validated_segment_key(segment_hash: bytes, target_tx, target_value: ValueRange, expected_recipient: str) -> bytes:
+    return keccak256(
+        b"EZCHAIN_VALIDATED_SEGMENT_V2"
+        + segment_hash
+        + canonical_encode(target_tx)
+        + canonical_encode(target_value)
+        + expected_recipient.encode("utf-8")
+    )
+
+
+def check_unit_proofs(unit: ConfirmedBundleUnit) -> str | None:
+    """The self-contained part of a unit's validation: claim-set hash and account proof."""
+    if unit.receipt.claim_set_hash is not None:
+        expected_claim_set_hash = claim_range_set_hash(claim_range_set_from_sidecar(unit.bundle_sidecar))
+        if unit.receipt.claim_set_hash != expected_claim_set_hash:
+            return "claim_set_hash does not match bundle sidecar"
+    leaf_hash = hash_account_leaf(reconstructed_leaf(unit))
+    addr_key = compute_addr_key(unit.bundle_sidecar.sender_addr)
+    proof = unit.receipt.account_state_proof
+    if proof is None:
+        return "current sender receipt missing single proof"
+    if not verify_proof(
+        unit.receipt.header_lite.state_root,
+        addr_key,
+        leaf_hash,
+        proof,
+    ):
+        return "account state proof does not verify"
+    return None
+
+
 @dataclass(slots=True)
 class ValidationContext:
     genesis_allocations: dict[str, tuple[ValueRange, ...]] = field(default_factory=dict)
@@ -45,34 +119,86 @@ class ValidationResult:
     accepted_witness: WitnessV2 | None = None
 
 
+DEFAULT_PARALLEL_MIN_UNITS = 8
+
+
 class V2TransferValidator:
-    def __init__(self, context: ValidationContext):
+    def __init__(
+        self,
+        context: ValidationContext,
+        executor: Executor | None = None,
+        parallel_min_units: int = DEFAULT_PARALLEL_MIN_UNITS,
+    ):
         self.context = context
+        # With an executor, the per-unit proof checks of every hop that still
+        # needs validating are fanned out up front; linkage, conflict and
+        # anchor checks stay sequential and consume the precomputed results.
+        self.executor = executor
+        self.parallel_min_units = parallel_min_units
 
     @staticmethod
     def _tx_contains_target_value(target_tx, target_value: ValueRange) -> bool:
         return any(tx_value.contains_range(target_value) for tx_value in target_tx.value_list)
 
-    def validate_transfer_package(self, package: TransferPackage, recipient_addr: str | None = None) -> ValidationResult:
-        recipient = recipient_addr or package.target_tx.recipient_addr
-        error = self._validate_transfer(
-            target_tx=package.target_tx,
-            target_value=package.target_value,
-            witness=package.witness_v2,
-            expected_recipient=recipient,
-        )
-        if error:
-            return ValidationResult(ok=False, error=error)
-        accepted_witness = WitnessV2(
-            value=package.target_value,
-            current_owner_addr=recipient,
-            confirmed_bundle_chain=(),
-            anchor=PriorWitnessLink(
-                acquire_tx=package.target_tx,
-                prior_witness=package.witness_v2,
-            ),
-        )
-        return ValidationResult(ok=True, accepted_witness=accepted_witness)
+    def validate_transfer_package(
+        self,
+        package: TransferPackage,
+        recipient_addr: str | None = None,
+        history_cache: ValidatedHistoryCache | None = None,
+    ) -> ValidationResult:
+        return self.validate_transfer_packages((package,), recipient_addr, history_cache)[0]
+
+    def validate_transfer_packages(
+        self,
+        packages: Sequence[TransferPackage],
+        recipient_addr: str | None = None,
+        history_cache: ValidatedHistoryCache | None = None,
+    ) -> list[ValidationResult]:
+        """Validate independent packages, returning one result per package.
+
+        With an executor, the proof checks of every package in the batch go
+        out as one map, so many short witnesses still keep the pool busy.
+        """
+        recipients = [recipient_addr or package.target_tx.recipient_addr for package in packages]
+        sessions: list[_ValidationSession | None] = [None] * len(packages)
+        if history_cache is not None or self.executor is not None:
+            sessions = [
+                _ValidationSession(
+                    history_cache,
+                    witness_segment_hashes(package.witness_v2) if history_cache is not None else {},
+                )
+                for package in packages
+            ]
+            if self.executor is not None:
+                self._precheck_unit_proofs(packages, recipients, sessions)
+        results: list[ValidationResult] = []
+        validated_keys: list[bytes] = []
+        for package, recipient, session in zip(packages, recipients, sessions):
+            error = self._validate_transfer(
+                target_tx=package.target_tx,
+                target_value=package.target_value,
+                witness=package.witness_v2,
+                expected_recipient=recipient,
+                session=session,
+            )
+            if error:
+                results.append(ValidationResult(ok=False, error=error))
+                continue
+            if session is not None:
+                validated_keys.extend(session.validated_keys)
+            accepted_witness = WitnessV2(
+                value=package.target_value,
+                current_owner_addr=recipient,
+                confirmed_bundle_chain=(),
+                anchor=PriorWitnessLink(
+                    acquire_tx=package.target_tx,
+                    prior_witness=package.witness_v2,
+                ),
+            )
+            results.append(ValidationResult(ok=True, accepted_witness=accepted_witness))
+        if history_cache is not None and validated_keys:
+            history_cache.save_validated_witness_segments(validated_keys, validated_at=int(time.time()))
+        return results
 
     def _validate_transfer(
         self,
@@ -80,6 +206,33 @@ class V2TransferValidator:
         target_value: ValueRange,
         witness: WitnessV2,
         expected_recipient: str,
+        session: "_ValidationSession | None" = None,
+    ) -> str | None:
+        segment_key = None
+        if session is not None and session.cache is not None:
+            segment_key = validated_segment_key(
+                session.segment_hashes[id(witness)],
+                target_tx,
+                target_value,
+                expected_recipient,
+            )
+            if session.cache.has_validated_witness_segment(segment_key):
+                # The cached result covers the structure of this segment and
+                # everything below it; trust in the root anchor can change, so
+                # it is always re-checked against the current context.
+                return self._validate_root_anchor(target_value, witness)
+        error = self._validate_segment(target_tx, target_value, witness, expected_recipient, session)
+        if error is None and segment_key is not None:
+            session.validated_keys.append(segment_key)
+        return error
+
+    def _validate_segment(
+        self,
+        target_tx,
+        target_value: ValueRange,
+        witness: WitnessV2,
+        expected_recipient: str,
+        session: "_ValidationSession | None",
     ) -> str | None:
         if witness.current_owner_addr != target_tx.sender_addr:
             return "witness owner does not match target tx sender"
@@ -95,35 +248,32 @@ class V2TransferValidator:
         if len(latest_matches) != 1:
             return "target tx must exist exactly once in latest bundle"
 
-        continuity_error = self._validate_current_sender_chain(target_value, witness.confirmed_bundle_chain, target_tx)
+        continuity_error = self._validate_current_sender_chain(
+            target_value,
+            witness.confirmed_bundle_chain,
+            target_tx,
+            session,
+        )
         if continuity_error:
             return continuity_error
 
-        return self._validate_anchor(target_value, witness)
+        return self._validate_anchor(target_value, witness, session)
 
     def _validate_current_sender_chain(
         self,
         target_value: ValueRange,
         chain: tuple[ConfirmedBundleUnit, ...],
         target_tx,
+        session: "_ValidationSession | None" = None,
     ) -> str | None:
+        unit_errors = session.unit_errors if session is not None else {}
         for index, unit in enumerate(chain):
-            if unit.receipt.claim_set_hash is not None:
-                expected_claim_set_hash = claim_range_set_hash(claim_range_set_from_sidecar(unit.bundle_sidecar))
-                if unit.receipt.claim_set_hash != expected_claim_set_hash:
-                    return "claim_set_hash does not match bundle sidecar"
-            leaf_hash = hash_account_leaf(reconstructed_leaf(unit))
-            addr_key = compute_addr_key(unit.bundle_sidecar.sender_addr)
-            proof = unit.receipt.account_state_proof
-            if proof is None:
-                return "current sender receipt missing single proof"
-            if not verify_proof(
-                unit.receipt.header_lite.state_root,
-                addr_key,
-                leaf_hash,
-                proof,
-            ):
-                return "account state proof does not verify"
+            if id(unit) in unit_errors:
+                proof_error = unit_errors[id(unit)]
+            else:
+                proof_error = check_unit_proofs(unit)
+            if proof_error:
+                return proof_error
             if index + 1 < len(chain):
                 if unit.receipt.prev_ref != confirmed_ref(chain[index + 1]):
                     return "prev_ref chain is discontinuous"
@@ -142,7 +292,52 @@ class V2TransferValidator:
                     return "value conflict detected inside current sender history"
         return None
 
-    def _validate_anchor(self, target_value: ValueRange, witness: WitnessV2) -> str | None:
+    def _precheck_unit_proofs(
+        self,
+        packages: Sequence[TransferPackage],
+        recipients: Sequence[str],
+        sessions: Sequence["_ValidationSession"],
+    ) -> None:
+        units: list[tuple[ConfirmedBundleUnit, _ValidationSession]] = []
+        for package, recipient, session in zip(packages, recipients, sessions):
+            witness: WitnessV2 | None = package.witness_v2
+            target_tx = package.target_tx
+            expected_recipient = recipient
+            while witness is not None:
+                if session.cache is not None:
+                    segment_key = validated_segment_key(
+                        session.segment_hashes[id(witness)],
+                        target_tx,
+                        package.target_value,
+                        expected_recipient,
+                    )
+                    if session.cache.has_validated_witness_segment(segment_key):
+                        break
+                units.extend((unit, session) for unit in witness.confirmed_bundle_chain)
+                anchor = witness.anchor
+                if not isinstance(anchor, PriorWitnessLink):
+                    break
+                target_tx = anchor.acquire_tx
+                expected_recipient = witness.current_owner_addr
+                witness = anchor.prior_witness
+        if len(units) < max(1, self.parallel_min_units):
+            return
+        chunksize = max(1, len(units) // ((os.cpu_count() or 1) * 4))
+        errors = self.executor.map(check_unit_proofs, [unit for unit, _ in units], chunksize=chunksize)
+        for (unit, session), error in zip(units, errors):
+            session.unit_errors[id(unit)] = error
+
+    def _validate_root_anchor(self, target_value: ValueRange, witness: WitnessV2) -> str | None:
+        while isinstance(witness.anchor, PriorWitnessLink):
+            witness = witness.anchor.prior_witness
+        return self._validate_anchor(target_value, witness)
+
+    def _validate_anchor(
+        self,
+        target_value: ValueRange,
+        witness: WitnessV2,
+        session: "_ValidationSession | None" = None,
+    ) -> str | None:
         anchor = witness.anchor
         if isinstance(anchor, GenesisAnchor):
             if not self.context.matches_genesis_anchor(anchor, target_value, witness.current_owner_addr):
@@ -158,6 +353,7 @@ class V2TransferValidator:
                 target_value=target_value,
                 witness=anchor.prior_witness,
                 expected_recipient=witness.current_owner_addr,
+                session=session,
             )
             if recursive_error:
                 return recursive_error
@@ -168,3 +364,13 @@ class V2TransferValidator:
                     return "current sender history starts before acquisition boundary"
             return None
         return "unsupported witness anchor"
+
+
+class _ValidationSession:
+    __slots__ = ("cache", "segment_hashes", "validated_keys", "unit_errors")
+
+    def __init__(self, cache: ValidatedHistoryCache | None, segment_hashes: dict[int, bytes]):
+        self.cache = cache
+        self.segment_hashes = segment_hashes
+        self.validated_keys: list[bytes] = []
+        self.unit_errors: dict[int, str | None] = {}
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, replace
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field, replace
 from enum import Enum
+from typing import Callable, Iterable
 
 
 class LocalValueStatus(Enum):
@@ -60,13 +62,243 @@ class ValueRange:
         return target, tuple(remainders)
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, weakref_slot=True)
 class LocalValueRecord:
+    """A wallet value and its witness.
+
+    Records built with ``deferred`` carry only the header fields and leave the
+    ``witness_v2`` slot empty; the first read of it falls through to
+    ``__getattr__``, which decodes the witness with ``witness_loader`` and
+    fills the slot. ``witness_source`` names that loader whether or not it has
+    run; records built with a witness of their own have none, so give a
+    stored record a new witness with ``replace`` rather than by assignment.
+    The witness is left out of ``==`` and ``repr`` so neither forces a decode.
+    """
+
     record_id: str
     value: ValueRange
-    witness_v2: object
+    witness_v2: object = field(compare=False, repr=False)
     local_status: LocalValueStatus
     acquisition_height: int
+    _witness_loader: Callable[[], object] | None = field(default=None, init=False, compare=False, repr=False)
+    _witness_source: Callable[[], object] | None = field(default=None, init=False, compare=False, repr=False)
+    _chain_length: int | None = field(default=None, init=False, compare=False, repr=False)
+
+    @classmethod
+    def deferred(
+        cls,
+        record_id: str,
+        value: ValueRange,
+        local_status: LocalValueStatus,
+        acquisition_height: int,
+        witness_loader: Callable[[], object],
+        chain_length: int | None = None,
+    ) -> "LocalValueRecord":
+        record = cls(record_id, value, None, local_status, acquisition_height)
+        del record.witness_v2
+        record._witness_loader = witness_loader
+        record._witness_source = witness_loader
+        record._chain_length = chain_length
+        # Lets the store decode this copy before the row it reads from changes.
+        track = getattr(witness_loader, "track", None)
+        if track is not None:
+            track(record)
+        return record
+
+    def __getattr__(self, name: str) -> object:
+        # Only reached when a slot is empty, i.e. a deferred witness not yet decoded.
+        loader = self._witness_loader if name == "witness_v2" else None
+        if loader is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        self.witness_v2 = loader()
+        self._witness_loader = None
+        return self.witness_v2
+
+    def detach_witness(self) -> None:
+        """Decode the witness if needed and stop naming the loader it came from."""
+        self.witness_v2 = self.witness_v2
+        self._witness_source = None
+
+    @property
+    def witness_loader(self) -> Callable[[], object] | None:
+        return self._witness_loader
+
+    @property
+    def witness_source(self) -> Callable[[], object] | None:
+        """Loader the current witness comes from, decoded or not; None once one is assigned."""
+        return self._witness_source
+
+    @property
+    def witness_loaded(self) -> bool:
+        return self._witness_loader is None
+
+    @property
+    def witness_chain_length(self) -> int:
+        """Length of the witness' confirmed bundle chain, known without decoding it for stored records."""
+        if self._chain_length is None:
+            self._chain_length = len(self.witness_v2.confirmed_bundle_chain)
+        return self._chain_length
 
     def with_status(self, status: LocalValueStatus) -> "LocalValueRecord":
+        if self._witness_source is not None:
+            # Share the source instead of letting replace() decode the witness
+            # or detach it from the stored row.
+            record = type(self).deferred(
+                self.record_id,
+                self.value,
+                status,
+                self.acquisition_height,
+                self._witness_source,
+                self._chain_length,
+            )
+            if self._witness_loader is None:
+                record.witness_v2 = self.witness_v2
+                record._witness_loader = None
+            return record
         return replace(self, local_status=status)
+
+    def __getstate__(self) -> tuple[None, dict]:
+        # Loaders are bound to an open store, so pickles carry the decoded witness.
+        return None, {
+            "record_id": self.record_id,
+            "value": self.value,
+            "witness_v2": self.witness_v2,
+            "local_status": self.local_status,
+            "acquisition_height": self.acquisition_height,
+            "_witness_loader": None,
+            "_witness_source": None,
+            "_chain_length": self._chain_length,
+        }
+
+
+class _RecordBucket:
+    """Records sorted by ``value.begin`` with a running max of ``value.end``.
+
+    A wallet's live records never overlap, but archived ones can (a value can
+    be sent away and received back), so a stabbing query walks left from the
+    last begin <= query.end until the running max end drops below query.begin.
+    Inserts and removals only mark the running max stale from their position;
+    the next query recomputes that suffix.
+    """
+
+    __slots__ = ("records", "keys", "begins", "max_ends", "_stale_from")
+
+    def __init__(self, records: list[LocalValueRecord]):
+        self.records = sorted(records, key=_record_sort_key)
+        self.keys = [_record_sort_key(record) for record in self.records]
+        self.begins = [record.value.begin for record in self.records]
+        self.max_ends: list[int] = []
+        self._stale_from = 0
+
+    def insert(self, record: LocalValueRecord) -> None:
+        key = _record_sort_key(record)
+        index = bisect_right(self.keys, key)
+        self.records.insert(index, record)
+        self.keys.insert(index, key)
+        self.begins.insert(index, record.value.begin)
+        self._stale_from = min(self._stale_from, index)
+
+    def remove(self, record: LocalValueRecord) -> None:
+        index = bisect_left(self.keys, _record_sort_key(record))
+        del self.records[index]
+        del self.keys[index]
+        del self.begins[index]
+        self._stale_from = min(self._stale_from, index)
+
+    def _refresh_max_ends(self) -> None:
+        start = self._stale_from
+        if start >= len(self.records) and len(self.max_ends) == len(self.records):
+            return
+        del self.max_ends[start:]
+        running = self.max_ends[-1] if self.max_ends else -1
+        for record in self.records[start:]:
+            running = max(running, record.value.end)
+            self.max_ends.append(running)
+        self._stale_from = len(self.records)
+
+    def overlapping(self, value: ValueRange) -> list[LocalValueRecord]:
+        self._refresh_max_ends()
+        matched: list[LocalValueRecord] = []
+        index = bisect_right(self.begins, value.end) - 1
+        while index >= 0 and self.max_ends[index] >= value.begin:
+            record = self.records[index]
+            if record.value.end >= value.begin:
+                matched.append(record)
+            index -= 1
+        matched.reverse()
+        return matched
+
+
+def _record_sort_key(record: LocalValueRecord) -> tuple[int, int, str]:
+    return (record.value.begin, record.value.end, record.record_id)
+
+
+class ValueRecordIndex:
+    """Interval index over one wallet's value records, bucketed by status."""
+
+    def __init__(self, records: Iterable[LocalValueRecord] = ()):
+        grouped: dict[LocalValueStatus, list[LocalValueRecord]] = {status: [] for status in LocalValueStatus}
+        self._by_id: dict[str, LocalValueRecord] = {}
+        for record in records:
+            grouped[record.local_status].append(record)
+            self._by_id[record.record_id] = record
+        self._buckets = {status: _RecordBucket(items) for status, items in grouped.items()}
+
+    def add(self, record: LocalValueRecord) -> None:
+        """Index ``record``, replacing any record already held under its id."""
+        self.discard(record.record_id)
+        self._buckets[record.local_status].insert(record)
+        self._by_id[record.record_id] = record
+
+    def discard(self, record_id: str) -> LocalValueRecord | None:
+        record = self._by_id.pop(record_id, None)
+        if record is not None:
+            self._buckets[record.local_status].remove(record)
+        return record
+
+    def sync(self, records: Iterable[LocalValueRecord]) -> None:
+        """Make the index hold exactly ``records``, touching only those that changed.
+
+        A record is unchanged when the index already holds that same object.
+        """
+        records = list(records)
+        live_ids = {record.record_id for record in records}
+        for record_id in [record_id for record_id in self._by_id if record_id not in live_ids]:
+            self.discard(record_id)
+        for record in records:
+            if self._by_id.get(record.record_id) is not record:
+                self.add(record)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, record_id: str) -> LocalValueRecord | None:
+        return self._by_id.get(record_id)
+
+    def by_status(self, status: LocalValueStatus) -> list[LocalValueRecord]:
+        return list(self._buckets[status].records)
+
+    def overlapping(
+        self,
+        value: ValueRange,
+        statuses: Iterable[LocalValueStatus] | None = None,
+    ) -> list[LocalValueRecord]:
+        selected = LocalValueStatus if statuses is None else statuses
+        matched: list[LocalValueRecord] = []
+        for status in selected:
+            matched.extend(self._buckets[status].overlapping(value))
+        return matched
+
+    def containing(
+        self,
+        value: ValueRange,
+        statuses: Iterable[LocalValueStatus] | None = None,
+    ) -> list[LocalValueRecord]:
+        return [record for record in self.overlapping(value, statuses) if record.value.contains_range(value)]
+
+    def exact(
+        self,
+        value: ValueRange,
+        statuses: Iterable[LocalValueStatus] | None = None,
+    ) -> list[LocalValueRecord]:
+        return [record for record in self.overlapping(value, statuses) if record.value == value]
@@ -4,9 +4,14 @@ import time
 import uuid
 from math import inf
 from dataclasses import replace
+from typing import Sequence
 
+from .checkpoint_policy import CheckpointPolicy, WitnessSizeStats, summarize_witness_sizes
 from .claim_set import claim_range_set_from_sidecar, claim_range_set_hash
 from .chain import (
+    DEFAULT_MAX_BUNDLE_BYTES,
+    DEFAULT_MAX_TX_PER_BUNDLE,
+    DEFAULT_MAX_VALUE_ENTRIES_PER_TX,
     compute_addr_key,
     compute_bundle_hash,
     confirmed_ref,
@@ -15,10 +20,19 @@ from .chain import (
     sign_bundle_envelope,
 )
 from .crypto import address_from_public_key_pem
+from .encoding import canonical_encode
+from .selection import DEFAULT_SELECTION_TIME_BUDGET_SECONDS, CoinSelector, SelectionCandidate
 from .smt import verify_proof
-from .storage import LocalWalletDB
+from .storage import LocalWalletDB, SidecarGarbageCollector
+from .transfer_cost import (
+    DEFAULT_ESTIMATED_PROOF_SIBLINGS,
+    OutputCostEstimate,
+    PaymentCostEstimate,
+    placeholder_receipt,
+)
 from .transport import transfer_package_hash
 from .types import (
+    CompressedSparseMerkleProof,
     BlockV2,
     BundleEnvelope,
     BundleSidecar,
@@ -35,7 +49,12 @@ from .types import (
     WitnessV2,
 )
 from .validator import V2TransferValidator
-from .values import LocalValueRecord, LocalValueStatus, ValueRange
+from .values import LocalValueRecord, LocalValueStatus, ValueRange, ValueRecordIndex
+
+# Consensus executes at most one seq per sender per block, so a wider window
+# only lets payments be built and signed ahead of confirmation; the bundles
+# still confirm one block apart.
+DEFAULT_MAX_PENDING_BUNDLES = 1
 
 
 def _append_confirmed_unit(witness: WitnessV2, value: ValueRange, unit: ConfirmedBundleUnit) -> WitnessV2:
@@ -95,27 +114,61 @@ def _iter_witness_sidecars(witness: WitnessV2):
 
 
 class WalletAccountV2:
-    def __init__(self, address: str, genesis_block_hash: bytes, db_path: str = ":memory:"):
+    def __init__(
+        self,
+        address: str,
+        genesis_block_hash: bytes,
+        db_path: str = ":memory:",
+        max_pending_bundles: int = DEFAULT_MAX_PENDING_BUNDLES,
+        checkpoint_policy: CheckpointPolicy | None = None,
+    ):
+        if max_pending_bundles < 1:
+            raise ValueError("max_pending_bundles must be positive")
         self.address = address
         self.genesis_block_hash = genesis_block_hash
+        self.max_pending_bundles = max_pending_bundles
+        self.checkpoint_policy = checkpoint_policy
         self.db = LocalWalletDB(db_path)
         self.records: list[LocalValueRecord] = []
+        self.record_index = ValueRecordIndex()
         self.checkpoints: list[Checkpoint] = []
+        self._coin_selector: CoinSelector | None = None
+        self._witness_bytes_cache: dict[tuple[str, int, ValueRange], int] = {}
+        self._sidecar_gc: SidecarGarbageCollector | None = None
         self._reload_state()
 
     def close(self) -> None:
+        self.stop_sidecar_gc()
         self.db.close()
 
     def _reload_state(self) -> None:
         self.records = self.db.list_value_records(self.address)
+        self.record_index = ValueRecordIndex(self.records)
+        self._reload_checkpoints()
+        self._records_changed()
+
+    def _reload_checkpoints(self) -> None:
         self.checkpoints = self.db.list_checkpoints(self.address)
+        self._coin_selector = None
+
+    def _records_changed(self) -> None:
+        self._coin_selector = None
+        live_ids = {record.record_id for record in self.records}
+        self._witness_bytes_cache = {
+            key: size for key, size in self._witness_bytes_cache.items() if key[0] in live_ids
+        }
+
+    def _adopt_stored_records(self, stored: list[LocalValueRecord]) -> None:
+        # Same order as list_value_records; the index only re-files what changed.
+        self.records = sorted(stored, key=lambda record: (record.value.begin, record.value.end, record.record_id))
+        self.record_index.sync(self.records)
+        self._records_changed()
 
     def reload_state(self) -> None:
         self._reload_state()
 
     def _persist_records(self, records: list[LocalValueRecord]) -> None:
-        self.db.replace_value_records_and_recompute_sidecar_refs(self.address, records)
-        self._reload_state()
+        self._adopt_stored_records(self.db.replace_value_records(self.address, records))
 
     def observe_canonical_header(self, header: HeaderLite) -> None:
         self.db.save_canonical_header(self.address, header)
@@ -171,22 +224,15 @@ class WalletAccountV2:
 
     def _sorted_spendable_records(self) -> list[LocalValueRecord]:
         return sorted(
-            (
-                record
-                for record in self.records
-                if record.local_status == LocalValueStatus.VERIFIED_SPENDABLE
-            ),
+            self.record_index.by_status(LocalValueStatus.VERIFIED_SPENDABLE),
             key=lambda record: (
-                len(record.witness_v2.confirmed_bundle_chain),
+                record.witness_chain_length,
                 -record.acquisition_height,
                 record.value.size,
                 record.value.begin,
             ),
         )
 
-    def _has_exact_local_checkpoint(self, record: LocalValueRecord) -> bool:
-        return any(checkpoint.matches(record.value, self.address) for checkpoint in self.checkpoints)
-
     def _witness_total_units(self, witness: WitnessV2) -> int:
         total = len(witness.confirmed_bundle_chain)
         anchor = witness.anchor
@@ -281,15 +327,9 @@ class WalletAccountV2:
     def _local_witness_for_checkpoint(self, checkpoint: Checkpoint) -> WitnessV2 | None:
         if checkpoint.owner_addr != self.address:
             return None
-        if checkpoint in self.checkpoints:
-            target_value = ValueRange(checkpoint.value_begin, checkpoint.value_end)
-            for record in self.records:
-                if record.value == target_value and self._checkpoint_matches_witness(checkpoint, record.witness_v2):
-                    return record.witness_v2
-            return None
         target_value = ValueRange(checkpoint.value_begin, checkpoint.value_end)
-        for record in self.records:
-            if record.value == target_value and self._checkpoint_matches_witness(checkpoint, record.witness_v2):
+        for record in self.record_index.exact(target_value):
+            if self._checkpoint_matches_witness(checkpoint, record.witness_v2):
                 return record.witness_v2
         return None
 
@@ -328,94 +368,261 @@ class WalletAccountV2:
             ),
         )
 
-    def _selection_plan_cost(
+    def _witness_bytes(self, record: LocalValueRecord) -> int:
+        # Witnesses only grow by prepending units, so record id, chain length
+        # and value identify an encoding across reloads.
+        key = (record.record_id, record.witness_chain_length, record.value)
+        size = self._witness_bytes_cache.get(key)
+        if size is None:
+            size = len(canonical_encode(record.witness_v2))
+            self._witness_bytes_cache[key] = size
+        return size
+
+    def _selection_candidate(self, record: LocalValueRecord, checkpointed: set[tuple[int, int]]) -> SelectionCandidate:
+        has_checkpoint = (record.value.begin, record.value.end) in checkpointed
+        return SelectionCandidate(
+            begin=record.value.begin,
+            size=record.value.size,
+            cost=(
+                0 if has_checkpoint else 1,
+                0 if has_checkpoint else self._witness_units_to_checkpoint(record.witness_v2),
+                self._witness_total_units(record.witness_v2),
+                self._witness_bytes(record),
+                -record.acquisition_height,
+            ),
+        )
+
+    def _checkpointed_ranges(self) -> set[tuple[int, int]]:
+        return {
+            (checkpoint.value_begin, checkpoint.value_end)
+            for checkpoint in self.checkpoints
+            if checkpoint.owner_addr == self.address
+        }
+
+    def coin_selector(self, max_package_bytes: int | None = None) -> CoinSelector:
+        """Selector over the spendable records.
+
+        With ``max_package_bytes`` only records whose witness plus one outgoing
+        unit is predicted to fit are offered; that selector is not cached.
+        """
+        if max_package_bytes is not None:
+            if max_package_bytes <= 0:
+                raise ValueError("max_package_bytes must be positive")
+            checkpointed = self._checkpointed_ranges()
+            overhead = self._package_overhead_bytes()
+            return CoinSelector(
+                [
+                    self._selection_candidate(record, checkpointed)
+                    for record in self.record_index.by_status(LocalValueStatus.VERIFIED_SPENDABLE)
+                    if self._witness_bytes(record) + overhead <= max_package_bytes
+                ]
+            )
+        # Built once per reloaded state; witness walks and checkpoint lookups
+        # happen here rather than on every plan comparison.
+        if self._coin_selector is None:
+            checkpointed = self._checkpointed_ranges()
+            self._coin_selector = CoinSelector(
+                [
+                    self._selection_candidate(record, checkpointed)
+                    for record in self.record_index.by_status(LocalValueStatus.VERIFIED_SPENDABLE)
+                ]
+            )
+        return self._coin_selector
+
+    def select_payment_ranges(
         self,
-        spendable_records: tuple[LocalValueRecord, ...],
-        plan: tuple[tuple[int, int], ...],
-    ) -> tuple:
-        split_count = 0
-        effective_anchor_cost = 0
-        total_witness_units = 0
-        checkpoint_miss_count = 0
-        freshness_penalty = 0
-        range_order: list[tuple[int, int]] = []
-        for record_index, take_size in plan:
-            record = spendable_records[record_index]
-            if take_size < record.value.size:
-                split_count += 1
-            has_checkpoint = self._has_exact_local_checkpoint(record)
-            checkpoint_miss_count += 0 if has_checkpoint else 1
-            distance_to_checkpoint = self._witness_units_to_checkpoint(record.witness_v2)
-            effective_anchor_cost += 0 if has_checkpoint else distance_to_checkpoint
-            total_witness_units += self._witness_total_units(record.witness_v2)
-            freshness_penalty -= record.acquisition_height
-            range_order.append((record.value.begin, take_size))
-        return (
-            len(plan),
-            split_count,
-            checkpoint_miss_count,
-            effective_anchor_cost,
-            total_witness_units,
-            freshness_penalty,
-            tuple(sorted(range_order)),
-        )
-
-    def select_payment_ranges(self, amount: int) -> tuple[ValueRange, ...]:
+        amount: int,
+        *,
+        time_budget: float = DEFAULT_SELECTION_TIME_BUDGET_SECONDS,
+        max_package_bytes: int | None = None,
+    ) -> tuple[ValueRange, ...]:
         if amount <= 0:
             raise ValueError("amount must be positive")
-        spendable_records = tuple(self._sorted_spendable_records())
-        exact_plans: dict[int, tuple[tuple[int, int], ...]] = {0: ()}
-        best_plan: tuple[tuple[int, int], ...] | None = None
-
-        for record_index, record in enumerate(spendable_records):
-            record_size = record.value.size
-            prior_plans = dict(exact_plans)
-
-            for subtotal, plan in prior_plans.items():
-                remaining = amount - subtotal
-                if 0 < remaining < record_size:
-                    candidate = plan + ((record_index, remaining),)
-                    if (
-                        best_plan is None
-                        or self._selection_plan_cost(spendable_records, candidate)
-                        < self._selection_plan_cost(spendable_records, best_plan)
-                    ):
-                        best_plan = candidate
-
-            for subtotal, plan in prior_plans.items():
-                new_total = subtotal + record_size
-                if new_total > amount:
-                    continue
-                candidate = plan + ((record_index, record_size),)
-                existing = exact_plans.get(new_total)
-                if (
-                    existing is None
-                    or self._selection_plan_cost(spendable_records, candidate)
-                    < self._selection_plan_cost(spendable_records, existing)
-                ):
-                    exact_plans[new_total] = candidate
-
-            exact_match = exact_plans.get(amount)
-            if (
-                exact_match is not None
-                and (
-                    best_plan is None
-                    or self._selection_plan_cost(spendable_records, exact_match)
-                    < self._selection_plan_cost(spendable_records, best_plan)
+        return self.coin_selector(max_package_bytes).select(amount, time_budget=time_budget).ranges
+
+    def _estimated_proof_siblings(self) -> int:
+        # next_sequence() - 1 is still a pending seq while later bundles are in
+        # the window; only a confirmed unit carries a real proof.
+        latest = self.db.get_confirmed_unit(self.address, self.db.last_confirmed_sequence(self.address))
+        if latest is not None:
+            proof = latest.receipt.account_state_proof
+            if isinstance(proof, CompressedSparseMerkleProof):
+                return len(proof.siblings)
+        return DEFAULT_ESTIMATED_PROOF_SIBLINGS
+
+    def _outgoing_unit(self, tx: OffChainTx, height: int) -> ConfirmedBundleUnit:
+        sidecar = BundleSidecar(sender_addr=self.address, tx_list=(tx,))
+        return ConfirmedBundleUnit(
+            receipt=placeholder_receipt(
+                height=height,
+                seq=self.next_sequence(),
+                proof_siblings=self._estimated_proof_siblings(),
+                claim_set_hash=claim_range_set_hash(claim_range_set_from_sidecar(sidecar)),
+            ),
+            bundle_sidecar=sidecar,
+        )
+
+    def _package_overhead_bytes(self) -> int:
+        # A single-range payment adds its tx twice (target and sidecar) plus one
+        # receipt on top of the source witness.
+        value = ValueRange(0, 0)
+        tx = OffChainTx(
+            sender_addr=self.address,
+            recipient_addr=self.address,
+            value_list=(value,),
+            tx_local_index=0,
+            tx_time=0,
+        )
+        empty = WitnessV2(
+            value=value,
+            current_owner_addr=self.address,
+            confirmed_bundle_chain=(self._outgoing_unit(tx, 0),),
+            anchor=GenesisAnchor(
+                genesis_block_hash=self.genesis_block_hash,
+                first_owner_addr=self.address,
+                value_begin=0,
+                value_end=0,
+            ),
+        )
+        return len(canonical_encode(TransferPackage(target_tx=tx, target_value=value, witness_v2=empty)))
+
+    def estimate_payment_cost(
+        self,
+        recipient_addr: str,
+        amount: int,
+        *,
+        tx_time: int | None = None,
+        extra_data: bytes = b"",
+        time_budget: float = DEFAULT_SELECTION_TIME_BUDGET_SECONDS,
+        max_package_bytes: int | None = None,
+    ) -> PaymentCostEstimate:
+        """Predict the transfer packages ``build_payment_bundle`` would lead to.
+
+        Ranges are chosen exactly as for the real payment; each output's package
+        is built from its source witness plus a placeholder receipt of the same
+        encoded size as the one consensus will return.
+        """
+        if not recipient_addr:
+            raise ValueError("recipient must be set")
+        ranges = self.select_payment_ranges(amount, time_budget=time_budget, max_package_bytes=max_package_bytes)
+        tx = OffChainTx(
+            sender_addr=self.address,
+            recipient_addr=recipient_addr,
+            value_list=ranges,
+            tx_local_index=0,
+            tx_time=int(time.time()) if tx_time is None else tx_time,
+            extra_data=extra_data,
+        )
+        assignments = self._assign_targets_to_records(ranges)
+        records = {record.record_id: record for record in self.records}
+        height = 1 + max(
+            (
+                record.witness_v2.confirmed_bundle_chain[0].receipt.header_lite.height
+                for record in records.values()
+                if record.witness_v2.confirmed_bundle_chain
+            ),
+            default=0,
+        )
+        unit = self._outgoing_unit(tx, height)
+        outputs: list[OutputCostEstimate] = []
+        for record_id, values in assignments.items():
+            record = records[record_id]
+            for value in values:
+                witness = self._trim_witness_for_recipient(
+                    _append_confirmed_unit(_clone_witness_for_value(record.witness_v2, value), value, unit),
+                    recipient_addr,
+                    value,
+                )
+                outputs.append(
+                    OutputCostEstimate.from_package(
+                        TransferPackage(target_tx=tx, target_value=value, witness_v2=witness),
+                        source_record_id=record_id,
+                        confirmed_units=self._witness_total_units(witness),
+                    )
                 )
-            ):
-                best_plan = exact_match
+        outputs.sort(key=lambda item: (item.value.begin, item.value.end))
+        return PaymentCostEstimate(recipient_addr=recipient_addr, amount=amount, outputs=tuple(outputs))
 
-        if best_plan is None:
+    def plan_payment_batch(
+        self,
+        payments: Sequence[tuple[str, int]],
+        *,
+        tx_time: int | None = None,
+        max_tx_per_bundle: int = DEFAULT_MAX_TX_PER_BUNDLE,
+        max_value_entries_per_tx: int = DEFAULT_MAX_VALUE_ENTRIES_PER_TX,
+        max_bundle_bytes: int = DEFAULT_MAX_BUNDLE_BYTES,
+        extra_data: bytes = b"",
+    ) -> tuple[tuple[OffChainTx, ...], ...]:
+        """Carve disjoint ranges for every payment and pack them into bundle tx lists.
+
+        Selection is one greedy pass over the spendable records rather than the
+        per-payment subset search of ``select_payment_ranges``; a payment that
+        needs more than ``max_value_entries_per_tx`` ranges is split into several
+        txs to the same recipient.
+        """
+        if not payments:
+            raise ValueError("payments cannot be empty")
+        if max_tx_per_bundle <= 0 or max_value_entries_per_tx <= 0:
+            raise ValueError("batch limits must be positive")
+        for recipient_addr, amount in payments:
+            if not recipient_addr:
+                raise ValueError("recipient must be set")
+            if amount <= 0:
+                raise ValueError("amount must be positive")
+        if sum(amount for _, amount in payments) > self.available_balance():
             raise ValueError("insufficient_balance")
-        selected = tuple(
-            ValueRange(
-                spendable_records[record_index].value.begin,
-                spendable_records[record_index].value.begin + take_size - 1,
+        now = int(time.time()) if tx_time is None else tx_time
+
+        spendable = [record.value for record in self._sorted_spendable_records()]
+        record_index = 0
+        offset = 0
+        carved: list[tuple[str, tuple[ValueRange, ...]]] = []
+        for recipient_addr, amount in payments:
+            ranges: list[ValueRange] = []
+            remaining = amount
+            while remaining > 0:
+                value = spendable[record_index]
+                begin = value.begin + offset
+                take = min(remaining, value.end - begin + 1)
+                ranges.append(ValueRange(begin, begin + take - 1))
+                remaining -= take
+                offset += take
+                if offset == value.size:
+                    record_index += 1
+                    offset = 0
+            for start in range(0, len(ranges), max_value_entries_per_tx):
+                chunk = ranges[start:start + max_value_entries_per_tx]
+                carved.append((recipient_addr, tuple(sorted(chunk, key=lambda item: (item.begin, item.end)))))
+
+        # Canonical encoding is concatenative, so a sidecar's size is its empty
+        # encoding plus the encoding of each tx; no need to re-encode per append.
+        base_bytes = len(canonical_encode(BundleSidecar(sender_addr=self.address, tx_list=())))
+        bundles: list[tuple[OffChainTx, ...]] = []
+        current: list[OffChainTx] = []
+        current_bytes = base_bytes
+        for recipient_addr, value_list in carved:
+            tx = OffChainTx(
+                sender_addr=self.address,
+                recipient_addr=recipient_addr,
+                value_list=value_list,
+                tx_local_index=len(current),
+                tx_time=now,
+                extra_data=extra_data,
             )
-            for record_index, take_size in best_plan
-        )
-        return tuple(sorted(selected, key=lambda item: (item.begin, item.end)))
+            tx_bytes = len(canonical_encode(tx))
+            if current and (len(current) >= max_tx_per_bundle or current_bytes + tx_bytes > max_bundle_bytes):
+                bundles.append(tuple(current))
+                current = []
+                current_bytes = base_bytes
+                tx = replace(tx, tx_local_index=0)
+                tx_bytes = len(canonical_encode(tx))
+            if base_bytes + tx_bytes > max_bundle_bytes:
+                raise ValueError("payment does not fit in a single bundle")
+            current.append(tx)
+            current_bytes += tx_bytes
+        if current:
+            bundles.append(tuple(current))
+        return tuple(bundles)
 
     def _apply_confirmed_unit_to_records(
         self,
@@ -423,16 +630,27 @@ class WalletAccountV2:
         outgoing_values: tuple[ValueRange, ...] = (),
         pending_record_ids: tuple[str, ...] = (),
         outgoing_record_ids: tuple[str, ...] = (),
+        later_pending_record_ids: tuple[str, ...] = (),
     ) -> list[LocalValueRecord]:
         outgoing_values = tuple(sorted(outgoing_values, key=lambda item: (item.begin, item.end)))
         pending_ids = set(pending_record_ids)
         outgoing_ids = set(outgoing_record_ids)
+        later_pending_ids = set(later_pending_record_ids)
+        targets_by_record: dict[str, list[ValueRange]] = {}
+        for target in outgoing_values:
+            for record in self.record_index.containing(target):
+                targets_by_record.setdefault(record.record_id, []).append(target)
         confirmed_height = confirmed_unit.receipt.header_lite.height
-        updated_records: list[LocalValueRecord] = []
-        for record in self.records:
-            if record.local_status == LocalValueStatus.ARCHIVED:
-                updated_records.append(record)
-                continue
+        # Archived records never take the unit, so they pass through untouched
+        # and only the live buckets are walked.
+        updated_records = self.record_index.by_status(LocalValueStatus.ARCHIVED)
+        live_records = [
+            record
+            for status in LocalValueStatus
+            if status != LocalValueStatus.ARCHIVED
+            for record in self.record_index.by_status(status)
+        ]
+        for record in live_records:
             if record.record_id in pending_ids:
                 new_status = (
                     LocalValueStatus.ARCHIVED
@@ -447,13 +665,23 @@ class WalletAccountV2:
                     )
                 )
                 continue
+            if record.record_id in later_pending_ids:
+                # Locked by a later in-flight bundle: its value was untouched by this
+                # unit, so the witness must still carry it to stay seq-contiguous.
+                updated_records.append(
+                    replace(
+                        record,
+                        witness_v2=_append_confirmed_unit(record.witness_v2, record.value, confirmed_unit),
+                    )
+                )
+                continue
             if record.local_status == LocalValueStatus.PENDING_BUNDLE:
                 updated_records.append(record)
                 continue
             if record.acquisition_height >= confirmed_height:
                 updated_records.append(record)
                 continue
-            contained_targets = tuple(target for target in outgoing_values if record.value.contains_range(target))
+            contained_targets = tuple(targets_by_record.get(record.record_id, ()))
             if not contained_targets:
                 updated_records.append(
                     replace(
@@ -489,6 +717,22 @@ class WalletAccountV2:
     def list_pending_bundles(self) -> list[PendingBundleContext]:
         return self.db.list_pending_bundles(self.address)
 
+    def pending_window_available(self) -> int:
+        return max(0, self.max_pending_bundles - len(self.list_pending_bundles()))
+
+    def is_pending_bundle_submitted(self, seq: int) -> bool:
+        return self.db.is_pending_bundle_submitted(self.address, seq)
+
+    def mark_pending_bundle_submitted(self, seq: int) -> None:
+        self.db.mark_pending_bundle_submitted(self.address, seq)
+
+    def _ensure_pending_window(self, seq: int | None = None) -> None:
+        pending = self.list_pending_bundles()
+        if len(pending) >= self.max_pending_bundles:
+            raise ValueError("wallet already has a pending bundle")
+        if seq is not None and pending and seq != pending[-1].seq + 1:
+            raise ValueError("pending bundle seq must follow the last pending bundle")
+
     def list_receipts(self):
         return self.db.list_receipts(self.address)
 
@@ -518,7 +762,8 @@ class WalletAccountV2:
         return next(item for item in self.records if item.record_id == record.record_id)
 
     def has_genesis_value(self, value: ValueRange) -> bool:
-        for record in self.records:
+        # Every record split from a genesis allocation lies inside its anchor range.
+        for record in self.record_index.overlapping(value):
             anchor = getattr(record.witness_v2, "anchor", None)
             if not isinstance(anchor, GenesisAnchor):
                 continue
@@ -531,17 +776,10 @@ class WalletAccountV2:
 
     def _assign_targets_to_records(self, targets: tuple[ValueRange, ...]) -> dict[str, list[ValueRange]]:
         assignments: dict[str, list[ValueRange]] = {}
-        eligible = [
-            record
-            for record in self.records
-            if record.local_status == LocalValueStatus.VERIFIED_SPENDABLE
-        ]
         for target in targets:
             selected = None
-            for record in eligible:
+            for record in self.record_index.containing(target, (LocalValueStatus.VERIFIED_SPENDABLE,)):
                 assigned = assignments.get(record.record_id, [])
-                if not record.value.contains_range(target):
-                    continue
                 if any(existing.intersects(target) for existing in assigned):
                     continue
                 selected = record
@@ -566,8 +804,7 @@ class WalletAccountV2:
         sender_addr = address_from_public_key_pem(public_key_pem)
         if sender_addr != self.address:
             raise ValueError("public key does not match wallet address")
-        if self.list_pending_bundles():
-            raise ValueError("wallet already has a pending bundle")
+        self._ensure_pending_window(seq)
         if not tx_list:
             raise ValueError("tx_list cannot be empty")
 
@@ -632,8 +869,9 @@ class WalletAccountV2:
             outgoing_values=outgoing_values,
             created_at=created_at if created_at is not None else int(time.time()),
         )
-        self.db.save_sidecar(sidecar)
-        self.db.save_pending_bundle(context)
+        # Only the oldest pending bundle goes to consensus; later ones in the
+        # window wait until every earlier seq has confirmed.
+        self.db.save_pending_bundle(context, submitted=not self.list_pending_bundles())
         self._persist_records(updated_records)
         return submission, context
 
@@ -654,8 +892,7 @@ class WalletAccountV2:
     ) -> tuple[BundleSubmission, PendingBundleContext, OffChainTx]:
         if amount <= 0:
             raise ValueError("amount must be positive")
-        if self.list_pending_bundles():
-            raise ValueError("wallet already has a pending bundle")
+        self._ensure_pending_window(seq)
         now = int(time.time()) if tx_time is None else tx_time
         payment_values = self.select_payment_ranges(amount)
         tx = OffChainTx(
@@ -713,12 +950,19 @@ class WalletAccountV2:
             confirmed_unit=confirmed_unit,
             pending_record_ids=context.pending_record_ids,
             outgoing_record_ids=context.outgoing_record_ids,
+            later_pending_record_ids=tuple(
+                record_id
+                for later in self.list_pending_bundles()
+                if later.seq > receipt.seq
+                for record_id in later.pending_record_ids
+            ),
         )
 
         self.db.save_receipt(self.address, receipt, context.bundle_hash)
         self.db.save_confirmed_unit(confirmed_unit)
         self.db.delete_pending_bundle(self.address, receipt.seq)
         self._persist_records(updated_records)
+        self.apply_checkpoint_policy(current_height=receipt.header_lite.height)
         return confirmed_unit
 
     def mark_receipt_missing(self, seq: int) -> PendingBundleContext:
@@ -729,7 +973,7 @@ class WalletAccountV2:
         updated_records: list[LocalValueRecord] = []
         for record in self.records:
             if record.record_id in pending_ids and record.local_status == LocalValueStatus.PENDING_BUNDLE:
-                updated_records.append(replace(record, local_status=LocalValueStatus.RECEIPT_MISSING))
+                updated_records.append(record.with_status(LocalValueStatus.RECEIPT_MISSING))
             else:
                 updated_records.append(record)
         self._persist_records(updated_records)
@@ -745,38 +989,37 @@ class WalletAccountV2:
             outgoing_values=outgoing_values,
         )
         self._persist_records(updated_records)
+        self.apply_checkpoint_policy(current_height=confirmed_unit.receipt.header_lite.height)
         return self.records
 
     def rollback_pending_bundle(self, seq: int) -> PendingBundleContext:
         context = self.db.get_pending_bundle(self.address, seq)
         if context is None:
             raise ValueError("no pending bundle matches seq")
+        # Later bundles chain their seq off this one, so they can never confirm
+        # once it is abandoned; release their records in the same pass.
+        cascaded = [item for item in self.list_pending_bundles() if item.seq >= seq]
         updated_records: list[LocalValueRecord] = []
-        pending_ids = set(context.pending_record_ids)
+        pending_ids = {record_id for item in cascaded for record_id in item.pending_record_ids}
         for record in self.records:
             if record.record_id in pending_ids:
-                updated_records.append(replace(record, local_status=LocalValueStatus.VERIFIED_SPENDABLE))
+                updated_records.append(record.with_status(LocalValueStatus.VERIFIED_SPENDABLE))
             else:
                 updated_records.append(record)
-        self.db.delete_pending_bundle(self.address, seq)
+        for item in reversed(cascaded):
+            self.db.delete_pending_bundle(self.address, item.seq)
         self._persist_records(updated_records)
         return context
 
     def clear_pending_bundles(self) -> int:
         pending = list(self.list_pending_bundles())
-        cleared = 0
-        for context in pending:
-            self.rollback_pending_bundle(context.seq)
-            cleared += 1
-        return cleared
+        if pending:
+            self.rollback_pending_bundle(pending[0].seq)
+        return len(pending)
 
     def export_transfer_package(self, target_tx: OffChainTx, target_value: ValueRange) -> TransferPackage:
-        for record in self.records:
-            if (
-                record.local_status == LocalValueStatus.ARCHIVED
-                and record.value == target_value
-                and record.witness_v2.current_owner_addr == self.address
-            ):
+        for record in self.record_index.exact(target_value, (LocalValueStatus.ARCHIVED,)):
+            if record.witness_v2.current_owner_addr == self.address:
                 if target_tx.sender_addr != self.address:
                     raise ValueError("target tx sender does not match wallet address")
                 latest_unit = record.witness_v2.confirmed_bundle_chain[0] if record.witness_v2.confirmed_bundle_chain else None
@@ -797,37 +1040,77 @@ class WalletAccountV2:
         raise ValueError("no archived outgoing record matches target value")
 
     def receive_transfer(self, package: TransferPackage, validator: V2TransferValidator) -> LocalValueRecord:
-        package_hash = transfer_package_hash(package)
-        if self.db.has_accepted_transfer_package(self.address, package_hash):
-            raise ValueError("transfer package already accepted")
-        result = validator.validate_transfer_package(package, recipient_addr=self.address)
-        if not result.ok or result.accepted_witness is None:
-            raise ValueError(result.error or "transfer validation failed")
-        accepted_witness = self._rehydrate_local_checkpoint_anchors(result.accepted_witness)
-        for sidecar in _iter_witness_sidecars(package.witness_v2):
-            self.db.save_sidecar(sidecar)
-        acquisition_height = package.witness_v2.confirmed_bundle_chain[0].receipt.header_lite.height
-        record = LocalValueRecord(
-            record_id=uuid.uuid4().hex,
-            value=package.target_value,
-            witness_v2=accepted_witness,
-            local_status=LocalValueStatus.VERIFIED_SPENDABLE,
-            acquisition_height=acquisition_height,
+        record, error = self.receive_transfers((package,), validator)[0]
+        if record is None:
+            raise ValueError(error or "transfer validation failed")
+        return record
+
+    def receive_transfers(
+        self,
+        packages: Sequence[TransferPackage],
+        validator: V2TransferValidator,
+    ) -> list[tuple[LocalValueRecord | None, str | None]]:
+        """Validate a batch of incoming packages and keep every accepted one.
+
+        Returns ``(record, None)`` or ``(None, error)`` per package, in order.
+        All accepted records, their sidecars and the accepted-package markers
+        are written in a single wallet transaction.
+        """
+        outcomes: list[tuple[LocalValueRecord | None, str | None]] = [(None, None)] * len(packages)
+        fresh: list[int] = []
+        package_hashes: list[bytes] = []
+        seen: set[bytes] = set()
+        for index, package in enumerate(packages):
+            package_hash = transfer_package_hash(package)
+            package_hashes.append(package_hash)
+            if package_hash in seen or self.db.has_accepted_transfer_package(self.address, package_hash):
+                outcomes[index] = (None, "transfer package already accepted")
+                continue
+            seen.add(package_hash)
+            fresh.append(index)
+        results = validator.validate_transfer_packages(
+            [packages[index] for index in fresh],
+            recipient_addr=self.address,
+            history_cache=self.db,
         )
-        self._persist_records(self.records + [record])
-        self.db.save_accepted_transfer_package(
+        accepted: list[tuple[int, LocalValueRecord]] = []
+        for index, result in zip(fresh, results):
+            if not result.ok or result.accepted_witness is None:
+                outcomes[index] = (None, result.error or "transfer validation failed")
+                continue
+            package = packages[index]
+            accepted.append(
+                (
+                    index,
+                    LocalValueRecord(
+                        record_id=uuid.uuid4().hex,
+                        value=package.target_value,
+                        witness_v2=self._rehydrate_local_checkpoint_anchors(result.accepted_witness),
+                        local_status=LocalValueStatus.VERIFIED_SPENDABLE,
+                        acquisition_height=package.witness_v2.confirmed_bundle_chain[0].receipt.header_lite.height,
+                    ),
+                )
+            )
+        if not accepted:
+            return outcomes
+        stored = self.db.commit_received_transfers(
             self.address,
-            package_hash,
+            self.records + [record for _, record in accepted],
+            [sidecar for index, _ in accepted for sidecar in _iter_witness_sidecars(packages[index].witness_v2)],
+            [package_hashes[index] for index, _ in accepted],
             accepted_at=int(time.time()),
         )
-        return next(item for item in self.records if item.record_id == record.record_id)
+        self._adopt_stored_records(stored)
+        by_id = {record.record_id: record for record in self.records}
+        for index, record in accepted:
+            outcomes[index] = (by_id[record.record_id], None)
+        return outcomes
 
-    def create_exact_checkpoint(self, record_id: str) -> Checkpoint:
-        record = next(item for item in self.records if item.record_id == record_id)
+    def _exact_checkpoint_for_record(self, record: LocalValueRecord) -> Checkpoint:
         if not record.witness_v2.confirmed_bundle_chain:
             raise ValueError("checkpoint requires at least one confirmed unit")
         latest = record.witness_v2.confirmed_bundle_chain[0]
-        checkpoint = Checkpoint(
+        return Checkpoint(
             value_begin=record.value.begin,
             value_end=record.value.end,
             owner_addr=self.address,
@@ -835,13 +1118,125 @@ class WalletAccountV2:
             checkpoint_block_hash=latest.receipt.header_lite.block_hash,
             checkpoint_bundle_hash=compute_bundle_hash(latest.bundle_sidecar),
         )
+
+    def create_exact_checkpoint(self, record_id: str) -> Checkpoint:
+        record = next(item for item in self.records if item.record_id == record_id)
+        checkpoint = self._exact_checkpoint_for_record(record)
         self.db.save_checkpoint(checkpoint)
-        self._reload_state()
+        self._reload_checkpoints()
         return checkpoint
 
+    def _latest_checkpoint_heights(self) -> dict[tuple[int, int], int]:
+        heights: dict[tuple[int, int], int] = {}
+        for checkpoint in self.checkpoints:
+            if checkpoint.owner_addr != self.address:
+                continue
+            key = (checkpoint.value_begin, checkpoint.value_end)
+            heights[key] = max(heights.get(key, checkpoint.checkpoint_height), checkpoint.checkpoint_height)
+        return heights
+
+    def _units_since_checkpoint(self, record: LocalValueRecord, checkpoint_height: int | None) -> int:
+        if checkpoint_height is None:
+            return self._witness_total_units(record.witness_v2)
+        return sum(
+            1
+            for unit in record.witness_v2.confirmed_bundle_chain
+            if unit.receipt.header_lite.height > checkpoint_height
+        )
+
+    def checkpoint_due(
+        self,
+        record: LocalValueRecord,
+        current_height: int | None = None,
+        policy: CheckpointPolicy | None = None,
+        latest_heights: dict[tuple[int, int], int] | None = None,
+    ) -> bool:
+        policy = policy or self.checkpoint_policy
+        if policy is None or not policy.enabled:
+            return False
+        if record.local_status != LocalValueStatus.VERIFIED_SPENDABLE or not record.witness_v2.confirmed_bundle_chain:
+            return False
+        if latest_heights is None:
+            latest_heights = self._latest_checkpoint_heights()
+        checkpoint_height = latest_heights.get((record.value.begin, record.value.end))
+        latest_height = record.witness_v2.confirmed_bundle_chain[0].receipt.header_lite.height
+        if checkpoint_height is not None and checkpoint_height >= latest_height:
+            return False
+        if (
+            policy.max_witness_units is not None
+            and self._units_since_checkpoint(record, checkpoint_height) >= policy.max_witness_units
+        ):
+            return True
+        if policy.max_age_blocks is not None:
+            base_height = checkpoint_height if checkpoint_height is not None else record.acquisition_height
+            height = latest_height if current_height is None else max(current_height, latest_height)
+            if height - base_height >= policy.max_age_blocks:
+                return True
+        if policy.max_witness_bytes is not None:
+            return len(canonical_encode(record.witness_v2)) >= policy.max_witness_bytes
+        return False
+
+    def apply_checkpoint_policy(
+        self,
+        current_height: int | None = None,
+        policy: CheckpointPolicy | None = None,
+    ) -> tuple[Checkpoint, ...]:
+        """Checkpoint every spendable record the policy marks as due.
+
+        Older checkpoints of the same exact range are dropped: any later witness
+        for that range passes through the newest checkpointed unit, which trims
+        more of it than an older one would.
+        """
+        policy = policy or self.checkpoint_policy
+        if policy is None or not policy.enabled:
+            return ()
+        latest_heights = self._latest_checkpoint_heights()
+        created = tuple(
+            self._exact_checkpoint_for_record(record)
+            for record in self.record_index.by_status(LocalValueStatus.VERIFIED_SPENDABLE)
+            if self.checkpoint_due(record, current_height, policy, latest_heights)
+        )
+        if not created:
+            return ()
+        for checkpoint in created:
+            self.db.save_checkpoint(checkpoint)
+            self.db.delete_checkpoints_before(
+                self.address,
+                checkpoint.value_begin,
+                checkpoint.value_end,
+                checkpoint.checkpoint_height,
+            )
+        self._reload_checkpoints()
+        return created
+
+    def witness_size_stats(self) -> WitnessSizeStats:
+        live = [record for record in self.records if record.local_status != LocalValueStatus.ARCHIVED]
+        return summarize_witness_sizes(
+            [self._witness_total_units(record.witness_v2) for record in live],
+            [len(canonical_encode(record.witness_v2)) for record in live],
+            checkpoint_count=len(self.checkpoints),
+        )
+
     def checkpoint_anchor(self, checkpoint: Checkpoint) -> CheckpointAnchor:
         return CheckpointAnchor(checkpoint=checkpoint)
 
     def gc_unused_sidecars(self) -> int:
-        self.db.recompute_sidecar_ref_counts()
         return self.db.gc_unused_sidecars()
+
+    def fsck_sidecar_refs(self) -> int:
+        return self.db.recompute_sidecar_ref_counts()
+
+    def start_sidecar_gc(self, interval_sec: float = 60.0, min_unreferenced_sec: float = 60.0) -> SidecarGarbageCollector:
+        self.stop_sidecar_gc()
+        self._sidecar_gc = SidecarGarbageCollector(
+            self.db,
+            interval_sec=interval_sec,
+            min_unreferenced_sec=min_unreferenced_sec,
+        )
+        self._sidecar_gc.start()
+        return self._sidecar_gc
+
+    def stop_sidecar_gc(self) -> None:
+        if self._sidecar_gc is not None:
+            self._sidecar_gc.stop()
+            self._sidecar_gc = None
@@ -18,5 +18,6 @@ __all__ = [
     "router",
     "transport",
     "codec",
+    "dedup",
     "security",
 ]
@@ -16,13 +16,21 @@ class P2PConfig:
     send_timeout_ms: int = 3000
     retry_count: int = 2
     retry_backoff_ms: int = 300
+    broadcast_concurrency: int = 16  # transport sends in flight across all peers
+    peer_queue_size: int = 64  # outbound messages buffered per peer
+    breaker_failure_threshold: int = 3  # consecutive failures before a peer is skipped
+    breaker_cooldown_sec: float = 10.0
     msg_size_limit_bytes: int = 2 * 1024 * 1024
     dedup_window_ms: int = 5 * 60 * 1000
+    dedup_max_entries: int = 200_000  # cap on remembered msg_ids inside the window
     node_id: Optional[str] = None  # can be public key fingerprint or uuid
     identity_private_key_pem: Optional[str] = None
     identity_public_key_pem: Optional[str] = None
     enforce_identity_verification: bool = False
     signed_message_types: List[str] = field(default_factory=list)
+    verify_cache_size: int = 16384  # cached signature verdicts for forwarded duplicates
+    verify_offload_inflight: int = 8  # frames in flight before verification moves to threads; 0 disables
+    verify_workers: int = 2
     maintenance_interval_sec: float = 5.0
     seed_retry_base_sec: float = 1.0
     seed_retry_max_sec: float = 30.0
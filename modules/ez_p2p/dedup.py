@@ -0,0 +1,71 @@
+import heapq
+from typing import Dict, List, Optional, Set
+
+
+class MessageIdCache:
+    """Seen message ids bucketed by envelope timestamp, for replay/dedup checks.
+
+    Ids live in per-second buckets keyed by the sender's timestamp. Expiring
+    pops whole buckets off a min-heap of bucket seconds, so each id is dropped
+    exactly once and an insert costs O(1) amortized however much traffic the
+    window holds. ``max_entries`` caps memory; past it the oldest ids go first.
+    """
+
+    def __init__(self, window_ms: int, max_entries: int = 200_000, bucket_ms: int = 1000):
+        self.window_ms = max(0, int(window_ms))
+        self.max_entries = max(1, int(max_entries))
+        self.bucket_ms = max(1, int(bucket_ms))
+        self._bucket_of: Dict[str, int] = {}
+        self._buckets: Dict[int, Set[str]] = {}
+        self._bucket_heap: List[int] = []
+        self.capacity_evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._bucket_of)
+
+    def __contains__(self, msg_id: str) -> bool:
+        return msg_id in self._bucket_of
+
+    def add(self, msg_id: str, timestamp_ms: int) -> bool:
+        """Remember an id; returns False if it was already present."""
+        if msg_id in self._bucket_of:
+            return False
+        bucket = int(timestamp_ms) // self.bucket_ms
+        ids = self._buckets.get(bucket)
+        if ids is None:
+            ids = set()
+            self._buckets[bucket] = ids
+            heapq.heappush(self._bucket_heap, bucket)
+        ids.add(msg_id)
+        self._bucket_of[msg_id] = bucket
+        while len(self._bucket_of) > self.max_entries:
+            self._evict_one_oldest()
+            self.capacity_evictions += 1
+        return True
+
+    def expire(self, now_ms: int) -> int:
+        """Drop ids whose whole bucket fell out of the window; returns how many went."""
+        threshold = (int(now_ms) - self.window_ms) // self.bucket_ms
+        removed = 0
+        while self._bucket_heap and self._bucket_heap[0] < threshold:
+            bucket = heapq.heappop(self._bucket_heap)
+            for msg_id in self._buckets.pop(bucket, ()):
+                self._bucket_of.pop(msg_id, None)
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        self._bucket_of.clear()
+        self._buckets.clear()
+        self._bucket_heap.clear()
+
+    def oldest_bucket_ms(self) -> Optional[int]:
+        return self._bucket_heap[0] * self.bucket_ms if self._bucket_heap else None
+
+    def _evict_one_oldest(self) -> None:
+        bucket = self._bucket_heap[0]
+        ids = self._buckets[bucket]
+        self._bucket_of.pop(ids.pop(), None)
+        if not ids:
+            heapq.heappop(self._bucket_heap)
+            del self._buckets[bucket]
@@ -1,19 +1,22 @@
 import asyncio
 import contextlib
+from concurrent.futures import ThreadPoolExecutor
 import time
 import uuid
-from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 
 from .codec import encode_message, decode_message
 from .config import P2PConfig
+from .dedup import MessageIdCache
 from .logger import setup_logger
 from .peer_manager import PeerManager, PeerInfo
 from .security import (
     SUPPORTED_ALGORITHM,
+    EnvelopeVerifier,
     derive_public_key_pem,
     fingerprint_public_key,
+    load_identity_private_key,
     sign_envelope,
-    verify_envelope_signature,
 )
 from .transport.tcp import TcpTransport
 from .transport.base import AbstractTransport
@@ -26,6 +29,34 @@ except Exception:  # optional
 Handler = Callable[[Dict[str, Any], str, asyncio.StreamWriter], Awaitable[None]]
 
 
+class _PeerOutbox:
+    """Bounded outbound queue, sender task and circuit breaker for one peer address."""
+
+    def __init__(self, addr: str, maxsize: int):
+        self.addr = addr
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.task: Optional[asyncio.Task] = None
+        self.failures = 0
+        self.open_until_monotonic = 0.0
+        self.last_error = ""
+
+    def is_open(self, now: float) -> bool:
+        # Past the cooldown the breaker is half-open: the next message is a probe,
+        # and a failed probe reopens it straight away since failures stays high.
+        return now < self.open_until_monotonic
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.open_until_monotonic = 0.0
+        self.last_error = ""
+
+    def record_failure(self, err: str, threshold: int, cooldown_sec: float) -> None:
+        self.failures += 1
+        self.last_error = err
+        if self.failures >= threshold:
+            self.open_until_monotonic = time.monotonic() + cooldown_sec
+
+
 class Router:
     DEFAULT_SIGNED_TYPES = {
         "HELLO",
@@ -43,7 +74,8 @@ class Router:
         self.logger = setup_logger("ez_p2p")
         self.peer_manager = PeerManager(max_neighbors=config.max_neighbors)
         self.handlers: Dict[str, Handler] = {}
-        self._seen_msg_ids: Dict[str, int] = {}
+        self._seen_msg_ids = MessageIdCache(config.dedup_window_ms, max_entries=config.dedup_max_entries)
+        self._dedup_stats = {"duplicates_dropped": 0, "stale_dropped": 0, "future_dropped": 0}
         self._maintenance_task: Optional[asyncio.Task] = None
         self._clock_future_skew_ms = 30_000
         self._seed_state: Dict[str, Dict[str, Any]] = {}
@@ -53,13 +85,28 @@ class Router:
         self._seed_retry_base_sec = max(0.1, float(config.seed_retry_base_sec))
         self._seed_retry_max_sec = max(self._seed_retry_base_sec, float(config.seed_retry_max_sec))
         self._degraded_no_peer_sec = max(1.0, float(config.degraded_no_peer_sec))
+        self._broadcast_concurrency = max(1, int(config.broadcast_concurrency))
+        self._peer_queue_size = max(1, int(config.peer_queue_size))
+        self._breaker_threshold = max(1, int(config.breaker_failure_threshold))
+        self._breaker_cooldown_sec = max(0.0, float(config.breaker_cooldown_sec))
+        self._outboxes: Dict[str, _PeerOutbox] = {}
+        self._send_slots: Optional[asyncio.Semaphore] = None
         self._enforce_identity = bool(config.enforce_identity_verification)
         signed_types = set(config.signed_message_types or [])
         self._signed_message_types: Set[str] = signed_types if signed_types else set(self.DEFAULT_SIGNED_TYPES)
         self._identity_private_key_pem = config.identity_private_key_pem
         self._identity_public_key_pem = config.identity_public_key_pem
-        if self._identity_private_key_pem and not self._identity_public_key_pem:
-            self._identity_public_key_pem = derive_public_key_pem(self._identity_private_key_pem)
+        # Parse the signing key once instead of per outbound message.
+        self._identity_private_key = (
+            load_identity_private_key(self._identity_private_key_pem) if self._identity_private_key_pem else None
+        )
+        if self._identity_private_key is not None and not self._identity_public_key_pem:
+            self._identity_public_key_pem = derive_public_key_pem(self._identity_private_key)
+        self._verifier = EnvelopeVerifier(max_results=config.verify_cache_size)
+        self._verify_offload_inflight = max(0, int(config.verify_offload_inflight))
+        self._verify_workers = max(1, int(config.verify_workers))
+        self._verify_executor: Optional[ThreadPoolExecutor] = None
+        self._inflight_frames = 0
 
         # Transport selection
         self.transport: AbstractTransport
@@ -96,9 +143,25 @@ class Router:
             with contextlib.suppress(asyncio.CancelledError):
                 await self._maintenance_task
             self._maintenance_task = None
+        for outbox in self._outboxes.values():
+            if outbox.task:
+                outbox.task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await outbox.task
+                outbox.task = None
         await self.transport.stop()
+        if self._verify_executor is not None:
+            self._verify_executor.shutdown(wait=False)
+            self._verify_executor = None
 
     async def _on_frame(self, data: bytes, remote_id: str, ctx: Any):
+        self._inflight_frames += 1
+        try:
+            await self._process_frame(data, remote_id, ctx)
+        finally:
+            self._inflight_frames -= 1
+
+    async def _process_frame(self, data: bytes, remote_id: str, ctx: Any):
         if len(data) > self.cfg.msg_size_limit_bytes:
             self.logger.info("drop_oversize_message", extra={"extra": {"size": len(data)}})
             return
@@ -108,7 +171,17 @@ class Router:
             self.logger.warning("decode_failed", extra={"extra": {"err": str(e)}})
             return
 
-        if not self._validate_envelope(msg):
+        if self._should_offload_verification(msg):
+            # Keep the event loop serving other connections while a backlog is verified.
+            if self._verify_executor is None:
+                self._verify_executor = ThreadPoolExecutor(
+                    max_workers=self._verify_workers, thread_name_prefix="ez_p2p_verify"
+                )
+            loop = asyncio.get_running_loop()
+            valid = await loop.run_in_executor(self._verify_executor, self._validate_envelope, msg)
+        else:
+            valid = self._validate_envelope(msg)
+        if not valid:
             return
 
         if self._is_replay_or_duplicate(msg):
@@ -124,13 +197,15 @@ class Router:
     def register_handler(self, msg_type: str, handler: Handler):
         self.handlers[msg_type] = handler
 
-    async def broadcastToConsensus(self, payload: Dict[str, Any], msg_type: str):
-        for p in self.peer_manager.select_by_role("consensus"):
-            await self._send_to_addr(p.address, payload, msg_type, network="consensus")
+    async def broadcastToConsensus(
+        self, payload: Dict[str, Any], msg_type: str, min_acks: Optional[int] = None
+    ) -> Dict[str, Any]:
+        return await self._broadcast("consensus", payload, msg_type, network="consensus", min_acks=min_acks)
 
-    async def broadcastToAccounts(self, payload: Dict[str, Any], msg_type: str):
-        for p in self.peer_manager.select_by_role("account"):
-            await self._send_to_addr(p.address, payload, msg_type, network="account")
+    async def broadcastToAccounts(
+        self, payload: Dict[str, Any], msg_type: str, min_acks: Optional[int] = None
+    ) -> Dict[str, Any]:
+        return await self._broadcast("account", payload, msg_type, network="account", min_acks=min_acks)
 
     async def sendToAccount(self, account_addr: str, payload: Dict[str, Any], msg_type: str):
         # account_addr is opaque here (user-defined). In MVP, treat as address string host:port
@@ -143,8 +218,112 @@ class Router:
     async def sendConsensusToAccount(self, account_addr: str, payload: Dict[str, Any], msg_type: str):
         await self._send_to_addr(account_addr, payload, msg_type, network="account")
 
+    async def _broadcast(
+        self,
+        role: str,
+        payload: Dict[str, Any],
+        msg_type: str,
+        network: str,
+        min_acks: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Fan one message out to every peer of a role through the per-peer outboxes.
+
+        Peers whose circuit breaker is open are skipped. With min_acks set the call
+        returns once that many peers have the message; the rest keep sending in the
+        background. Per-peer failures are reported, not raised.
+        """
+        result: Dict[str, Any] = {"delivered": [], "failed": {}, "skipped": [], "pending": []}
+        addrs: List[str] = []
+        now = time.monotonic()
+        for p in self.peer_manager.select_by_role(role):
+            if p.address in addrs:
+                continue
+            if self._outbox(p.address).is_open(now):
+                result["skipped"].append(p.address)
+            else:
+                addrs.append(p.address)
+        if not addrs:
+            return result
+
+        # One envelope for all peers so receivers can dedup the gossip by msg_id.
+        data = self._encode_outbound_message(network=network, msg_type=msg_type, payload=payload)
+        enqueued = await asyncio.gather(*(self._enqueue(addr, data, msg_type) for addr in addrs))
+        waiting: Dict[asyncio.Future, str] = {}
+        for addr, fut in zip(addrs, enqueued):
+            if isinstance(fut, str):
+                result["failed"][addr] = fut
+            else:
+                waiting[fut] = addr
+
+        needed = len(waiting) if min_acks is None else max(0, int(min_acks))
+        pending: Set[asyncio.Future] = set(waiting)
+        while pending and len(result["delivered"]) < needed:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                err = fut.result()
+                if err is None:
+                    result["delivered"].append(waiting[fut])
+                else:
+                    result["failed"][waiting[fut]] = err
+        result["pending"] = [waiting[fut] for fut in pending]
+        if result["failed"]:
+            self.logger.info(
+                "broadcast_partial",
+                extra={"extra": {"type": msg_type, "failed": sorted(result["failed"]), "skipped": result["skipped"]}},
+            )
+        return result
+
+    def _outbox(self, addr: str) -> _PeerOutbox:
+        outbox = self._outboxes.get(addr)
+        if outbox is None:
+            outbox = _PeerOutbox(addr, self._peer_queue_size)
+            self._outboxes[addr] = outbox
+        return outbox
+
+    async def _enqueue(self, addr: str, data: bytes, msg_type: str) -> Any:
+        """Queue a frame for a peer; returns a future for its outcome, or an error string."""
+        outbox = self._outbox(addr)
+        if outbox.task is None or outbox.task.done():
+            outbox.task = asyncio.create_task(self._outbox_worker(outbox))
+        fut = asyncio.get_running_loop().create_future()
+        # Backpressure: a full queue holds the broadcast for up to one send timeout.
+        timeout_sec = max(0.1, self.cfg.send_timeout_ms / 1000.0)
+        try:
+            await asyncio.wait_for(outbox.queue.put((data, msg_type, fut)), timeout=timeout_sec)
+        except asyncio.TimeoutError:
+            err = f"queue_full:{addr}:{msg_type}"
+            outbox.record_failure(err, self._breaker_threshold, self._breaker_cooldown_sec)
+            return err
+        return fut
+
+    async def _outbox_worker(self, outbox: _PeerOutbox) -> None:
+        # Messages to one peer go out in order; peers proceed independently.
+        if self._send_slots is None:
+            self._send_slots = asyncio.Semaphore(self._broadcast_concurrency)
+        while True:
+            data, msg_type, fut = await outbox.queue.get()
+            try:
+                if outbox.is_open(time.monotonic()):
+                    err: Optional[str] = f"breaker_open:{outbox.addr}"
+                else:
+                    async with self._send_slots:
+                        try:
+                            await self._send_bytes(outbox.addr, data, msg_type)
+                            err = None
+                            outbox.record_success()
+                        except Exception as e:
+                            err = str(e)
+                            outbox.record_failure(err, self._breaker_threshold, self._breaker_cooldown_sec)
+                if not fut.done():
+                    fut.set_result(err)
+            finally:
+                outbox.queue.task_done()
+
     async def _send_to_addr(self, addr: str, payload: Dict[str, Any], msg_type: str, network: str):
         data = self._encode_outbound_message(network=network, msg_type=msg_type, payload=payload)
+        await self._send_bytes(addr, data, msg_type)
+
+    async def _send_bytes(self, addr: str, data: bytes, msg_type: str):
         retry_count = max(0, int(self.cfg.retry_count))
         backoff_ms = max(0, int(self.cfg.retry_backoff_ms))
         timeout_sec = max(0.1, self.cfg.send_timeout_ms / 1000.0)
@@ -289,7 +468,7 @@ class Router:
     ) -> Dict[str, Any] | None:
         if msg_type not in self._signed_message_types:
             return None
-        if not self._identity_private_key_pem or not self._identity_public_key_pem:
+        if self._identity_private_key is None or not self._identity_public_key_pem:
             return None
         to_sign = {
             "version": self.cfg.protocol_version,
@@ -300,7 +479,7 @@ class Router:
             "sender_id": sender_id,
             "payload": payload,
         }
-        signature_hex = sign_envelope(to_sign, self._identity_private_key_pem)
+        signature_hex = sign_envelope(to_sign, self._identity_private_key)
         return {
             "algorithm": SUPPORTED_ALGORITHM,
             "public_key": self._identity_public_key_pem,
@@ -334,7 +513,7 @@ class Router:
             self.logger.info("drop_invalid_identity_metadata", extra={"extra": {"type": msg_type}})
             return not self._enforce_identity
 
-        if not verify_envelope_signature(msg, signature_hex=sig, public_key_pem=pub):
+        if not self._verifier.verify(msg, sig, pub):
             self.logger.info("drop_invalid_identity_signature", extra={"extra": {"type": msg_type, "sender_id": sender_id}})
             return not self._enforce_identity
 
@@ -346,27 +525,32 @@ class Router:
 
         return True
 
+    def _should_offload_verification(self, msg: Dict[str, Any]) -> bool:
+        if not self._verify_offload_inflight or self._inflight_frames <= self._verify_offload_inflight:
+            return False
+        return str(msg.get("type", "")) in self._signed_message_types and isinstance(msg.get("auth"), dict)
+
     def _is_replay_or_duplicate(self, msg: Dict[str, Any]) -> bool:
         now_ms = int(time.time() * 1000)
         msg_id = str(msg.get("msg_id", ""))
         msg_ts = int(msg.get("timestamp", 0))
         self._evict_old_msg_ids(now_ms)
         if msg_id in self._seen_msg_ids:
+            self._dedup_stats["duplicates_dropped"] += 1
             return True
         # Basic replay guard: too old or too far in the future are both suspicious.
         if msg_ts < now_ms - self.cfg.dedup_window_ms:
+            self._dedup_stats["stale_dropped"] += 1
             return True
         if msg_ts > now_ms + self._clock_future_skew_ms:
+            self._dedup_stats["future_dropped"] += 1
             return True
-        self._seen_msg_ids[msg_id] = msg_ts
+        self._seen_msg_ids.add(msg_id, msg_ts)
         return False
 
     def _evict_old_msg_ids(self, now_ms: Optional[int] = None):
-        current_ms = now_ms or int(time.time() * 1000)
-        threshold = current_ms - self.cfg.dedup_window_ms
-        old_ids = [mid for mid, ts in self._seen_msg_ids.items() if ts < threshold]
-        for mid in old_ids:
-            self._seen_msg_ids.pop(mid, None)
+        # Only whole expired buckets are touched, so this is cheap on every frame.
+        self._seen_msg_ids.expire(now_ms or int(time.time() * 1000))
 
     @staticmethod
     def _is_version_compatible(local_version: str, remote_version: str) -> bool:
@@ -446,10 +630,25 @@ class Router:
                 ),
                 "next_retry_in_sec": max(0.0, round(float(state.get("next_retry_monotonic", 0.0)) - now, 3)),
             }
+        outbox_state = {}
+        for addr, outbox in self._outboxes.items():
+            outbox_state[addr] = {
+                "queued": outbox.queue.qsize(),
+                "failures": outbox.failures,
+                "breaker_open": outbox.is_open(now),
+                "last_error": outbox.last_error,
+            }
         return {
             "node_id": self.node_id,
             "peer_count": peer_count,
             "degraded": degraded,
             "no_peer_for_sec": round(no_peer_for, 3),
             "seed_state": seed_state,
+            "outbox_state": outbox_state,
+            "dedup": {
+                **self._dedup_stats,
+                "tracked_ids": len(self._seen_msg_ids),
+                "capacity_evictions": self._seen_msg_ids.capacity_evictions,
+            },
+            "verify": {**self._verifier.stats, "inflight_frames": self._inflight_frames},
         }
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import Any, Dict
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
 
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes, serialization
@@ -12,6 +14,9 @@ from cryptography.hazmat.primitives.serialization import load_pem_private_key, l
 
 SUPPORTED_ALGORITHM = "ecdsa-p256-sha256"
 
+PrivateKeyLike = Union[str, bytes, ec.EllipticCurvePrivateKey]
+PublicKeyLike = Union[str, bytes, ec.EllipticCurvePublicKey]
+
 
 def _to_bytes(pem: str | bytes) -> bytes:
     if isinstance(pem, bytes):
@@ -37,10 +42,17 @@ def fingerprint_public_key(public_key_pem: str | bytes) -> str:
     return hashlib.sha256(pub).hexdigest()
 
 
-def derive_public_key_pem(private_key_pem: str | bytes) -> str:
+def load_identity_private_key(private_key_pem: str | bytes) -> ec.EllipticCurvePrivateKey:
     private_key = load_pem_private_key(_to_bytes(private_key_pem), password=None)
     if not isinstance(private_key, ec.EllipticCurvePrivateKey):
         raise ValueError("identity_private_key_must_be_ec")
+    return private_key
+
+
+def derive_public_key_pem(private_key_pem: PrivateKeyLike) -> str:
+    private_key = private_key_pem
+    if not isinstance(private_key, ec.EllipticCurvePrivateKey):
+        private_key = load_identity_private_key(private_key_pem)
     public_key = private_key.public_key()
     public_bytes = public_key.public_bytes(
         encoding=serialization.Encoding.PEM,
@@ -49,27 +61,99 @@ def derive_public_key_pem(private_key_pem: str | bytes) -> str:
     return public_bytes.decode("utf-8")
 
 
-def sign_envelope(envelope: Dict[str, Any], private_key_pem: str | bytes) -> str:
-    private_key = load_pem_private_key(_to_bytes(private_key_pem), password=None)
-    if not isinstance(private_key, ec.EllipticCurvePrivateKey):
-        raise ValueError("identity_private_key_must_be_ec")
+def envelope_digest(envelope: Dict[str, Any]) -> bytes:
+    return hashlib.sha256(canonical_envelope_payload(envelope)).digest()
+
 
-    digest = hashlib.sha256(canonical_envelope_payload(envelope)).digest()
-    signature = private_key.sign(digest, ec.ECDSA(hashes.SHA256()))
+def sign_envelope(envelope: Dict[str, Any], private_key: PrivateKeyLike) -> str:
+    """Sign an envelope with a PEM key, or with a key object loaded once by the caller."""
+    if not isinstance(private_key, ec.EllipticCurvePrivateKey):
+        private_key = load_identity_private_key(private_key)
+    signature = private_key.sign(envelope_digest(envelope), ec.ECDSA(hashes.SHA256()))
     return signature.hex()
 
 
+def _verify_digest(digest: bytes, signature_hex: str, public_key: ec.EllipticCurvePublicKey) -> bool:
+    try:
+        public_key.verify(bytes.fromhex(signature_hex), digest, ec.ECDSA(hashes.SHA256()))
+        return True
+    except (InvalidSignature, ValueError, TypeError):
+        return False
+
+
 def verify_envelope_signature(
     envelope: Dict[str, Any],
     signature_hex: str,
-    public_key_pem: str | bytes,
+    public_key_pem: PublicKeyLike,
 ) -> bool:
     try:
-        public_key = load_pem_public_key(_to_bytes(public_key_pem))
+        if isinstance(public_key_pem, ec.EllipticCurvePublicKey):
+            public_key = public_key_pem
+        else:
+            public_key = load_pem_public_key(_to_bytes(public_key_pem))
         if not isinstance(public_key, ec.EllipticCurvePublicKey):
             return False
-        digest = hashlib.sha256(canonical_envelope_payload(envelope)).digest()
-        public_key.verify(bytes.fromhex(signature_hex), digest, ec.ECDSA(hashes.SHA256()))
-        return True
-    except (InvalidSignature, ValueError, TypeError):
+        return _verify_digest(envelope_digest(envelope), signature_hex, public_key)
+    except (ValueError, TypeError):
         return False
+
+
+class EnvelopeVerifier:
+    """Envelope signature checks with loaded public keys and recent results kept.
+
+    Public keys are parsed once per identity fingerprint. Results are cached per
+    (msg_id, signature, fingerprint, digest): the digest ties a hit to the exact
+    signed content, so a forwarded copy of a message skips the ECDSA check while
+    a tampered one still misses. Both caches are LRU-bounded and lock-guarded,
+    so verification may run on worker threads.
+    """
+
+    def __init__(self, max_keys: int = 1024, max_results: int = 16384):
+        self.max_keys = max(1, int(max_keys))
+        self.max_results = max(1, int(max_results))
+        self._keys: "OrderedDict[str, Optional[ec.EllipticCurvePublicKey]]" = OrderedDict()
+        self._results: "OrderedDict[Tuple[str, str, str, bytes], bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"key_hits": 0, "key_loads": 0, "result_hits": 0, "verifications": 0}
+
+    def public_key(self, public_key_pem: str | bytes) -> Optional[ec.EllipticCurvePublicKey]:
+        return self._public_key(fingerprint_public_key(public_key_pem), public_key_pem)
+
+    def _public_key(self, fingerprint: str, public_key_pem: str | bytes) -> Optional[ec.EllipticCurvePublicKey]:
+        with self._lock:
+            if fingerprint in self._keys:
+                self._keys.move_to_end(fingerprint)
+                self.stats["key_hits"] += 1
+                return self._keys[fingerprint]
+        try:
+            key = load_pem_public_key(_to_bytes(public_key_pem))
+        except (ValueError, TypeError):
+            key = None
+        if not isinstance(key, ec.EllipticCurvePublicKey):
+            key = None
+        with self._lock:
+            self.stats["key_loads"] += 1
+            self._keys[fingerprint] = key
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        return key
+
+    def verify(self, envelope: Dict[str, Any], signature_hex: str, public_key_pem: str | bytes) -> bool:
+        fingerprint = fingerprint_public_key(public_key_pem)
+        digest = envelope_digest(envelope)
+        cache_key = (str(envelope.get("msg_id", "")), signature_hex, fingerprint, digest)
+        with self._lock:
+            cached = self._results.get(cache_key)
+            if cached is not None:
+                self._results.move_to_end(cache_key)
+                self.stats["result_hits"] += 1
+                return cached
+
+        public_key = self._public_key(fingerprint, public_key_pem)
+        ok = public_key is not None and _verify_digest(digest, signature_hex, public_key)
+        with self._lock:
+            self.stats["verifications"] += 1
+            self._results[cache_key] = ok
+            if len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return ok
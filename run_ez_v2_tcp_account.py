@@ -102,6 +102,10 @@ def run_daemon(
     reset_ephemeral_state: bool,
     reset_derived_state: bool,
     network_timeout_sec: float,
+    full_resync_sec: float = 30.0,
+    validation_workers: int = 0,
+    sidecar_gc_sec: float = 300.0,
+    max_pending_bundles: int = 1,
 ) -> None:
     root = Path(root_dir)
     root.mkdir(parents=True, exist_ok=True)
@@ -155,6 +159,9 @@ def run_daemon(
         private_key_pem=private_key_pem,
         public_key_pem=public_key_pem,
         state_path=str(network_state_path),
+        validation_workers=validation_workers,
+        sidecar_gc_interval_sec=max(0.0, sidecar_gc_sec),
+        max_pending_bundles=max(1, int(max_pending_bundles)),
     )
     if reset_ephemeral_state:
         account.reset_ephemeral_state()
@@ -175,6 +182,7 @@ def run_daemon(
     recovery_count = 0
     last_successful_sync_at = 0
     last_recovered_at = 0
+    last_full_sync_monotonic = 0.0
     try:
         while running:
             sync_started_at = int(time.time())
@@ -183,9 +191,28 @@ def run_daemon(
             last_sync_error = ""
             recovered_this_sync = False
             recovery = None
+            # With an active receipt subscription an idle account has nothing
+            # to poll for; receipts are pushed as blocks finalize. Fall back to
+            # a full recovery pass when work is pending or periodically; the
+            # periodic pass is also what notices a lost consensus host.
+            full_sync_due = (
+                not account.receipt_subscription_active
+                or consecutive_sync_failures > 0
+                or bool(account.wallet.list_pending_bundles())
+                or time.monotonic() - last_full_sync_monotonic >= max(0.0, full_resync_sec)
+            )
             try:
                 sync_started_monotonic = time.monotonic()
-                recovery = account.recover_network_state()
+                if full_sync_due:
+                    recovery = account.recover_network_state()
+                    last_full_sync_monotonic = time.monotonic()
+                    if not account.receipt_subscription_active:
+                        try:
+                            account.subscribe_receipts()
+                        except Exception:
+                            # Consensus hosts without receipt subscriptions
+                            # keep working through the polling recovery.
+                            pass
                 sync_duration_ms = int((time.monotonic() - sync_started_monotonic) * 1000)
             except Exception as exc:
                 sync_duration_ms = int((time.monotonic() - sync_started_monotonic) * 1000)
@@ -240,6 +267,7 @@ def run_daemon(
                     "pending_incoming_transfer_count": pending_incoming_transfer_count,
                     "fetched_block_count": fetched_block_count,
                     "applied_receipts_last_sync": applied_receipts,
+                    "receipt_subscription_active": account.receipt_subscription_active,
                     "last_sync_at": int(time.time()),
                     "last_sync_started_at": sync_started_at,
                     "last_sync_duration_ms": sync_duration_ms,
@@ -266,6 +294,12 @@ def main() -> None:
     parser.add_argument("--chain-id", type=int, default=1, help="Chain id for the V2 account daemon")
     parser.add_argument("--heartbeat-sec", type=float, default=0.5, help="Heartbeat interval")
     parser.add_argument("--network-timeout-sec", type=float, default=5.0, help="Transport request timeout in seconds")
+    parser.add_argument(
+        "--full-resync-sec",
+        type=float,
+        default=30.0,
+        help="Interval for a full recovery pass while a receipt subscription is active",
+    )
     parser.add_argument("--endpoint", default="127.0.0.1:19600", help="TCP listen endpoint for the account node")
     parser.add_argument(
         "--listen-host",
@@ -276,6 +310,27 @@ def main() -> None:
     parser.add_argument("--consensus-endpoint", required=True, help="Remote consensus TCP endpoint")
     parser.add_argument("--wallet-file", default="", help="Optional wallet.json path to reuse as the account identity")
     parser.add_argument("--wallet-db-path", default="", help="Optional sqlite path to reuse as the account wallet database")
+    parser.add_argument(
+        "--validation-workers",
+        type=int,
+        default=0,
+        help="Worker processes for parallel witness proof checks on incoming transfers (0 validates inline)",
+    )
+    parser.add_argument(
+        "--sidecar-gc-sec",
+        type=float,
+        default=300.0,
+        help="Interval for the background sweep of unreferenced bundle sidecars (0 disables it)",
+    )
+    parser.add_argument(
+        "--max-pending-bundles",
+        type=int,
+        default=1,
+        help=(
+            "Bundles the wallet may build ahead of confirmation; consensus confirms one per block, "
+            "so later seqs are sent as earlier ones confirm"
+        ),
+    )
     parser.add_argument(
         "--reset-ephemeral-state",
         action="store_true",
@@ -302,6 +357,10 @@ def main() -> None:
         reset_ephemeral_state=bool(args.reset_ephemeral_state),
         reset_derived_state=bool(args.reset_derived_state),
         network_timeout_sec=float(args.network_timeout_sec),
+        full_resync_sec=float(args.full_resync_sec),
+        validation_workers=max(0, int(args.validation_workers)),
+        sidecar_gc_sec=float(args.sidecar_gc_sec),
+        max_pending_bundles=max(1, int(args.max_pending_bundles)),
     )
 
 
@@ -15,6 +15,7 @@ from EZ_V2.crypto import address_from_public_key_pem, generate_secp256k1_keypair
 from EZ_V2.encoding import canonical_encode
 from EZ_V2.localnet import V2LocalNetwork
 from EZ_V2.serde import dumps_json
+from EZ_V2.transfer_cost import verification_hash_ops
 from EZ_V2.types import (
     AccountLeaf,
     BlockHeaderV2,
@@ -453,7 +454,7 @@ def project_costs(
         consensus_receipt_delivery_json_day / args.consensus_nodes + consensus_block_fanout_json_day
     )
 
-    user_verify_hash_ops_per_incoming = samples.smt_depth * effective_witness_hops
+    user_verify_hash_ops_per_incoming = verification_hash_ops(effective_witness_hops, samples.smt_depth)
     user_verify_hash_ops_per_day = user_verify_hash_ops_per_incoming * (
         args.tx_per_second * SECONDS_PER_DAY / active_users
     )
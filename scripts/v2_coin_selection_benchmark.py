@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from EZ_V2.selection import (
+    DEFAULT_SELECTION_MAX_NODES,
+    DEFAULT_SELECTION_TIME_BUDGET_SECONDS,
+    CoinSelector,
+    SelectionCandidate,
+)
+
+
+WALLET_SHAPES = ("uniform", "dust", "mixed")
+
+
+def synthetic_candidates(shape: str, record_count: int, seed: int) -> list[SelectionCandidate]:
+    rng = random.Random(seed)
+    candidates: list[SelectionCandidate] = []
+    cursor = 0
+    for _ in range(record_count):
+        if shape == "uniform":
+            size = rng.randint(50, 150)
+        elif shape == "dust":
+            size = rng.randint(1, 8)
+        else:
+            size = rng.choice((1, 2, 5, 10, 50, 100, 500, 1_000, 10_000))
+        has_checkpoint = rng.random() < 0.2
+        hops = rng.randint(1, 12)
+        candidates.append(
+            SelectionCandidate(
+                begin=cursor,
+                size=size,
+                cost=(
+                    0 if has_checkpoint else 1,
+                    0 if has_checkpoint else hops,
+                    hops,
+                    -rng.randint(0, 10_000),
+                ),
+            )
+        )
+        cursor += size + rng.randint(0, 3)
+    return candidates
+
+
+def run_shape(args: argparse.Namespace, shape: str) -> dict:
+    candidates = synthetic_candidates(shape, args.records, args.seed)
+    build_started = time.perf_counter()
+    selector = CoinSelector(candidates)
+    build_ms = (time.perf_counter() - build_started) * 1000.0
+    rng = random.Random(args.seed + 1)
+    timings: list[float] = []
+    inputs: list[int] = []
+    exhaustive = 0
+    splits = 0
+    for _ in range(args.queries):
+        amount = rng.randint(1, max(1, int(selector.total * args.max_amount_ratio)))
+        started = time.perf_counter()
+        plan = selector.select(amount, time_budget=args.time_budget, max_nodes=args.max_nodes)
+        timings.append((time.perf_counter() - started) * 1000.0)
+        inputs.append(plan.input_count)
+        exhaustive += 1 if plan.exhaustive else 0
+        splits += plan.split_count
+    timings.sort()
+    return {
+        "shape": shape,
+        "records": len(selector),
+        "total_value": selector.total,
+        "build_ms": round(build_ms, 3),
+        "queries": args.queries,
+        "select_ms_p50": round(statistics.median(timings), 4),
+        "select_ms_p99": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 4),
+        "select_ms_max": round(timings[-1], 4),
+        "avg_inputs": round(statistics.fmean(inputs), 2),
+        "split_ratio": round(splits / args.queries, 3),
+        "exhaustive_ratio": round(exhaustive / args.queries, 3),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark EZchain V2 payment coin selection over synthetic fragmented wallets."
+    )
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--shape", choices=(*WALLET_SHAPES, "all"), default="all")
+    parser.add_argument("--max-amount-ratio", type=float, default=0.01)
+    parser.add_argument("--time-budget", type=float, default=DEFAULT_SELECTION_TIME_BUDGET_SECONDS)
+    parser.add_argument("--max-nodes", type=int, default=DEFAULT_SELECTION_MAX_NODES)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json-output", action="store_true")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    shapes = WALLET_SHAPES if args.shape == "all" else (args.shape,)
+    results = [run_shape(args, shape) for shape in shapes]
+    if args.json_output:
+        print(json.dumps({"inputs": vars(args), "results": results}, indent=2, sort_keys=True))
+        return 0
+    for result in results:
+        print(
+            f"{result['shape']:>8}: records={result['records']} build={result['build_ms']:.1f} ms "
+            f"p50={result['select_ms_p50']:.3f} ms p99={result['select_ms_p99']:.3f} ms "
+            f"max={result['select_ms_max']:.3f} ms inputs={result['avg_inputs']:.1f} "
+            f"split={result['split_ratio']:.2f} exhaustive={result['exhaustive_ratio']:.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())